@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+
+"""
+Throughput benchmark for the JtR log parser
+
+Generates a synthetic JtR log (10 million lines by default) made up of wordlist, single,
+incremental, mask, loopback, and PRINCE sessions, then times how long the parser
+takes to read it and prints the lines per second.
+
+By default the Sessions and Strikes are only counted so this measures the parser itself.
+Use --full to save them into a SessionList/StrikeList the way JTRMgr.read_logfile() does.
+
+Run from the top level directory of this repo:
+    python -m benchmarks.bench_jtr_log_parser
+    python -m benchmarks.bench_jtr_log_parser --lines 100000 --full --keep example.log
+"""
+
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from lib_framework.jtr_mgr import JTRMgr
+from lib_framework._jtr_log_parser import JtRLogParser
+from lib_framework.hash import HashList
+from lib_framework.session import SessionList
+from lib_framework.strike import StrikeList
+
+
+# Number of hashes loaded in each session. Cracks are spread across these hash_ids
+NUM_HASHES = 10000
+
+
+class CountingParser(JtRLogParser):
+    """
+    Counts the Sessions and Strikes vs. saving them
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_sessions = 0
+        self.num_strikes = 0
+
+    def _add_session(self, session_info, compleated, strike_ids):
+        self.num_sessions += 1
+
+    def _add_strike(self, hash_id, details):
+        self.num_strikes += 1
+        return self.num_strikes
+
+
+def _timestamp(seconds):
+    """
+    Formats seconds the way JtR does in its logs. Aka D:HH:MM:SS
+    """
+    days, seconds = divmod(seconds, 24 * 60 * 60)
+    hours, seconds = divmod(seconds, 60 * 60)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{days}:{hours:02}:{minutes:02}:{seconds:02}"
+
+
+def _session_header(command_line, hash_type="Raw-MD5"):
+    return [
+        f"Command line: {command_line}",
+        "- UTF-8 input encoding enabled",
+        "- Passwords in this logfile are UTF-8 encoded",
+        f"Loaded a total of {NUM_HASHES} password hashes with no different salts",
+        f"- Hash type: {hash_type} (min-len 0, max-len 32)",
+        "- Algorithm: MD4 256/256 AVX2 8x3",
+        "- Candidate passwords will be buffered and tried in chunks of 24",
+    ]
+
+
+def _session_body(session_num, num_lines):
+    """
+    Generates the lines for the attack portion of a session
+
+    Inputs:
+        session_num: (Int) Used to pick the type of attack and vary the cracks
+
+        num_lines: (Int) Roughly how many lines to generate
+
+    Returns:
+        lines: (List) Log messages without timestamps
+    """
+    kind = session_num % 6
+    lines = []
+    if kind == 0:
+        lines += _session_header(f"john --format=raw-md5 --wordlist=dic-{session_num}.txt --rules=best64 left.hash")
+        lines += ["Proceeding with wordlist mode", "- Rules: best64", "- 77 preprocessed word mangling rules",
+            f"- Wordlist file: /wordlists/dic-{session_num}.txt"]
+        rule_line = "- Rule #{num}: '$1 $2' accepted as 'Az\"12\"'"
+        attack = "wordlist"
+    elif kind == 1:
+        lines += _session_header("john --format=raw-md5 --single left.hash")
+        lines += ['Proceeding with "single crack" mode', "- SingleWordsPairMax used is 6", "- 1079 preprocessed word mangling rules"]
+        rule_line = "- Rule #{num}: ':' accepted"
+        attack = "single"
+    elif kind == 2:
+        lines += _session_header("john --format=raw-md5 --incremental=ascii left.hash")
+        lines += ['Proceeding with "incremental" mode: ascii', "- Lengths 0 to 13, up to 95 different characters"]
+        rule_line = "- Trying length {num}"
+        attack = "incremental"
+    elif kind == 3:
+        lines += _session_header("john --format=raw-md5 --mask=?l?l?l?d?d left.hash")
+        lines += ["Proceeding with mask mode"]
+        rule_line = "Remaining {num} password hashes with no different salts"
+        attack = "mask"
+    elif kind == 4:
+        lines += _session_header("john --format=raw-md5 --loopback=jtr.pot --rules=jumbo left.hash")
+        lines += ["Proceeding with loopback mode", "- Rules: jumbo", "- Loopback pot file: /pots/jtr.pot"]
+        rule_line = "- Rule #{num}: 'c $1' rejected"
+        attack = "loopback"
+    else:
+        lines += _session_header("john --format=raw-md5 --prince=dic.txt left.hash")
+        lines += ["Proceeding with PRINCE (random order) mode", "- Input file: /wordlists/dic.txt",
+            "- Will generate candidates of length 1 - 24", "- Using chains with 1 - 8 elements.",
+            "Loading elements from wordlist", "Initializing chains", "Calculating keyspace"]
+        rule_line = "- Keyspace size {num}"
+        attack = "prince"
+
+    num = 0
+    while len(lines) < num_lines:
+        num += 1
+        lines.append(rule_line.format(num=num))
+        # Roughly one crack per three lines, which is a very good attack
+        if num % 3 == 0:
+            hash_id = (session_num * 7919 + num) % NUM_HASHES
+            lines.append(f"+ Cracked {hash_id}: password{num}")
+            if attack == "incremental" and num % 4 == 0:
+                lines.append("- Switching to length 8")
+
+    return lines
+
+
+def write_log(file, num_lines, session_lines=5000):
+    """
+    Writes a synthetic JtR log
+
+    Inputs:
+        file: (File) Open text file to write to
+
+        num_lines: (Int) The number of lines to write
+
+        session_lines: (Int) Roughly how many lines each session should be
+    """
+    written = 0
+    session_num = 0
+    while written < num_lines:
+        body = _session_body(session_num, min(session_lines, num_lines - written))
+        end = "Session completed" if session_num % 5 else "Session aborted"
+        file.write("0:00:00:00 Starting a new session\n")
+        for seconds, msg in enumerate(body):
+            file.write(f"{_timestamp(seconds)} {msg}\n")
+        file.write(f"{_timestamp(len(body))} {end}\n")
+        written += len(body) + 2
+        session_num += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JtR log parser")
+    parser.add_argument("--lines", type=int, default=10000000, help="Number of lines in the synthetic log")
+    parser.add_argument("--keep", default=None, help="Write the synthetic log to this file and keep it")
+    parser.add_argument("--full", action="store_true", help="Save the results to a SessionList/StrikeList")
+    args = parser.parse_args()
+
+    if args.keep:
+        filename = args.keep
+    else:
+        temp_file = tempfile.NamedTemporaryFile(suffix=".log", delete=False)
+        temp_file.close()
+        filename = temp_file.name
+
+    try:
+        print(f"Writing a {args.lines} line synthetic log to {filename}")
+        with open(filename, "w") as file:
+            write_log(file, args.lines)
+        file_size = os.path.getsize(filename)
+
+        with open(filename, "rb") as file:
+            num_lines = sum(chunk.count(b"\n") for chunk in iter(lambda: file.read(1024 * 1024), b""))
+
+        hash_list = HashList()
+        hash_list.add_type("raw-md5", "Raw-MD5", "0", "low")
+        for hash_id in range(NUM_HASHES):
+            hash_list.add(f"{hash_id:032x}", type="raw-md5")
+        session_list = SessionList()
+        strike_list = StrikeList()
+
+        jtr = JTRMgr({})
+        output = io.StringIO()
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            if args.full:
+                jtr.read_logfile(filename, session_list, strike_list, hash_list)
+                num_sessions = len(session_list.sessions)
+                num_strikes = len(strike_list.strikes)
+            else:
+                log_parser = CountingParser(jtr, session_list, strike_list, hash_list)
+                log_parser.parse_file(filename)
+                num_sessions = log_parser.num_sessions
+                num_strikes = log_parser.num_strikes
+        total_time = time.perf_counter() - start_time
+
+        print(f"Parsed {num_lines} lines ({file_size / (1024 * 1024):.1f} MB) in {total_time:.2f} seconds")
+        print(f"Throughput: {num_lines / total_time:,.0f} lines/sec")
+        print(f"Sessions: {num_sessions} Strikes: {num_strikes}")
+        unsupported = output.getvalue().count("Unsuported Log Line")
+        if unsupported:
+            print(f"Warning: {unsupported} log lines were not recognized")
+    finally:
+        if not args.keep:
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1003 @@
+"""
+Streaming parser for John the Ripper log files
+
+This used to be one giant if/elif chain inside JTRMgr.read_logfile(). That was easy to
+add new log messages to, but every line got compared against every message JtR can log
+(and was re-stripped for each comparison). Multi-day sessions can generate logs with
+millions of lines, so the parser is now a small state machine:
+
+- The log is read in large binary chunks, and only complete lines are processed. Anything
+  after the last newline is held until the next chunk arrives.
+- Each log message is dispatched to a handler by looking up its first few characters in a
+  table, so only the handful of messages that share that prefix are compared.
+- The parser state (current session, attack, rule, etc) lives in the class so parsing can
+  be paused and resumed between chunks. It also keeps track of how far into the file it has
+  read, so when JtR is still writing to a log only the new lines need to be parsed the next
+  time it is read. A session that is still running is saved when the parser stops, and then
+  updated in place as more of it is parsed. Duplicate sessions are only looked for once the
+  session is over since the total_time of a running session is only partial.
+
+Adding support for a new log message means adding an entry to _PREFIX_HANDLERS (or
+_IGNORED_PREFIXES if it should be skipped). If the message can't be identified by its
+prefix add it to _SUBSTRING_HANDLERS instead.
+
+Sessions and Strikes are created through _add_session() and _add_strike() so a subclass
+can collect them somewhere other than a SessionList/StrikeList. RecordingParser does that
+so logs can be parsed in other processes, and parse_log_records() is the function run by
+those processes. See JTRMgr.read_logfiles(). The records are also what is saved in the
+parsed log cache, using encode_log_records() and decode_log_records()
+"""
+
+
+import contextlib
+import hashlib
+import io
+import os
+
+# Using this to parse logfiles that may have been imported from a different system/os
+from pathlib import Path
+
+
+# The first line of every JtR session
+SESSION_START = "0:00:00:00 Starting a new session"
+
+# Maximum number of bytes of log messages to buffer before adding them to the running hash
+_MAX_UNHASHED = 64 * 1024
+
+# Number of characters used to look up a log message in the dispatch table
+# All the prefixes in the dispatch table need to be at least this long
+_BUCKET_SIZE = 5
+
+
+class JtRLogParser:
+    """
+    Parses JtR log files and creates Sessions and Strikes for them
+    """
+
+    # How much of the log file to read at a time
+    read_size = 1024 * 1024
+
+    def __init__(self, pw_cracker_mgr, session_list, strike_list, hash_list, filename=""):
+        """
+        Inputs:
+            pw_cracker_mgr: (JTRMgr) The manager the Sessions and Strikes are attributed to
+
+            session_list: (SessionList) Keeps track of password cracking sessions
+
+            strike_list: (StrikeList) Keeps track of sucessful rules
+
+            hash_list: (HashList) Used to check if a cracked username is a hash_id
+
+            filename: (String) Only used for error messages
+        """
+        self.pw_cracker_mgr = pw_cracker_mgr
+        self.session_list = session_list
+        self.strike_list = strike_list
+        self.hash_list = hash_list
+        self.filename = filename
+
+        # Partial line left over from the last chunk
+        self.pending = b""
+
+        # Number of bytes read from the file so far (including the partial line)
+        self.offset = 0
+
+        # Used to tell if the log file was replaced since it was last read
+        self.file_id = None
+
+        # Timestamp of the last line parsed. Kept as strings and only converted when needed
+        self.timestamp = ("0", "0", "0", "0")
+
+        self._reset_session()
+
+    def _reset_session(self):
+        """
+        Clears out the state for the current session
+        """
+        # Using this to do a sanity check on the log file format
+        self.active_session = False
+
+        # Information for the actual session
+        self.compleated = False
+        self.session_info = {
+            'mode':None,
+            'options':{}
+            }
+
+        # Used to match up cracks with what attack was running
+        self.cur_attack = None
+        self.cur_rule = None
+        self.cur_wordlist = None
+        self.cur_strikes = []
+
+        # Same as self.cur_strikes but used to quickly check for duplicates since sessions
+        # can have a lot of cracks
+        self.cur_strike_set = set()
+
+        # Running hashed value of all the lines parsed so far
+        # This way if the log file is run again, no duplicate strikes will be created
+        # Using blake2b vs. hash() since hash() of a string changes every time Python is
+        # started, so duplicates were never detected after restarting the notebook
+        self.running_hash = None
+
+        # Lines that haven't been added to running_hash yet. Hashing every line on its own
+        # was a big slowdown, so lines are only hashed when running_hash is needed
+        self.unhashed_lines = bytearray()
+
+        # The id of the Session if it was saved while it was still running
+        self.session_id = None
+
+    def parse_file(self, filename, verbose=True):
+        """
+        Parses a JtR log file. If this parser has read the file before, it picks up where
+        it left off
+
+        A partial line at the end of the file is saved until the next time the file is read since
+        JtR may be in the middle of writing it. If a session is still running, it is saved now
+        and then updated the next time the file is read.
+
+        Inputs:
+            filename: (String) The full path and filename of the log to parse
+
+            verbose: (Bool) If False, don't print an error if this isn't a JtR log
+
+        Returns:
+            success: (Bool) True if this completed properly
+                            False if an error occured
+        """
+        self.filename = filename
+        try:
+            with open(filename, mode='rb') as logfile:
+                if self.offset:
+                    logfile.seek(self.offset)
+                    data = logfile.read(self.read_size)
+                else:
+                    data = logfile.read(self.read_size)
+
+                    # First check to make sure the logfile is a JtR logfile
+                    if not self.is_header(data):
+                        if verbose:
+                            print(f"Error: The file {filename} is not a JtR formatted log file")
+                        return False
+                    self.file_id = self._get_file_id(filename)
+
+                while data:
+                    self.offset += len(data)
+                    self.feed(data)
+                    data = logfile.read(self.read_size)
+
+        except FileNotFoundError:
+            print(f"Error: Could not find the file:{filename}")
+            return False
+
+        self.save_running_session()
+        return True
+
+    def can_resume(self, filename):
+        """
+        Checks if the log file is the same one this parser read before, and it has only been
+        appended to since then
+
+        Inputs:
+            filename: (String) The full path and filename of the log
+
+        Returns:
+            True: If parse_file() can pick up where it left off
+            False: If the log needs to be parsed from the start with a new parser
+        """
+        if not self.offset or not self.file_id:
+            return False
+        if self._get_file_id(filename) != self.file_id:
+            return False
+        try:
+            return os.path.getsize(filename) >= self.offset
+        except OSError:
+            return False
+
+    def _get_file_id(self, filename):
+        """
+        Returns something that identifies the file on disk, even if it is renamed
+
+        Inputs:
+            filename: (String) The file to check
+
+        Returns:
+            file_id: (Tuple) The device and inode of the file. None if it couldn't be read
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def get_state(self):
+        """
+        Returns everything needed to pick up parsing where this parser left off
+
+        Returns:
+            state: (Dict) Can be passed to set_state() on a different parser
+        """
+        state = {}
+        for key in _STATE_FIELDS:
+            state[key] = getattr(self, key)
+
+        # This is added to in place so the state needs its own copy
+        state['unhashed_lines'] = bytes(self.unhashed_lines)
+        return state
+
+    def set_state(self, state):
+        """
+        Loads the state saved by get_state()
+
+        Inputs:
+            state: (Dict) The state returned by get_state()
+        """
+        for key in _STATE_FIELDS:
+            setattr(self, key, state[key])
+        self.unhashed_lines = bytearray(state['unhashed_lines'])
+        self.cur_strike_set = set(self.cur_strikes)
+
+    def is_header(self, data):
+        """
+        Checks if the start of a file looks like a JtR log
+
+        Inputs:
+            data: (Bytes) The start of the file
+
+        Returns:
+            True: If the first line is the start of a JtR session
+            False: If it is not
+        """
+        return data.split(b"\n", 1)[0].strip() == SESSION_START.encode()
+
+    def feed(self, data):
+        """
+        Parses all the complete lines in a chunk of the log file. Any partial line at the
+        end is saved until the next call to feed() or close()
+
+        Inputs:
+            data: (Bytes) The next chunk of the log file
+        """
+        data = self.pending + data
+        end = data.rfind(b"\n")
+        if end == -1:
+            self.pending = data
+            return
+        self.pending = data[end + 1:]
+
+        # Newlines can't show up in the middle of a multi-byte UTF-8 character so it's
+        # safe to decode everything up to the last newline at once
+        for line in data[:end].decode("utf-8", errors="replace").split("\n"):
+            self.parse_line(line)
+
+    def close(self):
+        """
+        Parses any partial line left at the end of the file and saves the session that
+        is still running (if any). Use this if no more data will be added to the log
+        """
+        if self.pending:
+            self.parse_line(self.pending.decode("utf-8", errors="replace"))
+            self.pending = b""
+
+        self.save_running_session()
+
+    def save_running_session(self):
+        """
+        Saves the session that is currently being parsed without ending it, so more of it
+        can be parsed later
+        """
+        if not self.active_session:
+            return
+
+        # Working on a copy since the session may not actually be over yet
+        session_info = dict(self.session_info)
+        session_info['options'] = dict(self.session_info['options'])
+        session_info['options']['total_time'] = self._get_time()
+
+        # To detect if pipe mode was used, I "could" parse the command line, but this is a bit easier
+        # since I'm worried that by parsing the command line I'll have some weird edge case
+        if session_info['mode'] == "wordlist" and "wordlist" not in session_info['options']:
+            session_info['mode'] = "pipe"
+            session_info['options']['duplicate_detection_id'] = self._get_running_hash(commit=False)
+
+        # total_time is only partial, so duplicates are checked for once the session is over
+        self._save_session(session_info, self.compleated, check_duplicates=False)
+
+    def parse_line(self, line):
+        """
+        Parses a single line of the log file
+
+        Inputs:
+            line: (String) The line to parse
+        """
+        line = line.strip()
+
+        # Skip blank lines
+        if not line:
+            return
+
+        # A new session was detected in the file
+        if line == SESSION_START:
+            self.active_session = True
+            return
+        # An unexpected line was encountered
+        elif not self.active_session:
+            print(f"Unexpected line found in logfile {self.filename}. Line: {line}")
+            return
+
+        # Split the timestamp from the log message. There may be a ":" in the message itself
+        split_line = line.split(":", 3)
+        if len(split_line) < 4:
+            print(f"Unexpected line found in logfile {self.filename}. Line: {line}")
+            return
+        time_second, divider, log_msg = split_line[3].partition(" ")
+        if not divider:
+            print(f"Unexpected line found in logfile {self.filename}. Line: {line}")
+            return
+        self.timestamp = (split_line[0], split_line[1], split_line[2], time_second)
+
+        # Update the running hash here. This is independent of the time so if the
+        # exact same attack is run again, it "might" detect duplicates.
+        self.unhashed_lines += log_msg.encode()
+        self.unhashed_lines += b"\n"
+        if len(self.unhashed_lines) >= _MAX_UNHASHED:
+            self._get_running_hash()
+
+        msg = log_msg.strip()
+
+        if msg in _EXACT_HANDLERS:
+            _EXACT_HANDLERS[msg](self, msg)
+            return
+
+        for prefix, handler in _DISPATCH.get(msg[:_BUCKET_SIZE], ()):
+            if msg.startswith(prefix):
+                if handler:
+                    handler(self, msg[len(prefix):])
+                return
+
+        for substring, handler in _SUBSTRING_HANDLERS:
+            if substring in msg:
+                handler(self, msg)
+                return
+
+        # Doing this to indentify log lines I haven't set up rules to parse yet
+        print(f"Unsuported Log Line: {msg}")
+
+    def _get_running_hash(self, commit=True):
+        """
+        Returns the running hash of all the lines parsed so far in this session
+
+        The lines are added to the hash in batches, so where a batch ends needs to depend
+        only on the contents of the log. Otherwise parsing a log in one go vs. picking up
+        where a previous read left off would give different values. That's why
+        save_running_session() doesn't commit the lines it hashes
+
+        Inputs:
+            commit: (Bool) If True, save the new hash and clear out unhashed_lines
+
+        Returns:
+            running_hash: (Int) 64 bit hash
+        """
+        if not self.unhashed_lines:
+            return self.running_hash
+
+        running_hash = hashlib.blake2b(self.unhashed_lines, digest_size=8)
+        if self.running_hash is not None:
+            running_hash.update(self.running_hash.to_bytes(8, "big"))
+        running_hash = int.from_bytes(running_hash.digest(), "big")
+
+        if commit:
+            self.running_hash = running_hash
+            self.unhashed_lines = bytearray()
+        return running_hash
+
+    def _get_time(self):
+        """
+        Returns the timestamp of the last line parsed in seconds
+
+        Returns:
+            seconds: (Int) The time since the session started
+        """
+        time_day, time_hour, time_minute, time_second = self.timestamp
+        return int(time_day) * (24 * 60 * 60) + int(time_hour) * (60 * 60) + int(time_minute) * 60 + int(time_second)
+
+    def _save_session(self, session_info, compleated, check_duplicates=True):
+        """
+        Adds the current session, or updates it if it was saved while it was still running
+
+        Inputs:
+            session_info: (Dict) The session info. Same format as SessionList.add()
+
+            compleated: (Bool) If the session ran to completion
+
+            check_duplicates: (Bool) If the session should be merged into a duplicate of it.
+            False while the session is still running
+        """
+        if self.session_id is None:
+            self.session_id = self._add_session(session_info, compleated, self.cur_strikes, check_duplicates)
+        else:
+            self.session_id = self._update_session(self.session_id, session_info, compleated, self.cur_strikes, check_duplicates)
+
+    def _add_session(self, session_info, compleated, strike_ids, check_duplicates):
+        """
+        Saves a parsed session and links its strikes to it
+
+        Inputs:
+            session_info: (Dict) The session info. Same format as SessionList.add()
+
+            compleated: (Bool) If the session ran to completion
+
+            strike_ids: (List) The strikes found during this session
+
+            check_duplicates: (Bool) If the session should be merged into a duplicate of it
+
+        Returns:
+            session_id: (Int) The id of the session
+        """
+        session_id = self.session_list.add(self.pw_cracker_mgr, session_info, compleated=compleated, check_duplicates=check_duplicates)
+
+        # Add strikes to the session
+        for strike_id in strike_ids:
+            self.session_list.sessions[session_id].add_strike(strike_id)
+
+        return session_id
+
+    def _update_session(self, session_id, session_info, compleated, strike_ids, check_duplicates):
+        """
+        Updates a session that was saved while it was still running
+
+        Inputs:
+            session_id: (Int) The id returned by _add_session()
+
+            session_info: (Dict) The session info. Same format as SessionList.add()
+
+            compleated: (Bool) If the session ran to completion
+
+            strike_ids: (List) All the strikes found during this session so far
+
+            check_duplicates: (Bool) If the session should be merged into a duplicate of it
+
+        Returns:
+            session_id: (Int) The id of the session. Changes if it was merged into a duplicate
+        """
+        session_id = self.session_list.update(session_id, session_info, compleated=compleated, check_duplicates=check_duplicates)
+
+        # Strikes that were already added to the session are skipped by add_strike()
+        for strike_id in strike_ids:
+            self.session_list.sessions[session_id].add_strike(strike_id)
+
+        return session_id
+
+    def _add_strike(self, hash_id, details):
+        """
+        Saves a strike
+
+        Inputs:
+            hash_id: (Int) The hash that was cracked. None if it couldn't be identified
+
+            details: (Dict) The strike details. Same format as StrikeList.add()
+
+        Returns:
+            strike_id: (Int) The id of the strike
+        """
+        return self.strike_list.add(self.pw_cracker_mgr, hash_id, details)
+
+    # Handlers for the log messages. The part of the message after the matched prefix is
+    # passed in (or the full message for exact and substring matches)
+
+    def _on_session_end(self, msg):
+        """
+        Session aborted / Session completed
+        """
+        if msg == "Session completed":
+            self.compleated = True
+
+        self.session_info['options']['total_time'] = self._get_time()
+
+        # To detect if pipe mode was used, I "could" parse the command line, but this is a bit easier
+        # since I'm worried that by parsing the command line I'll have some weird edge case
+        if self.session_info['mode'] == "wordlist" and "wordlist" not in self.session_info['options']:
+            self.session_info['mode'] = "pipe"
+
+        self._save_session(self.session_info, self.compleated)
+        self._reset_session()
+
+    def _on_loaded(self, rest):
+        """
+        Lists the number of hashes loaded
+        """
+        self.session_info['options']['num_loaded'] = int(rest.split()[0])
+
+    def _on_hash_type(self, rest):
+        """
+        Get the hash type (without having to parse the command line)
+        """
+        # The hash type can have extra info following a "," or a "("
+        self.session_info['hash_type'] = rest.split(",")[0].split(" (")[0]
+
+    def _on_max_length(self, rest):
+        """
+        Specifies the max accepted guess length (Helpful when targeting passphrases)
+        """
+        # Long variable name, but I want people to know exactly what this is
+        self.session_info['options']['max_guess_size_bytes'] = int(rest.split()[0])
+
+    def _on_command_line(self, rest):
+        """
+        Get the command line. Eventually I'll want to parse this further
+        """
+        self.session_info['options']['command_line'] = rest
+
+    # The following few handlers look for the mode the cracker is run in
+    # Eventually I can pull this from the command line too, but this will
+    # be a good stopgap until I add that functionality
+
+    def _on_single(self, rest):
+        self.session_info['mode'] = "single"
+        self.cur_attack = "single"
+
+    def _on_wordlist(self, rest):
+        # Gets a bit weird since I want to classify this as a single session, but this
+        # is the second default attack run in JtR's Single mode
+        if not self.session_info['mode']:
+            self.session_info['mode'] = "wordlist"
+        self.cur_attack = "wordlist"
+
+    def _on_incremental(self, rest):
+        # Single attacks may switch to incremental depending on how they are run
+        if self.session_info['mode'] == "single":
+            self.session_info['options']['incremental_started'] = self._get_time()
+        else:
+            self.session_info['mode'] = "incremental"
+
+        self.cur_attack = "incremental"
+
+        # Get the incremental training set being used
+        self.cur_rule = rest
+        self.session_info['options']['incremental'] = rest
+
+    def _on_mask(self, rest):
+        self.session_info['mode'] = "mask"
+
+        # Note, the mask used isn't captured in a specific log line, so we need to extract it from the command line
+        split_line = self.session_info['options'].get('command_line', "").split('--mask=')
+
+        # A mask was specified on the command line
+        if len(split_line) == 2:
+            # Dev note: I know this will break if you have spaces in your mask.... Don't know how to avoid that
+            self.cur_rule = split_line[1].split(' ')[0]
+        # Using the default mask in jtr config
+        else:
+            self.cur_rule = "default"
+        self.session_info['options']['mask'] = self.cur_rule
+
+    def _on_stdin(self, rest):
+        """
+        Reading password guesses in via stdin
+        """
+        self.session_info['mode'] = "stdin"
+        self.session_info['options']['duplicate_detection_id'] = self._get_running_hash()
+
+    def _on_loopback(self, rest):
+        """
+        Reading password guesses via loopback mode (aka reads them in from a pot file)
+        """
+        self.session_info['mode'] = 'loopback'
+        self.cur_attack = "wordlist"
+        self.session_info['options']['duplicate_detection_id'] = self._get_running_hash()
+
+    def _on_wordlist_file(self, rest):
+        """
+        Get the wordlist being used. Used for wordlist, loopback, and PRINCE attacks
+        """
+        # Just get the dictionary name
+        self.cur_wordlist = Path(rest).name
+        self.session_info['options']['wordlist'] = self.cur_wordlist
+        self.session_info['options']['wordlist_path'] = rest
+
+    def _on_prince(self, rest):
+        self.session_info['mode'] = 'prince'
+
+    def _on_prince_length(self, rest):
+        split_line = rest.split(" - ")
+        self.session_info['options']['min_length'] = split_line[0]
+        self.session_info['options']['max_length'] = split_line[1]
+
+    def _on_prince_chains(self, rest):
+        split_line = rest.split(" - ")
+        self.session_info['options']['min_elements'] = split_line[0]
+        self.session_info['options']['max_elements'] = split_line[1]
+
+    def _on_encoding(self, msg):
+        """
+        Get the encoding of input characters. Might be relevant for certain challenges
+        """
+        split_line = msg.split(" input encoding enabled")
+        self.session_info['options']['encoding'] = split_line[0].split("- ")[1]
+
+    def _on_num_rules(self, msg):
+        """
+        It might be helpful to see how many rules were run to identify
+        how useful/effecient different mangling rule sets are
+        """
+        split_line = msg.split(" preprocessed word mangling rules")
+        self.session_info['options']['num_rules'] = int(split_line[0].split("- ")[1])
+
+    def _on_ruleset(self, rest):
+        """
+        Mangling ruleset used
+        """
+        self.session_info['options']['ruleset'] = rest
+
+    def _on_rule(self, rest):
+        """
+        Parse the rules as they are processed
+        """
+        # Get the original rule vs. what's being processed.
+        # Strip the Rule # from the string
+        split_line = rest.split(": '", 1)
+        if len(split_line) != 2:
+            return
+        split_line = split_line[1]
+
+        # Remove the JtR fixup info
+        split_line = split_line.split("' accepted as '")
+        if len(split_line) == 2:
+            split_line = split_line[1].split("'")
+        split_line = split_line[0].split("' accepted")
+
+        # Remove the "rejected" from rejected rules. This shouldn't matter
+        # since rejected rules should not crack passwords...
+        self.cur_rule = split_line[0].split("' rejected")[0]
+
+    def _on_no_rules(self, rest):
+        """
+        No rules specified so it applies a default ":" rule to the wordlist
+        """
+        self.cur_rule = ":"
+
+    def _on_cracked(self, rest):
+        """
+        A hash was cracked
+        """
+        # Get the username and strip out the plaintext if that was logged
+        # The plaintext might have a ":" in it so only split on the first one that
+        # divides the username from the plaintext
+        username = rest.split(":", 1)[0]
+
+        # Check if the username is a hash_id or not
+        hash_id = None
+        if username.isdigit():
+            hash_id = int(username)
+            # Check if the hash_id is legitamite. If there isn't a hash_list that is done
+            # when the records are merged
+            if self.hash_list is not None and hash_id not in self.hash_list.hashes:
+                # hash_id wasn't found so set it to be none again
+                # and treat it as a straight username
+                hash_id = None
+
+        # Create the strike
+        if self.cur_attack in ["wordlist", "single", "pipe", "stdin", "loopback", "prince"]:
+            strike_id = self._add_strike(hash_id, {"attack":self.cur_attack, "rule":self.cur_rule, "wordlist":self.cur_wordlist, "duplicate_detection_id":self._get_running_hash()})
+        elif self.cur_attack in ["incremental", "mask"]:
+            strike_id = self._add_strike(hash_id, {"attack":self.cur_attack, "mode":self.cur_rule, "duplicate_detection_id":self._get_running_hash()})
+        else:
+            print(f"Warning, unkonwn attack type when creating the strike: {self.cur_attack}")
+            print("Skipping adding the strike")
+            return
+
+        if strike_id not in self.cur_strike_set:
+            self.cur_strike_set.add(strike_id)
+            self.cur_strikes.append(strike_id)
+
+    def _on_error(self, rest):
+        """
+        An error occured, session was not run/compleated
+        Not saving these sessions since they usually are caused by invalid command line inputs so no
+        real cracking session was run
+        """
+        self._reset_session()
+
+
+class RecordingParser(JtRLogParser):
+    """
+    Saves Sessions and Strikes as plain records vs. adding them to a SessionList/StrikeList
+
+    The records can be sent back from another process and replayed in order with
+    JTRMgr._merge_log_records(). Strike and session ids used in the records (and in the
+    parser state) are indexes into the strikes and sessions in this parser's records,
+    unless they were already real ids when the state was loaded
+    """
+
+    def __init__(self, filename=""):
+        """
+        Inputs:
+            filename: (String) Only used for error messages
+        """
+        super().__init__(None, None, None, None, filename=filename)
+
+        # List of tuples. The first item is "strike", "session", or "update"
+        self.records = []
+        self.num_strikes = 0
+        self.num_sessions = 0
+
+    def _add_session(self, session_info, compleated, strike_ids, check_duplicates):
+        self.records.append(("session", _copy_session_info(session_info), compleated, list(strike_ids), check_duplicates))
+        self.num_sessions += 1
+        return ("local", self.num_sessions - 1)
+
+    def _update_session(self, session_id, session_info, compleated, strike_ids, check_duplicates):
+        self.records.append(("update", session_id, _copy_session_info(session_info), compleated, list(strike_ids), check_duplicates))
+        return session_id
+
+    def _add_strike(self, hash_id, details):
+        self.records.append(("strike", hash_id, details))
+        self.num_strikes += 1
+        return ("local", self.num_strikes - 1)
+
+
+def _copy_session_info(session_info):
+    """
+    Copies session_info so later changes by the parser don't change the record
+    """
+    session_info = dict(session_info)
+    session_info['options'] = dict(session_info['options'])
+    return session_info
+
+
+def parse_log_records(filename, state=None, verbose=True, previous=None):
+    """
+    Parses a JtR log and returns the results as plain records. Used to parse logs in
+    a separate process
+
+    Inputs:
+        filename: (String) The log file to parse
+
+        state: (Dict) If not None, parser state from JtRLogParser.get_state() to resume from
+
+        verbose: (Bool) If False, don't print an error if this isn't a JtR log
+
+        previous: (Dict) If not None, the results of parsing the start of this log. Parsing
+        picks up where it left off and the new records are added to the end of its records.
+        Used to continue from the parsed log cache. See JTRMgr.read_logfiles()
+
+    Returns:
+        results: (Dict) with the keys:
+            'filename': The log file that was parsed
+            'success': (Bool) If the log was parsed
+            'records': (List) The Sessions and Strikes. See RecordingParser
+            'state': (Dict) The parser state at the end of the file
+            'output': (String) Anything the parser printed out
+    """
+    parser = RecordingParser(filename=filename)
+    output = io.StringIO()
+    if previous:
+        state = previous['state']
+        parser.records = list(previous['records'])
+        for record in parser.records:
+            if record[0] == "strike":
+                parser.num_strikes += 1
+            elif record[0] == "session":
+                parser.num_sessions += 1
+        output.write(previous['output'])
+    if state:
+        parser.set_state(state)
+
+    # Printing from another process won't show up in a notebook so send it back instead
+    with contextlib.redirect_stdout(output):
+        success = parser.parse_file(filename, verbose=verbose)
+
+    return {
+        'filename':filename,
+        'success':success,
+        'records':parser.records,
+        'state':parser.get_state(),
+        'output':output.getvalue(),
+    }
+
+
+def encode_log_records(results):
+    """
+    Converts the results from parse_log_records() into something that can be saved as JSON
+
+    Inputs:
+        results: (Dict) The results returned by parse_log_records()
+
+    Returns:
+        data: (Dict) The results with the bytes in the parser state converted to strings
+    """
+    state = dict(results['state'])
+    state['pending'] = state['pending'].decode("latin-1")
+    state['unhashed_lines'] = state['unhashed_lines'].decode("latin-1")
+
+    return {
+        'filename':results['filename'],
+        'success':results['success'],
+        'records':results['records'],
+        'state':state,
+        'output':results['output'],
+    }
+
+
+def decode_log_records(data):
+    """
+    Converts the output of encode_log_records() back into the results from parse_log_records()
+    after it was loaded from JSON. JSON turns all the tuples into lists so they need to be
+    converted back
+
+    Inputs:
+        data: (Dict) The results returned by encode_log_records()
+
+    Returns:
+        results: (Dict) Same format as parse_log_records()
+    """
+    records = []
+    for record in data['records']:
+        if record[0] == "strike":
+            records.append(("strike", record[1], record[2]))
+        elif record[0] == "session":
+            records.append(("session", record[1], record[2], [_decode_record_id(x) for x in record[3]], record[4]))
+        elif record[0] == "update":
+            records.append(("update", _decode_record_id(record[1]), record[2], record[3], [_decode_record_id(x) for x in record[4]], record[5]))
+
+    state = dict(data['state'])
+    state['pending'] = state['pending'].encode("latin-1")
+    state['unhashed_lines'] = state['unhashed_lines'].encode("latin-1")
+    state['timestamp'] = tuple(state['timestamp'])
+    if state['file_id'] is not None:
+        state['file_id'] = tuple(state['file_id'])
+    state['cur_strikes'] = [_decode_record_id(x) for x in state['cur_strikes']]
+    state['session_id'] = _decode_record_id(state['session_id'])
+
+    return {
+        'filename':data['filename'],
+        'success':data['success'],
+        'records':records,
+        'state':state,
+        'output':data['output'],
+    }
+
+
+def _decode_record_id(record_id):
+    """
+    Converts a ["local", index] id loaded from JSON back into a tuple
+    """
+    if isinstance(record_id, list):
+        return tuple(record_id)
+    return record_id
+
+
+# Parser attributes that need to be saved to resume parsing a file
+_STATE_FIELDS = [
+    'pending',
+    'offset',
+    'file_id',
+    'timestamp',
+    'active_session',
+    'compleated',
+    'session_info',
+    'cur_attack',
+    'cur_rule',
+    'cur_wordlist',
+    'cur_strikes',
+    'running_hash',
+    'unhashed_lines',
+    'session_id',
+]
+
+
+# Log messages that are matched exactly
+_EXACT_HANDLERS = {
+    "Session aborted":JtRLogParser._on_session_end,
+    "Session completed":JtRLogParser._on_session_end,
+}
+
+# Log messages identified by how they start. Order matters if one prefix is the start of another
+_PREFIX_HANDLERS = [
+    ("Loaded a total of ", JtRLogParser._on_loaded),
+    ("- Hash type: ", JtRLogParser._on_hash_type),
+    ("- Will reject candidates longer than ", JtRLogParser._on_max_length),
+    ("Command line: ", JtRLogParser._on_command_line),
+    ('Proceeding with "single crack" mode', JtRLogParser._on_single),
+    ("Proceeding with wordlist mode", JtRLogParser._on_wordlist),
+    ('Proceeding with "incremental" mode: ', JtRLogParser._on_incremental),
+    ("Proceeding with mask mode", JtRLogParser._on_mask),
+    ("- Reading candidate passwords from stdin", JtRLogParser._on_stdin),
+    ("Proceeding with loopback mode", JtRLogParser._on_loopback),
+    ("- Loopback pot file: ", JtRLogParser._on_wordlist_file),
+    ("- Wordlist file: ", JtRLogParser._on_wordlist_file),
+    ("Proceeding with PRINCE", JtRLogParser._on_prince),
+    ("- Will generate candidates of length ", JtRLogParser._on_prince_length),
+    ("- Using chains with ", JtRLogParser._on_prince_chains),
+    # Prince specific wordlist log line
+    ("- Input file: ", JtRLogParser._on_wordlist_file),
+    ("- Rules: ", JtRLogParser._on_ruleset),
+    ("- Rule #", JtRLogParser._on_rule),
+    ("- No word mangling rules", JtRLogParser._on_no_rules),
+    ("+ Cracked ", JtRLogParser._on_cracked),
+    ("Terminating on error", JtRLogParser._on_error),
+]
+
+# Log messages that don't have a fixed prefix
+_SUBSTRING_HANDLERS = [
+    ("input encoding enabled", JtRLogParser._on_encoding),
+    (" preprocessed word mangling rules", JtRLogParser._on_num_rules),
+]
+
+# Lines that are currently being ignored. (Doing it this way to make it easier to
+# identify interesting lines I haven't handled yet.)
+_IGNORED_PREFIXES = [
+    "- Candidate passwords will be buffered and tried in chunks of",
+    "- memory mapping wordlist",
+    "- Allocated",
+    "- Processing the remaining buffered candidate passwords, if any",
+    "- Passwords will be stored ",
+    "- Configured to use otherwise idle processor cycles only",
+    "- SingleWordsPairMax used is ",
+    "- SingleRetestGuessed = ",
+    "- SingleMaxBufferSize = ",
+    "- No information to base candidate passwords on",
+    "Enabling duplicate candidate password suppressor",
+    "Remaining ",
+    "- suppressed ",
+    "Cost ",
+    "- Passwords in this logfile are UTF-8 encoded",
+    "Sorting salts, for deterministic salt-resume",
+    "- SingleWordsPairMax increased to",
+    # We get the actual dictionary from an earlier logfile
+    "- loading wordfile",
+    "- wordfile had",
+    # I'm struggling with this one. I may want to add it back as an alternative
+    # rule since it can crack a password and right now it would be misattributed
+    # to the next rule
+    "- Oldest still in use is now rule",
+    # Skip a lot of the incremental logs
+    "- Trying length ",
+    "- Switching to length ",
+    "- Expanding tables for length ",
+    "- Lengths ",
+    # Hmm, it might be nice to warn that there was an invalid rule being run.....
+    # Dev Note: Might want to add this back in with a warning
+    "! Invalid rule at line",
+    # We're getting the the hash type from the "Hash Type" log message. So we can skip this message
+    "- Algorithm:",
+    # Need to look into what this really means, and where stacked rules can come into play
+    "- No stacked rules",
+    # Remove non-pertinant JtR debugging logs
+    "Disabling duplicate candidate password suppressor",
+    "- dupe suppression:",
+    "- Some rule logging suppressed.",
+    # Removing PRINCE debug lines
+    "Loading elements from wordlist",
+    "Initializing chains",
+    "- Using default output length distribution",
+    "Calculating keyspace",
+    "- Memory use for PRINCE: ",
+    "Sorting chains by keyspace",
+    "Sorting global order by password length counts",
+    "Starting candidate generation",
+    "PRINCE done. Cleaning up",
+    "- Keyspace size ",
+]
+
+
+def _build_dispatch():
+    """
+    Groups the prefix handlers by their first few characters
+
+    Returns:
+        dispatch: (Dict) Key = first _BUCKET_SIZE characters, value = [list of (prefix, handler)].
+        A handler of None means the message is ignored
+    """
+    dispatch = {}
+    for prefix, handler in _PREFIX_HANDLERS + [(prefix, None) for prefix in _IGNORED_PREFIXES]:
+        if len(prefix) < _BUCKET_SIZE:
+            raise ValueError(f"JtR log prefix is shorter than {_BUCKET_SIZE} characters: {prefix}")
+        key = prefix[:_BUCKET_SIZE]
+        if key not in dispatch:
+            dispatch[key] = []
+        dispatch[key].append((prefix, handler))
+    return dispatch
+
+
+_DISPATCH = _build_dispatch()
@@ -0,0 +1,538 @@
+"""
+Python Mixin extension to the SessionMgr class to hold functions related to planning
+what attacks to run next
+
+Since this is a Mixin instance, it is not stand alone code.
+The goal is to combine what has been learned from previous cracking Sessions (how fast
+an attack cracked hashes) with how many points are still on the table for each hash
+type, so rig time goes to the attacks that will earn the most points.
+
+Dev Note: The crack rates are only as good as the logs that were parsed. Attacks that were
+never logged (or logged without a total_time) won't show up in the recommendations.
+"""
+
+
+import shlex
+from pathlib import Path
+
+
+class Mixin:
+
+    def get_cracker_mgr(self, tool_name):
+        """
+        Returns the PWCrackerMgr that matches the tool name recorded in a Session or Strike
+
+        Inputs:
+            tool_name: (String) The name of the password cracking tool. E.g. "John the Ripper"
+
+        Returns:
+            pw_cracker_mgr: (PWCrackerMgr) The matching password cracker manager
+
+            None: If no manager matches the tool name
+        """
+        for pw_cracker_mgr in [self.jtr, self.hc]:
+            if pw_cracker_mgr and pw_cracker_mgr.name == tool_name:
+                return pw_cracker_mgr
+        return None
+
+    def get_session_hash_type(self, session):
+        """
+        Maps the hash_type recorded in a Session (which is password cracker specific) back
+        to a hash type in this framework
+
+        Inputs:
+            session: (Session) The session to look up
+
+        Returns:
+            hash_type: (String) The framework hash type. None if it can't be mapped
+        """
+        pw_cracker_mgr = self.get_cracker_mgr(session.tool)
+        if not pw_cracker_mgr:
+            return None
+
+        types = pw_cracker_mgr.lookup_hash_types(session.hash_type, self.hash_list)
+        if not types:
+            return None
+        return types[0]
+
+    def get_attack_stats(self):
+        """
+        Aggregates all of the parsed Sessions into crack statistics per attack
+
+        An attack is identified by (hash_type, tool, mode, wordlist, ruleset/mask). Cracks
+        are attributed to hash types using the strikes for the session when the strike
+        could be matched to a hash. Otherwise the session's hash type is used.
+
+        Inputs:
+            None
+
+        Returns:
+            attack_stats: (Dict) Key is the attack tuple, value is
+            {
+                'cracks':(int) Number of cracks attributed to this attack,
+                'runtime':(int) Total seconds this attack was run,
+                'num_sessions':(int) Number of sessions that ran this attack,
+                'compleated':(bool) If any of the sessions ran to completion,
+                'session_id':(int) The most recent session that ran this attack,
+                'num_rules':(int) The number of rules in the ruleset. None if it wasn't logged,
+            }
+        """
+        attack_stats = {}
+
+        for session_id, session in self.session_list.sessions.items():
+            session_type = self.get_session_hash_type(session)
+
+            # Count the cracks per framework hash type
+            type_cracks = {}
+            for strike_id in session.strike_id_list:
+                hash_id = self.strike_list.strikes[strike_id].hash_id
+                if hash_id is not None and hash_id in self.hash_list.type_lookup:
+                    cur_type = self.hash_list.type_lookup[hash_id]
+                else:
+                    cur_type = session_type
+                if not cur_type:
+                    continue
+                type_cracks[cur_type] = type_cracks.get(cur_type, 0) + 1
+
+            # Sessions that didn't crack anything still count towards the runtime
+            if session_type and session_type not in type_cracks:
+                type_cracks[session_type] = 0
+
+            runtime = session.options.get('total_time', 0)
+            if not runtime:
+                runtime = 0
+
+            for cur_type, num_cracks in type_cracks.items():
+                key = self._get_attack_key(cur_type, session)
+                if key not in attack_stats:
+                    attack_stats[key] = {
+                        'cracks':0,
+                        'runtime':0,
+                        'num_sessions':0,
+                        'compleated':False,
+                        'session_id':session_id,
+                        'num_rules':None,
+                    }
+                attack_stats[key]['cracks'] += num_cracks
+                attack_stats[key]['runtime'] += runtime
+                attack_stats[key]['num_sessions'] += 1
+                attack_stats[key]['session_id'] = session_id
+                if session.compleated:
+                    attack_stats[key]['compleated'] = True
+                if session.options.get('num_rules'):
+                    attack_stats[key]['num_rules'] = session.options['num_rules']
+
+        return attack_stats
+
+    def _get_attack_key(self, hash_type, session):
+        """
+        Returns the tuple used to group Sessions that ran the same attack
+
+        Inputs:
+            hash_type: (String) The framework hash type
+
+            session: (Session) The session to create the key for
+
+        Returns:
+            key: (Tuple) (hash_type, tool, mode, wordlist, ruleset/mask)
+        """
+        rules = None
+        for field in ['ruleset', 'mask', 'incremental']:
+            if session.options.get(field):
+                rules = session.options[field]
+                break
+
+        return (hash_type, session.tool, session.mode, session.options.get('wordlist'), rules)
+
+    def _use_scores(self):
+        """
+        Checks if scores were defined for any of the hash types. If not, every crack
+        is treated as worth one point
+
+        Returns:
+            use_score: (Bool) True if at least one hash type has a score
+        """
+        for values in self.hash_list.type_info.values():
+            if values['score']:
+                return True
+        return False
+
+    def get_attack_roi(self, hash_type=None):
+        """
+        Ranks the wordlist + ruleset combinations that have been run by the points they
+        earned per second of runtime
+
+        Unlike plan_attacks() this looks backwards at what attacks earned vs. what they are
+        expected to earn against the hashes that are left, and it includes attacks that were
+        run to completion. It's meant for finding slow, low-yield wordlists and rulesets that
+        can be dropped from the rotation.
+
+        Attacks are grouped by (hash_type, wordlist, ruleset/mask, mode) so the same attack
+        run with different tools is combined. Attacks without a logged runtime are skipped
+        since there's no way to normalize them.
+
+        Inputs:
+            hash_type: (String) If not None, only include attacks against this hash type
+
+        Returns:
+            roi: (List) A list of dictionaries sorted by points_per_second, best first
+            {
+                'hash_type':(str),
+                'wordlist':(str),
+                'rules':(str) The ruleset, mask, or incremental mode,
+                'mode':(str),
+                'num_rules':(int) None if it wasn't logged,
+                'cracks':(int),
+                'points':(int),
+                'runtime':(int) Total seconds these attacks were run,
+                'num_sessions':(int),
+                'cracks_per_second':(float),
+                'points_per_second':(float),
+            }
+        """
+        use_score = self._use_scores()
+
+        # Key = (hash_type, wordlist, rules, mode)
+        roi_lookup = {}
+        for key, stats in self.get_attack_stats().items():
+            cur_type, tool, mode, wordlist, rules = key
+
+            if hash_type and cur_type != hash_type:
+                continue
+
+            if not stats['runtime']:
+                continue
+
+            roi_key = (cur_type, wordlist, rules, mode)
+            if roi_key not in roi_lookup:
+                roi_lookup[roi_key] = {
+                    'hash_type':cur_type,
+                    'wordlist':wordlist,
+                    'rules':rules,
+                    'mode':mode,
+                    'num_rules':None,
+                    'cracks':0,
+                    'points':0,
+                    'runtime':0,
+                    'num_sessions':0,
+                }
+            entry = roi_lookup[roi_key]
+
+            value = self.hash_list.type_info[cur_type]['score'] if use_score else 1
+            entry['cracks'] += stats['cracks']
+            entry['points'] += stats['cracks'] * value
+            entry['runtime'] += stats['runtime']
+            entry['num_sessions'] += stats['num_sessions']
+            if stats['num_rules']:
+                entry['num_rules'] = stats['num_rules']
+
+        roi = list(roi_lookup.values())
+        for entry in roi:
+            entry['cracks_per_second'] = entry['cracks'] / entry['runtime']
+            entry['points_per_second'] = entry['points'] / entry['runtime']
+
+        roi.sort(key=lambda x: (x['points_per_second'], x['points']), reverse=True)
+        return roi
+
+    def print_attack_roi(self, hash_type=None, top_x=None):
+        """
+        Prints out the results of get_attack_roi() in a human readable format
+
+        Inputs:
+            hash_type: (String) If not None, only include attacks against this hash type
+
+            top_x: (Int) The number of attacks to print. If None print all of them
+
+        Returns:
+            None
+        """
+        roi = self.get_attack_roi(hash_type=hash_type)
+        if not roi:
+            print("No attacks with a runtime found. Parse some logs with read_all_logs() first")
+            return
+
+        if top_x:
+            roi = roi[:top_x]
+
+        for rank, entry in enumerate(roi, start=1):
+            print(f"#{rank} {entry['hash_type']}: {entry['points_per_second']:.4f} points/sec ({entry['cracks_per_second']:.4f} cracks/sec)")
+            print(f"    Mode: {entry['mode']}")
+            if entry['wordlist']:
+                print(f"    Wordlist: {entry['wordlist']}")
+            if entry['rules']:
+                print(f"    Rules/Mask: {entry['rules']}")
+            if entry['num_rules']:
+                print(f"    Num Rules: {entry['num_rules']}")
+            print(f"    Cracks: {entry['cracks']} Points: {entry['points']}")
+            print(f"    Run Time (seconds): {entry['runtime']} Num Sessions: {entry['num_sessions']}")
+
+    def plan_attacks(self, top_x=10, file_prefix=None, include_compleated=False, verbose=True):
+        """
+        Ranks attacks by the expected number of points they will earn per second
+
+        The crack rate is taken from previous Sessions (cracks / runtime) for each
+        (hash_type, tool, mode, wordlist, ruleset/mask). That's multiplied by how much each
+        crack is worth for that hash type. Hash types that have no hashes left are skipped.
+
+        If file_prefix is specified, a left list is written for each recommended hash type and
+        the command line to run the recommended attack against that left list is returned.
+
+        Inputs:
+            top_x: (Int) The number of recommendations to return. If None return all of them
+
+            file_prefix: (String) If not None, write the left lists to {file_prefix}_{hash_type}.{tool}.hash
+
+            include_compleated: (Bool) If True, include attacks that have already been run to
+            completion. Re-running those usually won't crack anything new, so they are excluded by default
+
+            verbose: (Bool) If True, print the recommendations
+
+        Returns:
+            recommendations: (List) A list of dictionaries sorted by points_per_second
+            {
+                'hash_type':(str),
+                'tool':(str),
+                'mode':(str),
+                'wordlist':(str),
+                'rules':(str) The ruleset, mask, or incremental mode,
+                'cracks_per_second':(float),
+                'points_per_second':(float),
+                'remaining':(int) Uncracked hashes of this type,
+                'remaining_points':(int),
+                'left_list':(str) Filename of the left list. None if it wasn't written,
+                'command':(str) The command line to run. None if it couldn't be recreated,
+            }
+        """
+        use_score = self._use_scores()
+
+        recommendations = []
+        attack_stats = self.get_attack_stats()
+        for key, stats in attack_stats.items():
+            hash_type, tool, mode, wordlist, rules = key
+
+            if stats['compleated'] and not include_compleated:
+                continue
+
+            # Can't get a rate without a runtime
+            if not stats['runtime']:
+                continue
+
+            type_info = self.hash_list.type_info[hash_type]
+            remaining = type_info['total'] - type_info['cracked']
+            if remaining <= 0:
+                continue
+
+            value = type_info['score'] if use_score else 1
+            cracks_per_second = stats['cracks'] / stats['runtime']
+
+            recommendations.append({
+                'hash_type':hash_type,
+                'tool':tool,
+                'mode':mode,
+                'wordlist':wordlist,
+                'rules':rules,
+                'cracks_per_second':cracks_per_second,
+                'points_per_second':cracks_per_second * value,
+                'remaining':remaining,
+                'remaining_points':remaining * value,
+                'left_list':None,
+                'command':None,
+                'session_id':stats['session_id'],
+            })
+
+        recommendations.sort(key=lambda x: (x['points_per_second'], x['remaining_points']), reverse=True)
+        if top_x:
+            recommendations = recommendations[:top_x]
+
+        # Generate the left lists and command lines
+        for rec in recommendations:
+            pw_cracker_mgr = self.get_cracker_mgr(rec['tool'])
+            session = self.session_list.sessions[rec.pop('session_id')]
+            if not pw_cracker_mgr:
+                continue
+
+            if pw_cracker_mgr == self.hc:
+                left_format = "hc"
+                extension = "hc"
+            else:
+                left_format = "jtr"
+                extension = "jtr"
+
+            left_list = f"<{rec['hash_type']}_left_list>"
+            if file_prefix:
+                left_list = f"{file_prefix}_{rec['hash_type']}.{extension}.hash"
+                self.create_left_list(format=left_format, file_name=left_list, hash_type=rec['hash_type'], silent=True)
+                rec['left_list'] = left_list
+
+            command = pw_cracker_mgr.create_attack_command(
+                left_list,
+                hash_mode=self.hash_list.type_info[rec['hash_type']][pw_cracker_mgr.mode_field],
+                attack_mode=rec['mode'],
+                options=session.options
+            )
+            if command:
+                rec['command'] = shlex.join(command)
+
+        if verbose:
+            self._print_attack_plan(recommendations)
+
+        return recommendations
+
+    def _print_attack_plan(self, recommendations):
+        """
+        Prints out the recommendations from plan_attacks() in a human readable format
+
+        Inputs:
+            recommendations: (List) The results of plan_attacks()
+
+        Returns:
+            None
+        """
+        if not recommendations:
+            print("No recommendations. Parse some logs with read_all_logs() so there are crack rates to base them on")
+            return
+
+        for rank, rec in enumerate(recommendations, start=1):
+            print(f"#{rank} {rec['hash_type']}: {rec['points_per_second']:.4f} points/sec ({rec['cracks_per_second']:.4f} cracks/sec)")
+            print(f"    Tool: {rec['tool']}")
+            print(f"    Mode: {rec['mode']}")
+            if rec['wordlist']:
+                print(f"    Wordlist: {rec['wordlist']}")
+            if rec['rules']:
+                print(f"    Rules/Mask: {rec['rules']}")
+            print(f"    Remaining Hashes: {rec['remaining']}")
+            print(f"    Remaining Points: {rec['remaining_points']}")
+            if rec['left_list']:
+                print(f"    Left List: {rec['left_list']}")
+            if rec['command']:
+                print(f"    Command: {rec['command']}")
+            else:
+                print(f"    Command: <Could not recreate the command line for this attack>")
+
+    def check_attack_coverage(self, command, cracker_name=None, hash_type=None):
+        """
+        Checks if the attack in a command line has already been run, so time isn't wasted
+        re-running attacks that were exhausted
+
+        Inputs:
+            command: (STR or List) The JtR or Hashcat command line
+
+            cracker_name: (STR) "jtr" or "hc". If None it is guessed from the name of the program
+
+            hash_type: (STR) The framework hash type being attacked. Only needed if the
+            command line doesn't specify the format/mode
+
+        Returns:
+            coverage: (STR) "exhausted" if the attack was run to completion, "partial" if it
+            was only partially run, or "new" if it has never been run. See SessionList.get_coverage()
+
+            None: If the command line couldn't be parsed
+        """
+        if isinstance(command, str):
+            try:
+                command = shlex.split(command)
+            except ValueError:
+                print(f"Error: Could not parse the command line: {command}")
+                return None
+        if not command:
+            return None
+
+        if not cracker_name:
+            cracker_name = "hc" if "hashcat" in Path(command[0]).name.lower() else "jtr"
+        pw_cracker_mgr = self._get_pw_cracker_mgr(cracker_name)
+
+        session_info = pw_cracker_mgr.parse_attack_command(command)
+        if not session_info:
+            return None
+
+        cracker_type = session_info.get('hash_type')
+        if hash_type:
+            if hash_type not in self.hash_list.type_info:
+                print(f"Error: hash_type of {hash_type} is not a type that has been loaded into this framework")
+                return None
+            cracker_type = self.hash_list.type_info[hash_type][pw_cracker_mgr.mode_field]
+
+        key = self.session_list.get_coverage_key(pw_cracker_mgr.name, cracker_type, session_info['mode'], session_info['options'])
+        return self.session_list.get_coverage(key)
+
+    def get_untried_attacks(self, top_x_types=5, verbose=True):
+        """
+        Lists attacks that have been run against some hash types but never against the
+        hash types that are worth the most points
+
+        Types are ranked by the points left on the table (uncracked hashes * score). The attacks
+        come from the coverage index in SessionList, so only attacks that have been run at least
+        once against something are suggested
+
+        Inputs:
+            top_x_types: (Int) How many of the highest value hash types to check. If None check all of them
+
+            verbose: (Bool) If True, print the results
+
+        Returns:
+            untried: (List) A list of dictionaries, highest value type first and then the most
+            commonly run attacks first
+            {
+                'hash_type':(str),
+                'remaining_points':(int),
+                'tool':(str),
+                'mode':(str),
+                'wordlist':(str),
+                'rules':(str) The ruleset, mask, or incremental mode,
+                'times_run':(int) Number of sessions that ran this attack against other types,
+            }
+        """
+        use_score = self._use_scores()
+
+        type_values = {}
+        for hash_type, info in self.hash_list.type_info.items():
+            remaining = info['total'] - info['cracked']
+            value = remaining * info['score'] if use_score else remaining
+            if value > 0:
+                type_values[hash_type] = value
+        top_types = sorted(type_values, key=lambda x: type_values[x], reverse=True)
+        if top_x_types:
+            top_types = top_types[:top_x_types]
+
+        # Key = (tool, mode, wordlist, rules), value = number of sessions that ran it
+        attacks = {}
+        for key, session_ids in self.session_list.coverage_lookup.items():
+            attack = (key[0], key[2], key[3], key[4])
+            attacks[attack] = attacks.get(attack, 0) + len(session_ids)
+        ordered_attacks = sorted(attacks, key=lambda x: (-attacks[x], [str(field) for field in x]))
+
+        untried = []
+        for hash_type in top_types:
+            for attack in ordered_attacks:
+                tool, mode, wordlist, rules = attack
+                pw_cracker_mgr = self.get_cracker_mgr(tool)
+                if not pw_cracker_mgr:
+                    continue
+                cracker_type = self.hash_list.type_info[hash_type][pw_cracker_mgr.mode_field]
+                if cracker_type is None:
+                    continue
+
+                if (tool, str(cracker_type).lower(), mode, wordlist, rules) in self.session_list.coverage_lookup:
+                    continue
+
+                untried.append({
+                    'hash_type':hash_type,
+                    'remaining_points':type_values[hash_type],
+                    'tool':tool,
+                    'mode':mode,
+                    'wordlist':wordlist,
+                    'rules':rules,
+                    'times_run':attacks[attack],
+                })
+
+        if verbose:
+            if not untried:
+                print("No untried attacks found")
+            cur_type = None
+            for attack in untried:
+                if attack['hash_type'] != cur_type:
+                    cur_type = attack['hash_type']
+                    print(f"{cur_type}: Remaining Points: {attack['remaining_points']}")
+                print(f"    {attack['tool']}: Mode: {attack['mode']} Wordlist: {attack['wordlist']} Rules/Mask: {attack['rules']} (Run {attack['times_run']} times on other types)")
+
+        return untried
@@ -0,0 +1,580 @@
+"""
+Python Mixin extension to the SessionMgr class to hold functions related to exporting
+the framework state to pandas and Arrow for deeper analysis, and saving/loading it
+as Parquet files
+
+Since this is a Mixin instance, it is not stand alone code.
+
+pandas and pyarrow are only imported when these functions are called. They are big
+imports and most cracking sessions never need them.
+
+The columns are built from the underlying HashList/TargetList lookups (type_list,
+meta_lookup, crack_times) as Arrow arrays and then joined with a single take() vs. creating
+a Python dict for every row and handing that to pandas.
+
+save_parquet() writes one Parquet file per list (hashes, targets, sessions, strikes) so the
+contest state can be reloaded with load_parquet() in seconds vs. re-reading every challenge
+file, potfile, and log.
+"""
+
+
+from array import array
+import datetime
+import json
+import os
+
+from .hash import HashList
+from .target import TargetList
+from .session import SessionList
+from .strike import StrikeList
+from .pw_cracker_mgr import PWCrackerMgr
+
+
+# Change this if the layout of the Parquet files changes so old exports aren't loaded incorrectly
+PARQUET_EXPORT_VERSION = 1
+
+
+class Mixin:
+
+    # Columns that are always included in to_arrow(). Metadata keys that collide with these
+    # are prefixed with "meta_"
+    export_columns = ['target_id', 'hash_id', 'hash', 'type', 'cracked', 'plaintext', 'score', 'crack_time']
+
+    def to_arrow(self):
+        """
+        Creates an Arrow table with one row per (target, hash)
+
+        Hashes that aren't associated with a target are included with a null target_id so
+        every hash shows up at least once. If a hash is shared by multiple targets it will
+        show up once per target.
+
+        The hash type and all of the metadata columns are dictionary encoded since there are
+        usually only a handful of unique values. Aka they become Categoricals in pandas
+
+        Inputs:
+            None
+
+        Returns:
+            table: (pyarrow.Table) Columns are:
+                target_id: (int64) Null if the hash isn't associated with a target
+                hash_id: (int64)
+                hash: (string)
+                type: (dictionary)
+                cracked: (bool)
+                plaintext: (string) Null if the hash hasn't been cracked
+                score: (int64) The score for the hash type
+                crack_time: (timestamp) When the hash was cracked. Null if it hasn't been
+                Followed by one column per metadata key
+
+            None: If pyarrow isn't installed
+        """
+        pa = self._import_pyarrow()
+        if not pa:
+            return None
+        import pyarrow.compute as pc
+
+        hash_table = self._get_hash_table(pa, pc)
+
+        # Map each row to a (target, hash). -1 = no target
+        row_targets = array('q')
+        row_hashes = array('q')
+        for target_id, target in self.target_list.targets.items():
+            row_targets.extend([target_id] * len(target.hashes))
+            row_hashes.extend(target.hashes)
+        for hash_id in self.hash_list.hashes:
+            if hash_id not in self.target_list.hash_lookup:
+                row_targets.append(-1)
+                row_hashes.append(hash_id)
+
+        num_rows = len(row_hashes)
+        target_ids = pa.Array.from_buffers(pa.int64(), num_rows, [None, pa.py_buffer(row_targets)])
+        hash_ids = pa.Array.from_buffers(pa.int64(), num_rows, [None, pa.py_buffer(row_hashes)])
+        target_ids = pc.if_else(pc.not_equal(target_ids, -1), target_ids, None)
+
+        table = hash_table.take(hash_ids)
+        columns = [target_ids] + table.columns
+        names = ['target_id'] + table.column_names
+
+        # Metadata is stored per target, so build each column per target and then expand it to the rows
+        for key, values in self.target_list.meta_lookup.items():
+            dictionary = self._to_arrow_array(pa, list(values.keys()))
+            target_index = array('i', [-1]) * self.target_list.next_index
+            for value_index, target_list in enumerate(values.values()):
+                for target_id in target_list:
+                    target_index[target_id] = value_index
+
+            indices = pa.Array.from_buffers(pa.int32(), len(target_index), [None, pa.py_buffer(target_index)])
+            indices = pc.if_else(pc.equal(indices, -1), None, indices)
+            column = pa.DictionaryArray.from_arrays(indices, dictionary)
+
+            name = key
+            if name in self.export_columns:
+                name = f"meta_{key}"
+            columns.append(column.take(target_ids))
+            names.append(name)
+
+        return pa.Table.from_arrays(columns, names=names)
+
+    def to_dataframe(self):
+        """
+        Creates a pandas DataFrame with one row per (target, hash). See to_arrow() for the columns
+
+        Dictionary encoded columns (the hash type and metadata) become Categoricals
+
+        Inputs:
+            None
+
+        Returns:
+            df: (pandas.DataFrame) The framework state
+
+            None: If pandas or pyarrow isn't installed
+        """
+        try:
+            import pandas
+        except ImportError:
+            print("Error: pandas needs to be installed to use to_dataframe(). Aka 'pip install pandas'")
+            return None
+
+        table = self.to_arrow()
+        if table is None:
+            return None
+
+        # Using pandas' nullable ints so target_id doesn't get turned into a float because of the nulls
+        # The table isn't used after this so let pyarrow free the columns as they are converted
+        pa = self._import_pyarrow()
+        return table.to_pandas(split_blocks=True, self_destruct=True, types_mapper={pa.int64():pandas.Int64Dtype()}.get)
+
+    def save_parquet(self, directory, compression="zstd"):
+        """
+        Saves the hashes, targets, sessions, and strikes to a set of Parquet files so they
+        can be reloaded with load_parquet() vs. re-parsing the challenge files and logs
+
+        Writes:
+            {directory}/hash_types.parquet: HashList.type_info (minus the counts)
+            {directory}/hashes.parquet: One row per hash, in hash_id order
+            {directory}/targets.parquet: One row per target, in target_id order
+            {directory}/sessions.parquet: One row per session, in session_id order
+            {directory}/strikes.parquet: One row per strike, in strike_id order
+            {directory}/manifest.json: Version and counts used by load_parquet()
+
+        The strike details that are interned in StrikeList (rule, wordlist, etc) are written
+        as dictionary encoded columns straight from the StrikeList arrays. Dicts like the session
+        options and target metadata are saved as JSON since their keys vary. Session status updates
+        are not saved since they only matter while the session is running
+
+        Inputs:
+            directory: (String) The folder to write the files to. Created if it doesn't exist
+
+            compression: (String) The Parquet compression codec. E.g. "zstd", "snappy", "gzip", or None
+
+        Returns:
+            manifest: (Dict) The contents of the manifest file
+
+            None: If a problem occured
+        """
+        pa = self._import_pyarrow()
+        if not pa:
+            return None
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        tables = {
+            'hash_types':self._get_hash_types_table(pa),
+            'hashes':self._get_hashes_export_table(pa, pc),
+            'targets':self._get_targets_table(pa),
+            'sessions':self._get_sessions_table(pa),
+            'strikes':self._get_strikes_table(pa, pc),
+        }
+
+        manifest = {
+            'version':PARQUET_EXPORT_VERSION,
+            'created':datetime.datetime.now().isoformat(),
+            'counts':{name:table.num_rows for name, table in tables.items()},
+        }
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for name, table in tables.items():
+                pq.write_table(table, os.path.join(directory, f"{name}.parquet"), compression=compression)
+            with open(os.path.join(directory, "manifest.json"), mode='w') as file:
+                json.dump(manifest, file)
+        except Exception as msg:
+            print(f"Exception writing the Parquet files to {directory}: {msg}")
+            return None
+
+        return manifest
+
+    def load_parquet(self, directory):
+        """
+        Replaces the hashes, targets, sessions, and strikes with the ones saved by save_parquet()
+
+        The ids of the hashes, targets, sessions, and strikes are the same as when they were saved
+
+        Inputs:
+            directory: (String) The folder the files were written to
+
+        Returns:
+            True: If the state was loaded
+
+            False: If a problem occured. The current state is left as is
+        """
+        pa = self._import_pyarrow()
+        if not pa:
+            return False
+        import pyarrow.parquet as pq
+
+        try:
+            with open(os.path.join(directory, "manifest.json")) as file:
+                manifest = json.load(file)
+            if manifest.get('version') != PARQUET_EXPORT_VERSION:
+                print(f"Error: {directory} was saved with export version {manifest.get('version')}. Only version {PARQUET_EXPORT_VERSION} is supported")
+                return False
+
+            tables = {}
+            for name in manifest['counts']:
+                tables[name] = pq.read_table(os.path.join(directory, f"{name}.parquet"))
+        except Exception as msg:
+            print(f"Exception reading the Parquet files from {directory}: {msg}")
+            return False
+
+        # Build everything new and only swap it in at the end so a bad file doesn't leave a half loaded state
+        hash_list = HashList()
+        target_list = TargetList()
+        session_list = SessionList()
+        strike_list = StrikeList()
+
+        # Key = tool name, value = PWCrackerMgr. Sessions and Strikes only need the name
+        cracker_mgrs = {}
+
+        try:
+            data = tables['hash_types'].to_pydict()
+            for type, info in zip(data['type'], data['info']):
+                info = json.loads(info)
+                hash_list.add_type(type, jtr_mode=info['jtr_mode'], hc_mode=info['hc_mode'], cost=info['cost'])
+                hash_list.type_info[type].update(info)
+
+            data = tables['hashes'].to_pydict()
+            for hash, type, plaintext, crack_time, submitted in zip(data['hash'], data['type'], data['plaintext'], data['crack_time'], data['submitted']):
+                # Cracks saved without a crack time stay unknown vs. being timestamped now
+                if crack_time is None:
+                    crack_time = 0
+                hash_list.add(hash, type=type, plaintext=plaintext, crack_time=crack_time)
+                hash_list.sub_lookup[hash_list.hash_lookup[hash]] = submitted
+
+            data = tables['targets'].to_pydict()
+            for metadata, hash_ids in zip(data['metadata'], data['hash_ids']):
+                target_list.add(json.loads(metadata), hash_ids, check_duplicates=False)
+
+            data = tables['sessions'].to_pydict()
+            for index in range(tables['sessions'].num_rows):
+                session_info = {
+                    'mode':data['mode'][index],
+                    'hash_type':data['hash_type'][index],
+                    'num_loaded_hashes':data['num_loaded_hashes'][index],
+                    'options':json.loads(data['options'][index]),
+                }
+                cracker_mgr = self._get_export_cracker_mgr(data['tool'][index], cracker_mgrs)
+                session_id = session_list.add(cracker_mgr, session_info, compleated=data['compleated'][index], check_duplicates=False)
+                session = session_list.sessions[session_id]
+                for hash_id in data['hash_ids'][index]:
+                    session.add_hash(hash_id)
+                for strike_id in data['strike_ids'][index]:
+                    session.add_strike(strike_id)
+                session.num_cracked_hashes = data['num_cracked_hashes'][index]
+
+            self._load_strikes_table(tables['strikes'], strike_list, cracker_mgrs)
+
+        except Exception as msg:
+            print(f"Exception loading the Parquet files from {directory}: {msg}")
+            return False
+
+        loaded = {
+            'hash_types':len(hash_list.type_info),
+            'hashes':len(hash_list.hashes),
+            'targets':len(target_list.targets),
+            'sessions':len(session_list.sessions),
+            'strikes':len(strike_list.strikes),
+        }
+        for name, count in manifest['counts'].items():
+            # The unknown hash type is always added, so there may be one more type than was saved
+            if loaded[name] != count and not (name == 'hash_types' and loaded[name] == count + 1):
+                print(f"Error: Expected to load {count} {name} from {directory} but loaded {loaded[name]}")
+                return False
+
+        self.hash_list = hash_list
+        self.target_list = target_list
+        self.session_list = session_list
+        self.strike_list = strike_list
+        self.status_file_sessions = {}
+
+        return True
+
+    def _get_hash_types_table(self, pa):
+        """
+        Creates the table saved to hash_types.parquet
+
+        Inputs:
+            pa: (module) pyarrow
+
+        Returns:
+            table: (pyarrow.Table) The type and the JSON encoded type_info for each hash type
+        """
+        types = []
+        infos = []
+        for type, info in self.hash_list.type_info.items():
+            types.append(type)
+            # The counts are recalculated as the hashes are loaded
+            infos.append(json.dumps({key:value for key, value in info.items() if key not in ['total', 'cracked']}, default=str))
+        return pa.Table.from_arrays([pa.array(types, type=pa.string()), pa.array(infos, type=pa.string())], names=['type', 'info'])
+
+    def _get_hashes_export_table(self, pa, pc):
+        """
+        Creates the table saved to hashes.parquet. Unlike _get_hash_table() the plaintext is saved
+        as is and the crack time is saved as the raw seconds since the epoch
+
+        Inputs:
+            pa: (module) pyarrow
+
+            pc: (module) pyarrow.compute
+
+        Returns:
+            table: (pyarrow.Table) The hash, type, plaintext, crack_time, and submitted columns
+        """
+        table = self._get_hash_table(pa, pc)
+        hashes = self.hash_list.hashes.values()
+        crack_times = pa.Array.from_buffers(pa.uint32(), self.hash_list.next_index, [None, pa.py_buffer(self.hash_list.crack_times)])
+        return pa.Table.from_arrays([
+            table.column('hash'),
+            table.column('type'),
+            pa.array([hash.plaintext for hash in hashes], type=pa.string()),
+            pc.if_else(pc.equal(crack_times, 0), None, crack_times),
+            pa.array(self.hash_list.sub_lookup.values(), type=pa.int8()),
+        ], names=['hash', 'type', 'plaintext', 'crack_time', 'submitted'])
+
+    def _get_targets_table(self, pa):
+        """
+        Creates the table saved to targets.parquet
+
+        Inputs:
+            pa: (module) pyarrow
+
+        Returns:
+            table: (pyarrow.Table) The JSON encoded metadata and list of hash_ids for each target
+        """
+        targets = self.target_list.targets.values()
+        return pa.Table.from_arrays([
+            pa.array([json.dumps(target.metadata, default=str) for target in targets], type=pa.string()),
+            pa.array([target.hashes for target in targets], type=pa.list_(pa.int64())),
+        ], names=['metadata', 'hash_ids'])
+
+    def _get_sessions_table(self, pa):
+        """
+        Creates the table saved to sessions.parquet
+
+        Inputs:
+            pa: (module) pyarrow
+
+        Returns:
+            table: (pyarrow.Table) One row per session
+        """
+        sessions = self.session_list.sessions.values()
+        return pa.Table.from_arrays([
+            pa.array([session.tool for session in sessions], type=pa.string()).dictionary_encode(),
+            pa.array([session.mode for session in sessions], type=pa.string()).dictionary_encode(),
+            pa.array([None if session.hash_type is None else str(session.hash_type) for session in sessions], type=pa.string()),
+            pa.array([session.compleated for session in sessions], type=pa.bool_()),
+            pa.array([session.num_loaded_hashes for session in sessions], type=pa.int64()),
+            pa.array([session.num_cracked_hashes for session in sessions], type=pa.int64()),
+            pa.array([json.dumps(session.options, default=str) for session in sessions], type=pa.string()),
+            pa.array([session.hashes for session in sessions], type=pa.list_(pa.int64())),
+            pa.array([session.strike_id_list for session in sessions], type=pa.list_(pa.int64())),
+        ], names=['tool', 'mode', 'hash_type', 'compleated', 'num_loaded_hashes', 'num_cracked_hashes', 'options', 'hash_ids', 'strike_ids'])
+
+    def _get_strikes_table(self, pa, pc):
+        """
+        Creates the table saved to strikes.parquet straight from the StrikeList arrays
+
+        The interned details are saved as dictionary encoded columns using the StrikeList's own
+        interned values as the dictionary. A null means the strike doesn't have that detail.
+        Parquet can't save a null in a dictionary, so details that are set to None are also saved
+        as null and flagged in the none_fields bitmask (bit = position in StrikeList.interned_fields).
+        Interned values that aren't strings are saved as strings
+
+        Inputs:
+            pa: (module) pyarrow
+
+            pc: (module) pyarrow.compute
+
+        Returns:
+            table: (pyarrow.Table) One row per strike
+        """
+        strike_list = self.strike_list
+        num_strikes = strike_list.next_index
+        none_value_id = strike_list._value_ids.get((type(None), None), -1)
+        dictionary = self._to_arrow_array(pa, ["" if value is None else value for value in strike_list._values])
+        if not pa.types.is_string(dictionary.type):
+            dictionary = pa.array(["" if value is None else str(value) for value in strike_list._values], type=pa.string())
+
+        def interned_column(values):
+            indices = pa.Array.from_buffers(pa.int32(), num_strikes, [None, pa.py_buffer(values)])
+            is_null = pc.or_(pc.equal(indices, -1), pc.equal(indices, none_value_id))
+            return pa.DictionaryArray.from_arrays(pc.if_else(is_null, None, indices), dictionary)
+
+        hash_ids = pa.Array.from_buffers(pa.int32(), num_strikes, [None, pa.py_buffer(strike_list._hash_ids)])
+        detection_ids = pa.Array.from_buffers(pa.uint64(), num_strikes, [None, pa.py_buffer(strike_list._detection_ids)])
+        has_detection_id = pa.Array.from_buffers(pa.int8(), num_strikes, [None, pa.py_buffer(strike_list._has_detection_id)])
+
+        extra_details = [None] * num_strikes
+        for strike_id, details in strike_list._extra_details.items():
+            extra_details[strike_id] = json.dumps(details, default=str)
+
+        columns = [
+            interned_column(strike_list._tools),
+            pc.if_else(pc.equal(hash_ids, -1), None, hash_ids),
+        ]
+        names = ['tool', 'hash_id']
+        none_fields = pa.array([0] * num_strikes, type=pa.int32())
+        for bit, field in enumerate(strike_list.interned_fields):
+            values = strike_list._columns[field]
+            columns.append(interned_column(values))
+            names.append(field)
+            if none_value_id != -1:
+                is_none = pc.equal(pa.Array.from_buffers(pa.int32(), num_strikes, [None, pa.py_buffer(values)]), none_value_id)
+                none_fields = pc.bit_wise_or(none_fields, pc.if_else(is_none, 1 << bit, 0))
+        columns.append(none_fields)
+        names.append('none_fields')
+        columns.append(pc.if_else(pc.equal(has_detection_id, 1), detection_ids, None))
+        names.append('duplicate_detection_id')
+        columns.append(pa.array(extra_details, type=pa.string()))
+        names.append('extra_details')
+
+        return pa.Table.from_arrays(columns, names=names)
+
+    def _load_strikes_table(self, table, strike_list, cracker_mgrs):
+        """
+        Adds the strikes saved by _get_strikes_table() to a StrikeList
+
+        Inputs:
+            table: (pyarrow.Table) The contents of strikes.parquet
+
+            strike_list: (StrikeList) The StrikeList to add the strikes to
+
+            cracker_mgrs: (Dict) Key = tool name, value = PWCrackerMgr. See _get_export_cracker_mgr()
+        """
+        fields = [(1 << bit, field, table.column(field).to_pylist()) for bit, field in enumerate(strike_list.interned_fields)]
+        tools = table.column('tool').to_pylist()
+        hash_ids = table.column('hash_id').to_pylist()
+        none_fields = table.column('none_fields').to_pylist()
+        detection_ids = table.column('duplicate_detection_id').to_pylist()
+        extra_details = table.column('extra_details').to_pylist()
+
+        for strike_id in range(table.num_rows):
+            details = {}
+            for bit, field, values in fields:
+                if values[strike_id] is not None:
+                    details[field] = values[strike_id]
+                elif none_fields[strike_id] & bit:
+                    details[field] = None
+            if detection_ids[strike_id] is not None:
+                details['duplicate_detection_id'] = detection_ids[strike_id]
+            if extra_details[strike_id] is not None:
+                details.update(json.loads(extra_details[strike_id]))
+
+            cracker_mgr = self._get_export_cracker_mgr(tools[strike_id], cracker_mgrs)
+            strike_list.add(cracker_mgr, hash_ids[strike_id], details)
+
+    def _get_export_cracker_mgr(self, tool, cracker_mgrs):
+        """
+        Returns a PWCrackerMgr with the name of the tool that created a Session/Strike
+
+        Inputs:
+            tool: (String) The name of the password cracker
+
+            cracker_mgrs: (Dict) Key = tool name, value = PWCrackerMgr. Used to only create one
+            placeholder per tool that isn't JtR or Hashcat
+
+        Returns:
+            pw_cracker_mgr: (PWCrackerMgr) The password cracker manager
+        """
+        if tool not in cracker_mgrs:
+            cracker_mgr = self.get_cracker_mgr(tool)
+            if not cracker_mgr:
+                cracker_mgr = PWCrackerMgr({})
+                cracker_mgr.name = tool
+            cracker_mgrs[tool] = cracker_mgr
+        return cracker_mgrs[tool]
+
+    def _get_hash_table(self, pa, pc):
+        """
+        Creates an Arrow table with one row per hash, in hash_id order
+
+        Inputs:
+            pa: (module) pyarrow
+
+            pc: (module) pyarrow.compute
+
+        Returns:
+            table: (pyarrow.Table) The hash_id, hash, type, cracked, plaintext, score, and crack_time columns
+        """
+        num_hashes = self.hash_list.next_index
+
+        # Dictionary encode the type using the type_list lookup
+        type_names = list(self.hash_list.type_info.keys())
+        type_index = array('i', [0]) * num_hashes
+        for index, type in enumerate(type_names):
+            for hash_id in self.hash_list.type_list[type]:
+                type_index[hash_id] = index
+        type_indices = pa.Array.from_buffers(pa.int32(), num_hashes, [None, pa.py_buffer(type_index)])
+        types = pa.DictionaryArray.from_arrays(type_indices, pa.array(type_names, type=pa.string()))
+        type_scores = pa.array([info['score'] for info in self.hash_list.type_info.values()], type=pa.int64())
+
+        hashes = self.hash_list.hashes.values()
+        plaintexts = pa.array([hash.plaintext if hash.plaintext else None for hash in hashes], type=pa.string())
+
+        # The crack times are already an array of unsigned ints so Arrow can use the memory directly
+        crack_times = pa.Array.from_buffers(pa.uint32(), num_hashes, [None, pa.py_buffer(self.hash_list.crack_times)])
+        crack_times = pc.if_else(pc.equal(crack_times, 0), None, crack_times)
+
+        return pa.Table.from_arrays([
+            pa.array(range(num_hashes), type=pa.int64()),
+            pa.array([hash.hash for hash in hashes], type=pa.string()),
+            types,
+            pc.is_valid(plaintexts),
+            plaintexts,
+            type_scores.take(type_indices),
+            crack_times.cast(pa.int64()).cast(pa.timestamp('s')),
+        ], names=['hash_id', 'hash', 'type', 'cracked', 'plaintext', 'score', 'crack_time'])
+
+    def _to_arrow_array(self, pa, values):
+        """
+        Converts a list of values to an Arrow array. Falls back to strings if the values
+        are of mixed types since Arrow columns can only have one type
+
+        Inputs:
+            pa: (module) pyarrow
+
+            values: (List) The values to convert
+
+        Returns:
+            array: (pyarrow.Array) The values
+        """
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+    def _import_pyarrow(self):
+        """
+        Imports pyarrow when it's first needed
+
+        Returns:
+            pa: (module) pyarrow
+
+            None: If pyarrow isn't installed
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            print("Error: pyarrow needs to be installed to export the framework state. Aka 'pip install pyarrow'")
+            return None
+        return pyarrow
@@ -0,0 +1,222 @@
+"""
+Python Mixin extension to the SessionMgr class to hold functions related to running
+password cracking jobs from the notebook
+
+Since this is a Mixin instance, it is not stand alone code.
+The heavy lifting is done by CrackerRunner. These functions wire it up to the
+HashList, SessionList, and password cracker managers held by SessionMgr
+"""
+
+
+import os
+
+from .cracker_runner import CrackerJob
+from .cracker_runner import CrackerRunner
+
+
+class Mixin:
+
+    def create_job(self, hash_type, cracker_name="jtr", attack_mode="wordlist", options={}, file_name=None, session_name=None):
+        """
+        Writes a left list for a hash type and creates a CrackerJob to attack it
+
+        Inputs:
+            hash_type: (String) The hash type to attack
+
+            cracker_name: (String) Either "jtr" or "hc"
+
+            attack_mode: (String) The attack mode. E.g. "wordlist", "mask", "incremental"
+
+            options: (Dict) The attack options. E.g. {'wordlist':'dic-0294.txt', 'ruleset':'best64'}
+
+            file_name: (String) Where to write the left list. If None, it defaults to
+            {hash_type}.{cracker_name}.hash
+
+            session_name: (String) The session name to pass to the password cracker. Needed if
+            running multiple JtR jobs at the same time so they don't overwrite each other's logs
+
+        Returns:
+            job: (CrackerJob) The job to pass to run_jobs()
+
+            None: If a problem occured
+        """
+        if cracker_name == "jtr":
+            pw_cracker_mgr = self.jtr
+        elif cracker_name == "hc":
+            pw_cracker_mgr = self.hc
+        else:
+            print(f"Error: cracker_name needs to be 'jtr' or 'hc'. You specified {cracker_name}")
+            return None
+
+        if hash_type not in self.hash_list.type_info:
+            print(f"Error: hash_type of {hash_type} is not a type that has been loaded into this framework")
+            return None
+
+        if not file_name:
+            file_name = f"{hash_type}.{cracker_name}.hash"
+
+        if self.create_left_list(format=cracker_name, file_name=file_name, hash_type=hash_type, silent=True) is None:
+            return None
+
+        hash_mode = self.hash_list.type_info[hash_type][pw_cracker_mgr.mode_field]
+        command = pw_cracker_mgr.create_attack_command(
+            file_name,
+            hash_mode=hash_mode,
+            attack_mode=attack_mode,
+            options=options,
+            session_name=session_name
+        )
+        if not command:
+            print(f"Error: Could not create the command line for a {attack_mode} attack with options {options}")
+            return None
+
+        session_info = {
+            'mode':attack_mode,
+            'hash_type':hash_mode,
+            'options':dict(options),
+        }
+
+        return CrackerJob(pw_cracker_mgr, command, session_info=session_info)
+
+    def run_jobs(self, jobs, max_concurrent=1, poll_interval=1.0, verbose=False):
+        """
+        Runs password cracking jobs and waits for them to finish
+
+        New cracks are loaded into the HashList as they are written to the pot files, and a
+        Session is added for each job when it finishes.
+
+        Note: This will not work inside a Jupyter notebook since it already has an event loop
+        running. In a notebook use "await sm.run_jobs_async(jobs)" instead
+
+        Inputs:
+            jobs: (List) The CrackerJobs to run. See create_job()
+
+            max_concurrent: (Int) The maximum number of jobs to run at the same time
+
+            poll_interval: (Float) How often (in seconds) to check the pot files for new cracks
+
+            verbose: (Bool) If True, print the output of the password crackers as it happens
+
+        Returns:
+            jobs: (List) The CrackerJobs with their results filled out
+
+            None: If called from inside a running event loop
+        """
+        runner = CrackerRunner(self.hash_list, self.session_list, max_concurrent=max_concurrent, poll_interval=poll_interval, verbose=verbose)
+        jobs = runner.run(jobs)
+        if jobs is not None:
+            print(f"Number of new cracked passwords: {runner.new_cracks}")
+        return jobs
+
+    async def run_jobs_async(self, jobs, max_concurrent=1, poll_interval=1.0, verbose=False):
+        """
+        Same as run_jobs() but can be awaited from a Jupyter notebook
+
+        Inputs:
+            jobs: (List) The CrackerJobs to run. See create_job()
+
+            max_concurrent: (Int) The maximum number of jobs to run at the same time
+
+            poll_interval: (Float) How often (in seconds) to check the pot files for new cracks
+
+            verbose: (Bool) If True, print the output of the password crackers as it happens
+
+        Returns:
+            jobs: (List) The CrackerJobs with their results filled out
+        """
+        runner = CrackerRunner(self.hash_list, self.session_list, max_concurrent=max_concurrent, poll_interval=poll_interval, verbose=verbose)
+        jobs = await runner.run_async(jobs)
+        print(f"Number of new cracked passwords: {runner.new_cracks}")
+        return jobs
+
+    def load_status_file(self, filename, hash_type=None, session_id=None, rig=None):
+        """
+        Loads the speed and progress of a running Hashcat job from a file containing
+        the output of "hashcat --status --status-json"
+
+        The status updates are saved in the Session for the job. If the file was loaded
+        before, only the new updates are read and they are added to the same Session.
+        The measured speed is also used as the speed of the hash type for cost estimates.
+
+        Inputs:
+            filename: (String) The file with the status output
+
+            hash_type: (String) The Hashcat mode being attacked. The status output doesn't
+            include it, so without it the speed can't be used for cost estimates
+
+            session_id: (Int) The Session to add the status updates to. If None, a new
+            Session is created the first time the file is loaded
+
+            rig: (String) The name of the rig the job is running on. If None, the filename
+            is used as the rig name
+
+        Returns:
+            session_id: (Int) The Session the status updates were added to. None if a problem
+            occured or there haven't been any status updates yet
+        """
+        full_path = os.path.abspath(filename)
+        if session_id is None:
+            session_id = self.status_file_sessions.get(full_path)
+
+        if session_id is not None and session_id not in self.session_list.sessions:
+            print(f"Error: Session {session_id} does not exist")
+            return None
+
+        statuses = self.hc.read_status_file(filename)
+        if not statuses:
+            return session_id
+
+        if session_id is None:
+            session_info = self.hc.get_status_session_info(statuses[0], hash_type=hash_type)
+            session_id = self.session_list.add(self.hc, session_info, compleated=False, check_duplicates=False)
+        elif hash_type:
+            self.session_list.update(session_id, {'hash_type':hash_type})
+        self.status_file_sessions[full_path] = session_id
+
+        session = self.session_list.sessions[session_id]
+        for status in statuses:
+            session.add_status(status)
+
+        if statuses[-1]['compleated']:
+            self.session_list.update(session_id, {}, compleated=True)
+
+        # Feed the measured speed into the cost estimates
+        speed = session.get_speed()
+        if speed and session.hash_type:
+            if not rig:
+                rig = os.path.basename(filename)
+            for type in self.hc.lookup_hash_types(session.hash_type, self.hash_list):
+                self.hash_list.set_speed(type, speed, rig=rig)
+
+        return session_id
+
+    def print_running_jobs(self):
+        """
+        Prints the current speed, progress, and estimated time left for every Session that
+        is still running. See load_status_file()
+        """
+        print("Session :Tool      :Mode      :Hash Type :Status              :Hashes/Sec      :Progress  :Cracked   :ETA")
+        for session_id, session in self.session_list.sessions.items():
+            if not session.is_running():
+                continue
+            status = session.get_latest_status()
+
+            speed = session.get_speed()
+            if speed is None:
+                speed = "N/A"
+            else:
+                speed = f"{speed:.0f}"
+
+            progress = "N/A"
+            if status['progress_total']:
+                progress = f"{status['progress'] / status['progress_total'] * 100:.1f}%"
+
+            eta = session.get_eta()
+            if eta is None:
+                eta = "N/A"
+            else:
+                hours, seconds = divmod(int(eta), 60 * 60)
+                minutes, seconds = divmod(seconds, 60)
+                eta = f"{hours}:{minutes:02}:{seconds:02}"
+
+            print(f"{session_id:<8}:{session.tool:<10}:{str(session.mode):<10}:{str(session.hash_type):<10}:{status['status']:<20}:{speed:<16}:{progress:<10}:{status['recovered']:<10}:{eta}")
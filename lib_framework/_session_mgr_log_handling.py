@@ -39,14 +39,14 @@ class Mixin:
 
         hc_success = False
         if self.hc.log_directory:
-            hc_success = self.read_logs_from_folder(self.jtr.log_directory, cracker_name="hc")
+            hc_success = self.read_logs_from_folder(self.hc.log_directory, cracker_name="hc")
 
         if jtr_success or hc_success:
             return True
         
         return False
         
-    def read_logs_from_folder(self, folder_name, cracker_name="all"):
+    def read_logs_from_folder(self, folder_name, cracker_name="all", max_workers=None):
         """
         Reads in all of the password cracking log files (JtR and HashCat) and save the Sessions
         and Strikes.
@@ -54,9 +54,18 @@ class Mixin:
         JtR and Hashcat are both are included in the same call to make it easier to just paste in a folder
         to this function if you are not using the top level "read_all_logs()" function
 
+        JtR logs are parsed in parallel (one log per process) since the logs from multiple cracking
+        rigs can add up. The logs are processed in filename order so the Session and Strike ids
+        are the same each time.
+
         Inputs:
             folder_name: The folder to read the logs in from
 
+            cracker_name: (String) "jtr", "hc", or "all"
+
+            max_workers: (Int) The maximum number of processes to use to parse the JtR logs. If None,
+            it defaults to the number of CPUs
+
         Outputs:
             True: Everything compleated sucessfully
 
@@ -66,25 +75,25 @@ class Mixin:
         # If at least one log was successfully parsed
         log_success = False
 
+        log_files = []
+        for file_name in sorted(os.listdir(folder_name)):
+            if file_name.endswith(".log"):
+                log_files.append(os.path.join(folder_name, file_name))
+
         # Parse the JtR log files
+        # The parser checks that each file is a JtR log itself so the file only needs to be opened once
         if cracker_name in ['all', 'jtr']:
-            for file_name in os.listdir(folder_name):
-                if file_name.endswith(".log"):
-                    full_file_name = os.path.join(folder_name, file_name)
-                    if self.jtr.is_logfile(filename=full_file_name):
-                        result = self.jtr.read_logfile(filename=full_file_name, session_list=self.session_list, strike_list=self.strike_list, hash_list=self.hash_list)
-                        if result:
-                            log_success = True
+            results = self.jtr.read_logfiles(log_files, self.session_list, self.strike_list, self.hash_list, max_workers=max_workers, verbose=False)
+            if True in results.values():
+                log_success = True
 
         # Parse the HC log files
         if cracker_name in ['all', 'hc']:
-            for file_name in os.listdir(folder_name):
-                if file_name.endswith(".log"):
-                    full_file_name = os.path.join(folder_name, file_name)
-                    if self.hc.is_logfile(filename=full_file_name):
-                        result = self.hc.read_logfile(filename=full_file_name, session_list=self.session_list, strike_list=self.strike_list, hash_list=self.hash_list)
-                        if result:
-                            log_success = True
+            for full_file_name in log_files:
+                if self.hc.is_logfile(filename=full_file_name):
+                    result = self.hc.read_logfile(filename=full_file_name, session_list=self.session_list, strike_list=self.strike_list, hash_list=self.hash_list)
+                    if result:
+                        log_success = True
 
         return log_success
     
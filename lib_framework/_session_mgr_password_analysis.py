@@ -0,0 +1,472 @@
+"""
+Python Mixin extension to the SessionMgr class to hold functions related to analyzing
+the structure of cracked passwords and how they relate to the target metadata
+
+Since this is a Mixin instance, it is not stand alone code.
+
+The structures follow the PCFG style of splitting a password into runs of letters (L),
+digits (D), and specials (S). E.g. "Summer2024!" is L6D4S1. Each run is a "terminal" for
+its slot (L6, D4, S1) so the terminal counts can be used to fill in the structures.
+
+The analysis is done on batches of plaintexts joined into one string. The structures come
+from a single str.translate() of each batch into character classes, and the terminals from
+a couple of regex calls counted with a Counter, vs. looping through every character in
+Python. That's what keeps it usable on millions of cracked passwords.
+
+The metadata correlation works the same way. Each transform of a metadata field is applied
+to a whole column of values at once and then checked against the plaintexts with
+map(operator.contains), so the only per target Python code is gathering the columns.
+"""
+
+
+from collections import Counter
+import datetime
+from itertools import repeat
+import operator
+import re
+
+from .target import DATE_COMMAND_REGEX, MONTHS, TIMEZONE_OFFSETS
+
+
+# Finds the runs in a plaintext that was translated to character classes (aka LLLLLLDDDDS)
+_RUN_REGEX = re.compile(r"L+|D+|S+")
+
+# Finds the terminals. Underscore is a word character for regex but a special for the
+# structures. Newlines are excluded since they seperate the plaintexts
+_LETTER_REGEX = re.compile(r"[^\W\d_]+")
+_DIGIT_REGEX = re.compile(r"\d+")
+_SPECIAL_REGEX = re.compile(r"(?:[^\w\n]|_)+")
+_DIGIT_SUFFIX_REGEX = re.compile(r"\d+$", re.MULTILINE)
+
+
+# Undoes common leet substitutions in a lowercase plaintext. The plaintexts are translated
+# vs. the metadata since a password may only use some of the substitutions (aka "b0ston").
+# More than one table since "1" can be "i" or "l"
+_LEET_TABLES = [
+    str.maketrans("4@3!10$57", "aaeiiosst"),
+    str.maketrans("4@3!10$57", "aaeilosst"),
+]
+
+# The formats a date from the metadata may show up as in a password
+_DATE_FORMATS = ["%Y%m%d", "%m%d%Y", "%d%m%Y", "%m%d%y", "%d%m%y", "%m%d", "%d%m", "%Y"]
+
+# Formats to try when a date in the metadata is a string vs. a datetime
+_DATE_PARSE_FORMATS = ["%m/%d/%Y", "%d/%m/%Y", "%m/%d/%y", "%Y/%m/%d", "%d-%m-%Y", "%m-%d-%Y"]
+
+# Used as the transformed value when a field can't be transformed. Plaintexts with a newline
+# are skipped so this never matches
+_NO_MATCH = "\n"
+
+
+class _CharClassTable(dict):
+    """
+    str.translate() table that maps every character to its class (L, D, or S)
+
+    The class of a character is looked up the first time it is seen and then cached, so
+    non-ASCII letters and digits are classified the same way as the terminal regexes
+    """
+
+    def __missing__(self, key):
+        char = chr(key)
+        if char == "\n":
+            char_class = "\n"
+        elif _LETTER_REGEX.match(char):
+            char_class = "L"
+        elif _DIGIT_REGEX.match(char):
+            char_class = "D"
+        else:
+            char_class = "S"
+        self[key] = char_class
+        return char_class
+
+
+class Mixin:
+
+    def get_password_structures(self, hash_type=None, filter=None, batch_size=100000):
+        """
+        Counts the structures and terminals of the cracked passwords
+
+        Inputs:
+            hash_type: (String) If not None, only use cracked passwords of hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used. Same format as create_left_list()
+
+            batch_size: (Int) The number of plaintexts to process at a time
+
+        Returns:
+            results: (Dict) {
+                'num_passwords':(Int) The number of cracked passwords analyzed,
+                'structures':(Counter) Key = structure (aka L6D4S1), value = count,
+                'terminals':(Dict) Key = slot (aka D4), value = Counter of the terminals for that slot,
+                'base_words':(Counter) Key = lowercase letter run, value = count,
+                'digit_suffixes':(Counter) Key = digit run at the end of the password, value = count,
+            }
+
+            None: If a problem occured
+        """
+        if not self._check_filter(hash_type=hash_type, filter=filter):
+            return None
+
+        if batch_size < 1:
+            print(f"Error: batch_size needs to be at least 1")
+            return None
+
+        plaintexts = self._get_cracked_plaintexts(hash_type=hash_type, filter=filter)
+
+        # Key = class of every character (aka LLLLLLDDDDS), value = count
+        masks = Counter()
+        letters = Counter()
+        digits = Counter()
+        specials = Counter()
+        digit_suffixes = Counter()
+        char_classes = _CharClassTable()
+
+        for start in range(0, len(plaintexts), batch_size):
+            text = "\n".join(plaintexts[start:start + batch_size])
+            masks.update(text.translate(char_classes).split("\n"))
+            letters.update(_LETTER_REGEX.findall(text))
+            digits.update(_DIGIT_REGEX.findall(text))
+            specials.update(_SPECIAL_REGEX.findall(text))
+            digit_suffixes.update(_DIGIT_SUFFIX_REGEX.findall(text))
+
+        # Far fewer unique masks than passwords so the runs are only measured once per mask
+        structures = Counter()
+        for mask, count in masks.items():
+            structure = "".join(f"{run[0]}{len(run)}" for run in _RUN_REGEX.findall(mask))
+            structures[structure] += count
+
+        # The terminals are grouped by slot after counting so the length is only calculated
+        # once per unique terminal
+        terminals = {}
+        base_words = Counter()
+        for slot_type, counts in [('L', letters), ('D', digits), ('S', specials)]:
+            for terminal, count in counts.items():
+                slot = f"{slot_type}{len(terminal)}"
+                if slot not in terminals:
+                    terminals[slot] = Counter()
+                terminals[slot][terminal] = count
+                if slot_type == 'L':
+                    base_words[terminal.lower()] += count
+
+        return {
+            'num_passwords':len(plaintexts),
+            'structures':structures,
+            'terminals':terminals,
+            'base_words':base_words,
+            'digit_suffixes':digit_suffixes,
+        }
+
+    def create_structure_wordlists(self, file_prefix, hash_type=None, filter=None, min_count=1):
+        """
+        Writes the results of get_password_structures() to files, most common first
+
+        Writes:
+            {file_prefix}_base_words.txt: The lowercase letter runs. Aka a wordlist to run rules against
+            {file_prefix}_digit_suffixes.txt: The digit runs found at the end of passwords
+            {file_prefix}_structures.txt: Tab seperated structure and count
+
+        Inputs:
+            file_prefix: (String) The prefix for the files
+
+            hash_type: (String) If not None, only use cracked passwords of hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used. Same format as create_left_list()
+
+            min_count: (Int) Only write items that were seen at least this many times
+
+        Returns:
+            results: (Dict) The results of get_password_structures()
+
+            None: If a problem occured
+        """
+        results = self.get_password_structures(hash_type=hash_type, filter=filter)
+        if results is None:
+            return None
+
+        files = [
+            (f"{file_prefix}_base_words.txt", results['base_words'], False),
+            (f"{file_prefix}_digit_suffixes.txt", results['digit_suffixes'], False),
+            (f"{file_prefix}_structures.txt", results['structures'], True),
+        ]
+        for file_name, counts, include_count in files:
+            try:
+                with open(file_name, mode='w') as file:
+                    for item, count in counts.most_common():
+                        if count < min_count:
+                            break
+                        if include_count:
+                            file.write(f"{item}\t{count}\n")
+                        else:
+                            file.write(f"{item}\n")
+            except Exception as msg:
+                print(f"Exception writing to {file_name}: {msg}")
+                return None
+
+        return results
+
+    def print_password_structures(self, hash_type=None, filter=None, top_x=10):
+        """
+        Prints out the most common structures and the top terminals for each of them
+
+        Inputs:
+            hash_type: (String) If not None, only use cracked passwords of hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used. Same format as create_left_list()
+
+            top_x: (Int) The number of structures, and terminals per slot, to print
+
+        Returns:
+            None
+        """
+        results = self.get_password_structures(hash_type=hash_type, filter=filter)
+        if results is None:
+            return
+
+        if not results['num_passwords']:
+            print("No cracked passwords match the filters")
+            return
+
+        print(f"Cracked Passwords: {results['num_passwords']} Unique Structures: {len(results['structures'])}")
+        for rank, (structure, count) in enumerate(results['structures'].most_common(top_x), start=1):
+            print(f"#{rank} {structure}: {count} ({count / results['num_passwords'] * 100:.2f}%)")
+            for slot in re.findall(r"[LDS]\d+", structure):
+                top_terminals = ", ".join(terminal for terminal, _ in results['terminals'][slot].most_common(top_x))
+                print(f"    {slot}: {top_terminals}")
+
+    def get_metadata_correlation(self, fields=None, hash_type=None, filter=None, min_length=3):
+        """
+        Measures how often the cracked passwords of targets contain their own metadata
+
+        Each (target, cracked plaintext) pair is checked for each metadata field of the target.
+        The transforms checked are:
+            case: The value in any case. Aka "Boston" in "bOSTON123"
+            leet: The value once common leet substitutions are undone in the plaintext. Aka "b0st0n"
+            reverse: The lowercase value reversed. Aka "notsob"
+            date: The value is a date and one of _DATE_FORMATS of it is in the plaintext. Dates
+            with a timezone (aka "Tue May 31 08:26:06 CST 2022") are also checked as the epoch
+
+        Inputs:
+            fields: (List) The metadata fields to check. If None, check all of them
+
+            hash_type: (String) If not None, only use cracked passwords of hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used. Same format as create_left_list()
+
+            min_length: (Int) Values shorter than this are skipped (aka a middle initial), other
+            than dates
+
+        Returns:
+            correlation: (List) Sorted by hit_rate with the highest first. Each item is a Dict {
+                'field':(String) The metadata field,
+                'num_pairs':(Int) Number of cracked passwords of targets that have this field,
+                'hits':(Int) Number of those passwords that contained the field with any transform,
+                'hit_rate':(Float) hits / num_pairs,
+                'transforms':(Dict) Key = transform, value = number of hits for that transform,
+            }
+
+            None: If a problem occured
+        """
+        if not self._check_filter(hash_type=hash_type, filter=filter):
+            return None
+
+        if fields is None:
+            fields = list(self.target_list.meta_lookup.keys())
+
+        # Gather the (target metadata, lowercase plaintext) pairs
+        metadata_list = []
+        plaintexts = []
+        for target in self.target_list.targets.values():
+            for hash_id in target.hashes:
+                plaintext = self.hash_list.hashes[hash_id].plaintext
+                if not plaintext or "\n" in plaintext:
+                    continue
+                if (hash_type or filter) and not self._filter_hash_id(hash_id=hash_id, hash_type=hash_type, filter=filter):
+                    continue
+                metadata_list.append(target.metadata)
+                plaintexts.append(plaintext)
+        plaintexts = list(map(str.lower, plaintexts))
+        leet_plaintexts = [list(map(str.translate, plaintexts, repeat(table))) for table in _LEET_TABLES]
+
+        # Key = value from the metadata, value = List of the date formats of it
+        date_cache = {}
+
+        correlation = []
+        for field in fields:
+            column = [metadata.get(field) for metadata in metadata_list]
+            has_field = [value is not None for value in column]
+            field_plaintexts = [plaintext for plaintext, keep in zip(plaintexts, has_field) if keep]
+            column = [value for value in column if value is not None]
+            if not column:
+                continue
+
+            dates = [self._get_date_formats(value, date_cache) for value in column]
+            values = [self._get_correlation_value(value, min_length) for value in column]
+
+            transforms = {}
+            transforms['case'] = list(map(operator.contains, field_plaintexts, values))
+
+            # Only counted as a leet hit if it didn't already match without the substitutions
+            leet_hits = [False] * len(values)
+            for table_plaintexts in leet_plaintexts:
+                table_plaintexts = [plaintext for plaintext, keep in zip(table_plaintexts, has_field) if keep]
+                leet_hits = list(map(operator.or_, leet_hits, map(operator.contains, table_plaintexts, values)))
+            transforms['leet'] = list(map(operator.gt, leet_hits, transforms['case']))
+
+            reversed_values = map(operator.getitem, values, repeat(slice(None, None, -1)))
+            reversed_values = [reverse if reverse != value else _NO_MATCH for reverse, value in zip(reversed_values, values)]
+            transforms['reverse'] = list(map(operator.contains, field_plaintexts, reversed_values))
+
+            date_hits = [False] * len(values)
+            for index in range(len(_DATE_FORMATS) + 1):
+                date_values = [formats[index] if formats and index < len(formats) else _NO_MATCH for formats in dates]
+                date_hits = list(map(operator.or_, date_hits, map(operator.contains, field_plaintexts, date_values)))
+            transforms['date'] = date_hits
+
+            hits = [False] * len(values)
+            for transform_hits in transforms.values():
+                hits = list(map(operator.or_, hits, transform_hits))
+
+            correlation.append({
+                'field':field,
+                'num_pairs':len(values),
+                'hits':sum(hits),
+                'hit_rate':sum(hits) / len(values),
+                'transforms':{transform:sum(transform_hits) for transform, transform_hits in transforms.items()},
+            })
+
+        correlation.sort(key=lambda x: (-x['hit_rate'], -x['hits'], x['field']))
+        return correlation
+
+    def print_metadata_correlation(self, fields=None, hash_type=None, filter=None, top_x=None):
+        """
+        Prints out the results of get_metadata_correlation() in a human readable format
+
+        Inputs:
+            fields: (List) The metadata fields to check. If None, check all of them
+
+            hash_type: (String) If not None, only use cracked passwords of hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used. Same format as create_left_list()
+
+            top_x: (Int) The number of fields to print. If None print all of them
+
+        Returns:
+            None
+        """
+        correlation = self.get_metadata_correlation(fields=fields, hash_type=hash_type, filter=filter)
+        if not correlation:
+            print("No cracked passwords of targets with metadata match the filters")
+            return
+
+        if top_x:
+            correlation = correlation[:top_x]
+
+        for rank, entry in enumerate(correlation, start=1):
+            transforms = ", ".join(f"{transform}: {hits}" for transform, hits in entry['transforms'].items() if hits)
+            print(f"#{rank} {entry['field']}: {entry['hit_rate'] * 100:.2f}% ({entry['hits']}/{entry['num_pairs']})")
+            if transforms:
+                print(f"    {transforms}")
+
+    def _get_correlation_value(self, value, min_length):
+        """
+        Returns the lowercase string of a metadata value to look for in the plaintexts
+
+        Inputs:
+            value: The value from the target metadata
+
+            min_length: (Int) Values shorter than this are not looked for
+
+        Returns:
+            value: (String) The lowercase value or _NO_MATCH if it shouldn't be looked for
+        """
+        value = str(value).lower()
+        if len(value) < min_length or "\n" in value:
+            return _NO_MATCH
+        return value
+
+    def _get_date_formats(self, value, date_cache):
+        """
+        Returns the ways a date from the metadata may show up in a password
+
+        Inputs:
+            value: The value from the target metadata. Either a date/datetime or a string
+
+            date_cache: (Dict) Key = value, value = the result of a previous call
+
+        Returns:
+            formats: (List) The date in each of _DATE_FORMATS, followed by the epoch if the
+            date has a timezone
+
+            None: If the value isn't a date
+        """
+        try:
+            if value in date_cache:
+                return date_cache[value]
+        except TypeError:
+            return None
+
+        date = None
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            date = value
+        elif isinstance(value, str) and DATE_COMMAND_REGEX.match(value):
+            # Unix date command format. Aka "Tue May 31 08:26:06 CST 2022" from the CMIYC 2023 Created field
+            month, day, hours, minutes, seconds, timezone, year = DATE_COMMAND_REGEX.match(value).groups()
+            if month.title() in MONTHS and timezone.upper() in TIMEZONE_OFFSETS:
+                try:
+                    date = datetime.datetime(int(year), MONTHS[month.title()], int(day), int(hours), int(minutes), int(seconds),
+                        tzinfo=datetime.timezone(datetime.timedelta(hours=TIMEZONE_OFFSETS[timezone.upper()])))
+                except ValueError:
+                    date = None
+        elif isinstance(value, str) and any(char.isdigit() for char in value[:4]):
+            try:
+                date = datetime.datetime.fromisoformat(value.strip())
+            except ValueError:
+                for date_format in _DATE_PARSE_FORMATS:
+                    try:
+                        date = datetime.datetime.strptime(value.strip(), date_format)
+                        break
+                    except ValueError:
+                        continue
+
+        formats = None
+        if date:
+            # The date as it was written in the metadata, so not converted to UTC
+            formats = [date.strftime(date_format) for date_format in _DATE_FORMATS]
+            # The epoch is only known if the timezone is
+            if isinstance(date, datetime.datetime) and date.tzinfo:
+                formats.append(str(int(date.timestamp())))
+        date_cache[value] = formats
+        return formats
+
+    def _get_cracked_plaintexts(self, hash_type=None, filter=None):
+        """
+        Returns the plaintexts of the cracked hashes that match the filters
+
+        Plaintexts with a newline are skipped since the batches are seperated by newlines.
+        They aren't something that can be written to a wordlist anyways.
+
+        Inputs:
+            hash_type: (String) If not None, only use cracked passwords of hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used. Same format as create_left_list()
+
+        Returns:
+            plaintexts: (List) One entry per cracked hash, so duplicates are counted
+        """
+        if not hash_type and not filter:
+            return [hash.plaintext for hash in self.hash_list.hashes.values() if hash.plaintext and "\n" not in hash.plaintext]
+
+        plaintexts = []
+        for hash_id, hash in self.hash_list.hashes.items():
+            if not hash.plaintext or "\n" in hash.plaintext:
+                continue
+            if not self._filter_hash_id(hash_id=hash_id, hash_type=hash_type, filter=filter):
+                continue
+            plaintexts.append(hash.plaintext)
+        return plaintexts
@@ -0,0 +1,233 @@
+"""
+Python Mixin extension to the SessionMgr class to hold functions related to splitting
+left lists across multiple cracking rigs
+
+Since this is a Mixin instance, it is not stand alone code.
+
+Splitting a left list by line count doesn't work well since the work to attack a set of
+hashes depends on the number of unique salts and how expensive the hash type is vs. how
+many hashes there are. Aka 100k raw-md5 hashes cost the same to attack as one raw-md5 hash,
+while every bcrypt salt costs as much as running the whole attack again. So the shards are
+balanced on the estimated work instead.
+"""
+
+
+import datetime
+import heapq
+import json
+
+from .hash_fingerprint import is_salted_type
+
+
+class Mixin:
+
+    def create_sharded_left_lists(self, num_shards, file_prefix, format="jtr", hash_type=None, filter=None):
+        """
+        Splits the uncracked hashes into multiple left lists, one per cracking rig, balanced
+        by the estimated work to attack them
+
+        The estimated work of a group of hashes is the number of unique salts times the cost
+        per candidate of the hash type (see HashList.get_cost()). All the hashes that share a
+        salt are kept in the same shard, and all the hashes of an unsalted type are kept together
+        since splitting them up would just make multiple rigs repeat the same work.
+
+        Writes:
+            {file_prefix}_{shard}.hash: The left list for each shard
+            {file_prefix}_manifest.json: Info needed to merge the results back with merge_shard_results()
+
+        Inputs:
+            num_shards: (Int) The number of left lists to create
+
+            file_prefix: (STR) The prefix for the left lists and manifest
+
+            format: (STR) Should be either "jtr" or "hc"
+
+            hash_type: (STR) If not none, only write hashes of this type to the left lists
+
+            filter: (Dict) All key/value pairs must match metadata for uncracked hashes to
+            be written to the left lists. Same format as create_left_list()
+
+        Returns:
+            manifest: (Dict) The contents of the manifest file
+
+            None: If a problem occured
+        """
+        supported_formats = ['jtr','hc']
+        if format not in supported_formats:
+            print(f"Error: format needs to be one of the following options: {supported_formats}")
+            return None
+
+        if num_shards < 1:
+            print(f"Error: num_shards needs to be at least 1")
+            return None
+
+        if not self._check_filter(hash_type=hash_type, filter=filter):
+            return None
+
+        # Group the hashes by (type, salt)
+        # Key = (type, salt), value = list of hash_ids
+        # A salted type where the salt couldn't be parsed gets its own group per hash since
+        # it's unknown which salt it shares. Same as _order_by_salt()
+        groups = {}
+        for hash_id, hash in self.hash_list.hashes.items():
+            if hash.plaintext:
+                continue
+            if not self._filter_hash_id(hash_id=hash_id, hash_type=hash_type, filter=filter):
+                continue
+
+            cur_type = self.hash_list.type_lookup[hash_id]
+            salt = self.hash_list.salt_lookup[hash_id]
+            key = (cur_type, salt)
+            if salt is None and is_salted_type(cur_type):
+                key = (cur_type, None, hash_id)
+            if key not in groups:
+                groups[key] = []
+            groups[key].append(hash_id)
+
+        # Assign the most expensive groups first to the shard with the least work (LPT scheduling)
+        # Sorting on the hash_id of the group as well so the results are deterministic
+        group_work = {}
+        for key in groups:
+            group_work[key] = self._get_group_cost(key[0])
+        ordered_groups = sorted(groups, key=lambda x: (-group_work[x], -len(groups[x]), groups[x][0]))
+
+        shards = []
+        shard_heap = []
+        for shard in range(num_shards):
+            shards.append({
+                'shard':shard,
+                'file':f"{file_prefix}_{shard}.hash",
+                'pot_file':f"{file_prefix}_{shard}{self._get_pw_cracker_mgr(format).pot_extension}",
+                'num_hashes':0,
+                'num_salts':0,
+                'estimated_work':0,
+                'hash_types':{},
+                'hash_ids':[],
+            })
+            heapq.heappush(shard_heap, (0, shard))
+
+        # Key = hash_id, value = the shard it is assigned to
+        assignment = {}
+        for key in ordered_groups:
+            work, shard = heapq.heappop(shard_heap)
+            work += group_work[key]
+            heapq.heappush(shard_heap, (work, shard))
+
+            shards[shard]['estimated_work'] = work
+            shards[shard]['num_salts'] += 1
+            shards[shard]['num_hashes'] += len(groups[key])
+            shards[shard]['hash_types'][key[0]] = shards[shard]['hash_types'].get(key[0], 0) + len(groups[key])
+            for hash_id in groups[key]:
+                assignment[hash_id] = shard
+
+        # Write all of the shards in one pass through the hashes
+        files = []
+        try:
+            for shard in shards:
+                files.append(open(shard['file'], mode='w'))
+
+            for hash_id in self.hash_list.hashes:
+                if hash_id not in assignment:
+                    continue
+                shard = assignment[hash_id]
+                files[shard].write(f"{self._format_left_list_hash(hash_id, format)}\n")
+                shards[shard]['hash_ids'].append(hash_id)
+
+        except Exception as msg:
+            print(f"Exception writing the sharded left lists: {msg}")
+            return None
+        finally:
+            for file in files:
+                file.close()
+
+        manifest = {
+            'created':datetime.datetime.now().isoformat(),
+            'format':format,
+            'hash_type':hash_type,
+            'filter':filter,
+            'shards':shards,
+        }
+
+        manifest_file = f"{file_prefix}_manifest.json"
+        try:
+            with open(manifest_file, mode='w') as file:
+                json.dump(manifest, file)
+        except Exception as msg:
+            print(f"Exception writing to {manifest_file}: {msg}")
+            return None
+
+        return manifest
+
+    def merge_shard_results(self, manifest_file, pot_files=None, verbose=True):
+        """
+        Loads the cracks from each shard's pot file back into the framework
+
+        Inputs:
+            manifest_file: (STR) The manifest written by create_sharded_left_lists()
+
+            pot_files: (List) The pot file for each shard in shard order. If None, the pot_file
+            listed in the manifest for each shard is used
+
+            verbose: (Bool) If True, print out how many hashes have been cracked for each shard
+
+        Returns:
+            new_cracks: (Dict) Key = shard, value = number of new cracks loaded from its pot file
+
+            None: If a problem occured
+        """
+        try:
+            with open(manifest_file) as file:
+                manifest = json.load(file)
+        except Exception as msg:
+            print(f"Exception reading {manifest_file}: {msg}")
+            return None
+
+        pw_cracker_mgr = self._get_pw_cracker_mgr(manifest['format'])
+
+        new_cracks = {}
+        for shard in manifest['shards']:
+            if pot_files:
+                pot_file = pot_files[shard['shard']]
+            else:
+                pot_file = shard['pot_file']
+
+            new_cracks[shard['shard']] = max(0, pw_cracker_mgr.load_potfile(pot_file, self.hash_list, update_only=True))
+
+            if verbose:
+                num_cracked = 0
+                for hash_id in shard['hash_ids']:
+                    if self.hash_list.hashes[hash_id].plaintext:
+                        num_cracked += 1
+                print(f"Shard {shard['shard']}: New Cracks: {new_cracks[shard['shard']]} Cracked: {num_cracked}/{shard['num_hashes']}")
+
+        return new_cracks
+
+    def _get_group_cost(self, hash_type):
+        """
+        Returns the estimated cost of attacking one salt (or all hashes of an unsalted type)
+
+        Inputs:
+            hash_type: (STR) The hash type
+
+        Returns:
+            cost: (Float) The estimated seconds per candidate password
+        """
+        cost = self.hash_list.get_cost(hash_type)
+        if cost is None:
+            # Unknown hash types are treated as cheap since there isn't anything better to go on
+            cost = 1 / 1000000000
+        return cost
+
+    def _get_pw_cracker_mgr(self, format):
+        """
+        Returns the password cracker manager for a left list format
+
+        Inputs:
+            format: (STR) Should be either "jtr" or "hc"
+
+        Returns:
+            pw_cracker_mgr: (PWCrackerMgr) The manager for that format
+        """
+        if format == "hc":
+            return self.hc
+        return self.jtr
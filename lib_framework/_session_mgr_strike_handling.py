@@ -8,6 +8,7 @@ The goal is to reduce the size of the main SessionMgr file
 """
 
 
+import heapq
 import os
 from collections import Counter
 
@@ -74,6 +75,159 @@ class Mixin:
 
         return ruleset_counter
     
+    def create_minimized_ruleset(self, file_name=None, coverage=1.0, hash_type=None, filter=None, use_scores=False, warnings=True):
+        """
+        Creates the smallest ordered set of password cracking rules that covers a fraction of the
+        cracked hashes. Aka if ten rules all cracked the same hashes, only one of them is kept
+
+        Unlike create_ruleset_from_cracked_hashes() which orders rules by number of strikes, this
+        looks at which hashes each rule cracked, and then picks rules using a greedy set cover.
+        The rule that cracked the most hashes not already covered by the rules picked before it
+        goes next. The number of new hashes a rule covers only goes down as other rules are
+        picked, so rules are kept in a heap and their gain is only recalculated when they make
+        it to the top (lazy updates) vs. recalculating every rule after each pick.
+
+        ONLY looks at strikes from wordlist attacks that have been matched to hashes loaded
+        into the framework, so the coverage is the fraction of those hashes vs. all cracked hashes
+
+        Dev Note: Currently not doing any fixup between hashcat and jtr style rule formats
+
+        Inputs:
+
+            file_name: (String) If it is not None, write the ruleset to this filename
+
+            coverage: (Float) Stop adding rules once this fraction of the hashes are covered.
+            Aka 0.9 = 90%
+
+            hash_type: (String) If not none, only use cracked passwords of hashes of this type
+            to generate the ruleset. If None, then it will use all cracked passwords regardless of type
+
+            filter: (Dict) All key/value pairs must match metadata for cracked passwords to
+            be used to generate the ruleset. If None the filter is ignored. If a value is None, then
+            it will use all passwords that have a metadata with the particular key set.
+
+            use_scores: (Bool) If True, weight each hash by the score of its hash type (see
+            HashList.init_scores()) so rules that crack more valuable hashes are picked first.
+            Hash types with no score are given a weight of 1
+
+            warnings: (Bool) If True, print warnings to stdout if this is run and there are no valid
+            strikes to create a ruleset from
+
+        Returns:
+            ruleset: (List) Ordered list of (rule, weight) tuples where weight is the number (or
+            score if use_scores is True) of hashes this rule covered that previous rules did not
+
+            None: If a problem occured
+        """
+        if coverage <= 0 or coverage > 1:
+            print(f"Error: coverage needs to be greater than 0 and less than or equal to 1")
+            return None
+
+        if not self._check_filter(hash_type=hash_type, filter=filter):
+            return None
+
+        # Key = rule, value = set of hash_ids the rule cracked
+        rule_hashes = {}
+
+        # Key = hash_id, value = weight of the hash
+        hash_weights = {}
+        for hash_id, strike_ids in self.strike_list.hash_id_lookup.items():
+            # Skip strikes that weren't matched to hashes in the framework
+            if hash_id is None:
+                continue
+
+            if not self._filter_hash_id(hash_id=hash_id, hash_type=hash_type, filter=filter):
+                continue
+
+            for strike_id in strike_ids:
+                details = self.strike_list.strikes[strike_id].details
+                if details['attack'] != "wordlist":
+                    continue
+
+                # Handle the "None" rule from things like input from stdin
+                rule = details['rule']
+                if not rule:
+                    rule = ":"
+
+                if rule not in rule_hashes:
+                    rule_hashes[rule] = set()
+                rule_hashes[rule].add(hash_id)
+
+                if hash_id not in hash_weights:
+                    hash_weights[hash_id] = self._get_ruleset_weight(hash_id, use_scores)
+
+        ruleset = []
+        if not rule_hashes:
+            if warnings:
+                print("Warning: No strikes were found that matched the filter criteria, so no rules were generated")
+            return ruleset
+
+        target = coverage * sum(hash_weights.values())
+
+        # Heap of (-gain, -num_hashes, rule). The number of hashes and the rule itself are there to
+        # break ties so the results are deterministic
+        rule_heap = []
+        for rule, hash_ids in rule_hashes.items():
+            gain = sum(hash_weights[hash_id] for hash_id in hash_ids)
+            rule_heap.append((-gain, -len(hash_ids), rule))
+        heapq.heapify(rule_heap)
+
+        covered = set()
+        covered_weight = 0
+        while rule_heap and covered_weight < target:
+            neg_gain, neg_num, rule = heapq.heappop(rule_heap)
+
+            # Recalculate the gain since other rules may have covered some of these hashes
+            new_hashes = rule_hashes[rule] - covered
+            if not new_hashes:
+                continue
+            gain = sum(hash_weights[hash_id] for hash_id in new_hashes)
+
+            # If the gain went down, it may no longer be the best rule so put it back
+            if gain < -neg_gain:
+                heapq.heappush(rule_heap, (-gain, -len(new_hashes), rule))
+                continue
+
+            covered.update(new_hashes)
+            covered_weight += gain
+            ruleset.append((rule, gain))
+
+        if warnings and covered_weight < target:
+            print(f"Warning: Only able to cover {covered_weight / sum(hash_weights.values()):.2%} of the cracked hashes")
+
+        # If not printing to stdout, open the file 
+        if file_name:
+            try:
+                file = open(file_name, mode='w')
+                for rule in ruleset:
+                    file.write(f"{rule[0]}\n")
+                file.close()
+
+            except Exception as msg:
+                print(f"Exception writing to {file_name}: {msg}")
+                return None
+
+        return ruleset
+
+    def _get_ruleset_weight(self, hash_id, use_scores):
+        """
+        Returns how much covering a hash is worth when minimizing a ruleset. See create_minimized_ruleset()
+
+        Inputs:
+            hash_id: (Int) The hash
+
+            use_scores: (Bool) If True, use the score of the hash type
+
+        Returns:
+            weight: (Int) The weight of the hash
+        """
+        if not use_scores:
+            return 1
+        hash_type = self.hash_list.type_lookup.get(hash_id)
+        if hash_type not in self.hash_list.type_info or not self.hash_list.type_info[hash_type]['score']:
+            return 1
+        return self.hash_list.type_info[hash_type]['score']
+
     def create_ruleset_from_uncategorized_cracks(self, file_name=None, warnings=True):
         """
         Creates a set of password cracking rules based on Strikes (rules that cracked passwords)
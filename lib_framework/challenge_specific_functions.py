@@ -4,9 +4,32 @@ per contest or cracking session
 
 For example, this contains logic for how to load up
 the challenge hashes
+
+Each challenge file format is a loader registered with register_loader(). A loader is
+a generator that reads the file and yields one (hash, type_hint, metadata) record at a time.
+The records are added to the HashList/TargetList in batches so only one batch is kept in memory
+vs. reading the whole file in with readlines() first. To support a new contest, write a loader
+in your own module and list it in the config file vs. editing this file:
+
+    challenge_files:
+      street:
+        file: "./challenge_files/street.txt"
+        format: "my_contest"
+        loader_module: "my_contest_loaders"
+
+    # my_contest_loaders.py
+    from lib_framework.challenge_specific_functions import register_loader
+
+    @register_loader("my_contest")
+    def load_my_contest(details):
+        with open(details['file']) as challenge_file:
+            for line in challenge_file:
+                username, hash = line.rstrip("\\n").split(":", 1)
+                yield hash, None, {'username':username}
 """
 
 
+import importlib
 import yaml
 
 # Local imports
@@ -14,13 +37,61 @@ from .hash_fingerprint import hash_fingerprint
 from .hash_fingerprint import get_len_for_type
 
 
+# Key = the format used in the config file, value = the loader generator. See register_loader()
+CHALLENGE_LOADERS = {}
+
+# The number of records to add to the HashList/TargetList at a time
+DEFAULT_BATCH_SIZE = 10000
+
+# The CMIYC 2023 challenge had raw-MD5, raw-sha1, and raw-sha256
+CMIYC_2023_LENGTH_HELPER = {
+    32:"raw-md5",
+    34:"striphash34",
+    35:"striphash35",
+    36:"striphash36",
+    37:"striphash37",
+    38:"striphash38",
+    39:"striphash39",
+    40:"raw-sha1",
+    64:"raw-sha256",
+}
+
+
+def register_loader(format_name):
+    """
+    Decorator to add a challenge file loader to CHALLENGE_LOADERS
+
+    The loader is called with the details for the challenge file from the config and
+    should yield a record for each hash:
+        hash: (String) The password hash
+
+        type_hint: Used to identify the hash type with hash_fingerprint(). Either:
+            None: Autodetect the type
+            (String): The type the hash is expected to be. Used to deconflict hashes of the
+            same length and a warning is printed if the hash doesn't match it
+            (Dict): A length helper for hash_fingerprint(). Aka {32:"raw-md5", 40:"raw-sha1"}
+
+        metadata: (Dict) The metadata for the target this hash belongs to. If None, the hash
+        is added to a single target for the whole file when details has a 'source'
+
+    Inputs:
+        format_name: (String) The format used in the config file
+
+    Returns:
+        decorator: (Function) Registers the loader and returns it unchanged
+    """
+    def decorator(loader):
+        CHALLENGE_LOADERS[format_name] = loader
+        return loader
+    return decorator
+
+
 def load_challenge_files(details, hash_list, target_list):
     """
     Top level function responsible for loading the hashes from a file
 
-    Eventually I'd like to have a plugin functionality so people
-    don't need to update this function, but for now you'll need
-    to add a reference to the logic to load a hash file here
+    Looks up the loader for details['format'] in CHALLENGE_LOADERS. If details has a
+    'loader_module' it is imported first so loaders outside of this file can register themselves
 
     Inputs:
         details: (DICT) Contains info needed to load the challenge file
@@ -36,57 +107,135 @@ def load_challenge_files(details, hash_list, target_list):
     """
 
     try:
-        # If the file is just a list of all the same hash types with no additional other data
-        if details['format'] == 'plain_hash':
-            return _load_plain_hash(details, hash_list, target_list)
-        elif details['format'] == 'cmiyc_2023':
-            return _load_cmiyc_2023(details, hash_list, target_list)
-        elif details['format'] == 'mixed_list_with_usernames':
-            return _load_mixed_list_with_usernames(details, hash_list, target_list)
-        else:
-            print(f"Error, format {details['format']} not supported. Add it to challenge_specific_functions.py")
+        if 'loader_module' in details:
+            importlib.import_module(details['loader_module'])
+
+        if details['format'] not in CHALLENGE_LOADERS:
+            print(f"Error, format {details['format']} not supported. Supported formats: {list(CHALLENGE_LOADERS.keys())}")
+            print("Add it to challenge_specific_functions.py or register it from the module listed in loader_module")
             return False
 
+        print(f"Starting to load challenge file: {details['file']}. This may take a minute or two")
+
+        loader = CHALLENGE_LOADERS[details['format']](details)
+        batch_size = details.get('batch_size', DEFAULT_BATCH_SIZE)
+
+        # Used to create a target that has all the hashes without their own metadata
+        source_hash_ids = {}
+
+        # Key = type_hint, value = length helper. Saves creating one for every hash
+        length_helpers = {}
+
+        # Key = hash type. The types that have already been added to hash_list
+        known_types = set()
+
+        batch = []
+        for record in loader:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                _add_batch(batch, details, hash_list, target_list, source_hash_ids, length_helpers, known_types)
+                batch = []
+        if batch:
+            _add_batch(batch, details, hash_list, target_list, source_hash_ids, length_helpers, known_types)
+
+        if source_hash_ids and 'source' in details:
+            target_list.add(metadata={'source':details['source']}, hashes=list(source_hash_ids))
+
+        print("Done loading the challenge file.")
+        return True
+
     except Exception as msg:
         print(f"Error loading the challenge file: {msg}")
         return False
-    
-def _load_plain_hash(details, hash_list, target_list):
+
+
+def _add_batch(batch, details, hash_list, target_list, source_hash_ids, length_helpers, known_types):
     """
-    Loads a list of plain password hashes. All hashes are expected to be of the
-    same format. No usernames or other metadata is expected to be in this list
+    Adds a batch of records from a loader to the HashList/TargetList
 
     Inputs:
-        details: (DICT) Contains info needed to load the hash files
+        batch: (List) The (hash, type_hint, metadata) records. See register_loader()
+
+        details: (DICT) Contains info needed to load the challenge file
 
         hash_list: (HashList) Place to store the hashes being loaded
 
         target_list: (TargetList) Place to store the targets being loaded
 
-    Returns:
-        True: The hash file was loaded sucessfully
+        source_hash_ids: (Dict) Key = hash_id of hashes without metadata. A Dict vs. a Set
+        to keep the order they were loaded in
+
+        length_helpers: (Dict) Cache of the length helper for each type_hint
 
-        False: An error occured loading the hashes
+        known_types: (Set) Hash types that have already been added to hash_list
     """
-    print(f"Starting to load challenge file: {details['file']}. This may take a minute or two")
+    for hash, type_hint, metadata in batch:
+        if isinstance(type_hint, dict):
+            length_helper = type_hint
+        elif type_hint not in length_helpers:
+            length_helper = {}
+            hash_length = get_len_for_type(type_hint) if type_hint else None
+            if hash_length:
+                length_helper[hash_length] = type_hint
+            length_helpers[type_hint] = length_helper
+        else:
+            length_helper = length_helpers[type_hint]
+
+        # Perform a sanity check to make sure the hash looks legit
+        hash_info = hash_fingerprint(hash, length_helper)
+        if not hash_info:
+            print(f"Error, likely passed invalid length helper to the hash_fingerprint function: {length_helper}")
+            raise Exception
+
+        if not hash_info['type']:
+            print(f"Warning: Unsupported Hash: {hash}")
+        if isinstance(type_hint, str) and (hash_info['type'] != type_hint):
+            print(f"Warning: the hash type from autodetection identifies the hash as {hash_info['type']} when the config specified {type_hint}")
+
+        # Add the type
+        # If the type has been added before this will not make any changes
+        if hash_info['type'] not in known_types:
+            hash_list.add_type(
+                type=hash_info['type'],
+                jtr_mode=hash_info['jtr_mode'],
+                hc_mode=hash_info['hc_mode'],
+                cost=hash_info['cost']
+            )
+            known_types.add(hash_info['type'])
 
-    hash_type = None
-    length_helper = {}
+        # Perform further normalization for certain file encryption hashes
+        if hash_info['type'] == "pkzip":
+            split_line = hash.split('$pkzip')[1]
+            hash = f"$pkzip{split_line.split('pkzip$')[0]}pkzip$"
 
-    # Used to create a target that has all of these hashes
-    target_hash_id_list = []
+        # Save the hash
+        hash_list.add(hash, type=hash_info['type'])
+        hash_index = hash_list.hash_lookup[hash]
 
-    # Check to see if the hash type is defined, and if it needs a length helper for it
-    # Aka a lot of 128 bit hashes look the same
-    if 'type' in details:
-        hash_type = details['type']
-        hash_length = get_len_for_type(hash_type)
-        if hash_length:
-            length_helper[hash_length] = hash_type
+        # Create a target/metadata for this hash
+        if metadata is None:
+            source_hash_ids[hash_index] = None
+        else:
+            target_list.add(metadata=metadata, hashes=[hash_index])
+
+
+@register_loader("plain_hash")
+def _load_plain_hash(details):
+    """
+    Loads a list of plain password hashes. All hashes are expected to be of the
+    same format. No usernames or other metadata is expected to be in this list
+
+    Inputs:
+        details: (DICT) Contains info needed to load the hash files. If 'type' is
+        specified, it is used to deconflict hashes of the same length
+
+    Yields:
+        record: (Tuple) (hash, type_hint, metadata). See register_loader()
+    """
+    hash_type = details.get('type')
 
     with open(details['file']) as challenge_file:
-        lines = challenge_file.readlines()
-        for line in lines:
+        for line in challenge_file:
             
             # Remove trailing whitespace and newlines
             line = line.strip()
@@ -95,147 +244,59 @@ def _load_plain_hash(details, hash_list, target_list):
             if len(line) == 0:
                 continue
 
-            # Perform a sanity check to make sure the hash looks legit
-            hash_info = hash_fingerprint(line, length_helper)
-
-            if not hash_info['type']:
-                print(f"Warning: Unsupported Hash: {line}")
-            if hash_type and (hash_info['type'] != hash_type):
-                print(f"Warning: the hash type from autodetection identifies the hash as {hash_info['type']} when the config specified {details['type']}")
-
-            # Add the type
-            # If the type has been added before this will not make any changes
-            hash_list.add_type(
-                type=hash_info['type'],
-                jtr_mode=hash_info['jtr_mode'],
-                hc_mode=hash_info['hc_mode'],
-                cost=hash_info['cost']
-            )
-
-            # Perform further normalization for certain file encryption hashes
-            if hash_info['type'] == "pkzip":
-                split_line = line.split('$pkzip')[1]
-                line = f"$pkzip{split_line.split('pkzip$')[0]}pkzip$"
-
-            # Save the hash
-            hash_list.add(line, type=hash_info['type'])
+            yield line, hash_type, None
 
-            # Create a target/metadata for this list
-            hash_index = hash_list.hash_lookup[line]
-            if hash_index not in target_hash_id_list:
-                target_hash_id_list.append(hash_index)
 
-    if 'source' in details:
-        target_list.add(metadata={'source':details['source']}, hashes=target_hash_id_list)
-
-    print("Done loading the challenge file.")
-    return True
-
-
-def _load_cmiyc_2023(details, hash_list, target_list):
+@register_loader("cmiyc_2023")
+def _load_cmiyc_2023(details):
     """
     Loads the challenge file from the cmiyc 2023 contest
 
+    The file is YAML so it is parsed all at once. The records are still added in batches
+
     Inputs:
         details: (DICT) Contains info needed to load the challenge file
 
-        hash_list: (HashList) Place to store the hashes being loaded
-
-        target_list: (TargetList) Place to store the targets being loaded
-
-    Returns:
-        True: The hash file was loaded sucessfully
-
-        False: An error occured loading the hashes
+    Yields:
+        record: (Tuple) (hash, type_hint, metadata). See register_loader()
     """
-    print("Starting to load challenge yaml file. This may take a minute or two")
     with open(details['file']) as challenge_file:
         raw_values = yaml.safe_load(challenge_file)
 
-    # This challenge had raw-MD5, raw-sha1, and raw-sha256
-    length_helper = {
-        32:"raw-md5",
-        34:"striphash33",
-        34:"striphash34",
-        35:"striphash35",
-        36:"striphash36",
-        37:"striphash37",
-        38:"striphash38",
-        39:"striphash39",
-        40:"raw-sha1",
-        64:"raw-sha256",
-    }
-
     for user_list in raw_values['users']:
         for username, user_info in user_list.items():
-            hash_info = hash_fingerprint(user_info['PasswordHash'], length_helper)
-            if not hash_info:
-                print(f"Error, likely passed invalid length helper to the hash_fingerprint function: {length_helper}")
-                raise Exception
-
-            # Add the type
-            # If the type has been added before this will not make any changes
-            hash_list.add_type(
-                type=hash_info['type'],
-                jtr_mode=hash_info['jtr_mode'],
-                hc_mode=hash_info['hc_mode'],
-                cost=hash_info['cost']
-            )
-
-            # Save the hash
-            hash_list.add(user_info['PasswordHash'], type=hash_info['type'])
-            
-            # Get the hash index to add that to the target info
-            hash_index = hash_list.hash_lookup[user_info['PasswordHash']]
-            
-            # Add the target
+            # Remove the password hash from target metadata
             metadata = {}
             for key, value in user_info.items():
-                # Remove the password hash from target metadata
                 if key != 'PasswordHash':
                     metadata[key] = value
 
-            target_list.add(metadata=metadata, hashes=[hash_index])
-    print("Done loading the challenge yaml file.")
-    return True
+            yield user_info['PasswordHash'], CMIYC_2023_LENGTH_HELPER, metadata
 
 
-def _load_mixed_list_with_usernames(details, hash_list, target_list):
+@register_loader("mixed_list_with_usernames")
+def _load_mixed_list_with_usernames(details):
     """
     Loads from a list that has multiple hash types stored in it, one per line
     These hashes also have a username in front of them
 
     Inputs:
-        details: (DICT) Contains info needed to load the challenge file
-
-        hash_list: (HashList) Place to store the hashes being loaded
-
-        target_list: (TargetList) Place to store the targets being loaded
-
-    Returns:
-        True: The hash file was loaded sucessfully
+        details: (DICT) Contains info needed to load the challenge file. If 'hash_types' is
+        specified, they are used to deconflict hashes of the same length
 
-        False: An error occured loading the hashes
+    Yields:
+        record: (Tuple) (hash, type_hint, metadata). See register_loader()
     """
-    print(f"Starting to load challenge file: {details['file']}. This may take a minute or two")
-
-    hash_type = None
-    length_helper = {}
-
-    # Used to create a target that has all of these hashes
-    target_hash_id_list = []
-
-    # Check to see if the hash type is defined, and if it needs a length helper for it
+    # Check to see if the hash types are defined, and if they need a length helper
     # Aka a lot of 128 bit hashes look the same
-    if 'hash_types' in details:
-        for hash_type in details['hash_types']:
-            hash_length = get_len_for_type(hash_type)
-            if hash_length:
-                length_helper[hash_length] = hash_type
+    length_helper = {}
+    for hash_type in details.get('hash_types', []):
+        hash_length = get_len_for_type(hash_type)
+        if hash_length:
+            length_helper[hash_length] = hash_type
 
     with open(details['file']) as challenge_file:
-        lines = challenge_file.readlines()
-        for line in lines:
+        for line in challenge_file:
             
             # Remove trailing whitespace and newlines
             line = line.strip()
@@ -254,34 +315,8 @@ def _load_mixed_list_with_usernames(details, hash_list, target_list):
                 username = split_list[0]
                 hash = split_list[1]
 
-            # Perform a sanity check to make sure the hash looks legit
-            hash_info = hash_fingerprint(hash, length_helper)
-
-            if not hash_info['type']:
-                print(f"Warning: Unsupported Hash: {hash}")
-            if hash_type and ('hash_types' in details) and (hash_type not in details['hash_types']):
-                print(f"Warning: the hash type from autodetection identifies the hash as {hash_info['type']} when the config specified {details['type']}")
-
-            # Add the type
-            # If the type has been added before this will not make any changes
-            hash_list.add_type(
-                type=hash_info['type'],
-                jtr_mode=hash_info['jtr_mode'],
-                hc_mode=hash_info['hc_mode'],
-                cost=hash_info['cost']
-            )
-
-            # Save the hash
-            hash_list.add(hash, type=hash_info['type'])
-
-            # Create a target/metadata for this list
-            hash_index = hash_list.hash_lookup[hash]
             metadata = {'username':username}
             if 'source' in details:
                 metadata['source'] = details['source']
-            target_list.add(metadata=metadata, hashes=[hash_index])
-
-    print("Done loading the challenge file.")
-    return True
-
 
+            yield hash, length_helper, metadata
@@ -0,0 +1,274 @@
+"""
+Runs password cracking jobs (JtR and Hashcat) in the background
+
+Up until now this framework only printed out command lines to paste into a shell.
+This lets the notebook launch the password crackers directly using asyncio so that
+multiple jobs can be run at the same time, and new cracks show up in the HashList as
+soon as they are written to the pot files vs. waiting until the jobs finish.
+
+CrackerJob holds the command and results for a single run
+
+CrackerRunner manages the queue of jobs, watches the pot files, and registers a Session
+for each job when it finishes
+
+Dev Note: Jupyter already has an event loop running, so in a notebook you'll want to call
+"await runner.run_async(jobs)" vs. "runner.run(jobs)"
+"""
+
+
+import asyncio
+import os
+import shlex
+import time
+from collections import deque
+
+
+class CrackerJob:
+    """
+    Information about a single password cracking job
+    """
+
+    def __init__(self, pw_cracker_mgr, command, session_info={}, pot_file=None):
+        """
+        Inputs:
+            pw_cracker_mgr: (PWCrackerMgr) The password cracker manager used to create
+            the command. Used to parse the pot file and register the Session
+
+            command: (List) The command split into arguments
+
+            session_info: (Dict) The information to record in the Session when this job finishes.
+            Same format as SessionList.add(). total_time and command_line are added automatically
+
+            pot_file: (String) The pot file to watch for new cracks. If None, the main pot
+            file of pw_cracker_mgr is used
+        """
+        self.pw_cracker_mgr = pw_cracker_mgr
+        self.command = command
+        self.session_info = session_info
+        self.pot_file = pot_file
+        if not self.pot_file:
+            self.pot_file = pw_cracker_mgr.main_pot_file
+
+        # Filled out when the job is run
+        self.returncode = None
+        self.total_time = None
+        self.session_id = None
+
+        # The last lines printed by the password cracker. Limiting how many are kept since
+        # the crackers can be very chatty
+        self.output = deque(maxlen=100)
+
+    def __repr__(self):
+        """
+        Making this easier to read
+        """
+        return f"CrackerJob({shlex.join(self.command)}, returncode={self.returncode})"
+
+
+class CrackerRunner:
+    """
+    Runs CrackerJobs with a limit on how many can run at the same time
+    """
+
+    def __init__(self, hash_list, session_list, max_concurrent=1, poll_interval=1.0, verbose=False):
+        """
+        Inputs:
+            hash_list: (HashList) Updated with new cracks as they are written to the pot files
+
+            session_list: (SessionList) A Session is added for every job when it finishes
+
+            max_concurrent: (Int) The maximum number of jobs to run at the same time
+
+            poll_interval: (Float) How often (in seconds) to check the pot files for new cracks
+
+            verbose: (Bool) If True, print the output of the password crackers as it happens
+        """
+        self.hash_list = hash_list
+        self.session_list = session_list
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+
+        # Key = pot file, value = byte offset of the data that has already been read
+        self.pot_offsets = {}
+
+        # Key = pot file, value = PWCrackerMgr used to normalize the hashes in it
+        self.pot_mgrs = {}
+
+        # Number of new cracks found while running jobs
+        self.new_cracks = 0
+
+    def run(self, jobs):
+        """
+        Runs all of the jobs and waits for them to finish
+
+        Inputs:
+            jobs: (List) The CrackerJobs to run
+
+        Returns:
+            jobs: (List) The CrackerJobs with their results filled out
+
+            None: If called from inside a running event loop (aka a Jupyter notebook)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_async(jobs))
+
+        print("Error: An event loop is already running (you are probably in a notebook).")
+        print("Use 'await run_async(jobs)' instead")
+        return None
+
+    async def run_async(self, jobs):
+        """
+        Runs all of the jobs and waits for them to finish
+
+        Inputs:
+            jobs: (List) The CrackerJobs to run
+
+        Returns:
+            jobs: (List) The CrackerJobs with their results filled out
+        """
+        # Only look at cracks written after the jobs started. Earlier cracks should have
+        # been loaded with load_potfile()
+        for job in jobs:
+            if job.pot_file and job.pot_file not in self.pot_offsets:
+                self.pot_offsets[job.pot_file] = self._get_file_size(job.pot_file)
+                self.pot_mgrs[job.pot_file] = job.pw_cracker_mgr
+
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        done = asyncio.Event()
+        watcher = asyncio.create_task(self._watch_pot_files(done))
+
+        workers = []
+        for _ in range(max(1, min(self.max_concurrent, len(jobs)))):
+            workers.append(asyncio.create_task(self._worker(queue)))
+
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            done.set()
+            await watcher
+
+        return jobs
+
+    async def _worker(self, queue):
+        """
+        Pulls jobs off of the queue and runs them until the queue is empty
+
+        Inputs:
+            queue: (asyncio.Queue) The jobs waiting to be run
+        """
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._run_job(job)
+
+    async def _run_job(self, job):
+        """
+        Runs a single job, then registers a Session for it
+
+        Inputs:
+            job: (CrackerJob) The job to run
+        """
+        start_time = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *job.command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+        except OSError as msg:
+            print(f"Error starting {job.command[0]}: {msg}")
+            job.returncode = -1
+            return
+
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            line = line.decode(errors="replace").rstrip("\r\n")
+            job.output.append(line)
+            if self.verbose:
+                print(line)
+
+        job.returncode = await process.wait()
+        job.total_time = int(time.monotonic() - start_time)
+
+        # Grab any cracks from the end of the job before the Session is recorded
+        self._read_new_pot_lines()
+
+        session_info = {
+            'mode':job.session_info.get('mode'),
+            'options':dict(job.session_info.get('options', {})),
+        }
+        if 'hash_type' in job.session_info:
+            session_info['hash_type'] = job.session_info['hash_type']
+        session_info['options']['command_line'] = shlex.join(job.command)
+        session_info['options']['total_time'] = job.total_time
+
+        job.session_id = self.session_list.add(job.pw_cracker_mgr, session_info, compleated=(job.returncode == 0), check_duplicates=False)
+
+    async def _watch_pot_files(self, done):
+        """
+        Checks the pot files for new cracks until all the jobs have finished
+
+        Inputs:
+            done: (asyncio.Event) Set when all of the jobs have finished
+        """
+        while not done.is_set():
+            self._read_new_pot_lines()
+            try:
+                await asyncio.wait_for(done.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        self._read_new_pot_lines()
+
+    def _read_new_pot_lines(self):
+        """
+        Reads any complete lines added to the pot files since the last check and
+        updates the HashList with them
+        """
+        for pot_file, offset in self.pot_offsets.items():
+            try:
+                with open(pot_file, mode='rb') as potfile:
+                    potfile.seek(offset)
+                    data = potfile.read()
+            except FileNotFoundError:
+                continue
+
+            # Only process complete lines. The cracker may be in the middle of writing one
+            end = data.rfind(b"\n")
+            if end == -1:
+                continue
+            self.pot_offsets[pot_file] = offset + end + 1
+
+            pw_cracker_mgr = self.pot_mgrs[pot_file]
+            for line in data[:end].decode(errors="replace").split("\n"):
+                hash, divider, plain = line.partition(":")
+                if not divider:
+                    continue
+                hash = pw_cracker_mgr.normalize_hash(hash)
+                if not hash:
+                    continue
+                self.new_cracks += self.hash_list.update(hash, plaintext=plain.rstrip("\r"))
+
+    def _get_file_size(self, filename):
+        """
+        Returns the size of a file, or 0 if it doesn't exist yet
+
+        Inputs:
+            filename: (String) The file to check
+
+        Returns:
+            size: (Int) The size of the file in bytes
+        """
+        try:
+            return os.path.getsize(filename)
+        except OSError:
+            return 0
@@ -18,6 +18,13 @@ past mistakes
 """
 
 
+from array import array
+import time
+
+# Local imports
+from .hash_fingerprint import get_salt
+
+
 class Hash:
     """
     Keeps track of hashes and plaintexts
@@ -84,6 +91,9 @@ class HashList:
     Keeps track of all the hashes
     """
 
+    # Size in seconds of the buckets used to track crack rates
+    crack_rate_bucket_size = 3600
+
     def __init__(self):
         """
         Pretty boring, just initializes all the datastructures
@@ -115,11 +125,32 @@ class HashList:
         # Information about the hash types
         self.type_info = {}
 
+        # Key = index, value = salt (None for unsalted hashes)
+        # See hash_fingerprint.get_salt() for the supported types
+        self.salt_lookup = {}
+
+        # Key = type, value = {salt: [list of hash indexes]}
+        # Only holds hashes that have a salt
+        self.salt_list = {}
+
+        # Key = plaintext, value = [list of hash indexes]
+        # Used to match up cracks in logs that only record the plaintext (Hashcat debug files)
+        self.plaintext_lookup = {}
+
+        # When each hash was cracked in seconds since the epoch. The position in the array is
+        # the hash index. 0 = not cracked, or it isn't known when. Keeping this out of Hash since there can be millions
+        # of hashes and an unsigned int is a lot smaller than a Python float
+        self.crack_times = array('I')
+
+        # Key = type, value = {start of bucket: number of cracks}
+        # Crack counts per crack_rate_bucket_size seconds, used to track how fast each type is being cracked
+        self.crack_rate_lookup = {}
+
         # value to assign unknown hash types
         self.unknown_type = "unknown"
         self.add_type(self.unknown_type, jtr_mode=None, hc_mode=None, cost=None)
 
-    def add(self, hash, type=None, plaintext=None):
+    def add(self, hash, type=None, plaintext=None, crack_time=None):
         """
         Adds a hash to the list.
 
@@ -133,14 +164,18 @@ class HashList:
 
             plaintext: (STR) The cracked password
 
+            crack_time: (Float) When the hash was cracked in seconds since the epoch. If None
+            the current time is used. 0 if it isn't known, in which case the crack isn't
+            counted towards the crack rate
+
         Returns:
             new_crack: (INT) 0 if the plaintext isn't new.
             1 if the plaintext is new
         """
         # Basically just a frontend to the private _add_update function
-        return self._add_update(hash, type=type, plaintext=plaintext, update_only=False)
+        return self._add_update(hash, type=type, plaintext=plaintext, update_only=False, crack_time=crack_time)
 
-    def update(self, hash, type=None, plaintext=None):
+    def update(self, hash, type=None, plaintext=None, crack_time=None):
         """
         Updates a hash. Will not add it if it is new.
 
@@ -151,14 +186,18 @@ class HashList:
 
             plaintext: (STR) The cracked password
 
+            crack_time: (Float) When the hash was cracked in seconds since the epoch. If None
+            the current time is used. 0 if it isn't known, in which case the crack isn't
+            counted towards the crack rate
+
         Returns:
             new_crack: (INT) 0 if the plaintext isn't new.
             1 if the plaintext is new
         """
         # Basically just a frontend to the private _add_update function
-        return self._add_update(hash, type=type, plaintext=plaintext, update_only=True)
+        return self._add_update(hash, type=type, plaintext=plaintext, update_only=True, crack_time=crack_time)
 
-    def _add_update(self, hash, type=None, plaintext=None, update_only=False):
+    def _add_update(self, hash, type=None, plaintext=None, update_only=False, crack_time=None):
         """
         Adds a hash to the list if update_only is False. Otherwise will only update an
         existing hash. Making this a private function since it's basically the same
@@ -176,6 +215,10 @@ class HashList:
 
             update_only: (BOOL) If true will not add a new hash to HashList
 
+            crack_time: (Float) When the hash was cracked in seconds since the epoch. If None
+            the current time is used. 0 if it isn't known, in which case the crack isn't
+            counted towards the crack rate
+
         Returns:
             new_crack: (INT) 0 if the plaintext isn't new.
             1 if the plaintext is new
@@ -201,12 +244,17 @@ class HashList:
                 self.type_list[type].append(index)
                 self.type_lookup[index] = type
 
+                # The salt depends on the hash type, so re-parse it
+                self._remove_salt(index, prev_type)
+                self._add_salt(index, type)
+
                 # Update counts for the types
                 self.type_info[prev_type]['total'] -= 1
                 self.type_info[type]['total'] += 1
                 if self.hashes[index].plaintext:
                     self.type_info[prev_type]['cracked'] -= 1
                     self.type_info[type]['cracked'] += 1
+                    self._move_crack_time(index, prev_type, type)
             else:
                 type = self.type_lookup[index]
 
@@ -214,6 +262,8 @@ class HashList:
             # now cracked a password
             if not self.hashes[index].plaintext and plaintext:
                 self.hashes[index].plaintext = plaintext
+                self._add_plaintext(index, plaintext)
+                self._set_crack_time(index, type, crack_time)
                 
                 # Update the count info
                 self.type_info[type]['cracked'] += 1
@@ -224,6 +274,8 @@ class HashList:
             self.hashes[self.next_index] = Hash(hash, plaintext)
             self.type_lookup[self.next_index] = type
             self.type_list[type].append(self.next_index)
+            self._add_salt(self.next_index, type)
+            self.crack_times.append(0)
 
             # Update the submission info
             self.sub_lookup[self.next_index] = 0
@@ -234,10 +286,223 @@ class HashList:
             self.type_info[type]['total'] += 1
             if plaintext:
                 self.type_info[type]['cracked'] += 1
+                self._add_plaintext(self.next_index - 1, plaintext)
+                self._set_crack_time(self.next_index - 1, type, crack_time)
                 new_crack = 1
                 
         return new_crack
 
+    def _add_plaintext(self, index, plaintext):
+        """
+        Adds a cracked hash to the plaintext lookup
+
+        Inputs:
+            index: (Int) The index of the hash
+
+            plaintext: (STR) The cracked password
+        """
+        if plaintext not in self.plaintext_lookup:
+            self.plaintext_lookup[plaintext] = []
+        self.plaintext_lookup[plaintext].append(index)
+
+    def _set_crack_time(self, index, type, crack_time=None):
+        """
+        Records when a hash was cracked
+
+        Inputs:
+            index: (Int) The index of the hash
+
+            type: (STR) The hash type
+
+            crack_time: (Float) Seconds since the epoch. If None the current time is used.
+            0 if it isn't known
+        """
+        if crack_time is None:
+            crack_time = time.time()
+        # Unknown crack times are left as 0 and don't count towards the crack rate
+        if not crack_time:
+            return
+        crack_time = max(1, int(crack_time))
+        self.crack_times[index] = crack_time
+
+        bucket = crack_time - crack_time % self.crack_rate_bucket_size
+        if type not in self.crack_rate_lookup:
+            self.crack_rate_lookup[type] = {}
+        self.crack_rate_lookup[type][bucket] = self.crack_rate_lookup[type].get(bucket, 0) + 1
+
+    def _move_crack_time(self, index, prev_type, type):
+        """
+        Moves a crack to a different type in the crack rate buckets. Used when the type
+        of a cracked hash is changed
+
+        Inputs:
+            index: (Int) The index of the hash
+
+            prev_type: (STR) The type the hash used to be
+
+            type: (STR) The new type of the hash
+        """
+        crack_time = self.crack_times[index]
+        if not crack_time:
+            return
+        bucket = crack_time - crack_time % self.crack_rate_bucket_size
+        self.crack_rate_lookup[prev_type][bucket] -= 1
+        if not self.crack_rate_lookup[prev_type][bucket]:
+            del self.crack_rate_lookup[prev_type][bucket]
+
+        if type not in self.crack_rate_lookup:
+            self.crack_rate_lookup[type] = {}
+        self.crack_rate_lookup[type][bucket] = self.crack_rate_lookup[type].get(bucket, 0) + 1
+
+    def get_crack_time(self, index):
+        """
+        Returns when a hash was cracked
+
+        Inputs:
+            index: (Int) The index of the hash
+
+        Returns:
+            crack_time: (Int) Seconds since the epoch. None if the hash hasn't been cracked
+        """
+        if index not in self.hashes or not self.crack_times[index]:
+            return None
+        return self.crack_times[index]
+
+    def get_crack_history(self, type):
+        """
+        Returns the number of cracks over time for a hash type
+
+        Inputs:
+            type: (STR) The hash type
+
+        Returns:
+            history: (List) Sorted list of (start of bucket, number of cracks) tuples. Each bucket
+            is crack_rate_bucket_size seconds long. Buckets without cracks are left out
+        """
+        return sorted(self.crack_rate_lookup.get(type, {}).items())
+
+    def get_crack_rate(self, type, window=6*3600, now=None):
+        """
+        Returns the average number of cracks per hour for a hash type over a recent window
+
+        Cracks are counted by bucket, so a bucket that is partially inside the window counts
+        towards the rate.
+
+        Inputs:
+            type: (STR) The hash type
+
+            window: (Int) How many seconds back to look. At least crack_rate_bucket_size
+
+            now: (Float) The end of the window in seconds since the epoch. If None the
+            current time is used
+
+        Returns:
+            crack_rate: (Float) Cracks per hour
+        """
+        if now is None:
+            now = time.time()
+        window = max(window, self.crack_rate_bucket_size)
+        start = now - window
+
+        num_cracks = 0
+        for bucket, count in self.crack_rate_lookup.get(type, {}).items():
+            if bucket + self.crack_rate_bucket_size > start and bucket <= now:
+                num_cracks += count
+        return num_cracks / window * 3600
+
+    def get_hash_ids_by_plaintext(self, plaintext):
+        """
+        Returns all the hashes that have been cracked with this plaintext
+
+        Inputs:
+            plaintext: (STR) The cracked password
+
+        Returns:
+            hash_ids: (List) The indexes of the hashes. Empty if none were found
+        """
+        return self.plaintext_lookup.get(plaintext, [])
+
+    def _add_salt(self, index, type):
+        """
+        Parses the salt for a hash and adds it to the salt datastructures
+
+        Inputs:
+            index: (Int) The index of the hash
+
+            type: (STR) The hash type to parse the salt as
+        """
+        salt = get_salt(self.hashes[index].hash, type)
+        self.salt_lookup[index] = salt
+        if salt is None:
+            return
+        if salt not in self.salt_list[type]:
+            self.salt_list[type][salt] = []
+        self.salt_list[type][salt].append(index)
+
+    def _remove_salt(self, index, type):
+        """
+        Removes a hash from the salt datastructures
+
+        Inputs:
+            index: (Int) The index of the hash
+
+            type: (STR) The hash type the salt was parsed as
+        """
+        salt = self.salt_lookup.pop(index, None)
+        if salt is None:
+            return
+        self.salt_list[type][salt].remove(index)
+        if not self.salt_list[type][salt]:
+            del self.salt_list[type][salt]
+
+    def get_salts_left(self, type):
+        """
+        Returns the number of uncracked hashes for each salt of a hash type
+
+        Inputs:
+            type: (STR) The hash type
+
+        Returns:
+            salts_left: (Dict) Key = salt, value = number of uncracked hashes that use
+            that salt. Salts where every hash has been cracked are not included. Empty if
+            the type is unsalted
+        """
+        salts_left = {}
+        for salt, indexes in self.salt_list.get(type, {}).items():
+            num_left = 0
+            for index in indexes:
+                if not self.hashes[index].plaintext:
+                    num_left += 1
+            if num_left:
+                salts_left[salt] = num_left
+        return salts_left
+
+    def get_num_salts_left(self, type):
+        """
+        Returns the number of unique salts that still have uncracked hashes
+
+        Unsalted types count as a single salt if they have any uncracked hashes since
+        all of them can be attacked at the same time
+
+        Inputs:
+            type: (STR) The hash type
+
+        Returns:
+            num_salts: (Int) The number of salts that still need to be attacked
+        """
+        if type not in self.type_info:
+            return 0
+
+        num_salts = len(self.get_salts_left(type))
+
+        # Unsalted hashes (or salts that couldn't be parsed) are attacked together
+        for index in self.type_list[type]:
+            if self.salt_lookup[index] is None and not self.hashes[index].plaintext:
+                num_salts += 1
+                break
+
+        return num_salts
+
     def add_type(self, type, jtr_mode, hc_mode, cost):
         """
         Adds a hash type/algorithm to the list.
@@ -249,9 +514,14 @@ class HashList:
                 'cost':cost,
                 'total':0,
                 'cracked':0,
-                'score':0
+                'score':0,
+                # Measured hashes per second summed across all the rigs
+                'speed':None,
+                # Key = rig name, value = hashes per second
+                'speed_by_rig':{},
             }
             self.type_list[type] = []
+            self.salt_list[type] = {}
 
         # Update info if not set
         else:
@@ -262,6 +532,96 @@ class HashList:
             if not self.type_info[type]['cost']:
                 self.type_info[type]['cost'] = cost
 
+    def set_speed(self, type, hashes_per_second, rig="default"):
+        """
+        Sets the measured cracking speed for a hash type on a particular rig
+
+        If the rig already has a speed listed for this type, the faster one is kept since
+        the same rig may have been benchmarked with both JtR and Hashcat. The total speed
+        for the type is the sum of the speeds of all the rigs.
+
+        Inputs:
+            type: (STR) The hash type
+
+            hashes_per_second: (Float) The measured hashes per second (per salt)
+
+            rig: (STR) The name of the cracking rig the benchmark was run on
+        """
+        if type not in self.type_info:
+            print(f"Warning, setting the speed of a hash type that hasn't been formally entered yet. Type: {type}")
+            self.add_type(type, jtr_mode=None, hc_mode=None, cost=None)
+
+        speed_by_rig = self.type_info[type]['speed_by_rig']
+        if rig not in speed_by_rig or speed_by_rig[rig] < hashes_per_second:
+            speed_by_rig[rig] = hashes_per_second
+
+        self.type_info[type]['speed'] = sum(speed_by_rig.values())
+
+    def get_cost(self, type):
+        """
+        Returns the estimated number of seconds it takes to try one candidate password
+        against one salt of this hash type
+
+        If a benchmark has been loaded for the type, the measured speed is used. Otherwise
+        falls back to a very rough guess based on the "low"/"medium"/"high" cost assigned
+        by hash_fingerprint
+
+        Inputs:
+            type: (STR) The hash type
+
+        Returns:
+            cost: (Float) Seconds per candidate password
+
+            None: If there is no information about the cost of this type
+        """
+        if type not in self.type_info:
+            return None
+
+        if self.type_info[type]['speed']:
+            return 1 / self.type_info[type]['speed']
+
+        # Ballpark numbers for a single GPU. Only meant to order types relative to each other
+        default_speeds = {
+            'low':1000000000,
+            'medium':10000000,
+            'high':10000,
+        }
+        if self.type_info[type]['cost'] in default_speeds:
+            return 1 / default_speeds[self.type_info[type]['cost']]
+
+        return None
+
+    def get_types_by_mode(self, mode, mode_field="jtr_mode"):
+        """
+        Returns all the hash types that map to a password cracker specific mode
+
+        Multiple hash types can share the same mode. For example all of the
+        striphash types are cracked as raw-SHA1. Comparison is case insensitive
+        since JtR isn't consistent with how it capitalizes format names in logs
+
+        Inputs:
+            mode: (String) The JtR format or Hashcat mode to look up
+
+            mode_field: (String) Either "jtr_mode" or "hc_mode"
+
+        Returns:
+            types: (List) The hash types that use this mode. Types that have hashes
+            loaded are listed first. Empty if no types match
+        """
+        if mode is None:
+            return []
+
+        mode = str(mode).lower()
+        types = []
+        for type, info in self.type_info.items():
+            if info[mode_field] and str(info[mode_field]).lower() == mode:
+                types.append(type)
+
+        # Put types that actually have hashes first since those are the ones
+        # callers almost always care about
+        types.sort(key=lambda x: self.type_info[x]['total'] == 0)
+        return types
+
     def init_scores(self, score_info):
         """
         Initializes score info for the hash types
@@ -6,6 +6,10 @@ might as well re-invent the wheel in python
 """
 
 
+import base64
+import binascii
+
+
 def hash_fingerprint(raw_hash, length_helper={}):
     """
     Used to identify a hash by type and return JtR and Hashcat modes
@@ -158,6 +162,121 @@ def hash_fingerprint(raw_hash, length_helper={}):
     return hash_info
 
 
+def get_salt(raw_hash, type):
+    """
+    Returns the salt for a hash
+
+    Cracking speed for salted hashes scales with the number of unique salts vs. the
+    number of hashes, so this is used to group hashes that share a salt together.
+
+    Inputs:
+        raw_hash: (String) The raw hash
+
+        type: (String) The hash type. E.g. "md5crypt"
+
+    Returns:
+        salt: (String) The salt. For hashes where the work factor is part of the hash
+        (e.g. bcrypt) that is included as well since it needs to match for hashes to be
+        cracked together
+
+        None: If the type is unsalted, or the salt couldn't be parsed
+    """
+    if type not in _salt_parsers:
+        return None
+
+    try:
+        return _salt_parsers[type](raw_hash)
+    except (IndexError, ValueError, binascii.Error):
+        return None
+
+
+def is_salted_type(type):
+    """
+    Returns True if salts can be extracted from hashes of this type with get_salt()
+
+    Inputs:
+        type: (String) The hash type. E.g. "md5crypt"
+
+    Returns:
+        True: If this is a salted type
+
+        False: If the type is unsalted, or its salts are not parsed
+    """
+    return type in _salt_parsers
+
+
+def _salt_crypt(raw_hash):
+    """
+    Salt for crypt style hashes: $id$[rounds=N$]salt$hash
+
+    The rounds are included with the salt since they need to be the same to crack
+    the hashes together
+    """
+    parts = raw_hash.split("$")
+    if len(parts) < 4:
+        return None
+    # Remove the leading "" and "id" and the trailing hash
+    return "$".join(parts[2:-1])
+
+
+def _salt_bcrypt(raw_hash):
+    """
+    Salt for bcrypt hashes: $2a$cost$[22 character salt][31 character hash]
+    """
+    parts = raw_hash.split("$")
+    if len(parts) != 4 or len(parts[3]) < 22:
+        return None
+    return f"{parts[2]}${parts[3][:22]}"
+
+
+def _salt_ldap(raw_hash, digest_len):
+    """
+    Salt for LDAP style hashes: {SCHEME}base64(digest + salt)
+
+    The salt is returned as hex since it is often binary
+    """
+    encoded = raw_hash.split("}", 1)[1]
+    decoded = base64.b64decode(encoded)
+    if len(decoded) <= digest_len:
+        return None
+    return decoded[digest_len:].hex()
+
+
+def _salt_mysqlna(raw_hash):
+    """
+    Salt for mysql native auth hashes: $mysqlna$salt*hash
+    """
+    salt = raw_hash[len("$mysqlna$"):].split("*")[0]
+    if not salt:
+        return None
+    return salt
+
+
+def _salt_mssql05(raw_hash):
+    """
+    Salt for mssql05 hashes: 0x0100[8 hex salt][40 hex hash]
+    """
+    if len(raw_hash) < 14:
+        return None
+    return raw_hash[6:14]
+
+
+# Key = hash type, value = function to extract the salt from a hash of that type
+_salt_parsers = {
+    'md5crypt':_salt_crypt,
+    'sha256crypt':_salt_crypt,
+    'sha512crypt':_salt_crypt,
+    'sha1crypt':_salt_crypt,
+    'bcrypt':_salt_bcrypt,
+    'bcr256':_salt_bcrypt,
+    'ssha':lambda raw_hash: _salt_ldap(raw_hash, 20),
+    'nsldaps':lambda raw_hash: _salt_ldap(raw_hash, 20),
+    'ssha512':lambda raw_hash: _salt_ldap(raw_hash, 64),
+    'mysqlna':_salt_mysqlna,
+    'mssql05':_salt_mssql05,
+}
+
+
 def get_len_for_type(type):
     """
     Returns the length of common hash types
@@ -7,7 +7,16 @@ and running simple loopback attacks.
 """
 
 
-from.pw_cracker_mgr import PWCrackerMgr
+import json
+import os
+import shlex
+import time
+
+# Using this to parse logfiles that may have been imported from a different system/os
+from pathlib import Path
+
+from .pw_cracker_mgr import PWCrackerMgr
+from .hash_fingerprint import hash_fingerprint
 
 
 class HashcatMgr(PWCrackerMgr):
@@ -22,9 +31,49 @@ class HashcatMgr(PWCrackerMgr):
         # Set cracker specific variables (default is JtR since I'm biased)
         self.pot_extension = ".potfile"
         self.hash_type = "hc_hash"
+        self.mode_field = "hc_mode"
         self.name = "Hashcat"
         self.seperator = ":"
 
+        # How much of a debug file to read at a time
+        self.read_size = 1024 * 1024
+
+        # How much of a file to look at when checking if it is a debug file
+        self.sample_size = 64 * 1024
+
+        # Key = full path to a debug file, value = (file_id, offset, strike_list) of
+        # the last time it was read. Used to only parse new lines the next time it is read
+        self.log_offsets = {}
+
+        # Same as log_offsets but for files with the output of "--status --status-json"
+        self.status_offsets = {}
+
+        # The "status" field in --status-json output. Index = status code
+        self.status_codes = [
+            "Initializing", "Autotuning", "Selftest", "Running", "Paused", "Exhausted",
+            "Cracked", "Aborted", "Quit", "Bypass", "Aborted (Checkpoint)", "Aborted (Runtime)",
+            "Running (Checkpoint)", "Error", "Aborted (Finish)", "Running (Autodetect)",
+        ]
+
+        # Statuses where Hashcat is still working on the attack
+        self.running_statuses = [
+            "Initializing", "Autotuning", "Selftest", "Running", "Paused",
+            "Running (Checkpoint)", "Running (Autodetect)",
+        ]
+
+        # Statuses where Hashcat finished the whole attack
+        self.compleated_statuses = ["Exhausted", "Cracked"]
+
+        # The "guess_mode" field in --status-json output mapped to the Session mode
+        # Hybrid attacks are counted as wordlist attacks to match the order in Session
+        self.guess_modes = {
+            1:"wordlist", 2:"wordlist", 3:"wordlist",
+            4:"stdin", 5:"stdin", 6:"stdin",
+            7:"wordlist", 8:"wordlist",
+            9:"mask", 10:"mask",
+            11:"wordlist", 12:"wordlist", 13:"wordlist", 14:"wordlist",
+        }
+
     def print_command(self):
         """
         Prints out the "default" options for running the password cracker
@@ -47,7 +96,7 @@ class HashcatMgr(PWCrackerMgr):
             command_parts.append(f" -o {self.main_pot_file}")
 
         if self.log_directory:
-            command_parts.append(f" --debug-file {self.log_directory}hc_session")
+            command_parts.append(f" --debug-file {self.log_directory}hc_session.log")
             command_parts.append(f" --debug-mode 5")
             command_parts.append(f" -p '{self.seperator}'")
 
@@ -57,11 +106,604 @@ class HashcatMgr(PWCrackerMgr):
 
         return command
 
+    def create_attack_command(self, hash_file, hash_mode=None, attack_mode=None, options=None, session_name=None):
+        """
+        Creates the command line to run a specific Hashcat attack using the same pot file
+        and debug file options as print_command()
+
+        Inputs:
+            hash_file: (STR) The file containing the hashes to attack (aka a left list)
+
+            hash_mode: (STR) The Hashcat hash mode. E.g. "0" for raw-md5
+
+            attack_mode: (STR) The attack mode as recorded in a Session. E.g. "wordlist", "mask"
+
+            options: (Dict) Session options describing the attack. E.g. 'wordlist', 'ruleset', 'mask'.
+            If None, no options are used
+
+            session_name: (STR) The name to use for the session/log files. Needed if running multiple
+            attacks at the same time. If None, the default "hc_session" is used. ".log" is added
+            to the end of it for the debug file so read_all_logs() will find it
+
+        Returns:
+            command: (List) The command split into arguments
+
+            None: If the attack can't be recreated from the command line
+        """
+        if not session_name:
+            session_name = "hc_session"
+        if options is None:
+            options = {}
+
+        if self.path:
+            command = [f"{self.path}/hashcat"]
+        else:
+            command = ["hashcat"]
+
+        if hash_mode:
+            command.extend(["-m", str(hash_mode)])
+
+        if attack_mode == "wordlist":
+            command.extend(["-a", "0"])
+        elif attack_mode == "mask":
+            command.extend(["-a", "3"])
+        else:
+            return None
+
+        if self.main_pot_file:
+            command.extend(["-o", self.main_pot_file])
+
+        if self.log_directory:
+            command.extend(["--debug-file", f"{self.log_directory}{session_name}.log"])
+            command.extend(["--debug-mode", "5"])
+            command.extend(["-p", self.seperator])
+
+        command.append(hash_file)
+
+        if attack_mode == "wordlist":
+            wordlist = options.get('wordlist_path', options.get('wordlist'))
+            if not wordlist:
+                return None
+            command.append(wordlist)
+            if options.get('ruleset'):
+                command.extend(["-r", options['ruleset']])
+        else:
+            if not options.get('mask'):
+                return None
+            command.append(options['mask'])
+
+        return command
+
+    def parse_attack_command(self, command):
+        """
+        Parses a Hashcat command line into the same session_info format that is created
+        from Hashcat status updates. The reverse of create_attack_command()
+
+        Inputs:
+            command: (STR or List) The command line. Either as a string or split into arguments
+
+        Returns:
+            session_info: (Dict) Same format as SessionList.add()
+
+            None: If the command line couldn't be parsed
+        """
+        if isinstance(command, str):
+            try:
+                command = shlex.split(command)
+            except ValueError:
+                print(f"Error: Could not parse the command line: {command}")
+                return None
+
+        # Options that take a value as the next argument. Everything else is a flag
+        value_options = {
+            '-m':'hash_type', '--hash-type':'hash_type',
+            '-a':'attack_mode', '--attack-mode':'attack_mode',
+            '-r':'rules', '--rules-file':'rules',
+            '-o':None, '--outfile':None, '-p':None, '--separator':None,
+            '--outfile-format':None, '--potfile-path':None, '--session':None,
+            '--debug-mode':None, '--debug-file':None, '-w':None, '--workload-profile':None,
+            '--status-timer':None, '--runtime':None, '-s':None, '--skip':None, '-l':None, '--limit':None,
+            '-1':None, '-2':None, '-3':None, '-4':None, '--custom-charset1':None, '--custom-charset2':None,
+            '--custom-charset3':None, '--custom-charset4':None, '--increment-min':None, '--increment-max':None,
+            '-j':None, '--rule-left':None, '-k':None, '--rule-right':None, '-d':None, '--backend-devices':None,
+            '-D':None, '--opencl-device-types':None, '-t':None, '--markov-threshold':None,
+            '--markov-hcstat2':None, '--restore-file-path':None, '--encoding-from':None, '--encoding-to':None,
+            '--segment-size':None, '--bitmap-min':None, '--bitmap-max':None, '--cpu-affinity':None,
+            '--hook-threads':None, '--scrypt-tmto':None, '-c':None,
+        }
+
+        hash_type = None
+        attack_mode = "0"
+        rules = []
+        positional = []
+        args = iter(command[1:])
+        for arg in args:
+            if not arg.startswith("-") or arg == "-":
+                positional.append(arg)
+                continue
+
+            name, divider, value = arg.partition("=")
+            if name not in value_options:
+                # Short options can have the value attached. Aka -a3
+                if arg[:2] not in value_options or arg.startswith("--"):
+                    continue
+                name, divider, value = arg[:2], True, arg[2:]
+            if not divider:
+                value = next(args, None)
+
+            field = value_options[name]
+            if field == 'hash_type':
+                hash_type = value
+            elif field == 'attack_mode':
+                attack_mode = value
+            elif field == 'rules' and value:
+                rules.append(Path(value).name)
+
+        # Combinator, hybrid, and association attacks are counted as wordlist attacks. Same as guess_modes
+        attack_modes = {"0":"wordlist", "1":"wordlist", "3":"mask", "6":"wordlist", "7":"wordlist", "9":"wordlist"}
+        if attack_mode not in attack_modes:
+            print(f"Error: Unsupported Hashcat attack mode: {attack_mode}")
+            return None
+
+        session_info = {'mode':attack_modes[attack_mode], 'options':{}}
+        if hash_type:
+            session_info['hash_type'] = hash_type
+
+        # The first positional argument is the hash file
+        inputs = positional[1:]
+        if attack_mode == "3":
+            if inputs:
+                session_info['options']['mask'] = inputs[0]
+        elif attack_mode == "7":
+            if len(inputs) >= 2:
+                session_info['options']['mask'] = inputs[0]
+                session_info['options']['wordlist'] = Path(inputs[1]).name
+                session_info['options']['wordlist_path'] = inputs[1]
+        elif inputs:
+            session_info['options']['wordlist'] = Path(inputs[0]).name
+            session_info['options']['wordlist_path'] = inputs[0]
+            if attack_mode == "6" and len(inputs) >= 2:
+                session_info['options']['mask'] = inputs[1]
+
+        if rules:
+            session_info['options']['ruleset'] = ",".join(rules)
+
+        return session_info
+
+    def read_benchmark_file(self, filename):
+        """
+        Parses the saved output of "hashcat -b"
+
+        Supports both the current and older formats for the hash mode header:
+            * Hash-Mode 0 (MD5)
+            Hashmode: 0 - MD5
+
+        Followed by the speed for each device and optionally the combined speed:
+            Speed.#1.........: 59840.6 MH/s (72.40ms) @ Accel:512 Loops:1024 Thr:32 Vec:1
+            Speed.#*.........:   119.7 GH/s
+
+        If there is a combined "Speed.#*" line it is used. Otherwise the speeds of the
+        individual devices are added together.
+
+        Inputs:
+            filename: (str) The full path and filename of the benchmark output
+
+        Returns:
+            speeds: (Dict) Key is the Hashcat mode, value is the measured hashes per second
+        """
+        speeds = {}
+        cur_mode = None
+        device_speeds = {}
+
+        try:
+            with open(filename) as benchfile:
+                for line in benchfile:
+                    line = line.strip()
+
+                    # New hash mode
+                    if line.startswith("* Hash-Mode ") or line.startswith("Hashmode: "):
+                        if cur_mode is not None and device_speeds:
+                            speeds[cur_mode] = self._combine_device_speeds(device_speeds)
+                        line = line.replace("* Hash-Mode ", "").replace("Hashmode: ", "")
+                        cur_mode = line.split()[0]
+                        device_speeds = {}
+                        continue
+
+                    if cur_mode is None or not line.startswith("Speed.#"):
+                        continue
+
+                    label, divider, rest = line.partition(":")
+                    device = label[len("Speed.#"):].rstrip(".")
+                    rest = rest.split()
+                    if len(rest) < 2:
+                        continue
+
+                    try:
+                        device_speeds[device] = self._parse_speed(rest[0], rest[1])
+                    except ValueError:
+                        print(f"Warning: Could not parse the speed in benchmark file {filename}: {line}")
+
+                if cur_mode is not None and device_speeds:
+                    speeds[cur_mode] = self._combine_device_speeds(device_speeds)
+
+        except FileNotFoundError:
+            print(f"Error: Could not find the file:{filename}")
+
+        return speeds
+
+    def _combine_device_speeds(self, device_speeds):
+        """
+        Returns the total speed across all the devices in a Hashcat benchmark
+
+        Inputs:
+            device_speeds: (Dict) Key is the device number, or "*" for the combined speed
+
+        Returns:
+            speed: (Float) The total hashes per second
+        """
+        if "*" in device_speeds:
+            return device_speeds["*"]
+        return sum(device_speeds.values())
+
+    def load_outfile(self, filename, hash_list, update_only=True):
+        """
+        Loads cracks from a Hashcat outfile that includes when each hash was cracked
+
+        Expects the outfile to be created with "--outfile-format=1,2,5" which writes
+        the absolute timestamp first. For example:
+            1700000000:5f4dcc3b5aa765d61d8327deb882cf99:password
+
+        Lines without a timestamp are loaded as well, but their crack time will be the
+        time they were loaded. Aka the same as load_potfile()
+
+        Inputs:
+            filename: (String) The outfile to load
+
+            hash_list: (HashList) The list of hashes to update
+
+            update_only: (Bool) If true, will skip loading new hashes if they
+            are not already in hash_list
+
+        Returns:
+            new_cracks: (Int) The number of newly cracked passwords
+
+            -1: If a problem occured
+        """
+        new_cracks = 0
+        try:
+            with open(filename) as outfile:
+                for line in outfile:
+                    line = line.rstrip('\r\n')
+                    crack_time = None
+                    timestamp, divider, remainder = line.partition(self.seperator)
+                    if timestamp.isdigit() and divider:
+                        crack_time = int(timestamp)
+                        line = remainder
+
+                    hash, divider, plain = line.partition(self.seperator)
+                    if not divider:
+                        continue
+                    hash = self.normalize_hash(hash)
+
+                    if update_only:
+                        new_cracks += hash_list.update(hash, plaintext=plain, crack_time=crack_time)
+                    else:
+                        hash_info = hash_fingerprint(hash)
+                        new_cracks += hash_list.add(hash, plaintext=plain, type=hash_info['type'], crack_time=crack_time)
+
+        except FileNotFoundError:
+            print(f"Error: Could not find the file:{filename}")
+            return -1
+        except Exception as msg:
+            print(f"Exception when trying to parse the outfile: {msg}")
+            return -1
+
+        return new_cracks
+
+    def read_status_file(self, filename, resume=True):
+        """
+        Reads a file containing the output of "hashcat --status --status-json"
+
+        Each status update is a JSON object on its own line. For example:
+            {"session": "hc_session", "guess": {...}, "status": 3, "progress": [1200, 5000],
+            "recovered_hashes": [2, 10], "rejected": 0, "devices": [{"device_id": 1, "speed": 1500}, ...],
+            "time_start": 1700000000, "estimated_stop": 1700000100}
+
+        Any other lines (aka the rest of the Hashcat output if stdout was saved) are skipped.
+
+        Hashcat counts both the progress and speed in hashes (candidates * salts) so the ETA
+        is just the remaining progress divided by the speed.
+
+        Inputs:
+            filename: (str) The full path and filename of the status output
+
+            resume: (Bool) If True and this file was read before, only return the status
+            updates that were added to it since then
+
+        Returns:
+            statuses: (List) Dicts with the parsed status updates in the order they were written
+
+            None: If an error occured
+        """
+        full_path = os.path.abspath(filename)
+        file_id = self._get_file_id(filename)
+
+        offset = 0
+        if resume and full_path in self.status_offsets:
+            prev_file_id, prev_offset = self.status_offsets[full_path]
+            try:
+                file_size = os.path.getsize(filename)
+            except OSError:
+                file_size = 0
+            if file_id and prev_file_id == file_id and file_size >= prev_offset:
+                offset = prev_offset
+
+        try:
+            with open(filename, mode='rb') as statusfile:
+                statusfile.seek(offset)
+                data = statusfile.read()
+        except FileNotFoundError:
+            print(f"Error: Could not find the file:{filename}")
+            return None
+
+        # Only process complete lines. Hashcat may be in the middle of writing one
+        end = data.rfind(b"\n")
+        if end == -1:
+            return []
+        self.status_offsets[full_path] = (file_id, offset + end + 1)
+
+        statuses = []
+        num_invalid = 0
+        read_time = time.time()
+        for line in data[:end].decode("utf-8", errors="replace").split("\n"):
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                status = self._parse_status(json.loads(line), read_time)
+            except (ValueError, KeyError, TypeError, IndexError):
+                num_invalid += 1
+                continue
+            statuses.append(status)
+
+        if num_invalid:
+            print(f"Warning: {num_invalid} status updates in {filename} could not be parsed")
+
+        return statuses
+
+    def _parse_status(self, status_json, read_time):
+        """
+        Converts a --status-json update into the format saved in Session.status_history
+
+        Inputs:
+            status_json: (Dict) The decoded status update
+
+            read_time: (Float) When the update was read. Hashcat doesn't timestamp the updates
+
+        Returns:
+            status: (Dict) The status update
+        """
+        status_code = status_json['status']
+        if 0 <= status_code < len(self.status_codes):
+            status_name = self.status_codes[status_code]
+        else:
+            status_name = f"Unknown ({status_code})"
+
+        device_speeds = {}
+        for device in status_json.get('devices', []):
+            device_speeds[device['device_id']] = device['speed']
+
+        progress = status_json.get('progress', [0, 0])
+        recovered = status_json.get('recovered_hashes', [0, 0])
+        guess = status_json.get('guess', {})
+
+        return {
+            'time':read_time,
+            'session_name':status_json.get('session'),
+            'status':status_name,
+            'running':status_name in self.running_statuses,
+            'compleated':status_name in self.compleated_statuses,
+            'speed':sum(device_speeds.values()),
+            'device_speeds':device_speeds,
+            'progress':progress[0],
+            'progress_total':progress[1],
+            'recovered':recovered[0],
+            'recovered_total':recovered[1],
+            'rejected':status_json.get('rejected', 0),
+            'time_start':status_json.get('time_start'),
+            'estimated_stop':status_json.get('estimated_stop'),
+            'guess_mode':guess.get('guess_mode'),
+            'guess_base':guess.get('guess_base'),
+            'guess_mod':guess.get('guess_mod'),
+        }
+
+    def get_status_session_info(self, status, hash_type=None):
+        """
+        Creates the session_info for a new Session from a status update
+
+        Inputs:
+            status: (Dict) A status update from read_status_file()
+
+            hash_type: (STR) The Hashcat mode that was attacked. The status updates don't include it
+
+        Returns:
+            session_info: (Dict) Same format as SessionList.add()
+        """
+        session_info = {
+            'mode':self.guess_modes.get(status['guess_mode']),
+            'options':{},
+        }
+        if hash_type:
+            session_info['hash_type'] = hash_type
+        if status['session_name']:
+            session_info['options']['session_name'] = status['session_name']
+
+        guess_mode = status['guess_mode']
+        if session_info['mode'] == "mask":
+            session_info['options']['mask'] = status['guess_base']
+        elif session_info['mode'] == "wordlist" and status['guess_base']:
+            session_info['options']['wordlist'] = Path(status['guess_base']).name
+
+        if status['guess_mod']:
+            # Rule files
+            if guess_mode in [2, 5]:
+                session_info['options']['ruleset'] = Path(status['guess_mod']).name
+            # Hybrid attacks
+            elif guess_mode in [11, 12, 13, 14]:
+                session_info['options']['mask'] = status['guess_mod']
+
+        return session_info
+
+    def read_logfile(self, filename, session_list, strike_list, hash_list, format=5, delimeter=":", resume=True):
+        """
+        Reads a Hashcat debug file and creates Strikes for the rules that cracked passwords
+
+        Dev Note: Only supporting Hashcat Debug file format 5
+
+        Debug Format 5: Original-Word:Finding-Rule:Processed-Word:Wordlist
+
+        The debug file doesn't say which hash was cracked, so the Processed-Word (aka the
+        plaintext) is matched up with hashes that have been cracked with that plaintext. This
+        means the pot files need to be loaded first. If no hashes have that plaintext, the
+        strike is assigned to the 'None' hash.
+
+        Hashcat doesn't log information about the session itself, so no Sessions are created.
+
+        Debug files can get very large for big rule runs, so the file is read in chunks and
+        only the lines added since the last time it was read are parsed.
+
+        Inputs:
+            filename: (str) The full path and filename of the log to parse
+
+            session_list: (SessionList) Not used. Hashcat debug files don't have session info
+
+            strike_list: (StrikeList) Keeps track of sucessful rules
+
+            hash_list: (HashList) Used to look up hashes to match cracks to them
+
+            format: (int) The Hashcat debug format to use (currently only '5' is supported)
+
+            delimeter: (str) The seperator used in the debug file
+
+            resume: (Bool) If True and this file was read before, only parse what was added
+            to it since then
+
+        Returns:
+            success: (Bool) True if this completed properly
+                            False if an error occured
+        """
+        # Putting this check in here to make it easier to support other modes in the future
+        if format not in [5]:
+            print(f"Error: Only supporting debug log files of type '5'. You specified type {format}")
+            return False
+
+        full_path = os.path.abspath(filename)
+        file_id = self._get_file_id(filename)
+
+        # Pick up where the last read left off if the file was only appended to since then
+        offset = 0
+        if resume and full_path in self.log_offsets:
+            prev_file_id, prev_offset, prev_strike_list = self.log_offsets[full_path]
+            try:
+                file_size = os.path.getsize(filename)
+            except OSError:
+                file_size = 0
+            if file_id and prev_file_id == file_id and prev_strike_list is strike_list and file_size >= prev_offset:
+                offset = prev_offset
+
+        num_invalid = 0
+
+        try:
+            with open(filename, mode='rb') as logfile:
+                logfile.seek(offset)
+                pending = b""
+                while True:
+                    chunk = logfile.read(self.read_size)
+                    if not chunk:
+                        break
+                    data = pending + chunk
+                    end = data.rfind(b"\n")
+                    if end == -1:
+                        pending = data
+                        continue
+                    pending = data[end + 1:]
+                    # data starts at offset since pending is always the unread end of the last chunk
+                    offset += end + 1
+
+                    # Lines in this chunk that have already been turned into strikes. Debug files
+                    # tend to have a lot of repeated lines so this skips the strike lookups for them.
+                    # Only kept per chunk so memory doesn't grow with the size of the file. Repeats
+                    # in other chunks are still caught by the strike duplicate detection
+                    seen_lines = set()
+                    for line in data[:end].decode("utf-8", errors="replace").split("\n"):
+                        line = line.rstrip("\r")
+                        if not line or line in seen_lines:
+                            continue
+                        seen_lines.add(line)
+
+                        if not self._add_debug_line_strikes(line, strike_list, hash_list, format, delimeter):
+                            num_invalid += 1
+
+                # A partial line at the end may still be being written so don't save the offset past it
+
+        except FileNotFoundError:
+            print(f"Error: Could not find the file:{filename}")
+            return False
+
+        if num_invalid:
+            print(f"Warning: {num_invalid} lines in {filename} could not be parsed")
+
+        self.log_offsets[full_path] = (file_id, offset, strike_list)
+        return True
+
+    def _add_debug_line_strikes(self, line, strike_list, hash_list, format=5, delimeter=":"):
+        """
+        Creates the strikes for a line in a Hashcat debug file
+
+        Inputs:
+            line: (str) The debug line
+
+            strike_list: (StrikeList) Keeps track of sucessful rules
+
+            hash_list: (HashList) Used to look up hashes to match cracks to them
+
+            format: (int) The Hashcat debug format to use (currently only '5' is supported)
+
+            delimeter: (str) The seperator used in the debug file
+
+        Returns:
+            success: (Bool) True if the line was parsed
+                            False if it could not be parsed
+        """
+        contents = self._parse_hc_log_line(line, format, delimeter, verbose=False)
+        if 'processed_word' not in contents:
+            return False
+
+        details = {
+            "attack":"wordlist",
+            "rule":contents['finding_rule'],
+            # Just get the dictionary name
+            "wordlist":Path(contents['wordlist']).name,
+            "original_word":contents['original_word'],
+        }
+
+        hash_ids = hash_list.get_hash_ids_by_plaintext(contents['processed_word'])
+        if not hash_ids:
+            hash_ids = [None]
+
+        for hash_id in hash_ids:
+            strike_list.add(self, hash_id, details)
+
+        return True
+
     def is_logfile(self, filename, format=5, delimeter=":", verbose=False):
         """
         Function that says if this log file is the correct format for this
         password cracker manager
 
+        Only the start of the file (self.sample_size) is checked since debug files
+        can be huge
+
         Dev Note: Only supporting Hashcat Debug file format 5
 
         Debug Format 5: Original-Word:Finding-Rule:Processed-Word:Wordlist
@@ -82,24 +724,31 @@ class HashcatMgr(PWCrackerMgr):
             return False
 
         try:
-            with open(filename) as logfile:
-                line = logfile.readline().strip()
-
-                # Quick bail out to ensure that we aren't parsing timestamped files
-                # Specifically looking for JtR timestamped files
-                if line.startswith("0:00:00:00"):
-                    return False
-
-                while line:
-                    result = self._parse_hc_log_line(line, format, delimeter, verbose)
-                    if not result:
-                        return False
-                    line = logfile.readline().strip()
-            return True
-        
+            with open(filename, errors="replace") as logfile:
+                sample = logfile.read(self.sample_size)
         except FileNotFoundError:
             print(f"Error: Could not find the file:{filename}")
-        return False
+            return False
+
+        lines = sample.split("\n")
+
+        # The last line may have been cut off by the sample size
+        if len(sample) >= self.sample_size and len(lines) > 1:
+            lines = lines[:-1]
+
+        # Quick bail out to ensure that we aren't parsing timestamped files
+        # Specifically looking for JtR timestamped files
+        if lines[0].strip().startswith("0:00:00:00"):
+            return False
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            result = self._parse_hc_log_line(line, format, delimeter, verbose)
+            if not result:
+                return False
+        return True
     
     def _parse_hc_log_line(self, line, format=5, delimeter=":", verbose=True):
         """
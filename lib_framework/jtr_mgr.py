@@ -7,10 +7,23 @@ and running simple loopback attacks.
 """
 
 
-# Using this to parse logfiles that may have been imported from a different system/os
-from pathlib import Path 
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import json
+import os
+import shlex
+from pathlib import Path
 
-from.pw_cracker_mgr import PWCrackerMgr
+from .pw_cracker_mgr import PWCrackerMgr
+from ._jtr_log_parser import JtRLogParser
+from ._jtr_log_parser import parse_log_records
+from ._jtr_log_parser import encode_log_records
+from ._jtr_log_parser import decode_log_records
+
+
+# Change this if the format of the parsed log records changes so old caches are ignored
+LOG_CACHE_VERSION = 3
 
 
 class JTRMgr(PWCrackerMgr):
@@ -27,6 +40,16 @@ class JTRMgr(PWCrackerMgr):
         self.hash_type = "jtr_hash"
         self.name = "John the Ripper"
 
+        # Key = full path to a log file, value = JtRLogParser that has read it
+        # Used to only parse new lines the next time a log file is read
+        self.log_parsers = {}
+
+        # Where to save the parsed logs so unchanged logs don't need to be parsed again after
+        # restarting the notebook. Off unless 'log_cache_directory' is set in the config. E.g.
+        # log_cache_directory: "./jtr_log_cache/"
+        # Each log gets its own cache file so only the logs that changed are loaded and rewritten
+        self.log_cache_directory = config.get('log_cache_directory')
+
     def print_command(self):
         """
         Prints out the "default" options for running the password cracker
@@ -109,7 +132,273 @@ class JTRMgr(PWCrackerMgr):
 
         return hash
     
-    def read_logfile(self, filename, session_list, strike_list, hash_list):
+    def create_attack_command(self, hash_file, hash_mode=None, attack_mode=None, options=None, session_name=None):
+        """
+        Creates the command line to run a specific JtR attack using the same pot file
+        and session options as print_command()
+
+        Inputs:
+            hash_file: (STR) The file containing the hashes to attack (aka a left list)
+
+            hash_mode: (STR) The JtR format. E.g. "raw-MD5"
+
+            attack_mode: (STR) The attack mode as recorded in a Session. E.g. "wordlist", "mask"
+
+            options: (Dict) Session options describing the attack. E.g. 'wordlist', 'ruleset', 'mask'.
+            If None, no options are used
+
+            session_name: (STR) The name to use for the session/log files. Needed if running multiple
+            attacks at the same time. If None, the default "jtr_session" is used
+
+        Returns:
+            command: (List) The command split into arguments
+
+            None: If the attack can't be recreated from the command line. For example
+            stdin and pipe attacks since the guesses came from another program
+        """
+        if not session_name:
+            session_name = "jtr_session"
+        if options is None:
+            options = {}
+
+        if self.path:
+            command = [f"{self.path}/john"]
+        else:
+            command = ["john"]
+
+        if self.main_pot_file:
+            command.append(f"--pot={self.main_pot_file}")
+
+        if self.log_directory:
+            command.append(f"--session={self.log_directory}{session_name}")
+
+        if hash_mode:
+            command.append(f"--format={hash_mode}")
+
+        wordlist = options.get('wordlist_path', options.get('wordlist'))
+
+        if attack_mode == "wordlist":
+            if not wordlist:
+                return None
+            command.append(f"--wordlist={wordlist}")
+        elif attack_mode == "loopback":
+            if not wordlist:
+                return None
+            command.append(f"--loopback={wordlist}")
+        elif attack_mode == "prince":
+            if not wordlist:
+                return None
+            command.append(f"--prince={wordlist}")
+        elif attack_mode == "single":
+            command.append("--single")
+        elif attack_mode == "incremental":
+            if options.get('incremental'):
+                command.append(f"--incremental={options['incremental']}")
+            else:
+                command.append("--incremental")
+        elif attack_mode == "mask":
+            if options.get('mask') and options['mask'] != "default":
+                command.append(f"--mask={options['mask']}")
+            else:
+                command.append("--mask")
+        else:
+            return None
+
+        if options.get('ruleset') and attack_mode in ["wordlist", "loopback", "prince", "single"]:
+            command.append(f"--rules={options['ruleset']}")
+
+        command.append(hash_file)
+
+        return command
+
+    def parse_attack_command(self, command):
+        """
+        Parses a JtR command line into the same session_info format that is created when
+        parsing JtR logs. The reverse of create_attack_command()
+
+        JtR lets you shorten options as long as they aren't ambiguous (aka --wo=dic.txt) and
+        use either "=" or ":" before the value, so both are handled. If no attack mode is
+        specified JtR runs in batch mode which starts with single mode.
+
+        Inputs:
+            command: (STR or List) The command line. Either as a string or split into arguments
+
+        Returns:
+            session_info: (Dict) Same format as SessionList.add()
+
+            None: If the command line couldn't be parsed
+        """
+        if isinstance(command, str):
+            try:
+                command = shlex.split(command)
+            except ValueError:
+                print(f"Error: Could not parse the command line: {command}")
+                return None
+
+        known_options = [
+            'format', 'wordlist', 'rules', 'single', 'incremental', 'mask', 'loopback',
+            'prince', 'stdin', 'pipe', 'session', 'pot', 'external', 'markov',
+        ]
+
+        # Key = option, value = the option's value. None if it was just a flag
+        options = {}
+        for arg in command[1:]:
+            if not arg.startswith("-"):
+                continue
+            name = arg.lstrip("-")
+            value = None
+            for index, char in enumerate(name):
+                if char in "=:":
+                    name, value = name[:index], name[index + 1:]
+                    break
+
+            matches = [option for option in known_options if option.startswith(name.lower())]
+            if name.lower() in known_options:
+                matches = [name.lower()]
+            if len(matches) != 1:
+                continue
+            options[matches[0]] = value
+
+        session_info = {'mode':None, 'options':{}}
+        if options.get('format'):
+            session_info['hash_type'] = options['format']
+
+        # Same order the modes are recorded in when parsing a log. See _jtr_log_parser
+        wordlist = None
+        if 'stdin' in options or 'pipe' in options:
+            session_info['mode'] = "stdin"
+        elif 'loopback' in options:
+            session_info['mode'] = "loopback"
+            wordlist = options['loopback']
+        elif 'prince' in options:
+            session_info['mode'] = "prince"
+            wordlist = options['prince']
+        elif 'mask' in options:
+            session_info['mode'] = "mask"
+            session_info['options']['mask'] = options['mask'] if options['mask'] else "default"
+            wordlist = options.get('wordlist')
+        elif 'wordlist' in options:
+            session_info['mode'] = "wordlist"
+            wordlist = options['wordlist']
+        elif 'incremental' in options:
+            session_info['mode'] = "incremental"
+            if options['incremental']:
+                session_info['options']['incremental'] = options['incremental']
+        elif 'external' in options or 'markov' in options:
+            print(f"Error: External and Markov modes are not supported")
+            return None
+        else:
+            session_info['mode'] = "single"
+
+        if wordlist:
+            session_info['options']['wordlist'] = Path(wordlist).name
+            session_info['options']['wordlist_path'] = wordlist
+
+        if 'rules' in options:
+            # --rules without a value uses the [List.Rules:Wordlist] section
+            session_info['options']['ruleset'] = options['rules'] if options['rules'] else "Wordlist"
+
+        return session_info
+
+    def lookup_hash_types(self, mode, hash_list):
+        """
+        Maps a JtR format (as recorded in the "Hash type:" log line) back to the
+        hash types used in this framework
+
+        Handles the $dynamic_X$ formats that format_hash() uses when creating left lists
+
+        Inputs:
+            mode: (STR) The JtR format
+
+            hash_list: (HashList) Holds the hash type information
+
+        Returns:
+            types: (List) The hash types that match the format. Empty if there is no match
+        """
+        if not mode:
+            return []
+
+        # Dynamic formats are logged as "dynamic_0: md5($p)"
+        mode = mode.split(":")[0].strip()
+        if mode == "dynamic_0":
+            mode = "raw-MD5"
+        elif mode == "dynamic_26":
+            mode = "raw-SHA1"
+
+        return hash_list.get_types_by_mode(mode, self.mode_field)
+
+    def read_benchmark_file(self, filename):
+        """
+        Parses the saved output of "john --test"
+
+        Example output:
+            Benchmarking: md5crypt, crypt(3) $1$ (and variants) [MD5 256/256 AVX2 8x3]... (8xOMP) DONE
+            Raw:	228864 c/s real, 28608 c/s virtual
+
+            Benchmarking: descrypt, traditional crypt(3) [DES 256/256 AVX2]... DONE
+            Many salts:	65175K c/s real, 8146K c/s virtual
+            Only one salt:	44138K c/s real, 5517K c/s virtual
+
+        The "real" speed is used. For salted formats the "Many salts" speed is used since that
+        is the number of hashes computed per second vs. the number of candidates tried.
+
+        Inputs:
+            filename: (str) The full path and filename of the benchmark output
+
+        Returns:
+            speeds: (Dict) Key is the JtR format, value is the measured hashes per second
+        """
+        speeds = {}
+        cur_format = None
+
+        # Used to pick which speed line to use if there are multiple for a format
+        speed_priority = ["Raw", "Many salts", "Only one salt"]
+        cur_priority = len(speed_priority)
+
+        try:
+            with open(filename) as benchfile:
+                for line in benchfile:
+                    line = line.strip()
+
+                    if line.startswith("Benchmarking: "):
+                        cur_format = line[len("Benchmarking: "):]
+                        # Format name is followed by a description, the algorithm, or "..."
+                        for divider in [",", " [", "..."]:
+                            cur_format = cur_format.split(divider)[0]
+                        cur_format = cur_format.strip()
+                        cur_priority = len(speed_priority)
+                        continue
+
+                    if not cur_format:
+                        continue
+
+                    label, divider, rest = line.partition(":")
+                    if not divider or label not in speed_priority:
+                        continue
+
+                    # Only keep the highest priority speed for this format
+                    if speed_priority.index(label) > cur_priority:
+                        continue
+
+                    # Only looking at the "real" speed
+                    rest = rest.split(",")[0].split()
+                    if len(rest) < 2 or rest[-1] != "real":
+                        continue
+
+                    value = rest[0].rstrip("KMGTkmgt")
+                    unit = rest[0][len(value):]
+                    try:
+                        speeds[cur_format] = self._parse_speed(value, unit)
+                        cur_priority = speed_priority.index(label)
+                    except ValueError:
+                        print(f"Warning: Could not parse the speed in benchmark file {filename}: {line}")
+
+        except FileNotFoundError:
+            print(f"Error: Could not find the file:{filename}")
+
+        return speeds
+
+    def read_logfile(self, filename, session_list, strike_list, hash_list, resume=True, verbose=True):
         """
         Reads the JtR logfiles
 
@@ -139,461 +428,362 @@ class JTRMgr(PWCrackerMgr):
 
             strike_list: (StrikeList) Keeps track of sucessful rules
 
+            hash_list: (HashList) Used to match up cracks with the hashes in this framework
+
+            resume: (Bool) If True and this log was read before, only parse what was added
+            to it since then
+
+            verbose: (Bool) If False, don't print an error if this isn't a JtR log
+
         Returns:
             success: (Bool) True if this completed properly
                             False if an error occured
         """
-        # First check to make sure the logfile is a JtR logfile
-        if not self.is_logfile(filename):
-            print(f"Error: The file {filename} is not a JtR formatted log file")
-            return False
+        # The actual parsing is done in _jtr_log_parser.py since it is a bit of a state machine
+        parser = self._get_log_parser(filename, session_list, strike_list, hash_list, resume=resume)
+        if not parser:
+            parser = JtRLogParser(self, session_list, strike_list, hash_list, filename=filename)
 
-        # Open the logfile up for reading
-        with open(filename) as logfile:
-
-            # Parsing the logfile line by line since these logfiles can get huge. This provides
-            # a future way to bail out or only read the tail of it in the future.
-            line = True
-
-            # Using this to do a sanity check on the log file format
-            active_session = False
-
-            # Information for the actual session
-            compleated = False
-            session_info = {
-                'mode':None,
-                'options':{}
-                }
-            
-            # Used to match up cracks with what attack was running
-            cur_attack = None
-            cur_rule = None
-            cur_wordlist = None
-            cur_strikes = []
-
-            # Running hashed value of all the lines parsed so far
-            # This way if the log file is run again, no duplicate strikes will be created
-            running_hash = None
-
-            while line:
-
-                # Doing this at the top, so if I select "continue" to skip a line then I don't have to
-                # remember to put the readline there as well
-                line = logfile.readline().strip()
+        result = parser.parse_file(filename, verbose=verbose)
+        if result:
+            self.log_parsers[os.path.abspath(filename)] = parser
+        return result
+
+    def read_logfiles(self, filenames, session_list, strike_list, hash_list, max_workers=None, verbose=True):
+        """
+        Reads multiple JtR logfiles, parsing them in parallel across multiple processes
 
-                # Skip blank lines
-                if len(line) == 0:
-                    continue
+        Each file is parsed by a single worker, and the results are added to the session_list
+        and strike_list in the order the files were passed in so the ids are the same no matter
+        which worker finished first. Logs that have been read before are only parsed from where
+        they left off, and since that is fast it's done in this process.
 
-                # A new session was detected in the file
-                if line == "0:00:00:00 Starting a new session":
-                    active_session = True
-                    continue
-                # An unexpected line was encountered
-                elif not active_session:
-                    print(f"Unexpected line found in logfile {logfile}. Line: {line}")
-                    continue
-
-                # Split up the line to extract the timestamp
-                split_line = line.split(":")
-
-                # If there wasn't a timestamp
-                if len(split_line) < 4:
-                    print(f"Unexpected line found in logfile {filename}. Line: {line}")
-                    continue
-
-                time_day = int(split_line[0])
-                time_hour = int(split_line[1])
-                time_minute = int(split_line[2])
-
-                # Split second from the rest of the log message. Also need to combine any 3+ index
-                # in case there was a ":' in the regular log
-                rest_line = split_line[3]
-                if len(split_line) > 4:
-                    for x in split_line[4:]:
-                        rest_line += ":" + x
-                split_line = rest_line.split(" ", 1)
-                if len(split_line) != 2:
-                    print(f"Unexpected line found in logfile {filename}. Line: {line}")
-                    continue
-
-                time_second = int(split_line[0])
-                log_msg = split_line[1]
-
-                # Update the running hash here. This is independent of the time so if the
-                # exact same attack is run again, it "might" detect duplicates.
-                running_hash = hash(f"{log_msg}{running_hash}")
-
-                # Now parse the various log messages
-
-                # If the session was finished
-                if log_msg.strip() == "Session aborted" or log_msg.strip() == "Session completed":
-                    if log_msg.strip() == "Session completed":
-                        compleated = True
-                    
-                    total_time = time_day * (24 * 60 * 60) + time_hour * (60 * 60) + time_minute * 60 + time_second
-                    session_info['options']['total_time'] = total_time
-
-                    # To detect if pipe mode was used, I "could" parse the command line, but this is a bit easier
-                    # since I'm worried that by parsing the command line I'll have some weird edge case
-                    if session_info['mode'] == "wordlist" and "wordlist" not in session_info['options']:
-                        session_info['mode'] = "pipe"
-
-                    session_id = session_list.add(self, session_info, compleated=compleated, check_duplicates=True)
-
-                    # Add strikes to the session
-                    for strike_id in cur_strikes:
-                        session_list.sessions[session_id].add_strike(strike_id)
-                    
-                    active_session = False
-                    compleated = False
-                    cur_attack = None
-                    cur_rule = None
-                    cur_wordlist = None
-                    cur_strikes = []
-                    running_hash = None
-                    session_info =  {
-                        'mode':None,
-                        'options':{}
-                        }
-
-                # Lists the number of hashes loaded
-                elif log_msg.strip().startswith("Loaded a total of "):
-                    split_line = log_msg.split("Loaded a total of ")
-                    num_loaded = int(split_line[1].split()[0].strip())
-                    session_info['options']['num_loaded'] = num_loaded
-                
-                # Get the hash type (without having to parse the command line)
-                elif log_msg.strip().startswith("- Hash type: "):
-                    split_line = log_msg.strip().split("- Hash type: ")
-                    # The hash type can have extra info following a "," or a "("
-                    split_line = split_line[1].split(",")
-                    split_line = split_line[0].split(" (")
-                    session_info['hash_type'] = split_line[0]
-
-                # Specifies the max accepted guess length (Helpful when targeting passphrases
-                elif log_msg.strip().startswith("- Will reject candidates longer than "):
-                    split_line = log_msg.split("- Will reject candidates longer than ")
-                    # Strip off the bytes at the end
-                    split_line = split_line[1].split()
-                    # Long variable name, but I want people to know exactly what this is
-                    session_info['options']['max_guess_size_bytes'] = int(split_line[0])
-
-                # Get the command line. Eventually I'll want to parse this further
-                elif log_msg.strip().startswith("Command line: "):
-                    split_line = log_msg.split("Command line: ")
-                    session_info['options']['command_line'] = split_line[1]
-
-                # The following few checks look for the mode the cracker is run in
-                # Eventually I can pull this from the command line too, but this will
-                # be a good stopgap until I add that functionality
-                elif log_msg.strip().startswith('Proceeding with "single crack" mode'):
-                    session_info['mode'] = "single"
-                    cur_attack = "single"
-                elif log_msg.strip().startswith("Proceeding with wordlist mode"):
-                    # Gets a bit weird since I want to classify this as a single session, but this
-                    # is the second default attack run in JtR's Single mode
-                    if not session_info['mode']:
-                        session_info['mode'] = "wordlist"
-                    cur_attack = "wordlist"
-                
-                # Incremental mode
-                elif log_msg.strip().startswith('Proceeding with "incremental" mode: '):
-
-                    # Single attacks may switch to incremental depending on how they are run
-                    if session_info['mode'] == "single":
-                        session_info['options']['incremental_started'] = time_day * (24 * 60 * 60) + time_hour * (60 * 60) + time_minute * 60 + time_second
-                    else:
-                        session_info['mode'] = "incremental"
-
-                    cur_attack = "incremental"
-
-                    # Get the incremental training set being used
-                    split_line = log_msg.strip().split('Proceeding with "incremental" mode: ')
-                    cur_rule = split_line[1]
-                    session_info['options']['incremental'] = cur_rule
-
-                # Running Mask mode
-                elif log_msg.strip().startswith('Proceeding with mask mode'):
-                    session_info['mode'] = "mask"
-
-                    # Note, the mask used isn't captured in a specific log line, so we need to extract it from the command line
-                    split_line = session_info['options']['command_line'].split('--mask=')
-
-                    # A mask was specified on the command line
-                    if len(split_line) == 2:
-                        # Dev note: I know this will break if you have spaces in your mask.... Don't know how to avoid that
-                        split_line = split_line[1].split(' ')
-                        cur_rule = split_line[0]
-                        session_info['options']['mask']= split_line[0]
-                    # Using the default mask in jtr config
-                    else:
-                        cur_rule = "default"
-                        session_info['options']['mask']= "default"
-
-                # Reading password guesses in via stdin
-                elif log_msg.strip().startswith('- Reading candidate passwords from stdin'):
-                    session_info['mode'] = "stdin"
-                    session_info['options']['duplicate_detection_id'] = running_hash
-                
-                # Reading password guesses via loopback mode (aka reads them in from a pot file
-                elif log_msg.strip().startswith('Proceeding with loopback mode'):
-                    session_info['mode'] = 'loopback'
-                    cur_attack = "wordlist"
-                    session_info['options']['duplicate_detection_id'] = running_hash
-
-                # Get the loopback wordlist being used
-                elif log_msg.strip().startswith("- Loopback pot file: "):
-                    split_line = log_msg.strip().split("- Loopback pot file: ")
-                    # Just get the dictionary name
-                    cur_wordlist = Path(split_line[1]).name
-                    session_info['options']['wordlist'] = cur_wordlist
-
-                # Get the wordlist being used
-                elif log_msg.strip().startswith("- Wordlist file: "):
-                    split_line = log_msg.strip().split("- Wordlist file: ")
-                    # Just get the dictionary name
-                    cur_wordlist = Path(split_line[1]).name
-                    session_info['options']['wordlist'] = cur_wordlist
-                
-                # PRINCE mode attack being used
-                elif log_msg.strip().startswith("Proceeding with PRINCE"):
-                    session_info['mode'] = 'prince'
-            
-                elif log_msg.strip().startswith("- Will generate candidates of length "):
-                    split_line = log_msg.strip().split("- Will generate candidates of length ")
-                    split_line = split_line[1].split(" - ")
-                    session_info['options']['min_length'] = split_line[0]
-                    session_info['options']['max_length'] = split_line[1]
-
-                elif log_msg.strip().startswith("- Using chains with "):
-                    split_line = log_msg.strip().split("- Using chains with ")
-                    split_line = split_line[1].split(" - ")
-                    session_info['options']['min_elements'] = split_line[0]
-                    session_info['options']['max_elements'] = split_line[1]
-
-                # Prince specific wordlist log line
-                elif log_msg.strip().startswith("- Input file: "):
-                    split_line = log_msg.strip().split("- Input file: ")
-                    # Just get the dictionary name
-                    cur_wordlist = Path(split_line[1]).name
-                    session_info['options']['wordlist'] = cur_wordlist
-
-                # Get the encoding of input characters. Might be relevant
-                # for certain challenges
-                elif "input encoding enabled" in log_msg.strip():
-                    split_line = log_msg.strip().split(" input encoding enabled")
-                    split_line = split_line[0].split("- ")
-                    session_info['options']['encoding'] = split_line[1]
-
-                # It might be helpful to see how many rules were run to identify
-                # how useful/effecient different mangling rule sets are
-                elif " preprocessed word mangling rules" in log_msg.strip():
-                    split_line = log_msg.strip().split(" preprocessed word mangling rules")
-                    split_line = split_line[0].split("- ")
-                    session_info['options']['num_rules'] = int(split_line[1])
-
-                # Mangling ruleset used
-                elif log_msg.strip().startswith("- Rules: "):
-                    split_line = log_msg.strip().split("- Rules: ")
-                    session_info['options']['ruleset'] = split_line[1]
-
-                # Parse the rules as they are processed
-                elif log_msg.strip().startswith("- Rule #"):
-                    # Get the original rule vs. what's being processed.
-                    # Strip the Rule # from the string
-                    split_line = log_msg.split(": '", 1)
-                    split_line = split_line[1]
-
-                    # Remove the JtR fixup info
-                    split_line = split_line.split("' accepted as '")
-                    if len(split_line) == 2:
-                        split_line = split_line[1].split("'")
-                    split_line = split_line[0].split("' accepted")
-
-                    # Remove the "rejected" from rejected rules. This shouldn't matter
-                    # since rejected rules should not crack passwords...
-                    split_line = split_line[0]
-                    split_line = split_line.split("' rejected")
-
-                    cur_rule = split_line[0]
-
-                # No rules specified so it applies a default ":" rule to the wordlist
-                elif log_msg.strip().startswith("- No word mangling rules"):
-                    cur_rule = ":"
-
-                # A hash was cracked
-                elif log_msg.strip().startswith("+ Cracked"):
-
-                    # Get the username and strip out the plaintext if that was logged
-                    split_line = log_msg.strip().split("+ Cracked ")
-                    # The plaintext might have a ":" in it so only split on the first one that
-                    # divides the username from the plaintext
-                    split_line = split_line[1].split(":",1)
-                    username = split_line[0]
-                    plaintext = None
-                    if len(split_line) != 1:
-                        plaintext = split_line[1]
-
-                    # Check if the username is a hash_id or not
+        If log_cache_directory is set, the parsed records for each log are also saved there. When the
+        logs are read again (aka after restarting the notebook), logs whose contents match the
+        cache are loaded from it without being parsed, and logs that have only been appended to
+        are parsed from where the cache left off.
+
+        Inputs:
+            filenames: (List) The full path and filename of the logs to parse
+
+            session_list: (SessionList) Keeps track of password cracking sessions
+
+            strike_list: (StrikeList) Keeps track of sucessful rules
+
+            hash_list: (HashList) Used to match up cracks with the hashes in this framework
+
+            max_workers: (Int) The maximum number of processes to use. If None, defaults to
+            the number of CPUs. If 1, everything is parsed in this process
+
+            verbose: (Bool) If False, don't print an error for files that aren't JtR logs
+
+        Returns:
+            results: (Dict) Key = filename, value = True if it was parsed, False if not
+        """
+        results = {}
+
+        # Only the logs that need to be parsed from the start are worth sending to a worker
+        full_parse = []
+
+        # Key = filename, value = cached results for the start of the log to continue from
+        previous = {}
+
+        parsed = {}
+        for filename in filenames:
+            if self._get_log_parser(filename, session_list, strike_list, hash_list):
+                continue
+
+            cached, complete = self._get_cached_log(filename)
+            if complete:
+                parsed[filename] = cached
+                continue
+            full_parse.append(filename)
+            if cached:
+                previous[filename] = cached
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(full_parse))
+
+        if max_workers > 1:
+            try:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {}
+                    for filename in full_parse:
+                        futures[filename] = executor.submit(parse_log_records, filename, verbose=verbose, previous=previous.get(filename))
+                    for filename in full_parse:
+                        parsed[filename] = futures[filename].result()
+            except (OSError, BrokenProcessPool) as msg:
+                print(f"Warning: Could not parse the logs in parallel, parsing them one at a time instead: {msg}")
+                for filename in full_parse:
+                    parsed.pop(filename, None)
+
+        # The records are needed to update the cache, so parse the logs here the same way
+        # the workers would have
+        if self.log_cache_directory:
+            for filename in full_parse:
+                if filename not in parsed:
+                    parsed[filename] = parse_log_records(filename, verbose=verbose, previous=previous.get(filename))
+
+        # Merge the results in order
+        for filename in filenames:
+            if filename in parsed:
+                if filename in full_parse:
+                    self._save_cached_log(parsed[filename])
+                results[filename] = self._merge_log_records(parsed[filename], session_list, strike_list, hash_list)
+            else:
+                results[filename] = self.read_logfile(filename, session_list, strike_list, hash_list, verbose=verbose)
+
+        return results
+
+    def _get_log_parser(self, filename, session_list, strike_list, hash_list, resume=True):
+        """
+        Returns the parser that read this log before if it can pick up where it left off
+
+        Inputs:
+            filename: (String) The log file
+
+            session_list: (SessionList) The parser needs to have been saving to this list
+
+            strike_list: (StrikeList) The parser needs to have been saving to this list
+
+            hash_list: (HashList) The parser needs to have been using this list
+
+            resume: (Bool) If False, always returns None
+
+        Returns:
+            parser: (JtRLogParser) The parser to use to continue reading the log
+
+            None: If the log needs to be parsed from the start
+        """
+        if not resume:
+            return None
+
+        parser = self.log_parsers.get(os.path.abspath(filename))
+
+        # Only pick up where the last read left off if it was saving to the same lists and the
+        # log has only been appended to since then
+        if (not parser or parser.session_list is not session_list or parser.strike_list is not strike_list
+            or parser.hash_list is not hash_list or not parser.can_resume(filename)):
+            return None
+
+        return parser
+
+    def _merge_log_records(self, results, session_list, strike_list, hash_list):
+        """
+        Adds the records from parse_log_records() to the session_list and strike_list
+
+        Inputs:
+            results: (Dict) The results returned by parse_log_records()
+
+            session_list: (SessionList) Keeps track of password cracking sessions
+
+            strike_list: (StrikeList) Keeps track of sucessful rules
+
+            hash_list: (HashList) Used to check the hash_ids in the records
+
+        Returns:
+            success: (Bool) True if the log was parsed
+                            False if an error occured
+        """
+        if results['output']:
+            print(results['output'], end="")
+        if not results['success']:
+            return False
+
+        # Key = ("local", index) used by the worker, value = the real id
+        id_map = {}
+        num_strikes = 0
+        num_sessions = 0
+        for record in results['records']:
+            if record[0] == "strike":
+                hash_id = record[1]
+                if hash_id is not None and hash_id not in hash_list.hashes:
+                    # hash_id wasn't found so treat it as a straight username
                     hash_id = None
-                    # A username wasn't specified
-                    if username == "?":
-                        username = None
-                    elif username.isdigit():
-                        hash_id = int(username)
-                        # Check if the hash_id is legitamite
-                        if hash_id not in hash_list.hashes:
-                            # hash_id wasn't found so set it to be none again
-                            # and treat it as a straight username
-                            hash_id = None
-
-                    # Create the strike
-                    if cur_attack in ["wordlist", "single", "pipe", "stdin", "loopback", "prince"]:
-                        strike_id = strike_list.add(self, hash_id, {"attack":cur_attack, "rule":cur_rule, "wordlist":cur_wordlist, "duplicate_detection_id":running_hash})
-                    elif cur_attack in ["incremental", "mask"]:
-                        strike_id = strike_list.add(self, hash_id, {"attack":cur_attack, "mode":cur_rule, "duplicate_detection_id":running_hash})
-                    else:
-                        print(f"Warning, unkonwn attack type when creating the strike: {cur_attack}")
-                        print("Skipping adding the strike")
-                        continue
+                id_map[("strike", num_strikes)] = strike_list.add(self, hash_id, record[2])
+                num_strikes += 1
+
+            elif record[0] == "session":
+                session_id = session_list.add(self, record[1], compleated=record[2], check_duplicates=record[4])
+                for strike_id in record[3]:
+                    session_list.sessions[session_id].add_strike(self._map_log_id(strike_id, "strike", id_map))
+                id_map[("session", num_sessions)] = session_id
+                num_sessions += 1
+
+            elif record[0] == "update":
+                session_id = self._map_log_id(record[1], "session", id_map)
+                session_id = session_list.update(session_id, record[2], compleated=record[3], check_duplicates=record[5])
+                if isinstance(record[1], tuple):
+                    # The session may have been merged into a duplicate of it
+                    id_map[("session", record[1][1])] = session_id
+                for strike_id in record[4]:
+                    session_list.sessions[session_id].add_strike(self._map_log_id(strike_id, "strike", id_map))
+
+        # Save the parser so the next read of this log picks up where the worker left off
+        state = results['state']
+        state['cur_strikes'] = [self._map_log_id(strike_id, "strike", id_map) for strike_id in state['cur_strikes']]
+        if state['session_id'] is not None:
+            state['session_id'] = self._map_log_id(state['session_id'], "session", id_map)
+
+        parser = JtRLogParser(self, session_list, strike_list, hash_list, filename=results['filename'])
+        parser.set_state(state)
+        self.log_parsers[os.path.abspath(results['filename'])] = parser
+
+        return True
+
+    def _get_cached_log(self, filename):
+        """
+        Looks up a log in the parsed log cache
+
+        The cache entry is only used if the start of the log still has the same contents it
+        had when it was parsed. Checking the digest vs. the modification time since logs are
+        often copied over from other cracking rigs
+
+        Inputs:
+            filename: (String) The log file
 
-                    if strike_id not in cur_strikes:
-                        cur_strikes.append(strike_id)
-
-                # An error occured, session was not run/compleated
-                # Not saving these sessions since they usually are caused by invalid command line inputs so no
-                # real cracking session was run
-                elif log_msg.strip().startswith("Terminating on error"):
-                    active_session = False
-                    compleated = False
-                    cur_attack = None
-                    cur_rule = None
-                    cur_wordlist = None
-                    cur_strikes = []
-                    running_hash = None
-                    session_info =  {
-                        'mode':None,
-                        'options':{}
-                        }
-
-                # Lines that are currently being ignored. (Doing it this way to make it easier to
-                # identify interesting lines I haven't handled yet.
-                elif log_msg.strip().startswith("- Candidate passwords will be buffered and tried in chunks of"):
-                    continue
-                elif log_msg.strip().startswith("- memory mapping wordlist"):
-                    continue
-                elif log_msg.strip().startswith("- Allocated"):
-                    continue
-                elif log_msg.strip().startswith("- Processing the remaining buffered candidate passwords, if any"):
-                    continue
-                elif log_msg.strip().startswith("- Passwords will be stored "):
-                    continue
-                elif log_msg.strip().startswith("- Configured to use otherwise idle processor cycles only"):
-                    continue
-                elif log_msg.strip().startswith("- SingleWordsPairMax used is "):
-                    continue
-                elif log_msg.strip().startswith("- SingleRetestGuessed = "):
-                    continue
-                elif log_msg.strip().startswith("- SingleMaxBufferSize = "):
-                    continue
-                elif log_msg.strip().startswith("- No information to base candidate passwords on"):
-                    continue
-                elif log_msg.strip().startswith("Enabling duplicate candidate password suppressor"):
-                    continue
-                elif log_msg.strip().startswith("Remaining "):
-                    continue
-                elif log_msg.strip().startswith("- suppressed "):
-                    continue
-                elif log_msg.strip().startswith("Cost "):
-                    continue
-                elif log_msg.strip().startswith("- Passwords in this logfile are UTF-8 encoded"):
-                    continue
-                elif log_msg.strip().startswith("Sorting salts, for deterministic salt-resume"):
-                    continue
-                elif log_msg.strip().startswith("- SingleWordsPairMax increased to"):
-                    continue
-                # We get the actual dictionary from an earlier logfile
-                elif log_msg.strip().startswith("- loading wordfile"):
-                    continue
-                elif log_msg.strip().startswith("- wordfile had"):
-                    continue
-                # I'm struggling with this one. I may want to add it back as an alternative
-                # rule since it can crack a password and right now it would be misattributed
-                # to the next rule
-                elif log_msg.strip().startswith("- Oldest still in use is now rule"):
-                    continue
-                # Skip a lot of the incremental logs
-                elif log_msg.strip().startswith("- Trying length "):
-                    continue
-                elif log_msg.strip().startswith("- Switching to length "):
-                    continue
-                elif log_msg.strip().startswith("- Expanding tables for length "):
-                    continue
-                elif log_msg.strip().startswith("- Lengths "):
-                    continue
-                # Hmm, it might be nice to warn that there was an invalid rule being run.....
-                # Dev Note: Might want to add this back in with a warning
-                elif log_msg.strip().startswith("! Invalid rule at line"):
-                    continue
-                # We're getting the the hash type from the "Hash Type" log message. So we can skip this message
-                elif log_msg.strip().startswith("- Algorithm:"):
-                    continue
-                # Need to look into what this really means, and where stacked rules can come into play
-                elif log_msg.strip().startswith("- No stacked rules"):
-                    continue
-                # Remove non-pertinant JtR debugging logs
-                elif log_msg.strip().startswith("Disabling duplicate candidate password suppressor"):
-                    continue
-                elif log_msg.strip().startswith("- dupe suppression:"):
-                    continue
-                elif log_msg.strip().startswith("- Some rule logging suppressed."):
-                    continue
-                # Removing PRINCE debug lines
-                elif log_msg.strip().startswith("Loading elements from wordlist."):
-                    continue
-                elif log_msg.strip().startswith("Initializing chains"):
-                    continue
-                elif log_msg.strip().startswith("- Using default output length distribution"):
-                    continue
-                elif log_msg.strip().startswith("Calculating keyspace"):
-                    continue
-                elif log_msg.strip().startswith("- Memory use for PRINCE: "):
-                    continue
-                elif log_msg.strip().startswith("Sorting chains by keyspace"):
-                    continue
-                elif log_msg.strip().startswith("Sorting global order by password length counts"):
-                    continue
-                elif log_msg.strip().startswith("Starting candidate generation"):
-                    continue
-                elif log_msg.strip().startswith("PRINCE done. Cleaning up"):
-                    continue
-                elif log_msg.strip().startswith("Loading elements from wordlist"):
-                    continue
-                elif log_msg.strip().startswith("- Keyspace size "):
-                    continue
-                # Doing this to indentify log lines I haven't set up rules to parse yet
-                else:
-                    print(f"Unsuported Log Line: {log_msg.strip()}")
-
-            # Clean up and capture any sessions that are being run right now
-            if active_session:
-                total_time = time_day * (24 * 60 * 60) + time_hour * (60 * 60) + time_minute * 60 + time_second
-                session_info['options']['total_time'] = total_time
-
-                # To detect if pipe mode was used, I "could" parse the command line, but this is a bit easier
-                # since I'm worried that by parsing the command line I'll have some weird edge case
-                if session_info['mode'] == "wordlist" and "wordlist" not in session_info['options']:
-                    session_info['mode'] = "pipe"
-                    session_info['options']['duplicate_detection_id'] = running_hash
-
-                session_id = session_list.add(self, session_info, compleated=compleated, check_duplicates=True)
-
-                # Add strikes to the session
-                for strike_id in cur_strikes:
-                    session_list.sessions[session_id].add_strike(strike_id)
+        Returns:
+            (cached, complete)
+            cached: (Dict) The cached results for the start of the log. Same format as
+            parse_log_records(). None if the log isn't cached or has changed
+
+            complete: (Bool) True if nothing has been added to the log since it was cached
+        """
+        if not self.log_cache_directory:
+            return None, False
+
+        cache_file = self._get_log_cache_file(filename)
+        if not os.path.isfile(cache_file):
+            return None, False
+
+        try:
+            with open(cache_file) as cachefile:
+                entry = json.load(cachefile)
+        except (OSError, ValueError) as msg:
+            print(f"Warning: Could not read the JtR log cache {cache_file}, the log will be parsed again: {msg}")
+            return None, False
 
+        if entry.get('version') != LOG_CACHE_VERSION or entry.get('filename') != os.path.abspath(filename):
+            return None, False
+
+        try:
+            file_size = os.path.getsize(filename)
+        except OSError:
+            return None, False
+
+        offset = entry['offset']
+        if file_size < offset or self._get_file_digest(filename, offset) != entry['digest']:
+            return None, False
+
+        cached = decode_log_records(entry['results'])
+        cached['filename'] = filename
+
+        # The file may have been copied here since it was cached
+        cached['state']['file_id'] = self._get_file_id(filename)
+
+        return cached, file_size == offset
+
+    def _save_cached_log(self, results):
+        """
+        Saves the results of parsing a log to its parsed log cache file. Only successfully
+        parsed logs are cached
+
+        Needs to be called before the results are passed to _merge_log_records() since that
+        changes the parser state in place
+
+        Inputs:
+            results: (Dict) The results returned by parse_log_records()
+
+        Returns:
+            True: If the cache was updated
+            False: If it was not
+        """
+        if not self.log_cache_directory or not results['success']:
+            return False
+
+        digest = self._get_file_digest(results['filename'], results['state']['offset'])
+        if digest is None:
+            return False
+
+        entry = {
+            'version':LOG_CACHE_VERSION,
+            'filename':os.path.abspath(results['filename']),
+            'offset':results['state']['offset'],
+            'digest':digest,
+            'results':encode_log_records(results),
+        }
+
+        cache_file = self._get_log_cache_file(results['filename'])
+        temp_file = f"{cache_file}.tmp"
+        try:
+            os.makedirs(self.log_cache_directory, exist_ok=True)
+            with open(temp_file, mode='w') as cachefile:
+                json.dump(entry, cachefile, separators=(",", ":"))
+            # Replace the old cache in one step so an interrupted write doesn't corrupt it
+            os.replace(temp_file, cache_file)
+        except OSError as msg:
+            print(f"Warning: Could not save the JtR log cache {cache_file}: {msg}")
+            return False
         return True
+
+    def _get_log_cache_file(self, filename):
+        """
+        Returns the parsed log cache file for a log
+
+        Inputs:
+            filename: (String) The log file
+
+        Returns:
+            cache_file: (String) The path to the cache file. Named after a digest of the full path
+            to the log since logs from different rigs often have the same name
+        """
+        path_digest = hashlib.blake2b(os.path.abspath(filename).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.log_cache_directory, f"{Path(filename).stem}_{path_digest}.json")
+
+    def _get_file_digest(self, filename, length):
+        """
+        Returns the blake2b digest of the start of a file
+
+        Inputs:
+            filename: (String) The file
+
+            length: (Int) The number of bytes at the start of the file to hash
+
+        Returns:
+            digest: (String) The hex digest. None if the file couldn't be read
+        """
+        digest = hashlib.blake2b(digest_size=32)
+        try:
+            with open(filename, mode='rb') as file:
+                while length > 0:
+                    data = file.read(min(length, JtRLogParser.read_size))
+                    if not data:
+                        return None
+                    digest.update(data)
+                    length -= len(data)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _map_log_id(self, record_id, record_type, id_map):
+        """
+        Converts an id used by RecordingParser to the real strike or session id
+
+        Inputs:
+            record_id: (Tuple) ("local", index) for ids created by the worker. Otherwise
+            this is already a real id
+
+            record_type: (String) "strike" or "session"
+
+            id_map: (Dict) Filled in by _merge_log_records()
+
+        Returns:
+            id: (Int) The real id
+        """
+        if isinstance(record_id, tuple):
+            return id_map[(record_type, record_id[1])]
+        return record_id
     
     def is_logfile(self, filename):
         """
@@ -36,6 +36,7 @@ class PWCrackerMgr:
         # Set cracker specific variables (default is JtR since I'm biased)
         self.pot_extension = ".pot"
         self.hash_type = "jtr_hash"
+        self.mode_field = "jtr_mode"
         self.name = "Generic Password Cracking Class"
 
         # Initialize the log file directionry
@@ -96,7 +97,7 @@ class PWCrackerMgr:
             return False
         return True
 
-    def load_potfile(self, filename, hash_list, update_only=True):
+    def load_potfile(self, filename, hash_list, update_only=True, crack_time=None):
         """
         Loads in newly cracked hashes into hash_list
 
@@ -110,6 +111,9 @@ class PWCrackerMgr:
             of another password cracking session in your potfile and don't want to mess
             up your analysis of your current session.
 
+            crack_time: (Float) When the new cracks were cracked in seconds since the epoch.
+            If None, the time they were loaded is used. 0 if it isn't known. See HashList.add()
+
         Returns:
             new_cracks: (Int) The number of newly cracked passwords
 
@@ -136,7 +140,7 @@ class PWCrackerMgr:
 
                     if update_only:
                         # Add cracks/plaintext to the hash
-                        new_cracks += hash_list.update(hash,plaintext=plain)
+                        new_cracks += hash_list.update(hash,plaintext=plain, crack_time=crack_time)
                     else:
                         # Add the hash
                         # If the hash has already been added/cracked nothing changes
@@ -150,9 +154,9 @@ class PWCrackerMgr:
                         # which case it might make sense to do this on the raw hash vs. the normalized one
                         hash_info = hash_fingerprint(hash)
                         if hash_info['type']: 
-                            new_cracks += hash_list.add(hash,plaintext=plain, type=hash_info['type'])
+                            new_cracks += hash_list.add(hash,plaintext=plain, type=hash_info['type'], crack_time=crack_time)
                         else:
-                            new_cracks += hash_list.add(hash,plaintext=plain)
+                            new_cracks += hash_list.add(hash,plaintext=plain, crack_time=crack_time)
 
         except Exception as msg:
             print(f"Exception when trying to parse the pot file: {msg}")
@@ -329,4 +333,117 @@ class PWCrackerMgr:
             command: (STR) The command that should be used to generate appropriate
             potfiles and logfiles
         """
-        return "Not Implimented"
\ No newline at end of file
+        return "Not Implimented"
+    
+    def create_attack_command(self, hash_file, hash_mode=None, attack_mode=None, options=None, session_name=None):
+        """
+        Stub function that creates the command line to run a specific attack using the
+        same pot file and log file options as print_command()
+
+        This should be implimented in the actual password manager implimentations
+
+        Inputs:
+            hash_file: (STR) The file containing the hashes to attack (aka a left list)
+
+            hash_mode: (STR) The password cracker specific hash format/mode
+
+            attack_mode: (STR) The attack mode as recorded in a Session. E.g. "wordlist", "mask"
+
+            options: (Dict) Session options describing the attack. E.g. 'wordlist', 'ruleset', 'mask'.
+            If None, no options are used
+
+            session_name: (STR) The name to use for the session/log files. Needed if running multiple
+            attacks at the same time
+
+        Returns:
+            command: (List) The command split into arguments
+
+            None: If the attack can't be recreated from the command line
+        """
+        return None
+
+    def parse_attack_command(self, command):
+        """
+        Stub function that parses a command line into the same session_info format that
+        is created when parsing logs. The reverse of create_attack_command()
+
+        This should be implimented in the actual password manager implimentations
+
+        Inputs:
+            command: (STR or List) The command line. Either as a string or split into arguments
+
+        Returns:
+            session_info: (Dict) Same format as SessionList.add()
+
+            None: If the command line couldn't be parsed
+        """
+        return None
+
+    def lookup_hash_types(self, mode, hash_list):
+        """
+        Maps a password cracker specific hash mode (as recorded in Sessions) back to the
+        hash types used in this framework
+
+        Inputs:
+            mode: (STR) The password cracker specific hash format/mode
+
+            hash_list: (HashList) Holds the hash type information
+
+        Returns:
+            types: (List) The hash types that match the mode. Empty if there is no match
+        """
+        return hash_list.get_types_by_mode(mode, self.mode_field)
+
+    def read_benchmark_file(self, filename):
+        """
+        Stub function for parsing the saved output of a password cracker benchmark
+
+        This should be implimented in the actual password manager implimentations
+
+        Inputs:
+            filename: (str) The full path and filename of the benchmark output
+
+        Returns:
+            speeds: (Dict) Key is the password cracker specific mode, value is the
+            measured hashes per second. Empty if nothing could be parsed
+        """
+        return {}
+
+    def _get_file_id(self, filename):
+        """
+        Returns something that identifies the file on disk, even if it is renamed
+
+        Inputs:
+            filename: (String) The file to check
+
+        Returns:
+            file_id: (Tuple) The device and inode of the file. None if it couldn't be read
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def _parse_speed(self, value, unit):
+        """
+        Converts a speed like "71933K" or "59840.6 MH/s" into hashes per second
+
+        Inputs:
+            value: (str) The numeric portion of the speed
+
+            unit: (str) The unit/suffix. E.g. "K", "MH/s", "c/s"
+
+        Returns:
+            speed: (float) Hashes per second
+        """
+        multipliers = {
+            'k':1000,
+            'm':1000000,
+            'g':1000000000,
+            't':1000000000000,
+        }
+        speed = float(value)
+        if unit and unit[0].lower() in multipliers:
+            speed *= multipliers[unit[0].lower()]
+        return speed
@@ -12,6 +12,9 @@ quick lookup lists
 """
 
 
+from collections import deque
+
+
 class Session:
     """
     Information about a particular cracking session
@@ -20,6 +23,12 @@ class Session:
     and what hashes were cracked during the session
     """
 
+    # How many status updates to keep for a running session. Older ones are dropped
+    max_status_history = 1000
+
+    # How many of the most recent status updates to average when reporting the speed
+    speed_samples = 5
+
     def __init__(self, pw_cracker_mgr, session_info, compleated=False):
         """
         Initializes the session, don't include specific cracks yet
@@ -71,6 +80,9 @@ class Session:
         # Can be added to later if desired
         self.hashes = []
 
+        # Same as self.hashes but used to quickly check for duplicates
+        self.hash_set = set()
+
         # How many hashes were cracked in the attack
         self.num_cracked_hashes = 0
 
@@ -80,6 +92,14 @@ class Session:
         # the session to find it.
         self.strike_id_list = []
 
+        # Same as self.strike_id_list but used to quickly check for duplicates since a
+        # session can have a lot of strikes
+        self.strike_id_set = set()
+
+        # Speed/progress telemetry for sessions that are still running. Each entry is a
+        # Dict created by the password cracker manager (see HashcatMgr.read_status_file())
+        self.status_history = deque(maxlen=self.max_status_history)
+
     def add_strike(self, strike_id):
         """
         Adds a strike by id to this session
@@ -93,8 +113,9 @@ class Session:
         Returns:
             num_new: (Int) the number of new cracks from this crack. Will be 0 or 1.
         """
-        if strike_id in self.strike_id_list:
+        if strike_id in self.strike_id_set:
             return 0
+        self.strike_id_set.add(strike_id)
         self.strike_id_list.append(strike_id)
         self.num_cracked_hashes += 1
         return 1
@@ -112,12 +133,78 @@ class Session:
         Returns:
             num_new: (Int) the number of new hashes. Will be 0 or 1.
         """
-        if hash_id in self.hashes:
+        if hash_id in self.hash_set:
             return 0
+        self.hash_set.add(hash_id)
         self.hashes.append(hash_id)
-        return 
+        return 1
+
+    def add_status(self, status):
+        """
+        Adds a status update for a running session
+
+        Inputs:
+            status: (Dict) The status update. Needs to include 'speed', 'progress',
+            'progress_total', and 'running'
+        """
+        self.status_history.append(status)
+
+    def get_latest_status(self):
+        """
+        Returns the most recent status update
+
+        Returns:
+            status: (Dict) The last status update. None if there haven't been any
+        """
+        if not self.status_history:
+            return None
+        return self.status_history[-1]
+
+    def is_running(self):
+        """
+        Says if the last status update for this session showed it was still running
+
+        Returns:
+            running: (Bool) True if the session is running
+        """
+        status = self.get_latest_status()
+        if not status or self.compleated:
+            return False
+        return status['running']
+
+    def get_speed(self):
+        """
+        Returns the average speed of the most recent status updates. Averaging smooths
+        out the jumps in speed that happen when the cracker switches rules/wordlists
+
+        Returns:
+            speed: (Float) Hashes per second. None if there are no status updates with a speed
+        """
+        speeds = []
+        for status in reversed(self.status_history):
+            if status['speed']:
+                speeds.append(status['speed'])
+                if len(speeds) >= self.speed_samples:
+                    break
+        if not speeds:
+            return None
+        return sum(speeds) / len(speeds)
+
+    def get_eta(self):
+        """
+        Returns the estimated number of seconds until this session finishes
+
+        Returns:
+            eta: (Float) Seconds left. None if it can't be estimated
+        """
+        status = self.get_latest_status()
+        speed = self.get_speed()
+        if not status or not speed or not status['progress_total']:
+            return None
+        return max(0, status['progress_total'] - status['progress']) / speed
     
 
+
 class SessionList:
     """
     Keeps track of all the sessions
@@ -140,6 +227,23 @@ class SessionList:
         # Sessions sorted by hash type
         self.hash_type_lookup = {}
 
+        # Key = session signature (see _get_signature()), value = [list of session_ids]
+        # Used to quickly find duplicate sessions vs. comparing against every session
+        self.signature_lookup = {}
+
+        # Key = session_id, value = the signature it is saved under in signature_lookup
+        self.session_signatures = {}
+
+        # Key = coverage key (see get_coverage_key()), value = [list of session_ids]
+        # Used to quickly check if an attack has already been run
+        self.coverage_lookup = {}
+
+        # Key = session_id, value = the coverage key it is saved under in coverage_lookup
+        self.session_coverage = {}
+
+        # Coverage keys where at least one of the sessions ran to completion
+        self.exhausted_coverage = set()
+
     def add(self, pw_cracker_mgr, session_info, compleated=False, check_duplicates=True):
         """
         Inputs:
@@ -161,45 +265,15 @@ class SessionList:
         Returns:
             session_id: (INT) The ID of the Session. If a problem occurs, returns -1
         """
+        options = session_info.get('options', {})
+        signature = self._get_signature(pw_cracker_mgr.name, session_info.get('mode'), session_info.get('hash_type'), options)
+
         # Look for duplicates
         if check_duplicates:
-            for session_id, session in self.sessions.items():
-                if pw_cracker_mgr.name != session.tool:
-                    continue
-                if 'mode' in session_info and session.mode != session_info['mode']:
-                    continue
-                elif 'mode' not in session_info and session.mode:
-                    continue
-                if 'hash_type' in session_info and session_info['hash_type'] != session.hash_type:
-                    continue
-
-                # Session specific options
-                exact_match = True
-
-                if 'options' not in session_info and len(session.options.keys()) > 0:
-                    continue
-                elif 'options' in session_info:
-                    for key, value in session_info['options'].items():
-                        if key in session.options and value == session.options[key]:
-                            pass
-
-                        # Only count this new session if the runtime was longer than the previous one
-                        elif key == "total_time" and session.options["total_time"] < value:
-                            pass
-
-                        else:
-                            exact_match = False
-                            break
-                
-                if exact_match:
-                    # Update compleated if it was not set before
-                    if not session.compleated:
-                        session.compleated = compleated
-
-                    # Update time if that was not set before
-                    if "total_time" in session_info['options']:
-                        session.options['total_time'] = session_info['options']['total_time']
-                    return session_id 
+            duplicate_id = self._get_duplicate(signature, options)
+            if duplicate_id is not None:
+                self._merge_duplicate(duplicate_id, options, compleated)
+                return duplicate_id
 
         session_id = self.next_index
         self.next_index += 1
@@ -215,4 +289,304 @@ class SessionList:
             self.hash_type_lookup[identified_hash_type] = []
         self.hash_type_lookup[identified_hash_type].append(session_id)
 
-        return session_id
\ No newline at end of file
+        self._add_signature(session_id, signature)
+        self._update_coverage(session_id)
+
+        return session_id
+
+    def update(self, session_id, session_info, compleated=False, check_duplicates=False):
+        """
+        Updates a session that was saved while it was still running. Used when parsing a
+        log file that is still being written to
+
+        Sessions that are still running should be added with check_duplicates=False since
+        their total_time is only partial. Once the session is over, update it with
+        check_duplicates=True so it is merged the same way add() would have
+
+        Inputs:
+            session_id: (INT) The ID of the Session to update
+
+            session_info: (Dict) The latest information about the session. Same format as add()
+
+            compleated: (Bool) If this session has now finished. A session that was compleated
+            before stays compleated
+
+            check_duplicates: (Bool) If the session should be merged into a duplicate of it. See add()
+
+        Returns:
+            session_id: (INT) The ID of the Session. If it was merged into a duplicate, the ID of
+            the duplicate. If a problem occurs, returns -1
+        """
+        if session_id not in self.sessions:
+            print(f"Error: Trying to update a session that doesn't exist. Session ID: {session_id}")
+            return -1
+
+        session = self.sessions[session_id]
+
+        if 'mode' in session_info:
+            session.mode = session_info['mode']
+
+        if compleated:
+            session.compleated = compleated
+
+        if 'options' in session_info and session_info['options'] is not session.options:
+            session.options.update(session_info['options'])
+
+        # Update the lookup index if the hash type was found since the last update
+        if 'hash_type' in session_info and session_info['hash_type'] != session.hash_type:
+            prev_hash_type = "unknown"
+            if session.hash_type:
+                prev_hash_type = session.hash_type
+            self.hash_type_lookup[prev_hash_type].remove(session_id)
+            if not self.hash_type_lookup[prev_hash_type]:
+                del self.hash_type_lookup[prev_hash_type]
+
+            session.hash_type = session_info['hash_type']
+            if session.hash_type not in self.hash_type_lookup:
+                self.hash_type_lookup[session.hash_type] = []
+            self.hash_type_lookup[session.hash_type].append(session_id)
+
+        # The mode and options may have changed so re-index the session
+        signature = self._get_signature(session.tool, session.mode, session.hash_type, session.options)
+        if signature != self.session_signatures[session_id]:
+            self._remove_signature(session_id)
+            self._add_signature(session_id, signature)
+
+        if check_duplicates:
+            duplicate_id = self._get_duplicate(signature, session.options, skip=session_id)
+            if duplicate_id is not None:
+                self._merge_duplicate(duplicate_id, session.options, session.compleated)
+                for strike_id in session.strike_id_list:
+                    self.sessions[duplicate_id].add_strike(strike_id)
+                for hash_id in session.hashes:
+                    self.sessions[duplicate_id].add_hash(hash_id)
+                self._remove(session_id)
+                return duplicate_id
+
+        self._update_coverage(session_id)
+
+        return session_id
+
+    def _get_duplicate(self, signature, options, skip=None):
+        """
+        Looks for a session that a new session with this signature should be merged into
+
+        Inputs:
+            signature: (Tuple) The signature from _get_signature()
+
+            options: (Dict) The options of the new session
+
+            skip: (INT) A session_id to ignore. Used so a session isn't a duplicate of itself
+
+        Returns:
+            session_id: (INT) The ID of the duplicate. None if there isn't one
+        """
+        for session_id in self.signature_lookup.get(signature, []):
+            if session_id == skip:
+                continue
+            session = self.sessions[session_id]
+
+            # Only count this new session if the runtime was longer than the previous one
+            if "total_time" in options and session.options.get("total_time", 0) > options["total_time"]:
+                continue
+
+            return session_id
+        return None
+
+    def _merge_duplicate(self, session_id, options, compleated):
+        """
+        Updates a session with the results of a duplicate of it
+
+        Inputs:
+            session_id: (INT) The ID of the session found by _get_duplicate()
+
+            options: (Dict) The options of the duplicate
+
+            compleated: (Bool) If the duplicate ran to completion
+        """
+        session = self.sessions[session_id]
+
+        # Update compleated if it was not set before
+        if not session.compleated:
+            session.compleated = compleated
+
+        # Update time if that was not set before
+        if "total_time" in options:
+            session.options['total_time'] = options['total_time']
+
+        self._update_coverage(session_id)
+
+    def _remove(self, session_id):
+        """
+        Removes a session from the list and all the lookup indexes. Used when a session was
+        merged into a duplicate of it
+
+        If it was the last session added, its id is given out again so the ids match what
+        they would have been if the session had never been added
+
+        Inputs:
+            session_id: (INT) The ID of the Session
+        """
+        session = self.sessions.pop(session_id)
+
+        identified_hash_type = "unknown"
+        if session.hash_type:
+            identified_hash_type = session.hash_type
+        self.hash_type_lookup[identified_hash_type].remove(session_id)
+        if not self.hash_type_lookup[identified_hash_type]:
+            del self.hash_type_lookup[identified_hash_type]
+
+        self._remove_signature(session_id)
+        self._remove_coverage(session_id)
+
+        if session_id == self.next_index - 1:
+            self.next_index -= 1
+
+    def _get_signature(self, tool, mode, hash_type, options):
+        """
+        Creates the key used to look for duplicate sessions
+
+        total_time isn't included since a session that ran longer than a previous one with
+        the same signature is still considered a duplicate. See add()
+
+        Inputs:
+            tool: (String) The name of the PWCrackerMgr that ran the session
+
+            mode: (String) The attack mode
+
+            hash_type: (String) The hash type that was targeted
+
+            options: (Dict) The session specific options
+
+        Returns:
+            signature: (Tuple) Sessions with the same signature are duplicates
+        """
+        # Sorting so the order the options were added in doesn't matter
+        items = tuple(sorted((key, value) for key, value in options.items() if key != "total_time"))
+        try:
+            hash(items)
+        except TypeError:
+            # Some of the values can't be used in a dict key (aka lists)
+            items = tuple((key, repr(value)) for key, value in items)
+        return (tool, mode, hash_type, items)
+
+    def _add_signature(self, session_id, signature):
+        """
+        Adds a session to signature_lookup
+
+        Inputs:
+            session_id: (INT) The ID of the Session
+
+            signature: (Tuple) The signature from _get_signature()
+        """
+        if signature not in self.signature_lookup:
+            self.signature_lookup[signature] = []
+        self.signature_lookup[signature].append(session_id)
+        self.session_signatures[session_id] = signature
+
+    def _remove_signature(self, session_id):
+        """
+        Removes a session from signature_lookup
+
+        Inputs:
+            session_id: (INT) The ID of the Session
+        """
+        signature = self.session_signatures.pop(session_id)
+        self.signature_lookup[signature].remove(session_id)
+        if not self.signature_lookup[signature]:
+            del self.signature_lookup[signature]
+
+    def get_coverage_key(self, tool, hash_type, mode, options):
+        """
+        Creates the key used to check if an attack has already been run
+
+        Only includes what defines the guesses that are made: the hash type, mode, wordlist,
+        and the ruleset/mask/incremental mode. The same as SessionMgr._get_attack_key() but
+        using the password cracker specific hash type since that's what is recorded in the
+        Session. Hash types and rulesets are compared case insensitive since JtR isn't
+        consistent with how it capitalizes them
+
+        Inputs:
+            tool: (String) The name of the PWCrackerMgr that ran the session
+
+            hash_type: (String) The password cracker specific hash type/mode
+
+            mode: (String) The attack mode
+
+            options: (Dict) The session specific options
+
+        Returns:
+            key: (Tuple) (tool, hash_type, mode, wordlist, ruleset/mask)
+        """
+        if hash_type is not None:
+            hash_type = str(hash_type).lower()
+
+        rules = None
+        if options.get('ruleset'):
+            rules = options['ruleset'].lower()
+        elif options.get('mask'):
+            rules = options['mask']
+        elif options.get('incremental'):
+            rules = options['incremental'].lower()
+        elif mode == "single":
+            # Single mode uses the [List.Rules:Single] section if no rules are specified
+            rules = "single"
+
+        return (tool, hash_type, mode, options.get('wordlist'), rules)
+
+    def get_coverage(self, key):
+        """
+        Checks if an attack has already been run
+
+        Inputs:
+            key: (Tuple) The key from get_coverage_key()
+
+        Returns:
+            coverage: (String) "exhausted" if a session ran this attack to completion, "partial" if it
+            was only partially run, or "new" if it has never been run
+        """
+        if key in self.exhausted_coverage:
+            return "exhausted"
+        if key in self.coverage_lookup:
+            return "partial"
+        return "new"
+
+    def _update_coverage(self, session_id):
+        """
+        Adds a session to coverage_lookup, or re-indexes it if the attack or compleated
+        status changed since it was last indexed
+
+        Inputs:
+            session_id: (INT) The ID of the Session
+        """
+        session = self.sessions[session_id]
+        key = self.get_coverage_key(session.tool, session.hash_type, session.mode, session.options)
+
+        prev_key = self.session_coverage.get(session_id)
+        if prev_key != key:
+            if prev_key is not None:
+                self._remove_coverage(session_id)
+
+            if key not in self.coverage_lookup:
+                self.coverage_lookup[key] = []
+            self.coverage_lookup[key].append(session_id)
+            self.session_coverage[session_id] = key
+
+        if session.compleated:
+            self.exhausted_coverage.add(key)
+
+    def _remove_coverage(self, session_id):
+        """
+        Removes a session from coverage_lookup
+
+        Inputs:
+            session_id: (INT) The ID of the Session
+        """
+        key = self.session_coverage.pop(session_id)
+        self.coverage_lookup[key].remove(session_id)
+        if not self.coverage_lookup[key]:
+            del self.coverage_lookup[key]
+            self.exhausted_coverage.discard(key)
+        elif key in self.exhausted_coverage:
+            if not any(self.sessions[index].compleated for index in self.coverage_lookup[key]):
+                self.exhausted_coverage.discard(key)
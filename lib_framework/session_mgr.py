@@ -10,7 +10,11 @@ functions in the Jupyter Notebook
 
 # Data analysis and visualization imports
 import matplotlib.pyplot as plt
+import datetime
+import math
 import os
+import re
+import time
 
 # Local imports
 from .config_mgmt import load_config
@@ -18,14 +22,24 @@ from .jtr_mgr import JTRMgr
 from .hashcat_mgr import HashcatMgr
 from .challenge_specific_functions import load_challenge_files
 from .hash import HashList
+from .hash_fingerprint import is_salted_type
 from .target import TargetList
 from .session import SessionList
 from .strike import StrikeList
 from ._session_mgr_log_handling import Mixin as LogHandlingMixin
 from ._session_mgr_strike_handling import Mixin as StrikeHandlingMixin
+from ._session_mgr_attack_planning import Mixin as AttackPlanningMixin
+from ._session_mgr_job_handling import Mixin as JobHandlingMixin
+from ._session_mgr_sharding import Mixin as ShardingMixin
+from ._session_mgr_export import Mixin as ExportMixin
+from ._session_mgr_password_analysis import Mixin as PasswordAnalysisMixin
 
 
-class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
+# Digits and specials at the start and end of a password. See export_wordlist()
+_BASE_WORD_REGEX = re.compile(r"^[\W\d_]+|[\W\d_]+$")
+
+
+class SessionMgr(LogHandlingMixin, StrikeHandlingMixin, AttackPlanningMixin, JobHandlingMixin, ShardingMixin, ExportMixin, PasswordAnalysisMixin):
     """
     Making it easy to reference hashes, configs,
     and interfaces from the Jupyter Notebook
@@ -76,9 +90,20 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
         self.session_list = SessionList()
         self.strike_list = StrikeList()
 
+        # Key = full path to a Hashcat status file, value = the session_id it is recorded in
+        self.status_file_sessions = {}
+
+        # If the main pots have been loaded yet. See load_main_pots()
+        self.main_pots_loaded = False
+
     def load_main_pots(self, verbose=True, update_only=True):
         """
         Responsible for going through the main JtR and Hashcat pots and updating cracked passwords
+
+        Pot files don't say when a hash was cracked. The first time the pots are loaded most of
+        the cracks are from before the notebook was started, so their crack time is recorded as
+        unknown. That way they don't show up as a burst of cracks in get_crack_projections().
+        Cracks loaded after that are timestamped with when they were loaded
         
         Inputs:
             verbose: (Bool) If true, will print out more statistics about the
@@ -88,15 +113,20 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
             This is to keep results from other cracking sessions from muddying the current cracking session
             analysis being done.
         """
+        crack_time = None
+        if not self.main_pots_loaded:
+            crack_time = 0
+        self.main_pots_loaded = True
+
         if self.jtr:
-            new_cracks = self.jtr.load_potfile(self.jtr.main_pot_file, self.hash_list, update_only=update_only) 
+            new_cracks = self.jtr.load_potfile(self.jtr.main_pot_file, self.hash_list, update_only=update_only, crack_time=crack_time) 
             if new_cracks == -1:
                 print(f"Error loading hashes from the main John the Ripper pot file {self.jtr.main_pot_file}")
             elif verbose:
                 print(f"Number of new JtR cracked passwords: {new_cracks}")
 
         if self.hc:
-            new_cracks = self.hc.load_potfile(self.hc.main_pot_file, self.hash_list, update_only=update_only) 
+            new_cracks = self.hc.load_potfile(self.hc.main_pot_file, self.hash_list, update_only=update_only, crack_time=crack_time) 
             if new_cracks == -1:
                 print(f"Error loading hashes from the main Hashcat pot file {self.hc.main_pot_file}")
             elif verbose:
@@ -137,6 +167,118 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
             if info['total'] != 0:
                 print(f"{type:<15}:{info['total']:<10}:{info['cracked']:<10}:{info['total']-info['cracked']:<10}:{info['cracked']/info['total']:.0%}")
 
+    def get_crack_projections(self, end_time=None, window=6*3600, now=None):
+        """
+        Projects how many more hashes of each type will be cracked by the end of the contest
+        based on how fast they've been cracked recently
+
+        The crack rate comes from the crack times recorded in HashList. Cracks loaded from pot
+        files are timestamped when they were loaded, so the rate only means something for
+        cracks loaded while cracking is happening (or from Hashcat outfiles that include
+        the crack time). Cracks that were already in the pots when they were first loaded
+        don't have a crack time and aren't counted. See load_main_pots()
+
+        Inputs:
+            end_time: (datetime or Float) When the contest ends. Either a datetime, a date, or seconds
+            since the epoch. If None, uses 'contest_end' under 'session_management' in the config.
+            If that isn't set either, no projections are made
+
+            window: (Int) How many seconds back to look when calculating the crack rate
+
+            now: (Float) The current time in seconds since the epoch. If None the current time is used
+
+        Returns:
+            projections: (Dict) Key = hash type, value =
+            {
+                'remaining':(int) Uncracked hashes of this type,
+                'cracks_per_hour':(float) Recent crack rate,
+                'last_crack':(int) When the last hash was cracked, None if none have been,
+                'projected_cracks':(int) Expected cracks by end_time. None if there is no end_time,
+                'projected_points':(int) projected_cracks * the score for the type,
+                'stalled':(bool) True if there are hashes left but none were cracked during the window,
+            }
+
+            None: If end_time isn't a supported type
+        """
+        if now is None:
+            now = time.time()
+
+        if end_time is None:
+            end_time = self.config.get('session_management', {}).get('contest_end')
+        if isinstance(end_time, str):
+            try:
+                end_time = datetime.datetime.fromisoformat(end_time)
+            except ValueError:
+                print(f"Error: contest_end of {end_time} is not an ISO 8601 date")
+                end_time = None
+        if isinstance(end_time, datetime.datetime):
+            end_time = end_time.timestamp()
+        # YAML loads dates without a time, (e.g. 2023-08-10), as a date. Treat it as midnight
+        elif isinstance(end_time, datetime.date):
+            end_time = datetime.datetime.combine(end_time, datetime.time()).timestamp()
+        elif end_time is not None and not isinstance(end_time, (int, float)):
+            print(f"Error: contest_end of {end_time} needs to be a date, datetime, or seconds since the epoch")
+            return None
+
+        hours_left = None
+        if end_time is not None:
+            hours_left = max(0, end_time - now) / 3600
+
+        projections = {}
+        for type, info in self.hash_list.type_info.items():
+            # Don't include types that don't have any hashes associated with them
+            if info['total'] == 0:
+                continue
+
+            remaining = info['total'] - info['cracked']
+            cracks_per_hour = self.hash_list.get_crack_rate(type, window=window, now=now)
+
+            last_crack = None
+            history = self.hash_list.get_crack_history(type)
+            if history:
+                last_crack = max(self.hash_list.crack_times[index] for index in self.hash_list.type_list[type])
+
+            projected_cracks = None
+            projected_points = None
+            if hours_left is not None:
+                projected_cracks = min(remaining, int(cracks_per_hour * hours_left))
+                projected_points = projected_cracks * info['score']
+
+            projections[type] = {
+                'remaining':remaining,
+                'cracks_per_hour':cracks_per_hour,
+                'last_crack':last_crack,
+                'projected_cracks':projected_cracks,
+                'projected_points':projected_points,
+                'stalled':remaining > 0 and cracks_per_hour == 0,
+            }
+
+        return projections
+
+    def print_crack_rates(self, end_time=None, window=6*3600):
+        """
+        Prints the recent crack rate and projected cracks for each hash algorithm, and
+        flags the ones that have stalled. See get_crack_projections()
+
+        Inputs:
+            end_time: (datetime or Float) When the contest ends. See get_crack_projections()
+
+            window: (Int) How many seconds back to look when calculating the crack rate
+        """
+        now = time.time()
+        projections = self.get_crack_projections(end_time=end_time, window=window, now=now)
+        if projections is None:
+            return
+
+        print("Algorithm      :Remaining :Cracks/Hour :Projected :Last Crack")
+        for type, info in projections.items():
+            projected = "N/A" if info['projected_cracks'] is None else info['projected_cracks']
+            last_crack = "Never"
+            if info['last_crack']:
+                last_crack = f"{(now - info['last_crack']) / 60:.0f} minutes ago"
+            stalled = " (Stalled)" if info['stalled'] else ""
+            print(f"{type:<15}:{info['remaining']:<10}:{info['cracks_per_hour']:<12.2f}:{projected:<10}:{last_crack}{stalled}")
+
     def print_attack_formats(self):
         """
         Prints the JtR and Hashcat formats/types to use when targeting hashes
@@ -150,6 +292,81 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
             if info['total'] != 0:
                 print(f"{type:<15}:{info['total']-info['cracked']:<16}:{info['jtr_mode']:<16}:{info['hc_mode']}")
 
+    def load_benchmark_file(self, filename, rig=None, cracker_name="all"):
+        """
+        Loads the saved output of "john --test" or "hashcat -b" and stores the measured
+        speed for each hash type in HashList.type_info
+
+        Benchmarks can be loaded from multiple rigs. The speed for a hash type is the total
+        across all the rigs.
+
+        Inputs:
+            filename: (String) The benchmark output to load
+
+            rig: (String) The name of the rig the benchmark was run on. If None, the filename
+            is used as the rig name
+
+            cracker_name: (String) "jtr", "hc", or "all". If "all", the format of the
+            benchmark file is autodetected
+
+        Returns:
+            num_types: (Int) The number of hash types that had their speed updated
+        """
+        if not rig:
+            rig = os.path.basename(filename)
+
+        speeds = {}
+        pw_cracker_mgr = None
+        for cur_name, cur_mgr in [('jtr', self.jtr), ('hc', self.hc)]:
+            if cracker_name not in ['all', cur_name]:
+                continue
+            speeds = cur_mgr.read_benchmark_file(filename)
+            if speeds:
+                pw_cracker_mgr = cur_mgr
+                break
+
+        if not speeds:
+            print(f"Error: No benchmark results were found in {filename}")
+            return 0
+
+        num_types = 0
+        for mode, hashes_per_second in speeds.items():
+            for type in pw_cracker_mgr.lookup_hash_types(mode, self.hash_list):
+                self.hash_list.set_speed(type, hashes_per_second, rig=rig)
+                num_types += 1
+
+        return num_types
+
+    def print_cost_estimates(self):
+        """
+        Prints the estimated time to try one million candidate passwords against
+        all the remaining salts of each hash type that still has uncracked hashes
+
+        Uses the speeds from load_benchmark_file() if they have been loaded. Otherwise
+        uses a rough guess based on the cost assigned when the hash type was identified
+        """
+        print("Algorithm      :Num Remaining   :Salts Left      :Hashes/Sec      :Sec Per 1M Candidates")
+        for type, info in self.hash_list.type_info.items():
+            remaining = info['total'] - info['cracked']
+            if remaining <= 0:
+                continue
+
+            # Every salt needs to be attacked separately
+            num_salts = self.hash_list.get_num_salts_left(type)
+
+            cost = self.hash_list.get_cost(type)
+            if info['speed']:
+                speed = f"{info['speed']:.0f}"
+            else:
+                speed = f"<est: {info['cost']}>"
+
+            if cost is None:
+                estimate = "N/A"
+            else:
+                estimate = f"{cost * num_salts * 1000000:.4g}"
+
+            print(f"{type:<15}:{remaining:<16}:{num_salts:<16}:{speed:<16}:{estimate}")
+
     def print_score(self):
         """
         Prints the current score as defined by the config file
@@ -411,7 +628,7 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
 
         return
 
-    def create_left_list(self, format="jtr", file_name=None, hash_type=None, filter=None, silent=False):
+    def create_left_list(self, format="jtr", file_name=None, hash_type=None, filter=None, silent=False, order_by_salt=False, min_hashes_per_salt=None, range_filter=None):
         """
         Creates a hash file of uncracked hashes.
 
@@ -434,6 +651,20 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
             full resutls are still sent via the return value. This is useful if you are feeding
             the results of this function into a variable vs. making it human readable
 
+            order_by_salt: (BOOL) If True, hashes are grouped by salt and the salts with the most
+            uncracked hashes are written first. That way attacks that are stopped early have
+            spent their time on the salts that have the most chances for a crack. All the
+            hashes of an unsalted type are treated as sharing one salt
+
+            min_hashes_per_salt: (Int) If not None, only write hashes whose salt has at least
+            this many uncracked hashes in the left list. Hashes of unsalted types, and hashes
+            whose salt couldn't be parsed, are always written
+
+            range_filter: (Dict) Key = metadata field, value = (min, max). Only write hashes of
+            targets whose metadata is inside all of the ranges. Either bound can be None. Use
+            datetime/date bounds for dates and numbers for numeric fields.
+            E.g. {'Created':(datetime.date(2022, 5, 1), None)}. See TargetList.filter_range()
+
         Returns:
             wordlist: (List) List of all the hashes written to disk or printed out
         """
@@ -446,18 +677,14 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
             return
 
         # Sanity check on filter values to make sure they are correct
-        if hash_type and hash_type not in self.hash_list.type_info:
-            print(f"Error: hash_type of {hash_type} is not a type that has been loaded into this framework")
+        if not self._check_filter(hash_type=hash_type, filter=filter):
             return
-        
-        if filter:
-            for key, value in filter.items():
-                if key not in self.target_list.meta_lookup:
-                    print(f"Error: filter/metadata with a key of of {key} has not been entered into the target/metadata datastructures")
-                    return
-                if value and value not in self.target_list.meta_lookup[key]:
-                    print(f"Error: filter/metadata with a key of of {key} and value of {value} has not been entered into the target/metadata datastructures")
-                    return
+
+        range_hash_ids = None
+        if range_filter:
+            range_hash_ids = self._get_range_filter_hash_ids(range_filter)
+            if range_hash_ids is None:
+                return
         
         # If not printing to stdout, open the file 
         if file_name:
@@ -474,26 +701,27 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
         # to generate the left list. I'm concerned about the code complexity though so for
         # this current implimentation I'm just going to loop through all hashes and then
         # apply filters to them to see if they should be included in the left list
+        hash_ids = []
         for hash_id, hash in self.hash_list.hashes.items():
             # First filter, if it has a plaintext, don't include it in the left list
             if hash.plaintext:
                 continue
 
+            if range_hash_ids is not None and hash_id not in range_hash_ids:
+                continue
+
             # Next filter based on filters/metadata
             if not self._filter_hash_id(hash_id=hash_id, hash_type=hash_type, filter=filter):
                 continue
 
+            hash_ids.append(hash_id)
+
+        if order_by_salt or min_hashes_per_salt:
+            hash_ids = self._order_by_salt(hash_ids, order_by_salt=order_by_salt, min_hashes_per_salt=min_hashes_per_salt)
+
+        for hash_id in hash_ids:
             # Add this hash to the left list
-            # Format the hash for the target password cracking program
-            if format == "jtr":
-                out_hash = self.jtr.format_hash(hash.hash, self.hash_list.type_lookup[hash_id])
-                # Add in the hash_id as a username to make parsing the log files easier
-                out_hash = f"{hash_id}:{out_hash}"
-            # Not a password cracker, instead use the index to the hash in this framework
-            elif format == "index":
-                out_hash = hash_id
-            else:
-                out_hash = self.hc.format_hash(hash.hash, self.hash_list.type_lookup[hash_id])
+            out_hash = self._format_left_list_hash(hash_id, format)
             
             wordlist.append(out_hash)
             if file:
@@ -507,6 +735,214 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
 
         return wordlist
     
+    def _order_by_salt(self, hash_ids, order_by_salt=True, min_hashes_per_salt=None):
+        """
+        Groups hashes by salt and drops salts with too few hashes. See create_left_list()
+
+        Inputs:
+            hash_ids: (List) The hash ids to order
+
+            order_by_salt: (BOOL) If True, order the salts by number of hashes, largest first.
+            Otherwise the original order of the hashes is kept
+
+            min_hashes_per_salt: (Int) If not None, drop salts that have fewer hashes than this.
+            Unsalted types and salts that couldn't be parsed are never dropped
+
+        Returns:
+            hash_ids: (List) The filtered and ordered hash ids
+        """
+        # Key = (type, salt), value = [list of hash_ids]
+        # Dicts keep insertion order, so ties are broken by which salt showed up first
+        groups = {}
+        for hash_id in hash_ids:
+            type = self.hash_list.type_lookup[hash_id]
+            salt = self.hash_list.salt_lookup.get(hash_id)
+            key = (type, salt)
+            # A salted type where the salt couldn't be parsed. Since it's unknown which salt it
+            # shares, treat it as its own salt
+            if salt is None and is_salted_type(type):
+                key = (type, None, hash_id)
+            if key not in groups:
+                groups[key] = []
+            groups[key].append(hash_id)
+
+        if min_hashes_per_salt:
+            # Unsalted types (and unparsed salts) don't get any faster by leaving hashes out,
+            # so only actual salts are held to the minimum
+            groups = {key:group for key, group in groups.items() if key[1] is None or len(group) >= min_hashes_per_salt}
+
+            if not order_by_salt:
+                keep = set()
+                for group in groups.values():
+                    keep.update(group)
+                return [hash_id for hash_id in hash_ids if hash_id in keep]
+
+        ordered = []
+        for group in sorted(groups.values(), key=len, reverse=True):
+            ordered.extend(group)
+        return ordered
+
+    def print_salt_stats(self, hash_type=None, top_x=5):
+        """
+        Prints the number of unique salts per hash type, and the salts that have the most
+        uncracked hashes
+
+        Cracking speed for salted hashes depends on the number of salts vs. the number of
+        hashes, so this is useful to see how much work is left
+
+        Inputs:
+            hash_type: (STR) If not None, only print stats for this hash type
+
+            top_x: (Int) The number of salts with the most uncracked hashes to print per type
+        """
+        if hash_type and hash_type not in self.hash_list.type_info:
+            print(f"Error: hash_type of {hash_type} is not a type that has been loaded into this framework")
+            return
+
+        print("Algorithm      :Unique Salts    :Salts Left      :Hashes Left")
+        for type, info in self.hash_list.type_info.items():
+            if hash_type and type != hash_type:
+                continue
+            if not self.hash_list.salt_list[type]:
+                continue
+
+            salts_left = self.hash_list.get_salts_left(type)
+            print(f"{type:<15}:{len(self.hash_list.salt_list[type]):<16}:{len(salts_left):<16}:{info['total']-info['cracked']}")
+
+            for salt, num_left in sorted(salts_left.items(), key=lambda x: x[1], reverse=True)[:top_x]:
+                print(f"    {num_left:<8}:{salt}")
+
+    def _format_left_list_hash(self, hash_id, format):
+        """
+        Formats a hash to be written to a left list for the target password cracking program
+
+        Inputs:
+            hash_id: (Int) The lookup id for the hash
+
+            format: (STR) Should be either "jtr", "hc", "index". See create_left_list()
+
+        Returns:
+            out_hash: (STR) The formatted hash. (Int) if format is "index"
+        """
+        hash = self.hash_list.hashes[hash_id]
+        if format == "jtr":
+            out_hash = self.jtr.format_hash(hash.hash, self.hash_list.type_lookup[hash_id])
+            # Add in the hash_id as a username to make parsing the log files easier
+            return f"{hash_id}:{out_hash}"
+        # Not a password cracker, instead use the index to the hash in this framework
+        elif format == "index":
+            return hash_id
+        return self.hc.format_hash(hash.hash, self.hash_list.type_lookup[hash_id])
+
+    def create_date_candidates(self, field, hash_ids, file_name=None, date_format="epoch", offset=0, placeholder="placeholder", date_parse_format=None):
+        """
+        Creates one password guess per hash from a date in its target's metadata
+
+        This is meant to be paired with a left list created with format="index" for a Hashcat
+        association attack (-a 9), so line N of the wordlist is the guess for hash N.
+        E.g. the CMIYC 2023 passwords that were the Unix epoch of the "Created" date
+
+        Inputs:
+            field: (Str) The metadata field with the date. E.g. "Created"
+
+            hash_ids: (List) The hash ids to create guesses for, in left list order
+
+            file_name: (Str) If not None, write the guesses to this file
+
+            date_format: (Str) "epoch" for seconds since the epoch, otherwise a strftime() format
+            applied to the date in the timezone it was written in. Aka "Tue Oct 11 20:07:07 CST 2022"
+            with "%m%d%Y" is "10112022". Dates without a timezone are formatted in UTC
+
+            offset: (Int) Seconds to add to the date before formatting it. E.g. 3600 to adjust
+            for daylight savings time
+
+            placeholder: (Str) The guess to use for hashes that don't have a date
+
+            date_parse_format: (Str) strptime() format to try when parsing the metadata. See
+            TargetList.get_typed_column()
+
+        Returns:
+            guesses: (List) One guess per hash_id
+
+            None: If a problem occured
+        """
+        column = self.target_list.get_typed_column(field, column_type="datetime", date_format=date_parse_format)
+        values = column['values']
+        utc_offsets = column['utc_offsets']
+
+        # Key = (timestamp, utc_offset), value = formatted guess. A lot of targets share the same date
+        formatted = {}
+        guesses = []
+        for hash_id in hash_ids:
+            timestamp = math.nan
+            utc_offset = 0
+            for target_id in self.target_list.hash_lookup.get(hash_id, []):
+                if not math.isnan(values[target_id]):
+                    timestamp = values[target_id]
+                    utc_offset = utc_offsets[target_id]
+                    break
+            if math.isnan(timestamp):
+                guesses.append(placeholder)
+                continue
+
+            guess = formatted.get((timestamp, utc_offset))
+            if guess is None:
+                if date_format == "epoch":
+                    guess = str(int(timestamp) + offset)
+                else:
+                    # Using the timezone the date was written in so the day matches what the
+                    # target saw. Same as the dates matched by get_metadata_correlation()
+                    timezone = datetime.timezone(datetime.timedelta(seconds=utc_offset))
+                    guess = datetime.datetime.fromtimestamp(timestamp + offset, tz=timezone).strftime(date_format)
+                formatted[(timestamp, utc_offset)] = guess
+            guesses.append(guess)
+
+        if file_name:
+            try:
+                with open(file_name, mode='w') as file:
+                    file.write("".join(f"{guess}\n" for guess in guesses))
+            except Exception as msg:
+                print(f"Exception writing to {file_name}: {msg}")
+                return None
+
+        return guesses
+
+    def _get_range_filter_hash_ids(self, range_filter):
+        """
+        Returns the hash ids of the targets that match all the ranges. See create_left_list()
+
+        Inputs:
+            range_filter: (Dict) Key = metadata field, value = (min, max)
+
+        Returns:
+            hash_ids: (Set) The hash ids that match
+
+            None: If a problem occured
+        """
+        hash_ids = None
+        for field, bounds in range_filter.items():
+            if field not in self.target_list.meta_lookup:
+                print(f"Error: range_filter with a key of {field} has not been entered into the target/metadata datastructures")
+                return None
+            if not isinstance(bounds, (tuple, list)) or len(bounds) != 2:
+                print(f"Error: range_filter values need to be (min, max). Got {bounds} for {field}")
+                return None
+
+            target_ids = self.target_list.filter_range(field, min_value=bounds[0], max_value=bounds[1])
+            if target_ids is None:
+                return None
+
+            field_hash_ids = set()
+            for target_id in target_ids:
+                field_hash_ids.update(self.target_list.targets[target_id].hashes)
+
+            if hash_ids is None:
+                hash_ids = field_hash_ids
+            else:
+                hash_ids &= field_hash_ids
+
+        return hash_ids
+
     def create_cracked_list(self, file_name=None, hash_type=None, filter=None):
         """
         Creates a wordlist based on cracked password hashes
@@ -514,6 +950,8 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
         Considering 95% of this code is the same as create_left_list(), I probably should look
         to combine it into a shared function
 
+        Writes one line per cracked hash. Use export_wordlist() for a deduplicated wordlist
+
         Inputs:
 
             file_name: (String) If it is not None, write the wordlist/cracked_list to this filename. If
@@ -534,19 +972,9 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
         wordlist = []
 
         # Sanity check on filter values to make sure they are correct
-        if hash_type and hash_type not in self.hash_list.type_info:
-            print(f"Error: hash_type of {hash_type} is not a type that has been loaded into this framework")
+        if not self._check_filter(hash_type=hash_type, filter=filter):
             return
         
-        if filter:
-            for key, value in filter.items():
-                if key not in self.target_list.meta_lookup:
-                    print(f"Error: filter/metadata with a key of of {key} has not been entered into the target/metadata datastructures")
-                    return
-                if value and value not in self.target_list.meta_lookup[key]:
-                    print(f"Error: filter/metadata with a key of of {key} and value of {value} has not been entered into the target/metadata datastructures")
-                    return
-        
         # If not printing to stdout, open the file 
         if file_name:
             try:
@@ -584,6 +1012,164 @@ class SessionMgr(LogHandlingMixin, StrikeHandlingMixin):
 
         return wordlist
     
+    def export_wordlist(self, file_name, hash_type=None, filter=None, order_by="count", base_words=False, min_count=1, return_list=False, block_size=65536):
+        """
+        Writes a deduplicated wordlist of the cracked passwords, most reused first
+
+        Unlike create_cracked_list() each plaintext is only written once. The words come from
+        HashList.plaintext_lookup so the hashes don't need to be looped through, and they are
+        written in blocks vs. a write() per word
+
+        Inputs:
+            file_name: (String) The file to write the wordlist to
+
+            hash_type: (String) If not None, only count hashes of this type
+
+            filter: (Dict) All key/value pairs must match metadata for a hash to be counted.
+            Same format as create_left_list()
+
+            order_by: (String) One of:
+                "count": The number of cracked hashes that used the word
+                "score": The sum of the score of each hash type the word cracked (see print_score())
+                None: The order the words were first cracked in
+
+            base_words: (Bool) If True, strip the digits and specials from the start and end of
+            each word (aka "!Summer2024" -> "Summer") and merge the counts of the results
+
+            min_count: (Int) Only write words used by at least this many cracked hashes
+
+            return_list: (Bool) If True return the words written. Otherwise only the number of
+            words is returned so nothing extra is kept in memory
+
+            block_size: (Int) The number of words to write at a time
+
+        Returns:
+            num_words: (Int) The number of words written if return_list is False
+
+            wordlist: (List) The words written if return_list is True
+
+            None: If a problem occured
+        """
+        supported_orders = ['count', 'score', None]
+        if order_by not in supported_orders:
+            print(f"Error: order_by needs to be one of the following options: {supported_orders}")
+            return None
+
+        if not self._check_filter(hash_type=hash_type, filter=filter):
+            return None
+
+        allowed_hash_ids = None
+        if hash_type or filter:
+            allowed_hash_ids = self._get_filtered_hash_ids(hash_type=hash_type, filter=filter)
+
+        type_lookup = self.hash_list.type_lookup
+        type_info = self.hash_list.type_info
+
+        # Key = word, value = number of cracked hashes. Dicts keep insertion order so order_by=None
+        # is the order the words were cracked in
+        counts = {}
+        # Key = word, value = sum of the scores. Only used for order_by="score"
+        scores = {}
+        for plaintext, hash_ids in self.hash_list.plaintext_lookup.items():
+            if not plaintext or "\n" in plaintext:
+                continue
+            if allowed_hash_ids is not None:
+                hash_ids = [hash_id for hash_id in hash_ids if hash_id in allowed_hash_ids]
+                if not hash_ids:
+                    continue
+
+            if base_words:
+                plaintext = _BASE_WORD_REGEX.sub("", plaintext)
+                if not plaintext:
+                    continue
+
+            counts[plaintext] = counts.get(plaintext, 0) + len(hash_ids)
+            if order_by == "score":
+                scores[plaintext] = scores.get(plaintext, 0) + sum(type_info[type_lookup[hash_id]]['score'] for hash_id in hash_ids)
+
+        weights = scores if order_by == "score" else counts
+        words = [word for word, count in counts.items() if count >= min_count]
+        if order_by:
+            words.sort(key=weights.get, reverse=True)
+
+        try:
+            with open(file_name, mode='w') as file:
+                for start in range(0, len(words), block_size):
+                    file.write("\n".join(words[start:start + block_size]) + "\n")
+        except Exception as msg:
+            print(f"Exception writing to {file_name}: {msg}")
+            return None
+
+        if return_list:
+            return words
+        return len(words)
+
+    def _get_filtered_hash_ids(self, hash_type=None, filter=None):
+        """
+        Returns all the hash ids that match the filters. Same results as calling _filter_hash_id()
+        on every hash but only walks the targets once per filter
+
+        Inputs:
+            hash_type: (String) If not None, only include hashes of this type
+
+            filter: (Dict) The metadata key/value pairs. Same format as create_left_list()
+
+        Returns:
+            hash_ids: (Set) The hash ids that match
+        """
+        hash_ids = None
+        if filter:
+            for filter_key, filter_value in filter.items():
+                key_hash_ids = set()
+                for cur_value, target_ids in self.target_list.meta_lookup.get(filter_key, {}).items():
+                    if filter_value and cur_value != filter_value:
+                        continue
+                    for target_id in target_ids:
+                        key_hash_ids.update(self.target_list.targets[target_id].hashes)
+                if hash_ids is None:
+                    hash_ids = key_hash_ids
+                else:
+                    hash_ids &= key_hash_ids
+
+        if hash_type:
+            type_hash_ids = set(self.hash_list.type_list.get(hash_type, []))
+            if hash_ids is None:
+                hash_ids = type_hash_ids
+            else:
+                hash_ids &= type_hash_ids
+
+        return hash_ids
+
+    def _check_filter(self, hash_type=None, filter=None):
+        """
+        Sanity check on hash_type and filter values to make sure they are correct. Prints
+        out an error if they are not
+
+        Inputs:
+            hash_type: (String) The hash type to check
+
+            filter: (Dict) The metadata key/value pairs to check
+
+        Returns:
+            True: If the hash_type and filter are valid
+
+            False: If the hash_type or filter reference data not loaded into the framework
+        """
+        if hash_type and hash_type not in self.hash_list.type_info:
+            print(f"Error: hash_type of {hash_type} is not a type that has been loaded into this framework")
+            return False
+
+        if filter:
+            for key, value in filter.items():
+                if key not in self.target_list.meta_lookup:
+                    print(f"Error: filter/metadata with a key of of {key} has not been entered into the target/metadata datastructures")
+                    return False
+                if value and value not in self.target_list.meta_lookup[key]:
+                    print(f"Error: filter/metadata with a key of of {key} and value of {value} has not been entered into the target/metadata datastructures")
+                    return False
+
+        return True
+
     def _filter_hash_id(self, hash_id, hash_type=None, filter=None):
         """
         Returns True if the hash referenced by hash_id matches the filters. False otherwise.
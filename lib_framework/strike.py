@@ -12,9 +12,19 @@ details into a "details" dictionary and let the PWCrackerMgr handle what to do w
 StrikeList will handle metadata for adding strikes (and detecting duplicates) as well
 as managing various lookup tables
 
+There can be millions of strikes, and most of them share the same handful of attack
+labels, rules, and wordlists. So StrikeList doesn't save a Strike object for each one.
+Instead it stores them in parallel arrays of ids that point into a table of interned values.
+StrikeList.strikes[strike_id] returns a StrikeView that reads the strike back out of the
+arrays, so StrikeList.strikes[strike_id].details['rule'] still works.
+
 """
 
 
+from array import array
+from collections.abc import Mapping
+
+
 class Strike:
     """
     Information about a particular sucessfull attack
@@ -45,11 +55,167 @@ class Strike:
         self.details = details.copy()
 
 
+class StrikeIds(array):
+    """
+    Compact list of strike_ids used by the StrikeList lookup tables
+
+    Python ints take up 28+ bytes each in a List vs. 4 bytes in an array. Compares equal to
+    a List with the same strike_ids so it can be used like one
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, strike_ids=()):
+        return super().__new__(cls, 'i', strike_ids)
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            return self.tolist() == other
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+class StrikeView:
+    """
+    Read only view of a strike saved in a StrikeList
+
+    Has the same tool, hash_id, and details attributes as Strike
+    """
+
+    __slots__ = ('strike_list', 'strike_id')
+
+    def __init__(self, strike_list, strike_id):
+        """
+        Inputs:
+            strike_list: (StrikeList) The StrikeList the strike is saved in
+
+            strike_id: (Int) The id of the strike
+        """
+        self.strike_list = strike_list
+        self.strike_id = strike_id
+
+    @property
+    def tool(self):
+        """
+        The name of the PWCrackerMgr that created the strike
+        """
+        return self.strike_list._values[self.strike_list._tools[self.strike_id]]
+
+    @property
+    def hash_id(self):
+        """
+        The id of the hash cracked by this attack. None if it is unknown
+        """
+        hash_id = self.strike_list._hash_ids[self.strike_id]
+        if hash_id == -1:
+            return None
+        return hash_id
+
+    @property
+    def details(self):
+        """
+        The details about the specific crack as a read only Dict
+        """
+        return StrikeDetails(self.strike_list, self.strike_id)
+
+    def __repr__(self):
+        return f"StrikeView({self.strike_id}, tool={self.tool!r}, hash_id={self.hash_id}, details={dict(self.details)})"
+
+
+class StrikeDetails(Mapping):
+    """
+    Read only view of the details of a strike saved in a StrikeList
+
+    Acts like the details Dict that was passed to StrikeList.add()
+    """
+
+    __slots__ = ('strike_list', 'strike_id')
+
+    def __init__(self, strike_list, strike_id):
+        """
+        Inputs:
+            strike_list: (StrikeList) The StrikeList the strike is saved in
+
+            strike_id: (Int) The id of the strike
+        """
+        self.strike_list = strike_list
+        self.strike_id = strike_id
+
+    def __getitem__(self, key):
+        strike_list = self.strike_list
+        if key in strike_list._columns:
+            value_id = strike_list._columns[key][self.strike_id]
+            if value_id != -1:
+                return strike_list._values[value_id]
+        elif key == "duplicate_detection_id":
+            if strike_list._has_detection_id[self.strike_id]:
+                return strike_list._detection_ids[self.strike_id]
+        elif self.strike_id in strike_list._extra_details and key in strike_list._extra_details[self.strike_id]:
+            return strike_list._extra_details[self.strike_id][key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        strike_list = self.strike_list
+        for key, column in strike_list._columns.items():
+            if column[self.strike_id] != -1:
+                yield key
+        if strike_list._has_detection_id[self.strike_id]:
+            yield "duplicate_detection_id"
+        if self.strike_id in strike_list._extra_details:
+            yield from strike_list._extra_details[self.strike_id]
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class StrikeMapping(Mapping):
+    """
+    Read only Dict like access to the strikes in a StrikeList. Key = strike_id, value = StrikeView
+    """
+
+    __slots__ = ('strike_list',)
+
+    def __init__(self, strike_list):
+        """
+        Inputs:
+            strike_list: (StrikeList) The StrikeList the strikes are saved in
+        """
+        self.strike_list = strike_list
+
+    def __getitem__(self, strike_id):
+        if not isinstance(strike_id, int) or strike_id < 0 or strike_id >= self.strike_list.next_index:
+            raise KeyError(strike_id)
+        return StrikeView(self.strike_list, strike_id)
+
+    def __iter__(self):
+        return iter(range(self.strike_list.next_index))
+
+    def __len__(self):
+        return self.strike_list.next_index
+
+
 class StrikeList:
     """
     Keeps track of all the strikes
+
+    Strikes are saved in parallel arrays (one entry per strike) vs. as individual objects
+    to save memory. Strings like the rule and wordlist are saved once in _values and the
+    arrays hold their index.
     """
 
+    # The details that are saved as interned values. Other details are saved as is
+    interned_fields = ['attack', 'rule', 'wordlist', 'mode', 'original_word']
+
     def __init__(self):
         """
         Pretty boring, just initializes all the datastructures
@@ -58,12 +224,12 @@ class StrikeList:
         # Holds all the strikes
         # The key is the index that other related datastructures will
         # reference (vs. referencing the raw strikes)
-        self.strikes = {}
+        self.strikes = StrikeMapping(self)
 
         # Keeps track of the next index number to assign for the strikes
         self.next_index = 0
 
-        # Key = hash_id, value = (List) indexes of strikes for that hash_id
+        # Key = hash_id, value = (StrikeIds) indexes of strikes for that hash_id
         # Used to find all the strikes for a particular hash. If the hash
         # hasn't been cracked, it will not exist in this list. Note, there
         # is also a "None" lookup for strikes that are not associated with a
@@ -71,11 +237,43 @@ class StrikeList:
         # the cracked hash by default
         self.hash_id_lookup = {}
 
-        # Key = PWCrackerMgr Name, value = (List) indexes of strikes that have been
+        # Key = PWCrackerMgr Name, value = (StrikeIds) indexes of strikes that have been
         # generated by this tool
         # Used to generate a list of all strikes/rules for a particular tool
         self.tool_lookup = {}
 
+        # Open addressing hash table of strike_ids (-1 = empty slot), keyed on the hash of
+        # (tool, hash_id, details). _strike_hashes holds the hash for each slot so most
+        # collisions can be skipped without looking up the strike.
+        # Used to detect duplicate strikes with a single lookup. Checking every strike for
+        # the 'None' hash_id made reading JtR logs without hash_id usernames very slow.
+        # Not using a Dict since its keys took up more memory than the strikes themselves
+        self._strike_table = array('i', [-1]) * 1024
+        self._strike_hashes = array('i', [0]) * 1024
+
+        # Interned values. _value_ids is Key = value, value = index in _values
+        self._values = []
+        self._value_ids = {}
+
+        # The arrays holding the strikes. Index = strike_id
+        # hash_id of -1 means None
+        self._hash_ids = array('i')
+        self._tools = array('i')
+
+        # Key = detail name, value = array of indexes into _values. -1 means the strike
+        # doesn't have that detail
+        self._columns = {}
+        for field in self.interned_fields:
+            self._columns[field] = array('i')
+
+        # JtR adds a 64 bit duplicate_detection_id to every strike, which is unique so
+        # there's no point in interning it
+        self._detection_ids = array('Q')
+        self._has_detection_id = array('b')
+
+        # Key = strike_id, value = Dict of any details that aren't saved in the arrays
+        self._extra_details = {}
+
     def add(self, pw_cracker_mgr, hash_id, details):
         """
         Inputs:
@@ -91,35 +289,197 @@ class StrikeList:
         Returns:
             strike_id: (INT) The ID of the Strike. If a problem occurs, returns -1
         """
+        if hash_id is not None and (not isinstance(hash_id, int) or hash_id < 0):
+            print(f"Error: Invalid hash_id for a strike: {hash_id}")
+            return -1
+
+        row = self._get_row(pw_cracker_mgr.name, hash_id, details)
+
         # Check to make sure this isn't a duplicate
-        # hash_id_lookup is a quick way to narrow things down
-        if hash_id in self.hash_id_lookup:
-            strikes = self.hash_id_lookup[hash_id]
-            for strike_id in strikes:
-                if self.strikes[strike_id].tool == pw_cracker_mgr.name:
-                    exact_match = True
-                    for key, value in details.items():
-                        if key in self.strikes[strike_id].details and value == self.strikes[strike_id].details[key]:
-                            pass
-                        else:
-                           exact_match = False
-                           break
-                    if exact_match:
-                        return strike_id
+        # Only keeping 31 bits of the hash to save space
+        strike_hash = hash(row) & 0x7FFFFFFF
+        slot = self._find_slot(row, strike_hash)
+        if self._strike_table[slot] != -1:
+            return self._strike_table[slot]
 
         # Add the strike
         strike_id = self.next_index
         self.next_index += 1
 
-        self.strikes[strike_id] = Strike(pw_cracker_mgr, hash_id, details)
+        tool_id, saved_hash_id, value_ids, detection_id, extra_details = row
+        self._tools.append(tool_id)
+        self._hash_ids.append(saved_hash_id)
+        for field, value_id in zip(self.interned_fields, value_ids):
+            self._columns[field].append(value_id)
+        if detection_id is None:
+            self._detection_ids.append(0)
+            self._has_detection_id.append(0)
+        else:
+            self._detection_ids.append(detection_id)
+            self._has_detection_id.append(1)
+        if extra_details:
+            # extra_details may have had its values converted to strings so use the originals
+            self._extra_details[strike_id] = {key:details[key] for key, _ in extra_details}
+
+        self._strike_table[slot] = strike_id
+        self._strike_hashes[slot] = strike_hash
+
+        # Keep the table at most half full so lookups stay fast
+        if self.next_index * 2 > len(self._strike_table):
+            self._resize_table()
 
         # Update the lookup datastructures
         if hash_id not in self.hash_id_lookup:
-            self.hash_id_lookup[hash_id] = []
+            self.hash_id_lookup[hash_id] = StrikeIds()
         self.hash_id_lookup[hash_id].append(strike_id)
 
         if pw_cracker_mgr.name not in self.tool_lookup:
-            self.tool_lookup[pw_cracker_mgr.name] = []
+            self.tool_lookup[pw_cracker_mgr.name] = StrikeIds()
         self.tool_lookup[pw_cracker_mgr.name].append(strike_id)
 
-        return strike_id
\ No newline at end of file
+        return strike_id
+
+    def _find_slot(self, row, strike_hash):
+        """
+        Finds where a strike is in the hash table
+
+        Inputs:
+            row: (Tuple) The strike from _get_row()
+
+            strike_hash: (Int) The hash of the row. See add()
+
+        Returns:
+            slot: (Int) The slot holding the strike, or the empty slot where it should be added
+        """
+        mask = len(self._strike_table) - 1
+        slot = strike_hash & mask
+        while True:
+            strike_id = self._strike_table[slot]
+            if strike_id == -1:
+                return slot
+            if self._strike_hashes[slot] == strike_hash and self._get_saved_row(strike_id) == row:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _resize_table(self):
+        """
+        Doubles the size of the hash table used to find duplicate strikes
+        """
+        old_table = self._strike_table
+        old_hashes = self._strike_hashes
+        size = len(old_table) * 2
+        mask = size - 1
+
+        self._strike_table = array('i', [-1]) * size
+        self._strike_hashes = array('i', [0]) * size
+        for strike_id, strike_hash in zip(old_table, old_hashes):
+            if strike_id == -1:
+                continue
+            slot = strike_hash & mask
+            while self._strike_table[slot] != -1:
+                slot = (slot + 1) & mask
+            self._strike_table[slot] = strike_id
+            self._strike_hashes[slot] = strike_hash
+
+    def _get_row(self, tool, hash_id, details):
+        """
+        Converts a strike into the values saved in the arrays
+
+        Inputs:
+            tool: (String) The name of the PWCrackerMgr that created the strike
+
+            hash_id: (Int) The id of the hash cracked by this attack
+
+            details: (Dict) Details about the specific crack
+
+        Returns:
+            row: (Tuple) (tool_id, hash_id, (interned value ids), duplicate_detection_id, (other details)).
+            Two strikes with the same tool, hash_id, and details have the same row
+        """
+        if hash_id is None:
+            hash_id = -1
+
+        value_ids = []
+        for field in self.interned_fields:
+            if field in details:
+                value_ids.append(self._intern(details[field]))
+            else:
+                value_ids.append(-1)
+
+        detection_id = None
+        extra_details = []
+        for key, value in details.items():
+            if key in self._columns:
+                continue
+            if key == "duplicate_detection_id" and isinstance(value, int) and 0 <= value < 2**64:
+                detection_id = value
+            else:
+                extra_details.append((key, value))
+
+        return (self._intern(tool), hash_id, tuple(value_ids), detection_id, self._get_extra_key(extra_details))
+
+    def _get_saved_row(self, strike_id):
+        """
+        Returns the row for a strike that has already been saved. See _get_row()
+
+        Inputs:
+            strike_id: (Int) The id of the strike
+
+        Returns:
+            row: (Tuple) Same format as _get_row()
+        """
+        value_ids = tuple(self._columns[field][strike_id] for field in self.interned_fields)
+
+        detection_id = None
+        if self._has_detection_id[strike_id]:
+            detection_id = self._detection_ids[strike_id]
+
+        extra_details = ()
+        if strike_id in self._extra_details:
+            extra_details = self._get_extra_key(self._extra_details[strike_id].items())
+
+        return (self._tools[strike_id], self._hash_ids[strike_id], value_ids, detection_id, extra_details)
+
+    def _get_extra_key(self, extra_details):
+        """
+        Converts the details that aren't saved in the arrays into something that can be
+        compared and hashed
+
+        Inputs:
+            extra_details: (List) (key, value) pairs
+
+        Returns:
+            extra_key: (Tuple) The sorted (key, value) pairs
+        """
+        # Sorting so the order the details were added in doesn't matter
+        items = tuple(sorted(extra_details))
+        try:
+            hash(items)
+        except TypeError:
+            # Some of the values can't be used in a dict key (aka lists)
+            items = tuple((key, repr(value)) for key, value in items)
+        return items
+
+    def _intern(self, value):
+        """
+        Returns the index of a value in the interned values table, adding it if needed
+
+        Inputs:
+            value: The value to intern. Unhashable values (aka lists) are interned by their repr()
+
+        Returns:
+            value_id: (Int) The index into _values
+        """
+        # Including the type so 1 and True and "1" are saved seperately
+        try:
+            key = (type(value), value)
+            value_id = self._value_ids.get(key)
+        except TypeError:
+            key = (type(value), repr(value))
+            value_id = self._value_ids.get(key)
+
+        if value_id is None:
+            value_id = len(self._values)
+            self._values.append(value)
+            self._value_ids[key] = value_id
+        return value_id
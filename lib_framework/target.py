@@ -5,6 +5,53 @@ This includes metadata and hashes for that target
 """
 
 
+from array import array
+import datetime
+import functools
+import math
+import re
+
+
+# Timezone abbreviations seen in challenge files. E.g. "Tue May 31 08:26:06 CST 2022"
+TIMEZONE_OFFSETS = {
+    'UTC':0,
+    'GMT':0,
+    'EST':-5,
+    'EDT':-4,
+    'CST':-6,
+    'CDT':-5,
+    'MST':-7,
+    'MDT':-6,
+    'PST':-8,
+    'PDT':-7,
+}
+
+MONTHS = {month:index for index, month in enumerate(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], start=1)}
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# Matches the Unix date command format. Parsing it by hand since strptime() can't handle
+# the timezone abbreviations and is slow when there are hundreds of thousands of them
+DATE_COMMAND_REGEX = re.compile(r"^\s*[A-Za-z]{3} ([A-Za-z]{3}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2}) ([A-Za-z]{3,4}) (\d{4})\s*$")
+
+
+@functools.lru_cache(maxsize=None)
+def _days_since_epoch(year, month, day):
+    """
+    Returns the number of days from 1970-01-01 to a date. Cached since most dates in a
+    challenge file fall on a small number of days
+
+    Returns:
+        days: (Int) The number of days
+
+        None: If the date is invalid
+    """
+    try:
+        return datetime.date(year, month, day).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
 class Target:
     """
     Keeps track of target specific information
@@ -62,6 +109,10 @@ class TargetList:
         # E.g. {1:[0,3,5]} for hash id 1 is found in targets with id 0,3,5
         self.hash_lookup = {}
 
+        # Cache of the columns created by get_typed_column()
+        # Key = (field, column_type, date_format), value = column Dict
+        self.typed_columns = {}
+
     def find(self, metadata={}, hashes=[]):
         """
         Checks to see if the submitted metadata + hashes is equal to or a subset of an existing target
@@ -112,7 +163,7 @@ class TargetList:
         # Looks like a duplicate entry
         return matched_targets
 
-    def add(self, metadata={}, hashes=[]):
+    def add(self, metadata={}, hashes=[], check_duplicates=True):
         """
         Adds a target to the list.
 
@@ -123,13 +174,16 @@ class TargetList:
 
             hashes: (List) A list of all the hash indexes associated with the target
 
+            check_duplicates: (Bool) If False, don't check if the target is a duplicate of (or a
+            subset of) an existing target. Used when reloading targets that were already checked
+
         Returns:
             new_target: (INT) 0 if the target isn't new.
             1 if the target is new
         """
         
         # Checks to see if the target is unique
-        if self.find(metadata, hashes) != []:
+        if check_duplicates and self.find(metadata, hashes) != []:
             # Target(s) exists so don't add this new one
             return 0
         
@@ -228,4 +282,222 @@ class TargetList:
             stats['num_hashes'] += item_stats['num_hashes']
             stats['num_cracked'] += item_stats['num_cracked']
 
-        return stats
\ No newline at end of file
+        return stats
+
+    def get_typed_column(self, field, column_type="datetime", date_format=None):
+        """
+        Returns a metadata field parsed into a typed column indexed by target_id
+
+        Each unique value is only parsed once (using meta_lookup) and then copied to all the
+        targets that have it. The column is cached until more targets are added
+
+        Inputs:
+            field: (Str) The metadata key. E.g. "Created"
+
+            column_type: (Str) One of:
+                "datetime": Seconds since the epoch. Values can be datetime/date objects, ISO
+                format strings, Unix date command strings (aka "Tue May 31 08:26:06 CST 2022"),
+                or match date_format. Dates without a timezone are treated as UTC
+                "int": Numbers
+                "category": The raw values, encoded as an index into a list of categories
+
+            date_format: (Str) strptime() format to try for "datetime" columns
+
+        Returns:
+            column: (Dict) {
+                'type':(Str) The column_type,
+                'values':(array) Index = target_id. array('d') for "datetime" and "int" with NaN
+                for targets that don't have the field or couldn't be parsed. array('i') for
+                "category" with -1 for targets that don't have the field,
+                'categories':(List) Only for "category". The value for each index,
+                'utc_offsets':(array) Only for "datetime". array('d') of the seconds the timezone each
+                date was written in is ahead of UTC. 0 for dates without a timezone,
+                'num_invalid':(Int) Number of targets with a value that couldn't be parsed,
+            }
+
+            None: If the column_type isn't supported
+        """
+        supported_types = ['datetime', 'int', 'category']
+        if column_type not in supported_types:
+            print(f"Error: column_type needs to be one of the following options: {supported_types}")
+            return None
+
+        key = (field, column_type, date_format)
+        column = self.typed_columns.get(key)
+        if column and column['num_targets'] == self.next_index:
+            return column
+
+        column = {
+            'type':column_type,
+            'num_targets':self.next_index,
+            'num_invalid':0,
+        }
+        if column_type == "category":
+            values = array('i', [-1]) * self.next_index
+            column['categories'] = []
+        else:
+            values = array('d', [math.nan]) * self.next_index
+        if column_type == "datetime":
+            utc_offsets = array('d', [0]) * self.next_index
+            column['utc_offsets'] = utc_offsets
+
+        for raw_value, target_ids in self.meta_lookup.get(field, {}).items():
+            utc_offset = 0
+            if column_type == "category":
+                value = len(column['categories'])
+                column['categories'].append(raw_value)
+            elif column_type == "datetime":
+                value = self._parse_datetime_offset(raw_value, date_format)
+                if value is not None:
+                    value, utc_offset = value
+            else:
+                value = self._parse_number(raw_value)
+
+            if value is None:
+                column['num_invalid'] += len(target_ids)
+                continue
+            for target_id in target_ids:
+                values[target_id] = value
+            if utc_offset:
+                for target_id in target_ids:
+                    utc_offsets[target_id] = utc_offset
+
+        column['values'] = values
+        self.typed_columns[key] = column
+        return column
+
+    def filter_range(self, field, min_value=None, max_value=None, column_type=None, date_format=None):
+        """
+        Returns the targets with a metadata value inside of a range
+
+        Inputs:
+            field: (Str) The metadata key. E.g. "Created"
+
+            min_value: If not None, the value must be >= this. A datetime/date for "datetime" columns,
+            a number for "int" columns
+
+            max_value: If not None, the value must be <= this
+
+            column_type: (Str) "datetime" or "int". If None, "int" is used for number bounds and
+            "datetime" for everything else
+
+            date_format: (Str) See get_typed_column()
+
+        Returns:
+            target_ids: (List) The targets inside the range. Targets without the field are excluded
+
+            None: If a problem occured
+        """
+        if column_type is None:
+            bound = min_value if min_value is not None else max_value
+            column_type = "int" if isinstance(bound, (int, float)) else "datetime"
+
+        if column_type == "category":
+            print(f"Error: Range filters are not supported for category columns")
+            return None
+
+        column = self.get_typed_column(field, column_type=column_type, date_format=date_format)
+        if column is None:
+            return None
+
+        if column_type == "datetime":
+            min_value = None if min_value is None else self._parse_datetime(min_value, date_format)
+            max_value = None if max_value is None else self._parse_datetime(max_value, date_format)
+
+        low = -math.inf if min_value is None else min_value
+        high = math.inf if max_value is None else max_value
+
+        # NaN fails both comparisons so targets without the field drop out here too
+        return [target_id for target_id, value in enumerate(column['values']) if low <= value <= high]
+
+    def _parse_datetime(self, value, date_format=None):
+        """
+        Converts a metadata value to seconds since the epoch
+
+        Inputs:
+            value: A datetime, date, or string. See get_typed_column()
+
+            date_format: (Str) strptime() format to try if the built in formats don't match
+
+        Returns:
+            timestamp: (Float) Seconds since the epoch
+
+            None: If the value couldn't be parsed
+        """
+        parsed = self._parse_datetime_offset(value, date_format)
+        if parsed is None:
+            return None
+        return parsed[0]
+
+    def _parse_datetime_offset(self, value, date_format=None):
+        """
+        Converts a metadata value to seconds since the epoch, and keeps the timezone it was
+        written in
+
+        Inputs:
+            value: A datetime, date, or string. See get_typed_column()
+
+            date_format: (Str) strptime() format to try if the built in formats don't match
+
+        Returns:
+            (timestamp, utc_offset)
+            timestamp: (Float) Seconds since the epoch
+
+            utc_offset: (Float) Seconds the timezone of the value is ahead of UTC. 0 if it
+            didn't have a timezone
+
+            None: If the value couldn't be parsed
+        """
+        if isinstance(value, datetime.datetime):
+            date = value
+        elif isinstance(value, datetime.date):
+            date = datetime.datetime(value.year, value.month, value.day)
+        elif isinstance(value, str):
+            date = None
+            match = DATE_COMMAND_REGEX.match(value)
+            if match:
+                month, day, hours, minutes, seconds, timezone, year = match.groups()
+                if month.title() in MONTHS and timezone.upper() in TIMEZONE_OFFSETS:
+                    # Doing the math directly since creating a datetime for every value is slow
+                    days = _days_since_epoch(int(year), MONTHS[month.title()], int(day))
+                    if days is None or int(hours) > 23 or int(minutes) > 59 or int(seconds) > 60:
+                        return None
+                    utc_offset = TIMEZONE_OFFSETS[timezone.upper()] * 3600
+                    return (float(days * 86400 + int(hours) * 3600 + int(minutes) * 60 + int(seconds) - utc_offset), float(utc_offset))
+            if date is None and date_format:
+                try:
+                    date = datetime.datetime.strptime(value.strip(), date_format)
+                except ValueError:
+                    pass
+            if date is None:
+                try:
+                    date = datetime.datetime.fromisoformat(value.strip())
+                except ValueError:
+                    return None
+        else:
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        return (date.timestamp(), date.utcoffset().total_seconds())
+
+    def _parse_number(self, value):
+        """
+        Converts a metadata value to a number
+
+        Inputs:
+            value: An int, float, or string
+
+        Returns:
+            number: (Float) The value
+
+            None: If the value couldn't be parsed
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return float(str(value).strip().replace(",", ""))
+        except ValueError:
+            return None
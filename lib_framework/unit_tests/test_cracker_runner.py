@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+
+"""
+Unit tests for CrackerRunner and CrackerJob
+
+Uses a small python script standing in for the real password crackers so
+these tests don't need JtR or Hashcat installed
+"""
+
+
+import unittest
+from unittest.mock import patch
+import io
+import os
+import stat
+import sys
+import tempfile
+
+# Functions and classes to tests
+from ..cracker_runner import CrackerJob
+from ..cracker_runner import CrackerRunner
+from ..session_mgr import SessionMgr
+from ..jtr_mgr import JTRMgr
+from ..hash import HashList
+from ..session import SessionList
+
+
+# Pretends to be JtR. "Cracks" every hash in the hash file by writing it to the
+# pot file one at a time. Exits with an error if a mask attack is requested
+FAKE_JOHN = """#!{python}
+import sys
+import time
+
+pot_file = None
+for arg in sys.argv[1:]:
+    if arg.startswith("--pot="):
+        pot_file = arg[len("--pot="):]
+    if arg.startswith("--mask"):
+        print("Terminating on error")
+        sys.exit(1)
+
+print("Loaded hashes")
+with open(sys.argv[-1]) as hash_file:
+    for line in hash_file:
+        hash_id, hash = line.strip().split(":", 1)
+        with open(pot_file, "a") as pot:
+            pot.write(f"{{hash}}:plain{{hash_id}}\\n")
+        print(f"plain{{hash_id}} ({{hash_id}})")
+        time.sleep(0.05)
+print("Session completed")
+"""
+
+
+class Test_CrackerRunner(unittest.TestCase):
+    """
+    Responsible for testing the CrackerRunner
+    """
+
+    def setUp(self):
+        """
+        Creates a temp folder with the fake password cracker in it
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.john = os.path.join(self.temp_dir.name, "john")
+        with open(self.john, "w") as fake_john:
+            fake_john.write(FAKE_JOHN.format(python=sys.executable))
+        os.chmod(self.john, os.stat(self.john).st_mode | stat.S_IEXEC)
+        self.pot_file = os.path.join(self.temp_dir.name, "test.pot")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_run_jobs(self):
+        """
+        Checks that multiple jobs run, cracks are loaded from the pot file,
+        and Sessions are registered
+        """
+        jtr_mgr = JTRMgr({'path':self.temp_dir.name, 'main_pot_file':self.pot_file})
+
+        hash_list = HashList()
+        hash_list.add_type("type1", "type1", "1337", "high")
+        hash_list.add("hash1", type="type1")
+        hash_list.add("hash2", type="type1")
+        hash_list.add("hash3", type="type1")
+
+        session_list = SessionList()
+
+        jobs = []
+        for hashes in [["hash1", "hash2"], ["hash3"]]:
+            hash_file = os.path.join(self.temp_dir.name, f"{hashes[0]}.hash")
+            with open(hash_file, "w") as left_list:
+                for hash in hashes:
+                    left_list.write(f"{hash_list.hash_lookup[hash]}:{hash}\n")
+            command = jtr_mgr.create_attack_command(hash_file, hash_mode="type1", attack_mode="single", session_name=hashes[0])
+            jobs.append(CrackerJob(jtr_mgr, command, session_info={'mode':'single', 'hash_type':'type1'}))
+
+        # A job that fails
+        command = jtr_mgr.create_attack_command(hash_file, hash_mode="type1", attack_mode="mask")
+        jobs.append(CrackerJob(jtr_mgr, command, session_info={'mode':'mask', 'hash_type':'type1'}))
+
+        runner = CrackerRunner(hash_list, session_list, max_concurrent=2, poll_interval=0.01)
+        jobs = runner.run(jobs)
+
+        assert runner.new_cracks == 3
+        assert hash_list.hashes[hash_list.hash_lookup["hash1"]].plaintext == "plain0"
+        assert hash_list.hashes[hash_list.hash_lookup["hash3"]].plaintext == "plain2"
+        assert hash_list.type_info['type1']['cracked'] == 3
+
+        assert jobs[0].returncode == 0
+        assert list(jobs[0].output) == ["Loaded hashes", "plain0 (0)", "plain1 (1)", "Session completed"]
+        assert jobs[2].returncode == 1
+
+        assert len(session_list.sessions) == 3
+        session = session_list.sessions[jobs[0].session_id]
+        assert session.compleated
+        assert session.mode == "single"
+        assert session.hash_type == "type1"
+        assert session.options['total_time'] >= 0
+        assert session.options['command_line'].endswith("hash1.hash")
+        assert not session_list.sessions[jobs[2].session_id].compleated
+
+    def test_session_mgr_run_jobs(self):
+        """
+        Checks creating and running a job from SessionMgr
+        """
+        config = {'jtr_config':{'path':self.temp_dir.name, 'main_pot_file':self.pot_file}}
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value=config):
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        sm.hash_list.add_type("type1", "type1", "1337", "high")
+        sm.hash_list.add("hash1", type="type1")
+        sm.hash_list.add("hash2", type="type1", plaintext="already_cracked")
+
+        hash_file = os.path.join(self.temp_dir.name, "left.hash")
+        job = sm.create_job("type1", cracker_name="jtr", attack_mode="wordlist", options={'wordlist':'dic.txt'}, file_name=hash_file)
+        assert job.command == [self.john, f"--pot={self.pot_file}", "--format=type1", "--wordlist=dic.txt", hash_file]
+
+        suppress_text = io.StringIO()
+        sys.stdout = suppress_text
+        jobs = sm.run_jobs([job], poll_interval=0.01)
+        sys.stdout = sys.__stdout__
+
+        assert sm.hash_list.hashes[0].plaintext == "plain0"
+        assert sm.session_list.sessions[jobs[0].session_id].options['wordlist'] == 'dic.txt'
@@ -9,7 +9,9 @@ Unit tests for the Hashcat PWCrackerMGR
 
 import unittest
 import io
+import os
 import sys
+import tempfile
 from unittest.mock import patch, mock_open
 
 # Functions and classes to tests
@@ -115,4 +117,231 @@ class Test_HashcatMgr(unittest.TestCase):
         # Test log with a ":" in the rule
         test_data = test_data = "test::$1:test1:wordlist\n"
         with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
-            assert hc.is_logfile("test.log")
\ No newline at end of file
+            assert hc.is_logfile("test.log")
+
+        # Test only the start of the file is checked and a cut off line is ignored
+        hc.sample_size = 30
+        test_data = "word:rule:pass:wordlist\nword2:rule2:pass2:wor\nbad line"
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+            assert hc.is_logfile("test.log")
+
+    def test_read_logfile(self):
+        """
+        Checks that HashcatManager creates strikes from a debug file and only
+        reads new lines when the file is read again
+        """
+        hc = HashcatMgr({})
+        hc.read_size = 16
+
+        hash_list = HashList()
+        hash_list.add_type("raw-md5", "Raw-MD5", "0", "low")
+        hash_list.add("1a1dc91c907325c69271ddf0c944bc72", type="raw-md5", plaintext="pass")
+        hash_list.add("2a1dc91c907325c69271ddf0c944bc72", type="raw-md5", plaintext="pass")
+        hash_list.add("3a1dc91c907325c69271ddf0c944bc72", type="raw-md5", plaintext="pass1")
+        session_list = SessionList()
+        strike_list = StrikeList()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "hc_session.log")
+            with open(filename, "w") as logfile:
+                logfile.write("pass:::pass:/wordlists/dic.txt\n")
+                logfile.write("pass:::pass:/wordlists/dic.txt\n")
+                logfile.write("pass:$1:pass1:/wordlists/dic.txt\n")
+                logfile.write("unknown:c:Unknown:/wordlists/dic.txt\n")
+                logfile.write("pass:$2:pa")
+
+            assert hc.read_logfile(filename, session_list, strike_list, hash_list)
+            assert len(strike_list.strikes) == 4
+            assert strike_list.hash_id_lookup[0] == [0]
+            assert strike_list.hash_id_lookup[1] == [1]
+            assert strike_list.hash_id_lookup[2] == [2]
+            assert strike_list.hash_id_lookup[None] == [3]
+            assert strike_list.strikes[0].details == {'attack':'wordlist', 'rule':':', 'wordlist':'dic.txt', 'original_word':'pass'}
+            assert strike_list.strikes[2].details['rule'] == "$1"
+
+            # Finish the partial line and make sure only it is parsed
+            with open(filename, "a") as logfile:
+                logfile.write("ss2:/wordlists/dic.txt\n")
+            assert hc.read_logfile(filename, session_list, strike_list, hash_list)
+            assert len(strike_list.strikes) == 5
+            assert strike_list.strikes[4].details['rule'] == "$2"
+
+    def test_read_logfile_resume_offset(self):
+        """
+        Checks that the saved offset is correct when lines span chunk boundaries so a
+        resume doesn't re-read part of a line
+        """
+        hc = HashcatMgr({})
+        hc.read_size = 16
+
+        hash_list = HashList()
+        hash_list.add_type("raw-md5", "Raw-MD5", "0", "low")
+        hash_list.add("1a1dc91c907325c69271ddf0c944bc72", type="raw-md5", plaintext="password1")
+        hash_list.add("2a1dc91c907325c69271ddf0c944bc72", type="raw-md5", plaintext="password2")
+        hash_list.add("3a1dc91c907325c69271ddf0c944bc72", type="raw-md5", plaintext="password3")
+        session_list = SessionList()
+        strike_list = StrikeList()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "hc_session.log")
+            with open(filename, "w") as logfile:
+                logfile.write("password:$1:password1:/wordlists/dic.txt\n")
+                logfile.write("password:$2:password2:/wordlists/dic.txt\n")
+            file_size = os.path.getsize(filename)
+
+            # Suppress stdout to clean up unittest output
+            sys.stdout = io.StringIO()
+            assert hc.read_logfile(filename, session_list, strike_list, hash_list)
+            assert hc.log_offsets[os.path.abspath(filename)][1] == file_size
+
+            with open(filename, "a") as logfile:
+                logfile.write("password:$3:password3:/wordlists/dic.txt\n")
+            assert hc.read_logfile(filename, session_list, strike_list, hash_list)
+            output = sys.stdout.getvalue()
+            # Unsupress stdout
+            sys.stdout = sys.__stdout__
+
+            assert "could not be parsed" not in output
+            assert hc.log_offsets[os.path.abspath(filename)][1] == os.path.getsize(filename)
+            assert len(strike_list.strikes) == 3
+            assert [strike_list.hash_id_lookup[hash_id] for hash_id in range(3)] == [[0], [1], [2]]
+
+    def test_read_status_file(self):
+        """
+        Checks that HashcatManager parses the output of --status --status-json
+        """
+        hc = HashcatMgr({})
+
+        status_lines = [
+            "hashcat (v6.2.6) starting",
+            '{ "session": "hc_session", "guess": { "guess_base": "/wordlists/dic.txt", "guess_base_count": 1, "guess_base_offset": 1, "guess_base_percent": 100.00, "guess_mod": "/rules/best64.rule", "guess_mod_count": 77, "guess_mod_offset": 1, "guess_mod_percent": 100.00, "guess_mode": 2 }, "status": 3, "target": "left.hash", "progress": [ 1000000, 4000000 ], "restore_point": 0, "recovered_hashes": [ 2, 10 ], "recovered_salts": [ 1, 1 ], "rejected": 5, "devices": [ { "device_id": 1, "device_name": "GPU 1", "device_type": "GPU", "speed": 300000, "temp": 60, "util": 99 }, { "device_id": 2, "device_name": "GPU 2", "device_type": "GPU", "speed": 200000, "temp": 58, "util": 99 } ], "time_start": 1700000000, "estimated_stop": 1700000006 }',
+            "not json {",
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "status.json")
+            with open(filename, "w") as statusfile:
+                statusfile.write("\n".join(status_lines) + "\n")
+
+            statuses = hc.read_status_file(filename)
+            assert len(statuses) == 1
+            status = statuses[0]
+            assert status['status'] == "Running"
+            assert status['running']
+            assert not status['compleated']
+            assert status['speed'] == 500000
+            assert status['device_speeds'] == {1:300000, 2:200000}
+            assert status['progress'] == 1000000
+            assert status['progress_total'] == 4000000
+            assert status['recovered'] == 2
+            assert status['rejected'] == 5
+
+            session_info = hc.get_status_session_info(status, hash_type="0")
+            assert session_info == {'mode':'wordlist', 'hash_type':'0', 'options':{'session_name':'hc_session', 'wordlist':'dic.txt', 'ruleset':'best64.rule'}}
+
+            # Only new updates are returned, and a partial line is held back
+            with open(filename, "a") as statusfile:
+                statusfile.write('{"session": "hc_session", "status": 5, "progress": [4000000, 4000000], "devices": []}\n{"status": 3')
+            statuses = hc.read_status_file(filename)
+            assert len(statuses) == 1
+            assert statuses[0]['status'] == "Exhausted"
+            assert statuses[0]['compleated']
+            assert not statuses[0]['running']
+
+    def test_load_outfile(self):
+        """
+        Checks that HashcatManager loads cracks and their crack times from an outfile
+        """
+        hc = HashcatMgr({})
+
+        hash_list = HashList()
+        hash_list.add_type("raw-md5", "Raw-MD5", "0", "low")
+        hash_list.add("5f4dcc3b5aa765d61d8327deb882cf99", type="raw-md5")
+        hash_list.add("0d107d09f5bbe40cade3de5c71e9e9b7", type="raw-md5")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "hc.out")
+            with open(filename, "w") as outfile:
+                outfile.write("1700000000:5f4dcc3b5aa765d61d8327deb882cf99:password\n")
+                outfile.write("0d107d09f5bbe40cade3de5c71e9e9b7:letmein\n")
+                outfile.write("1700000100:e10adc3949ba59abbe56e057f20f883e:123456\n")
+
+            assert hc.load_outfile(filename, hash_list) == 2
+            assert hash_list.hashes[0].plaintext == "password"
+            assert hash_list.get_crack_time(0) == 1700000000
+            assert hash_list.hashes[1].plaintext == "letmein"
+            assert hash_list.get_crack_time(1) > 1700000100
+            assert len(hash_list.hashes) == 2
+
+            assert hc.load_outfile(filename, hash_list, update_only=False) == 1
+            assert hash_list.get_crack_time(2) == 1700000100
+
+        # Suppress stdout to clean up unittest output
+        suppress_text = io.StringIO()
+        sys.stdout = suppress_text
+
+        assert hc.load_outfile("does_not_exist.out", hash_list) == -1
+
+        # Unsupress stdout
+        sys.stdout = sys.__stdout__
+
+    def test_parse_attack_command(self):
+        """
+        Checks that Hashcat command lines are parsed into the same format as status updates
+        """
+        hc = HashcatMgr({})
+
+        session_info = hc.parse_attack_command("hashcat -m 0 -a 0 -o hc.potfile left.hash /words/dic.txt -r /rules/best64.rule")
+        assert session_info == {'mode':'wordlist', 'hash_type':'0', 'options':{'wordlist':'dic.txt', 'wordlist_path':'/words/dic.txt', 'ruleset':'best64.rule'}}
+
+        session_info = hc.parse_attack_command(["hashcat", "-m1000", "-a3", "-w", "3", "left.hash", "?u?l?l?d"])
+        assert session_info == {'mode':'mask', 'hash_type':'1000', 'options':{'mask':'?u?l?l?d'}}
+
+        # Hybrid attacks
+        session_info = hc.parse_attack_command("hashcat --hash-type=0 --attack-mode=6 left.hash dic.txt ?d?d")
+        assert session_info == {'mode':'wordlist', 'hash_type':'0', 'options':{'wordlist':'dic.txt', 'wordlist_path':'dic.txt', 'mask':'?d?d'}}
+        session_info = hc.parse_attack_command("hashcat -m 0 -a 7 left.hash ?d?d dic.txt")
+        assert session_info['options']['mask'] == '?d?d'
+        assert session_info['options']['wordlist'] == 'dic.txt'
+
+        # Suppress stdout to clean up unittest output
+        suppress_text = io.StringIO()
+        sys.stdout = suppress_text
+
+        assert hc.parse_attack_command("hashcat -m 0 -a 5 left.hash") is None
+
+        # Unsupress stdout
+        sys.stdout = sys.__stdout__
+
+    def test_read_benchmark_file(self):
+        """
+        Checks that HashcatManager parses the output of hashcat -b
+        """
+        hc = HashcatMgr({})
+
+        # Current format with multiple devices
+        test_data = "hashcat (v6.2.6) starting in benchmark mode\n"
+        test_data += "-------------------\n"
+        test_data += "* Hash-Mode 0 (MD5)\n"
+        test_data += "-------------------\n"
+        test_data += "\n"
+        test_data += "Speed.#1.........: 59840.6 MH/s (72.40ms) @ Accel:512 Loops:1024 Thr:32 Vec:1\n"
+        test_data += "Speed.#2.........: 40000.0 MH/s (72.40ms) @ Accel:512 Loops:1024 Thr:32 Vec:1\n"
+        test_data += "Speed.#*.........:   99.8 GH/s\n"
+        test_data += "\n"
+        test_data += "-------------------\n"
+        test_data += "* Hash-Mode 500 (md5crypt, MD5 (Unix), Cisco-IOS $1$ (MD5)) [Iterations: 1000]\n"
+        test_data += "-------------------\n"
+        test_data += "\n"
+        test_data += "Speed.#1.........: 25000.0 kH/s (50.87ms) @ Accel:1024 Loops:1000 Thr:32 Vec:1\n"
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+            speeds = hc.read_benchmark_file("test.txt")
+        assert speeds == {'0':99800000000, '500':25000000}
+
+        # Older format with a single device
+        test_data = "Hashmode: 100 - SHA1\n"
+        test_data += "\n"
+        test_data += "Speed.#1.........:  6803.0 MH/s (49.01ms)\n"
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+            speeds = hc.read_benchmark_file("test.txt")
+        assert speeds == {'100':6803000000}
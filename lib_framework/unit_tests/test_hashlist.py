@@ -130,4 +130,116 @@ class Test_HashList(unittest.TestCase):
         # Check that it was removed from unknown_type
         assert 0 not in hl.type_list[hl.unknown_type]
         assert hl.type_info[hl.unknown_type]['total'] == 0
-        assert hl.type_info[hl.unknown_type]['cracked'] == 0
\ No newline at end of file
+        assert hl.type_info[hl.unknown_type]['cracked'] == 0
+
+    def test_speed_and_cost(self):
+        """
+        Checks that measured speeds from multiple rigs are combined and
+        used for the cost estimates
+        """
+        hl = HashList()
+        hl.add_type("type1", "type1", "1337", "high")
+        hl.add_type("type2", "type2", "31337", "low")
+
+        # No benchmark so fall back to the string cost
+        assert hl.get_cost("type1") > hl.get_cost("type2")
+        assert hl.get_cost(hl.unknown_type) == None
+
+        hl.set_speed("type1", 1000, rig="rig1")
+        assert hl.get_cost("type1") == 1 / 1000
+
+        # Keep the faster speed for the same rig, and add up multiple rigs
+        hl.set_speed("type1", 500, rig="rig1")
+        hl.set_speed("type1", 3000, rig="rig2")
+        assert hl.type_info['type1']['speed'] == 4000
+        assert hl.type_info['type1']['speed_by_rig'] == {'rig1':1000, 'rig2':3000}
+
+    def test_plaintext_lookup(self):
+        """
+        Checks to make sure cracked hashes can be looked up by their plaintext
+        """
+        hl = HashList()
+        hl.add_type("test", "test", "1337", "high")
+        hl.add("abc123", type="test", plaintext="password")
+        hl.add("abc456", type="test")
+        assert hl.get_hash_ids_by_plaintext("password") == [0]
+        assert hl.get_hash_ids_by_plaintext("letmein") == []
+
+        # Cracking a hash later should add it
+        hl.add("abc456", plaintext="password")
+        assert hl.get_hash_ids_by_plaintext("password") == [0, 1]
+
+    def test_crack_times(self):
+        """
+        Checks that cracks are timestamped and counted towards the crack rate of their type
+        """
+        hl = HashList()
+        hl.add_type("type1", "type1", "1337", "high")
+        hl.add_type("type2", "type2", "31337", "high")
+        hl.add("abc123", type="type1", plaintext="password", crack_time=7200)
+        hl.add("abc456", type="type1")
+        hl.add("abc789", plaintext="letmein", crack_time=7300)
+
+        assert hl.get_crack_time(0) == 7200
+        assert hl.get_crack_time(1) is None
+        assert hl.get_crack_time(5) is None
+
+        # Cracking a hash later should timestamp it. Cracking it again shouldn't
+        hl.update("abc456", plaintext="password", crack_time=11000)
+        hl.update("abc456", plaintext="password", crack_time=20000)
+        assert hl.get_crack_time(1) == 11000
+        assert hl.get_crack_history("type1") == [(7200, 1), (10800, 1)]
+
+        # Changing the type moves the crack
+        assert hl.get_crack_history("unknown") == [(7200, 1)]
+        hl.add("abc789", type="type2")
+        assert hl.get_crack_history("unknown") == []
+        assert hl.get_crack_history("type2") == [(7200, 1)]
+
+        assert hl.get_crack_rate("type1", window=2*3600, now=12000) == 1
+        assert hl.get_crack_rate("type1", window=2*3600, now=18000) == 0.5
+        assert hl.get_crack_rate("type1", window=3600, now=20000) == 0
+
+        # Defaults to when it was loaded
+        hl.add("def123", type="type2", plaintext="123456")
+        assert hl.get_crack_time(3) > 7300
+
+        # Unknown crack times aren't counted towards the crack rate
+        hl.add("def456", type="type2", plaintext="123456", crack_time=0)
+        assert hl.get_crack_time(4) is None
+        assert hl.type_info['type2']['cracked'] == 3
+        assert sum(count for bucket, count in hl.get_crack_history("type2")) == 2
+
+    def test_salts(self):
+        """
+        Checks that salts are parsed when hashes are added, re-parsed when the
+        type changes, and counted by how many uncracked hashes they have
+        """
+        hl = HashList()
+        hl.add_type("md5crypt", "md5crypt", "500", "medium")
+        hl.add_type("raw-md5", "raw-md5", "0", "low")
+
+        hl.add("$1$salt1$aaaaaaaaaaaaaaaaaaaaaa", type="md5crypt")
+        hl.add("$1$salt1$bbbbbbbbbbbbbbbbbbbbbb", type="md5crypt", plaintext="pw")
+        hl.add("$1$salt2$cccccccccccccccccccccc", type="md5crypt", plaintext="pw")
+        hl.add("5f4dcc3b5aa765d61d8327deb882cf99", type="raw-md5")
+
+        assert hl.salt_lookup == {0:"salt1", 1:"salt1", 2:"salt2", 3:None}
+        assert hl.salt_list["md5crypt"] == {"salt1":[0, 1], "salt2":[2]}
+        assert hl.salt_list["raw-md5"] == {}
+
+        # Fully cracked salts are not included
+        assert hl.get_salts_left("md5crypt") == {"salt1":1}
+        assert hl.get_num_salts_left("md5crypt") == 1
+
+        # Unsalted types count as one salt
+        assert hl.get_salts_left("raw-md5") == {}
+        assert hl.get_num_salts_left("raw-md5") == 1
+
+        # Type is added later, so the salt needs to be parsed then
+        hl.add("$1$salt3$dddddddddddddddddddddd")
+        assert hl.salt_lookup[4] == None
+        hl.add("$1$salt3$dddddddddddddddddddddd", type="md5crypt")
+        assert hl.salt_lookup[4] == "salt3"
+        assert hl.get_num_salts_left("md5crypt") == 2
+        assert hl.get_num_salts_left(hl.unknown_type) == 0
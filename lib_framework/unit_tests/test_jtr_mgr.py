@@ -9,7 +9,9 @@ Unit tests for JtR PWCrackerMGR
 
 import unittest
 import io
+import os
 import sys
+import tempfile
 from unittest.mock import patch, mock_open
 
 # Functions and classes to tests
@@ -17,6 +19,7 @@ from ..jtr_mgr import JTRMgr
 from ..session import SessionList
 from ..strike import StrikeList
 from ..hash import HashList
+from .._jtr_log_parser import JtRLogParser
 
 class Test_JTRMgr(unittest.TestCase):
     """
@@ -121,7 +124,8 @@ class Test_JTRMgr(unittest.TestCase):
         test_data += "0:00:00:00 + Cracked 0: plaintext1\n"
         test_data += "0:00:00:00 + Cracked 2: plaintext2\n"
         test_data += "0:00:00:16 Session completed\n"
-        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+        # Logs are read in binary chunks
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data.encode()):
             assert jtr_mgr.read_logfile("TestFile", session_list, strike_list, hash_list)
 
         for key, value in session_list.sessions.items():
@@ -136,3 +140,367 @@ class Test_JTRMgr(unittest.TestCase):
         assert strike_list.hash_id_lookup[0] == [0]
         assert strike_list.hash_id_lookup[2] == [1]
 
+
+    def test_read_logfile_chunks(self):
+        """
+        Checks that lines split across chunks are parsed correctly, and that a
+        session that is still running at the end of the log is saved
+        """
+        jtr_mgr = JTRMgr({})
+        session_list = SessionList()
+        strike_list = StrikeList()
+        hash_list = HashList()
+        hash_list.add_type("type1", "type1", "1337", "high")
+        hash_list.add("hash1", type="type1")
+        hash_list.add("hash2", type="type1")
+
+        test_data = "0:00:00:00 Starting a new session\n"
+        test_data += "0:00:00:00 Command line: john --mask=?d?d test.hash\n"
+        test_data += "0:00:00:00 - Hash type: type1\n"
+        test_data += '0:00:00:01 Proceeding with "incremental" mode: ascii\n'
+        test_data += "0:00:00:02 + Cracked 1: plaintext2\n"
+        test_data += "0:00:00:03 - Trying length 5\n"
+        test_data += "0:00:01:05 + Cracked ?"
+
+        log_parser = JtRLogParser(jtr_mgr, session_list, strike_list, hash_list)
+        data = test_data.encode()
+        for start in range(0, len(data), 3):
+            log_parser.feed(data[start:start + 3])
+        log_parser.close()
+
+        assert len(session_list.sessions) == 1
+        session = session_list.sessions[0]
+        assert session.mode == "incremental"
+        assert session.hash_type == "type1"
+        assert session.options['incremental'] == "ascii"
+        assert session.options['total_time'] == 65
+        assert not session.compleated
+
+        assert strike_list.hash_id_lookup[1] == [0]
+        assert strike_list.strikes[0].details['mode'] == "ascii"
+        assert strike_list.strikes[1].hash_id == None
+
+    def test_read_logfile_resume(self):
+        """
+        Checks that reading a log again only parses the new lines, and that a session
+        that was running the first time is updated vs. added again
+        """
+        jtr_mgr = JTRMgr({})
+        session_list = SessionList()
+        strike_list = StrikeList()
+        hash_list = HashList()
+        hash_list.add_type("type1", "type1", "1337", "high")
+        hash_list.add("hash1", type="type1")
+        hash_list.add("hash2", type="type1")
+
+        test_data = "0:00:00:00 Starting a new session\n"
+        test_data += "0:00:00:00 Command line: john --wordlist=dic.txt test.hash\n"
+        test_data += "0:00:00:00 - Hash type: type1\n"
+        test_data += "0:00:00:00 Proceeding with wordlist mode\n"
+        test_data += "0:00:00:00 - Wordlist file: dic.txt\n"
+        test_data += "0:00:00:00 - Rule #1: ':' accepted\n"
+        test_data += "0:00:00:10 + Cracked 0: plaintext1\n"
+        # JtR is in the middle of writing this line
+        test_data += "0:00:00:20 + Crac"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "john.log")
+            with open(log_file, "w") as file:
+                file.write(test_data)
+
+            assert jtr_mgr.read_logfile(log_file, session_list, strike_list, hash_list)
+            assert len(session_list.sessions) == 1
+            assert not session_list.sessions[0].compleated
+            assert session_list.sessions[0].options['total_time'] == 10
+            assert session_list.sessions[0].strike_id_list == [0]
+
+            with open(log_file, "a") as file:
+                file.write("ked 1: plaintext2\n")
+                file.write("0:00:00:30 Session completed\n")
+
+            assert jtr_mgr.read_logfile(log_file, session_list, strike_list, hash_list)
+            assert len(session_list.sessions) == 1
+            assert session_list.sessions[0].compleated
+            assert session_list.sessions[0].mode == "wordlist"
+            assert session_list.sessions[0].options['total_time'] == 30
+            assert session_list.sessions[0].strike_id_list == [0, 1]
+            assert strike_list.hash_id_lookup[1] == [1]
+
+            # Nothing new to parse
+            parser = jtr_mgr.log_parsers[os.path.abspath(log_file)]
+            offset = parser.offset
+            assert jtr_mgr.read_logfile(log_file, session_list, strike_list, hash_list)
+            assert jtr_mgr.log_parsers[os.path.abspath(log_file)] is parser
+            assert parser.offset == offset
+
+            # The log was replaced by a shorter one, so it is parsed from the start
+            with open(log_file, "w") as file:
+                file.write("0:00:00:00 Starting a new session\n")
+            assert jtr_mgr.read_logfile(log_file, session_list, strike_list, hash_list)
+            assert jtr_mgr.log_parsers[os.path.abspath(log_file)] is not parser
+
+    def test_read_logfile_resume_duplicates(self):
+        """
+        Checks that a session that was still running the first time the log was read is
+        merged into a duplicate of it once it finishes, the same as if the log was read in one go
+        """
+        incremental_session = "0:00:00:00 Starting a new session\n"
+        incremental_session += "0:00:00:00 Command line: john --incremental=ascii test.hash\n"
+        incremental_session += "0:00:00:00 - Hash type: type1\n"
+        incremental_session += '0:00:00:00 Proceeding with "incremental" mode: ascii\n'
+
+        first_half = incremental_session
+        first_half += "0:00:10:00 + Cracked 0: plaintext1\n"
+        first_half += "0:00:50:00 Session completed\n"
+        first_half += "0:00:00:00 Starting a new session\n"
+        first_half += "0:00:00:00 - Hash type: type1\n"
+        first_half += "0:00:00:00 Proceeding with wordlist mode\n"
+        first_half += "0:00:00:00 - Wordlist file: dic.txt\n"
+        first_half += "0:00:00:00 - Rule #1: ':' accepted\n"
+        first_half += "0:00:00:30 Session completed\n"
+        # Same attack as the first session, and it has run for less time so far
+        first_half += incremental_session
+        first_half += "0:00:41:52 + Cracked 1: plaintext2\n"
+
+        second_half = "0:00:50:00 Session completed\n"
+        second_half += "0:00:00:00 Starting a new session\n"
+        second_half += "0:00:00:00 Command line: john --mask=?d?d?d test.hash\n"
+        second_half += "0:00:00:00 - Hash type: type1\n"
+        second_half += "0:00:00:00 Proceeding with mask mode\n"
+        second_half += "0:00:00:20 Session completed\n"
+
+        def get_results(session_list, strike_list):
+            sessions = []
+            for session_id, session in session_list.sessions.items():
+                sessions.append((session_id, session.mode, session.compleated, session.options, session.strike_id_list))
+            strikes = []
+            for strike_id, strike in strike_list.strikes.items():
+                strikes.append((strike_id, strike.hash_id, strike.details))
+            return sessions, strikes, session_list.next_index
+
+        def read_logs(jtr_mgr, log_file, use_read_logfiles):
+            session_list = SessionList()
+            strike_list = StrikeList()
+            hash_list = HashList()
+            hash_list.add_type("type1", "type1", "1337", "high")
+            hash_list.add("hash1", type="type1")
+            hash_list.add("hash2", type="type1")
+            if use_read_logfiles:
+                jtr_mgr.read_logfiles([log_file], session_list, strike_list, hash_list, max_workers=1)
+            else:
+                jtr_mgr.read_logfile(log_file, session_list, strike_list, hash_list)
+            return session_list, strike_list, hash_list
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "john.log")
+            with open(log_file, "w") as file:
+                file.write(first_half + second_half)
+            expected = get_results(*read_logs(JTRMgr({}), log_file, False)[:2])
+            assert len(expected[0]) == 3
+            assert expected[0][0][3]['total_time'] == 3000
+            assert expected[0][0][4] == [0, 1]
+            assert expected[0][2][1] == "mask"
+
+            # Picking up where the last read left off
+            with open(log_file, "w") as file:
+                file.write(first_half)
+            jtr_mgr = JTRMgr({})
+            session_list, strike_list, hash_list = read_logs(jtr_mgr, log_file, False)
+            # The running session isn't merged yet since it has only run for part of the time
+            assert len(session_list.sessions) == 3
+            with open(log_file, "a") as file:
+                file.write(second_half)
+            jtr_mgr.read_logfile(log_file, session_list, strike_list, hash_list)
+            assert get_results(session_list, strike_list) == expected
+
+            # Picking up where the parsed log cache left off
+            cache_directory = os.path.join(temp_dir, "cache")
+            with open(log_file, "w") as file:
+                file.write(first_half)
+            read_logs(JTRMgr({'log_cache_directory':cache_directory}), log_file, True)
+            with open(log_file, "a") as file:
+                file.write(second_half)
+            assert get_results(*read_logs(JTRMgr({'log_cache_directory':cache_directory}), log_file, True)[:2]) == expected
+
+    def test_read_logfiles(self):
+        """
+        Checks that parsing logs in parallel gives the same results as parsing
+        them one at a time
+        """
+        log1 = "0:00:00:00 Starting a new session\n"
+        log1 += "0:00:00:00 - Hash type: type1\n"
+        log1 += "0:00:00:00 Proceeding with wordlist mode\n"
+        log1 += "0:00:00:00 - Wordlist file: dic.txt\n"
+        log1 += "0:00:00:00 - Rule #1: ':' accepted\n"
+        log1 += "0:00:00:10 + Cracked 0: plaintext1\n"
+        log1 += "0:00:00:20 + Cracked 99: not_a_hash_id\n"
+        log1 += "0:00:00:30 Session completed\n"
+
+        # Still running
+        log2 = "0:00:00:00 Starting a new session\n"
+        log2 += "0:00:00:00 - Hash type: type1\n"
+        log2 += '0:00:00:01 Proceeding with "incremental" mode: ascii\n'
+        log2 += "0:00:00:02 + Cracked 1: plaintext2\n"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filenames = []
+            for name, data in [("a.log", log1), ("b.log", log2), ("c.log", "Not a JtR log\n")]:
+                filenames.append(os.path.join(temp_dir, name))
+                with open(filenames[-1], "w") as file:
+                    file.write(data)
+
+            results = []
+            for max_workers in [1, 2]:
+                jtr_mgr = JTRMgr({})
+                session_list = SessionList()
+                strike_list = StrikeList()
+                hash_list = HashList()
+                hash_list.add_type("type1", "type1", "1337", "high")
+                hash_list.add("hash1", type="type1")
+                hash_list.add("hash2", type="type1")
+
+                parsed = jtr_mgr.read_logfiles(filenames, session_list, strike_list, hash_list, max_workers=max_workers, verbose=False)
+                assert parsed == {filenames[0]:True, filenames[1]:True, filenames[2]:False}
+
+                # Finish the running session
+                with open(filenames[1], "a") as file:
+                    file.write("0:00:00:40 Session completed\n")
+                jtr_mgr.read_logfiles(filenames, session_list, strike_list, hash_list, max_workers=max_workers, verbose=False)
+                with open(filenames[1], "w") as file:
+                    file.write(log2)
+
+                sessions = []
+                for session_id, session in session_list.sessions.items():
+                    sessions.append((session_id, session.mode, session.compleated, session.options['total_time'], session.strike_id_list))
+                strikes = []
+                for strike_id, strike in strike_list.strikes.items():
+                    strikes.append((strike_id, strike.hash_id, strike.details.get('wordlist')))
+                results.append((sessions, strikes))
+
+            assert results[0] == results[1]
+            assert results[0][0] == [(0, "wordlist", True, 30, [0, 1]), (1, "incremental", True, 40, [2])]
+            assert results[0][1] == [(0, 0, "dic.txt"), (1, None, "dic.txt"), (2, 1, None)]
+
+    def test_read_logfiles_cache(self):
+        """
+        Checks that parsed logs are loaded from the cache after a restart, and that
+        the duplicate detection ids are the same every time
+        """
+        log = "0:00:00:00 Starting a new session\n"
+        log += "0:00:00:00 - Hash type: type1\n"
+        log += "0:00:00:00 Proceeding with wordlist mode\n"
+        log += "0:00:00:00 - Wordlist file: dic.txt\n"
+        log += "0:00:00:00 - Rule #1: ':' accepted\n"
+        log += "0:00:00:10 + Cracked 0: plaintext1\n"
+        log += "0:00:00:30 Session completed\n"
+        log += "0:00:00:00 Starting a new session\n"
+        log += "0:00:00:00 - Hash type: type1\n"
+        log += '0:00:00:01 Proceeding with "incremental" mode: ascii\n'
+
+        def read_logs(jtr_mgr, filenames):
+            session_list = SessionList()
+            strike_list = StrikeList()
+            hash_list = HashList()
+            hash_list.add_type("type1", "type1", "1337", "high")
+            hash_list.add("hash1", type="type1")
+            hash_list.add("hash2", type="type1")
+            jtr_mgr.read_logfiles(filenames, session_list, strike_list, hash_list, max_workers=1, verbose=False)
+
+            sessions = []
+            for session_id, session in session_list.sessions.items():
+                sessions.append((session_id, session.mode, session.compleated, session.options, session.strike_id_list))
+            strikes = []
+            for strike_id, strike in strike_list.strikes.items():
+                strikes.append((strike_id, strike.hash_id, strike.details))
+            return sessions, strikes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filenames = [os.path.join(temp_dir, "a.log"), os.path.join(temp_dir, "b.log")]
+            cache_directory = os.path.join(temp_dir, "cache")
+            for filename in filenames:
+                with open(filename, "w") as file:
+                    file.write(log)
+
+            # The cache is off unless a directory is specified, so nothing is written to the log folder
+            assert JTRMgr({'log_directory':temp_dir}).log_cache_directory is None
+
+            expected = read_logs(JTRMgr({}), filenames)
+            assert expected[1][0][2]['duplicate_detection_id'] == 10686028335035837779
+
+            assert read_logs(JTRMgr({'log_cache_directory':cache_directory}), filenames) == expected
+            # One cache file per log
+            cache_files = sorted(os.listdir(cache_directory))
+            assert len(cache_files) == 2
+
+            # An unchanged log shouldn't be parsed again
+            with unittest.mock.patch('lib_framework.jtr_mgr.parse_log_records', side_effect=AssertionError):
+                assert read_logs(JTRMgr({'log_cache_directory':cache_directory}), filenames) == expected
+
+            # An appended to log should only have the new lines parsed, and only its cache file is rewritten
+            with open(filenames[0], "a") as file:
+                file.write("0:00:00:02 + Cracked 1: plaintext2\n0:00:00:40 Session completed\n")
+            expected = read_logs(JTRMgr({}), filenames)
+            assert len(expected[0]) == 3
+            with unittest.mock.patch('lib_framework.jtr_mgr.JTRMgr._save_cached_log', autospec=True, side_effect=JTRMgr._save_cached_log) as save_cached_log:
+                assert read_logs(JTRMgr({'log_cache_directory':cache_directory}), filenames) == expected
+                assert [call.args[1]['filename'] for call in save_cached_log.call_args_list] == [filenames[0]]
+            assert read_logs(JTRMgr({'log_cache_directory':cache_directory}), filenames) == expected
+            assert sorted(os.listdir(cache_directory)) == cache_files
+
+            # A changed log should be parsed from the start
+            with open(filenames[0], "w") as file:
+                file.write(log.replace("dic.txt", "dic2.txt"))
+            expected = read_logs(JTRMgr({}), filenames)
+            assert expected[1][0][2]['wordlist'] == "dic2.txt"
+            assert read_logs(JTRMgr({'log_cache_directory':cache_directory}), filenames) == expected
+
+    def test_read_benchmark_file(self):
+        """
+        Checks that JtRManager parses the output of john --test
+        """
+        jtr_mgr = JTRMgr({})
+
+        test_data = "Benchmarking: descrypt, traditional crypt(3) [DES 256/256 AVX2]... (8xOMP) DONE\n"
+        test_data += "Many salts:\t65175K c/s real, 8146K c/s virtual\n"
+        test_data += "Only one salt:\t44138K c/s real, 5517K c/s virtual\n"
+        test_data += "\n"
+        test_data += "Benchmarking: md5crypt, crypt(3) $1$ (and variants) [MD5 256/256 AVX2 8x3]... (8xOMP) DONE\n"
+        test_data += "Raw:\t228864 c/s real, 28608 c/s virtual\n"
+        test_data += "\n"
+        test_data += "Benchmarking: Raw-MD5 [MD5 256/256 AVX2 8x3]... DONE\n"
+        test_data += "Raw:\t1.5M c/s real, 1.5M c/s virtual\n"
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+            speeds = jtr_mgr.read_benchmark_file("test.txt")
+
+        assert speeds == {'descrypt':65175000, 'md5crypt':228864, 'Raw-MD5':1500000}
+
+    def test_parse_attack_command(self):
+        """
+        Checks that JtR command lines are parsed into the same format as the logs
+        """
+        jtr_mgr = JTRMgr({})
+
+        session_info = jtr_mgr.parse_attack_command("john --format=raw-md5 --wordlist=/words/dic.txt --rules=best64 left.hash")
+        assert session_info == {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic.txt', 'wordlist_path':'/words/dic.txt', 'ruleset':'best64'}}
+
+        # Shortened options and ":" separators
+        session_info = jtr_mgr.parse_attack_command(["john", "-form:raw-md5", "-w:dic.txt", "--ru", "left.hash"])
+        assert session_info == {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic.txt', 'wordlist_path':'dic.txt', 'ruleset':'Wordlist'}}
+
+        assert jtr_mgr.parse_attack_command("john --mask='?l?l?d' left.hash")['options'] == {'mask':'?l?l?d'}
+        assert jtr_mgr.parse_attack_command("john --mask left.hash")['options'] == {'mask':'default'}
+        assert jtr_mgr.parse_attack_command("john --incremental=ascii left.hash") == {'mode':'incremental', 'options':{'incremental':'ascii'}}
+        assert jtr_mgr.parse_attack_command("john --loopback=jtr.pot left.hash")['mode'] == "loopback"
+        assert jtr_mgr.parse_attack_command("john --stdin left.hash")['mode'] == "stdin"
+
+        # Batch mode starts with single mode
+        assert jtr_mgr.parse_attack_command("john left.hash") == {'mode':'single', 'options':{}}
+
+        # Suppress stdout to clean up unittest output
+        suppress_text = io.StringIO()
+        sys.stdout = suppress_text
+
+        assert jtr_mgr.parse_attack_command("john --external=test left.hash") is None
+
+        # Unsupress stdout
+        sys.stdout = sys.__stdout__
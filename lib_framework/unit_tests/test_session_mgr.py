@@ -7,13 +7,19 @@ Unit tests for SessionMgr
 
 
 import unittest
+import importlib.util
 from unittest.mock import patch, mock_open
+import datetime
 import io
+import json
+import os
 import sys
+import tempfile
 
 # Functions and classes to tests
 from ..session_mgr import SessionMgr
 from ..config_mgmt import load_config
+from ..challenge_specific_functions import register_loader, CHALLENGE_LOADERS
 
 
 # Defining this to make it easy for me to mute printouts
@@ -209,6 +215,63 @@ class Test_SessionMgr(unittest.TestCase):
             mocked_file().write.assert_any_call("cracked4\n")
             assert mocked_file().write.call_count == 2
 
+    def test_session_mgr_load_status_file(self):
+        """
+        Checks loading Hashcat status output for a running job
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+        sm.hash_list.add_type("raw-md5", "Raw-MD5", "0", "low")
+
+        status = {"session":"hc_session", "guess":{"guess_base":"?l?l?l?l?l?l", "guess_mod":None, "guess_mode":9}, "status":3,
+            "progress":[1000, 11000], "recovered_hashes":[1, 5], "rejected":0, "devices":[{"device_id":1, "speed":100}]}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "status.json")
+            with open(filename, "w") as statusfile:
+                statusfile.write(json.dumps(status) + "\n")
+
+            session_id = sm.load_status_file(filename, hash_type="0", rig="rig1")
+            session = sm.session_list.sessions[session_id]
+            assert session.mode == "mask"
+            assert session.options == {'session_name':'hc_session', 'mask':'?l?l?l?l?l?l'}
+            assert session.is_running()
+            assert session.get_eta() == 100
+            assert sm.hash_list.type_info['raw-md5']['speed_by_rig'] == {'rig1':100}
+
+            if mute_output:
+                sys.stdout = io.StringIO()
+            sm.print_running_jobs()
+            output = sys.stdout.getvalue() if mute_output else ""
+            sys.stdout = sys.__stdout__
+            if mute_output:
+                assert "0:01:40" in output
+
+            # More updates for the same file go to the same session
+            status['status'] = 6
+            status['progress'] = [11000, 11000]
+            status['devices'] = [{"device_id":1, "speed":300}]
+            with open(filename, "a") as statusfile:
+                statusfile.write(json.dumps(status) + "\n")
+            assert sm.load_status_file(filename, rig="rig1") == session_id
+            assert len(session.status_history) == 2
+            assert session.compleated
+            assert not session.is_running()
+            assert sm.hash_list.type_info['raw-md5']['speed_by_rig'] == {'rig1':200}
+
+            # Rule files are saved under 'ruleset' like every other session, so a finished
+            # status file session counts towards the attack coverage
+            status = {"session":"hc_rules", "guess":{"guess_base":"/words/dic.txt", "guess_mod":"/rules/best64.rule", "guess_mode":2}, "status":6,
+                "progress":[500, 500], "recovered_hashes":[1, 5], "rejected":0, "devices":[{"device_id":1, "speed":100}]}
+            filename = os.path.join(temp_dir, "status_rules.json")
+            with open(filename, "w") as statusfile:
+                statusfile.write(json.dumps(status) + "\n")
+
+            session_id = sm.load_status_file(filename, hash_type="0", rig="rig1")
+            session = sm.session_list.sessions[session_id]
+            assert session.options == {'session_name':'hc_rules', 'wordlist':'dic.txt', 'ruleset':'best64.rule'}
+            assert sm.check_attack_coverage("hashcat -m 0 -a 0 left.hash /words/dic.txt -r /rules/best64.rule") == "exhausted"
+
     def test_session_mgr_status_prints(self):
         """
         Checks some basic prints that StatusMgr does
@@ -282,3 +345,761 @@ class Test_SessionMgr(unittest.TestCase):
         self._setup_basic_targetlist(sm.target_list, sm.hash_list)
         sm.pie_graph_metadata("city", has_plaintext=False, top_x=None)
 
+
+    def test_session_mgr_plan_attacks(self):
+        """
+        Checks that plan_attacks ranks attacks by points per second
+        """
+        # Load SessionMgr works with a valid config (no challenge files)
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        sm.hash_list.init_scores({'type1':10, 'type2':100})
+
+        # type1 cracks faster, but type2 is worth a lot more
+        session_info = {'mode':'wordlist', 'hash_type':'type1', 'options':{'wordlist':'dic.txt', 'wordlist_path':'/words/dic.txt', 'ruleset':'best64', 'total_time':10}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=False)
+        strike_id = sm.strike_list.add(sm.jtr, 0, {'attack':'wordlist', 'rule':':', 'wordlist':'dic.txt'})
+        sm.session_list.sessions[session_id].add_strike(strike_id)
+        sm.hash_list.add("pw1_type1", plaintext="cracked1")
+
+        session_info = {'mode':'mask', 'hash_type':'TYPE2', 'options':{'mask':'?d?d?d', 'total_time':20}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=False)
+        strike_id = sm.strike_list.add(sm.jtr, 2, {'attack':'mask', 'mode':'?d?d?d'})
+        sm.session_list.sessions[session_id].add_strike(strike_id)
+        sm.hash_list.add("pw3_type2", plaintext="cracked3")
+
+        # Completed attacks are skipped by default
+        session_info = {'mode':'single', 'hash_type':'type1', 'options':{'total_time':1}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=True)
+
+        plan = sm.plan_attacks(verbose=False)
+        assert len(plan) == 2
+        assert plan[0]['hash_type'] == 'type2'
+        assert plan[0]['points_per_second'] == 5
+        assert plan[0]['command'] == "test_path/john --format=type2 '--mask=?d?d?d' '<type2_left_list>'"
+        assert plan[1]['hash_type'] == 'type1'
+        assert plan[1]['points_per_second'] == 1
+        assert plan[1]['remaining'] == 1
+        assert plan[1]['command'] == "test_path/john --format=type1 --wordlist=/words/dic.txt --rules=best64 '<type1_left_list>'"
+
+        plan = sm.plan_attacks(verbose=False, include_compleated=True)
+        assert len(plan) == 3
+
+        # Check that the left list gets written
+        with unittest.mock.patch('builtins.open', new_callable=mock_open) as mocked_file:
+            plan = sm.plan_attacks(top_x=1, file_prefix="plan", verbose=False)
+            mocked_file.assert_called_once_with("plan_type2.jtr.hash", mode='w')
+            mocked_file().write.assert_called_once_with("3:pw4_type2\n")
+        assert plan[0]['command'] == "test_path/john --format=type2 '--mask=?d?d?d' plan_type2.jtr.hash"
+
+    def test_session_mgr_load_benchmark_file(self):
+        """
+        Checks that benchmark speeds are mapped to hash types through the jtr_mode
+        and hc_mode of each type
+        """
+        # Load SessionMgr works with a valid config (no challenge files)
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+
+        # JtR benchmark
+        test_data = "Benchmarking: TYPE1 [MD5 256/256 AVX2 8x3]... DONE\n"
+        test_data += "Raw:\t1000K c/s real, 1000K c/s virtual\n"
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+            assert sm.load_benchmark_file("rig1_john.txt", rig="rig1") == 1
+        assert sm.hash_list.type_info['type1']['speed'] == 1000000
+
+        # Hashcat benchmark from a second rig
+        test_data = "* Hash-Mode 1337 (type1)\n"
+        test_data += "Speed.#1.........:  1000.0 kH/s (49.01ms)\n"
+        test_data += "* Hash-Mode 31337 (type2)\n"
+        test_data += "Speed.#1.........:  20.0 H/s (49.01ms)\n"
+        with unittest.mock.patch('builtins.open', new_callable=mock_open, read_data=test_data):
+            assert sm.load_benchmark_file("rig2_hashcat.txt", cracker_name="hc") == 2
+        assert sm.hash_list.type_info['type1']['speed'] == 2000000
+        assert sm.hash_list.type_info['type1']['speed_by_rig'] == {'rig1':1000000, 'rig2_hashcat.txt':1000000}
+        assert sm.hash_list.get_cost('type2') == 1 / 20
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        sm.print_cost_estimates()
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+    def test_session_mgr_create_sharded_left_lists(self):
+        """
+        Checks that hashes sharing a salt stay together, shards are balanced on
+        estimated work, and results can be merged back in from the manifest
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        sm.hash_list.add_type("md5crypt", "md5crypt", "500", "medium")
+        sm.hash_list.add_type("raw-md5", "raw-md5", "0", "low")
+
+        # Two hashes share salt1, the rest have their own salts
+        sm.hash_list.add("$1$salt1$aaaaaaaaaaaaaaaaaaaaaa", type="md5crypt")
+        sm.hash_list.add("$1$salt1$bbbbbbbbbbbbbbbbbbbbbb", type="md5crypt")
+        sm.hash_list.add("$1$salt2$cccccccccccccccccccccc", type="md5crypt")
+        sm.hash_list.add("$1$salt3$dddddddddddddddddddddd", type="md5crypt")
+        sm.hash_list.add("$1$salt4$eeeeeeeeeeeeeeeeeeeeee", type="md5crypt", plaintext="cracked")
+        sm.hash_list.add("5f4dcc3b5aa765d61d8327deb882cf99", type="raw-md5")
+        sm.hash_list.add("098f6bcd4621d373cade4e832627b4f6", type="raw-md5")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prefix = os.path.join(temp_dir, "shard")
+
+            # Invalid options
+            if mute_output:
+                suppress_text = io.StringIO()
+                sys.stdout = suppress_text
+            assert sm.create_sharded_left_lists(2, prefix, format="index") is None
+            assert sm.create_sharded_left_lists(0, prefix) is None
+            assert sm.create_sharded_left_lists(2, prefix, hash_type="bad_type") is None
+            if mute_output:
+                sys.stdout = sys.__stdout__
+
+            manifest = sm.create_sharded_left_lists(2, prefix)
+            shards = manifest['shards']
+            assert len(shards) == 2
+
+            # 3 md5crypt salts + 1 raw-md5 group. The cheap raw-md5 group goes to the shard
+            # with less work after the md5crypt salts are split up
+            assert shards[0]['hash_ids'] == [0, 1, 3]
+            assert shards[0]['hash_types'] == {'md5crypt':3}
+            assert shards[0]['num_salts'] == 2
+            assert shards[0]['estimated_work'] == 2 * sm.hash_list.get_cost("md5crypt")
+            assert shards[1]['hash_ids'] == [2, 5, 6]
+            assert shards[1]['hash_types'] == {'md5crypt':1, 'raw-md5':2}
+            assert shards[1]['num_salts'] == 2
+
+            with open(shards[1]['file']) as left_list:
+                assert left_list.read() == "2:$1$salt2$cccccccccccccccccccccc\n5:$dynamic_0$5f4dcc3b5aa765d61d8327deb882cf99\n6:$dynamic_0$098f6bcd4621d373cade4e832627b4f6\n"
+
+            with open(f"{prefix}_manifest.json") as manifest_file:
+                assert json.load(manifest_file)['shards'][1]['file'] == shards[1]['file']
+
+            # Only the second shard has returned results
+            with open(shards[1]['pot_file'], "w") as pot_file:
+                pot_file.write("$1$salt2$cccccccccccccccccccccc:password\n")
+
+            if mute_output:
+                suppress_text = io.StringIO()
+                sys.stdout = suppress_text
+            new_cracks = sm.merge_shard_results(f"{prefix}_manifest.json")
+            if mute_output:
+                sys.stdout = sys.__stdout__
+
+            assert new_cracks == {0:0, 1:1}
+            assert sm.hash_list.hashes[2].plaintext == "password"
+
+            # Salts that couldn't be parsed are each costed as their own salt and can be split up
+            sm.hash_list.add("$1$broken1", type="md5crypt")
+            sm.hash_list.add("$1$broken2", type="md5crypt")
+            shards = sm.create_sharded_left_lists(2, os.path.join(temp_dir, "unparsed"))['shards']
+            assert shards[0]['hash_ids'] == [0, 1, 5, 6, 7]
+            assert shards[0]['num_salts'] == 3
+            assert shards[1]['hash_ids'] == [3, 8]
+            assert shards[1]['num_salts'] == 2
+            assert shards[1]['estimated_work'] == 2 * sm.hash_list.get_cost("md5crypt")
+
+    def test_session_mgr_create_left_list_by_salt(self):
+        """
+        Checks ordering the left list by number of hashes per salt and
+        dropping salts with too few hashes
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        sm.hash_list.add_type("md5crypt", "md5crypt", "500", "medium")
+        sm.hash_list.add_type("raw-md5", "raw-md5", "0", "low")
+
+        sm.hash_list.add("$1$salt1$aaaaaaaaaaaaaaaaaaaaaa", type="md5crypt")
+        sm.hash_list.add("$1$salt2$bbbbbbbbbbbbbbbbbbbbbb", type="md5crypt")
+        sm.hash_list.add("$1$salt2$cccccccccccccccccccccc", type="md5crypt")
+        sm.hash_list.add("$1$salt3$dddddddddddddddddddddd", type="md5crypt")
+        sm.hash_list.add("$1$salt3$eeeeeeeeeeeeeeeeeeeeee", type="md5crypt")
+        sm.hash_list.add("$1$salt3$ffffffffffffffffffffff", type="md5crypt", plaintext="cracked")
+        sm.hash_list.add("$1$salt3$gggggggggggggggggggggg", type="md5crypt")
+        sm.hash_list.add("5f4dcc3b5aa765d61d8327deb882cf99", type="raw-md5")
+
+        assert sm.create_left_list(format="index", order_by_salt=True, silent=True) == [3, 4, 6, 1, 2, 0, 7]
+        assert sm.create_left_list(format="index", min_hashes_per_salt=2, silent=True) == [1, 2, 3, 4, 6, 7]
+        assert sm.create_left_list(format="index", hash_type="md5crypt", order_by_salt=True, min_hashes_per_salt=2, silent=True) == [3, 4, 6, 1, 2]
+
+        # Unsalted types and salts that couldn't be parsed aren't held to the minimum
+        sm.hash_list.add("e10adc3949ba59abbe56e057f20f883e", type="raw-md5")
+        sm.hash_list.add("$1$broken", type="md5crypt")
+        assert sm.create_left_list(format="index", min_hashes_per_salt=3, silent=True) == [3, 4, 6, 7, 8, 9]
+        assert sm.create_left_list(format="index", order_by_salt=True, min_hashes_per_salt=3, silent=True) == [3, 4, 6, 7, 8, 9]
+        assert sm.create_left_list(format="index", order_by_salt=True, silent=True) == [3, 4, 6, 1, 2, 7, 8, 0, 9]
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        sm.print_salt_stats()
+        sm.print_cost_estimates()
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+    def test_session_mgr_create_minimized_ruleset(self):
+        """
+        Checks that the minimized ruleset drops rules that only crack hashes already
+        covered by earlier rules
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+
+        rules = {
+            'r1':[0, 1],
+            'r2':[0, 1, 2],
+            'r3':[3],
+            'r4':[2],
+            'r5':[2, 3],
+        }
+        for rule, hash_ids in rules.items():
+            for hash_id in hash_ids:
+                sm.strike_list.add(sm.jtr, hash_id, {'attack':'wordlist', 'rule':rule, 'wordlist':'dic.txt'})
+
+        # Non wordlist attacks and strikes not matched to a hash are ignored
+        sm.strike_list.add(sm.jtr, 3, {'attack':'mask', 'mode':'?d?d?d'})
+        sm.strike_list.add(sm.jtr, None, {'attack':'wordlist', 'rule':'r6', 'wordlist':'dic.txt'})
+
+        assert sm.create_minimized_ruleset() == [('r2', 3), ('r3', 1)]
+        assert sm.create_minimized_ruleset(coverage=0.5) == [('r2', 3)]
+        assert sm.create_minimized_ruleset(hash_type="type2") == [('r5', 2)]
+
+        # Type2 hashes are worth a lot more, so cover them first
+        sm.hash_list.init_scores({'type1':10, 'type2':100})
+        assert sm.create_minimized_ruleset(use_scores=True) == [('r5', 200), ('r1', 20)]
+
+        with unittest.mock.patch('builtins.open', new_callable=mock_open) as mocked_file:
+            sm.create_minimized_ruleset(file_name="min.rule")
+            mocked_file.assert_called_once_with("min.rule", mode='w')
+            mocked_file().write.assert_has_calls([unittest.mock.call("r2\n"), unittest.mock.call("r3\n")])
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        assert sm.create_minimized_ruleset(coverage=2) is None
+        assert sm.create_minimized_ruleset(hash_type="type3") is None
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+    def test_session_mgr_attack_roi(self):
+        """
+        Checks that get_attack_roi ranks the attacks that were run by points per second
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        sm.hash_list.init_scores({'type1':10, 'type2':100})
+
+        session_info = {'mode':'wordlist', 'hash_type':'type1', 'options':{'wordlist':'dic.txt', 'ruleset':'best64', 'num_rules':77, 'total_time':10}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=True)
+        strike_id = sm.strike_list.add(sm.jtr, 0, {'attack':'wordlist', 'rule':':', 'wordlist':'dic.txt'})
+        sm.session_list.sessions[session_id].add_strike(strike_id)
+
+        session_info = {'mode':'mask', 'hash_type':'type2', 'options':{'mask':'?d?d?d', 'total_time':20}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=False)
+        strike_id = sm.strike_list.add(sm.jtr, 2, {'attack':'mask', 'mode':'?d?d?d'})
+        sm.session_list.sessions[session_id].add_strike(strike_id)
+
+        # A slow attack that didn't crack anything
+        session_info = {'mode':'wordlist', 'hash_type':'type1', 'options':{'wordlist':'big.txt', 'ruleset':'jumbo', 'total_time':100}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=True)
+
+        # No runtime so it can't be ranked
+        session_info = {'mode':'single', 'hash_type':'type1', 'options':{}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=True)
+
+        roi = sm.get_attack_roi()
+        assert len(roi) == 3
+        assert roi[0]['hash_type'] == 'type2'
+        assert roi[0]['rules'] == '?d?d?d'
+        assert roi[0]['points'] == 100
+        assert roi[0]['points_per_second'] == 5
+        assert roi[1]['wordlist'] == 'dic.txt'
+        assert roi[1]['rules'] == 'best64'
+        assert roi[1]['num_rules'] == 77
+        assert roi[1]['points_per_second'] == 1
+        assert roi[2]['wordlist'] == 'big.txt'
+        assert roi[2]['points_per_second'] == 0
+        assert roi[2]['runtime'] == 100
+
+        roi = sm.get_attack_roi(hash_type="type1")
+        assert [entry['wordlist'] for entry in roi] == ['dic.txt', 'big.txt']
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        sm.print_attack_roi(top_x=2)
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+    def test_session_mgr_crack_projections(self):
+        """
+        Checks the crack rate projections and stalled type detection
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}, 'session_management':{'contest_end':'1970-01-02T00:00:00+00:00'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        sm.hash_list.add("pw5_type1", type="type1")
+        sm.hash_list.add("pw6_type1", type="type1")
+        sm.hash_list.init_scores({'type1':10, 'type2':100})
+
+        # Two type1 cracks in the last hour, and one type2 crack a long time ago
+        sm.hash_list.update("pw1_type1", plaintext="cracked1", crack_time=7200)
+        sm.hash_list.update("pw2_type1", plaintext="cracked2", crack_time=7300)
+        sm.hash_list.update("pw3_type2", plaintext="cracked3", crack_time=100)
+
+        projections = sm.get_crack_projections(window=3600, now=8000)
+        assert projections['type1']['remaining'] == 2
+        assert projections['type1']['cracks_per_hour'] == 2
+        assert projections['type1']['last_crack'] == 7300
+        assert projections['type1']['projected_cracks'] == 2
+        assert projections['type1']['projected_points'] == 20
+        assert not projections['type1']['stalled']
+        assert projections['type2']['cracks_per_hour'] == 0
+        assert projections['type2']['projected_cracks'] == 0
+        assert projections['type2']['stalled']
+        assert 'unknown' not in projections
+
+        # Only half an hour left
+        projections = sm.get_crack_projections(end_time=9800, window=3600, now=8000)
+        assert projections['type1']['projected_cracks'] == 1
+
+        # YAML loads a contest_end without a time as a date
+        sm.config['session_management']['contest_end'] = datetime.date(1970, 1, 2)
+        projections = sm.get_crack_projections(window=3600, now=8000)
+        assert projections['type1']['projected_cracks'] == 2
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        # Unsupported types are rejected
+        projections = sm.get_crack_projections(end_time=['1970-01-02'], window=3600, now=8000)
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+        assert projections is None
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        sm.print_crack_rates()
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+    def test_session_mgr_load_main_pots_crack_times(self):
+        """
+        Checks that cracks already in the pots the first time they are loaded don't count
+        towards the crack rate, and cracks loaded after that do
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jtr_pot = os.path.join(temp_dir, "jtr.pot")
+            hc_pot = os.path.join(temp_dir, "hc.potfile")
+            with open(jtr_pot, "w") as pot_file:
+                pot_file.write("pw1_type1:cracked1\npw3_type2:cracked3\n")
+            with open(hc_pot, "w") as pot_file:
+                pot_file.write("")
+
+            config = {'jtr_config':{'path':'test_path', 'main_pot_file':jtr_pot}, 'hashcat_config':{'main_pot_file':hc_pot}}
+            with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value=config) as load_config:
+                sm = SessionMgr("test.yml", load_challenge=False)
+            self._setup_basic_hashlist(sm.hash_list)
+
+            sm.load_main_pots(verbose=False)
+            assert sm.hash_list.type_info['type1']['cracked'] == 1
+            assert sm.hash_list.get_crack_time(0) is None
+            assert sm.hash_list.get_crack_history("type1") == []
+            projections = sm.get_crack_projections(end_time=0)
+            assert projections['type1']['cracks_per_hour'] == 0
+            assert projections['type1']['last_crack'] is None
+            assert projections['type1']['stalled']
+
+            # Cracks found while the notebook is running are timestamped when they are loaded
+            with open(jtr_pot, "a") as pot_file:
+                pot_file.write("pw2_type1:cracked2\n")
+            sm.load_main_pots(verbose=False)
+            assert sm.hash_list.get_crack_time(1) is not None
+            projections = sm.get_crack_projections(end_time=0, window=3600)
+            assert projections['type1']['cracks_per_hour'] == 1
+            assert not projections['type1']['stalled']
+            assert projections['type2']['stalled']
+
+    def test_session_mgr_attack_coverage(self):
+        """
+        Checks that proposed attacks are compared against the attacks that have been run
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        sm.hash_list.add("pw5_type2", type="type2")
+        sm.hash_list.init_scores({'type1':10, 'type2':100})
+
+        session_info = {'mode':'wordlist', 'hash_type':'type1', 'options':{'wordlist':'dic.txt', 'ruleset':'best64', 'total_time':10}}
+        sm.session_list.add(sm.jtr, session_info, compleated=True)
+        session_info = {'mode':'mask', 'hash_type':'type1', 'options':{'mask':'?d?d?d', 'total_time':10}}
+        sm.session_list.add(sm.jtr, session_info, compleated=False)
+        session_info = {'mode':'wordlist', 'hash_type':'31337', 'options':{'wordlist':'dic.txt', 'total_time':10}}
+        sm.session_list.add(sm.hc, session_info, compleated=True)
+
+        assert sm.check_attack_coverage("john --format=type1 --wordlist=/words/dic.txt --rules=best64 left.hash") == "exhausted"
+        assert sm.check_attack_coverage("john --wordlist=/words/dic.txt --rules=best64 left.hash", hash_type="type1") == "exhausted"
+        assert sm.check_attack_coverage("john --format=type1 --mask=?d?d?d left.hash") == "partial"
+        assert sm.check_attack_coverage("john --format=type1 --wordlist=dic.txt left.hash") == "new"
+        assert sm.check_attack_coverage("john --format=type2 --wordlist=dic.txt --rules=best64 left.hash") == "new"
+        assert sm.check_attack_coverage("hashcat -m 31337 -a 0 left.hash dic.txt") == "exhausted"
+        assert sm.check_attack_coverage("/opt/hashcat/hashcat.bin -m 1337 -a 0 left.hash dic.txt") == "new"
+
+        # Type2 is worth more, so the JtR attacks are suggested for it first
+        untried = sm.get_untried_attacks(verbose=False)
+        assert [(attack['hash_type'], attack['tool'], attack['mode']) for attack in untried] == [
+            ('type2', sm.jtr.name, 'mask'),
+            ('type2', sm.jtr.name, 'wordlist'),
+            ('type1', sm.hc.name, 'wordlist'),
+        ]
+        assert untried[0]['remaining_points'] == 300
+        assert untried[1]['rules'] == 'best64'
+        assert len(sm.get_untried_attacks(top_x_types=1, verbose=False)) == 2
+
+        if mute_output:
+            suppress_text = io.StringIO()
+            sys.stdout = suppress_text
+
+        sm.get_untried_attacks()
+        assert sm.check_attack_coverage("john --wordlist=dic.txt left.hash", hash_type="type3") is None
+
+        if mute_output:
+            sys.stdout = sys.__stdout__
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas") and importlib.util.find_spec("pyarrow"), "pandas and pyarrow are not installed")
+    def test_session_mgr_to_dataframe(self):
+        """
+        Checks that the framework state is exported with one row per (target, hash)
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        self._setup_basic_targetlist(sm.target_list, sm.hash_list)
+        sm.hash_list.add("pw5_type1", type="type1")
+        sm.hash_list.update("pw1_type1", plaintext="cracked1", crack_time=1700000000)
+        sm.hash_list.init_scores({'type1':10, 'type2':100})
+
+        table = sm.to_arrow()
+        assert table.column_names == ['target_id', 'hash_id', 'hash', 'type', 'cracked', 'plaintext', 'score', 'crack_time', 'user', 'city']
+        assert table.num_rows == 5
+        assert str(table.schema.field('type').type) == "dictionary<values=string, indices=int32, ordered=0>"
+        assert str(table.schema.field('city').type) == "dictionary<values=string, indices=int32, ordered=0>"
+
+        data = table.to_pydict()
+        assert data['target_id'] == [0, 0, 1, 1, None]
+        assert data['hash'] == ["pw1_type1", "pw3_type2", "pw2_type1", "pw4_type2", "pw5_type1"]
+        assert data['type'] == ["type1", "type2", "type1", "type2", "type1"]
+        assert data['cracked'] == [True, False, False, False, False]
+        assert data['plaintext'] == ["cracked1", None, None, None, None]
+        assert data['score'] == [10, 100, 10, 100, 10]
+        assert data['crack_time'] == [datetime.datetime(2023, 11, 14, 22, 13, 20), None, None, None, None]
+        assert data['user'] == ["user1", "user1", "user2", "user2", None]
+        assert data['city'] == ["boston", "boston", "boston", "boston", None]
+
+        df = sm.to_dataframe()
+        assert len(df) == 5
+        assert str(df['city'].dtype) == "category"
+        assert str(df['target_id'].dtype) == "Int64"
+        assert df['cracked'].sum() == 1
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_session_mgr_parquet_round_trip(self):
+        """
+        Checks that the framework state can be saved to Parquet and reloaded with the same ids
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        self._setup_basic_targetlist(sm.target_list, sm.hash_list)
+        sm.hash_list.update("pw1_type1", plaintext="cracked1", crack_time=1700000000)
+        sm.hash_list.sub_lookup[0] = 1
+
+        session_info = {'mode':'wordlist', 'hash_type':'type1', 'num_loaded_hashes':2, 'options':{'wordlist':'dic.txt', 'ruleset':'best64'}}
+        session_id = sm.session_list.add(sm.jtr, session_info, compleated=True)
+        sm.session_list.sessions[session_id].add_hash(0)
+        sm.session_list.sessions[session_id].add_hash(1)
+        strike_id = sm.strike_list.add(sm.jtr, 0, {'attack':'wordlist', 'rule':':', 'wordlist':'dic.txt', 'duplicate_detection_id':12345, 'other':5})
+        sm.session_list.sessions[session_id].add_strike(strike_id)
+        sm.strike_list.add(sm.hc, None, {'attack':'mask', 'mode':None})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest = sm.save_parquet(temp_dir)
+            assert manifest['counts'] == {'hash_types':3, 'hashes':4, 'targets':2, 'sessions':1, 'strikes':2}
+
+            with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+                sm2 = SessionMgr("test.yml", load_challenge=False)
+            assert sm2.load_parquet(temp_dir)
+
+        assert list(sm2.hash_list.hashes) == list(sm.hash_list.hashes)
+        assert sm2.hash_list.hashes[0].plaintext == "cracked1"
+        assert sm2.hash_list.get_crack_time(0) == 1700000000
+        assert sm2.hash_list.type_lookup[3] == "type2"
+        assert sm2.hash_list.sub_lookup[0] == 1
+        assert sm2.hash_list.type_info['type1']['cracked'] == 1
+        assert sm2.hash_list.type_info['type2']['hc_mode'] == sm.hash_list.type_info['type2']['hc_mode']
+
+        assert sm2.target_list.targets[1].metadata == sm.target_list.targets[1].metadata
+        assert sm2.target_list.targets[1].hashes == sm.target_list.targets[1].hashes
+
+        session = sm2.session_list.sessions[0]
+        assert session.tool == sm.jtr.name
+        assert session.compleated
+        assert session.options['ruleset'] == 'best64'
+        assert session.hashes == [0, 1]
+        assert session.strike_id_list == [0]
+        assert session.num_cracked_hashes == 1
+
+        assert sm2.strike_list.strikes[0].details == sm.strike_list.strikes[0].details
+        assert sm2.strike_list.strikes[1].details == {'attack':'mask', 'mode':None}
+        assert sm2.strike_list.strikes[1].hash_id is None
+        assert sm2.strike_list.strikes[1].tool == sm.hc.name
+
+    def test_session_mgr_password_structures(self):
+        """
+        Checks that cracked passwords are split into letter/digit/special runs and counted
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        self._setup_basic_targetlist(sm.target_list, sm.hash_list)
+        sm.hash_list.update("pw1_type1", plaintext="Summer2024!")
+        sm.hash_list.update("pw2_type1", plaintext="winter2024!")
+        sm.hash_list.update("pw3_type2", plaintext="pass_word1")
+
+        results = sm.get_password_structures(batch_size=2)
+        assert results['num_passwords'] == 3
+        assert results['structures'] == {'L6D4S1':2, 'L4S1L4D1':1}
+        assert results['terminals']['L6'] == {'Summer':1, 'winter':1}
+        assert results['terminals']['D4'] == {'2024':2}
+        assert results['terminals']['S1'] == {'!':2, '_':1}
+        assert results['base_words']['summer'] == 1
+        assert results['digit_suffixes'] == {'1':1}
+
+        results = sm.get_password_structures(hash_type="type2")
+        assert results['structures'] == {'L4S1L4D1':1}
+
+        results = sm.get_password_structures(filter={'user':'user2'})
+        assert results['structures'] == {'L6D4S1':1}
+        assert results['terminals']['L6'] == {'winter':1}
+
+        if mute_output:
+            sys.stdout = io.StringIO()
+        assert sm.get_password_structures(hash_type="not_loaded") is None
+        sys.stdout = sys.__stdout__
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_prefix = os.path.join(temp_dir, "test")
+            sm.create_structure_wordlists(file_prefix)
+            with open(f"{file_prefix}_base_words.txt") as file:
+                assert file.read().split() == ['summer', 'winter', 'pass', 'word']
+            with open(f"{file_prefix}_structures.txt") as file:
+                assert file.readline() == "L6D4S1\t2\n"
+
+    def test_session_mgr_metadata_correlation(self):
+        """
+        Checks that cracked passwords are matched against transforms of their target's metadata
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        sm.hash_list.add_type("type1", "type1", "1337", "high")
+        plaintexts = ["Bob1990", "B0st0n!", "yraM2", "pw04151985", "nothing"]
+        targets = [
+            {'user':'bob', 'city':'boston', 'created':datetime.date(2001, 2, 3)},
+            {'user':'sue', 'city':'boston', 'created':datetime.date(2001, 2, 3)},
+            {'user':'mary', 'city':'seattle', 'created':"2010-01-01"},
+            {'user':'al', 'city':'seattle', 'created':"04/15/1985"},
+            {'user':'tom', 'city':'seattle'},
+        ]
+        for index, (plaintext, metadata) in enumerate(zip(plaintexts, targets)):
+            sm.hash_list.add(f"hash{index}", type="type1", plaintext=plaintext)
+            sm.target_list.add(metadata, [sm.hash_list.hash_lookup[f"hash{index}"]])
+
+        # Uncracked hashes are ignored
+        sm.hash_list.add("hash5", type="type1")
+        sm.target_list.add({'user':'bill'}, [sm.hash_list.hash_lookup["hash5"]])
+
+        correlation = sm.get_metadata_correlation()
+        assert [entry['field'] for entry in correlation] == ['user', 'created', 'city']
+
+        assert correlation[0]['num_pairs'] == 5
+        assert correlation[0]['hits'] == 2
+        assert correlation[0]['transforms'] == {'case':1, 'leet':0, 'reverse':1, 'date':0}
+
+        assert correlation[1]['num_pairs'] == 4
+        assert correlation[1]['hits'] == 1
+        assert correlation[1]['transforms']['date'] == 1
+
+        assert correlation[2]['hits'] == 1
+        assert correlation[2]['transforms']['leet'] == 1
+
+        correlation = sm.get_metadata_correlation(fields=['city'], filter={'city':'boston'})
+        assert len(correlation) == 1
+        assert correlation[0]['num_pairs'] == 2
+        assert correlation[0]['hit_rate'] == 0.5
+
+    def test_session_mgr_metadata_correlation_date_command(self):
+        """
+        Checks that Created values in the CMIYC 2023 Unix date command format are matched
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        sm.hash_list.add_type("type1", "type1", "1337", "high")
+        plaintexts = ["summer20220531", "05312022x", "1654007166", "nothing"]
+        for index, plaintext in enumerate(plaintexts):
+            sm.hash_list.add(f"hash{index}", type="type1", plaintext=plaintext)
+            sm.target_list.add({'user':f"user{index}", 'Created':"Tue May 31 08:26:06 CST 2022"}, [index])
+
+        correlation = sm.get_metadata_correlation(fields=['Created'])
+        assert correlation[0]['num_pairs'] == 4
+        assert correlation[0]['hits'] == 3
+        assert correlation[0]['transforms']['date'] == 3
+
+    def test_session_mgr_date_range_filter(self):
+        """
+        Checks range filters on metadata dates and the epoch candidates for an association attack
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        sm.target_list.add({'user':'user1', 'Created':"Tue May 31 08:26:06 CST 2022"}, [sm.hash_list.hash_lookup["pw1_type1"]])
+        sm.target_list.add({'user':'user2', 'Created':"Tue Oct 11 00:07:07 CST 2022"}, [sm.hash_list.hash_lookup["pw2_type1"]])
+        sm.target_list.add({'user':'user3'}, [sm.hash_list.hash_lookup["pw3_type2"]])
+
+        hash_ids = sm.create_left_list(format="index", silent=True, range_filter={'Created':(None, None)})
+        assert hash_ids == [0, 1]
+
+        hash_ids = sm.create_left_list(format="index", silent=True, range_filter={'Created':(datetime.date(2022, 6, 1), None)})
+        assert hash_ids == [1]
+
+        if mute_output:
+            sys.stdout = io.StringIO()
+        assert sm.create_left_list(format="index", silent=True, range_filter={'Missing':(0, 1)}) is None
+        sys.stdout = sys.__stdout__
+
+        guesses = sm.create_date_candidates("Created", [0, 1, 2])
+        assert guesses == ["1654007166", "1665468427", "placeholder"]
+
+        guesses = sm.create_date_candidates("Created", [0], date_format="%m%d%Y", offset=3600)
+        assert guesses == ["05312022"]
+
+        # Dates are formatted in the timezone they were written in, even if it's a different day in UTC
+        sm.target_list.add({'user':'user4', 'Created':"Tue Oct 11 20:07:07 CST 2022"}, [sm.hash_list.hash_lookup["pw4_type2"]])
+        guesses = sm.create_date_candidates("Created", [3, 1], date_format="%m%d%Y")
+        assert guesses == ["10112022", "10112022"]
+        guesses = sm.create_date_candidates("Created", [3])
+        assert guesses == [str(int(datetime.datetime(2022, 10, 12, 2, 7, 7, tzinfo=datetime.timezone.utc).timestamp()))]
+
+    def test_session_mgr_export_wordlist(self):
+        """
+        Checks that the cracked wordlist is deduplicated and ordered by how often words were used
+        """
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value={'jtr_config':{'path':'test_path'}}) as load_config:
+            sm = SessionMgr("test.yml", load_challenge=False)
+
+        self._setup_basic_hashlist(sm.hash_list)
+        self._setup_basic_targetlist(sm.target_list, sm.hash_list)
+        sm.hash_list.init_scores({'type1':1, 'type2':10})
+        sm.hash_list.update("pw1_type1", plaintext="password1")
+        sm.hash_list.update("pw2_type1", plaintext="summer")
+        sm.hash_list.update("pw4_type2", plaintext="summer")
+        sm.hash_list.update("pw3_type2", plaintext="!Password22")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "test.dic")
+
+            assert sm.export_wordlist(file_name) == 3
+            with open(file_name) as file:
+                assert file.read() == "summer\npassword1\n!Password22\n"
+
+            words = sm.export_wordlist(file_name, order_by="score", return_list=True)
+            assert words == ["summer", "!Password22", "password1"]
+
+            words = sm.export_wordlist(file_name, order_by=None, min_count=2, return_list=True, block_size=1)
+            assert words == ["summer"]
+
+            words = sm.export_wordlist(file_name, base_words=True, return_list=True)
+            assert words == ["summer", "password", "Password"]
+
+            words = sm.export_wordlist(file_name, hash_type="type2", filter={'user':'user2'}, return_list=True)
+            assert words == ["summer"]
+            with open(file_name) as file:
+                assert file.read() == "summer\n"
+
+    def test_session_mgr_challenge_loader_registry(self):
+        """
+        Checks that challenge files are loaded in batches through a registered loader
+        """
+        yielded = []
+
+        @register_loader("test_format")
+        def load_test_format(details):
+            for index in range(5):
+                yielded.append(index)
+                metadata = {'user':f"user{index}"} if index % 2 else None
+                yield f"{index:032x}", "raw-md5", metadata
+
+        config = {
+            'jtr_config':{'path':'test_path'},
+            'challenge_files':{
+                'test':{'file':"test.txt", 'format':"test_format", 'source':"test_list", 'batch_size':2},
+            },
+        }
+        try:
+            if mute_output:
+                sys.stdout = io.StringIO()
+            with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value=config) as load_config:
+                sm = SessionMgr("test.yml")
+            sys.stdout = sys.__stdout__
+        finally:
+            del CHALLENGE_LOADERS["test_format"]
+
+        assert yielded == [0, 1, 2, 3, 4]
+        assert len(sm.hash_list.hashes) == 5
+        assert sm.hash_list.type_lookup[0] == "raw-md5"
+        assert sm.target_list.targets[0].metadata == {'user':"user1"}
+        assert sm.target_list.targets[0].hashes == [1]
+        assert sm.target_list.targets[2].metadata == {'source':"test_list"}
+        assert sm.target_list.targets[2].hashes == [0, 2, 4]
+
+        # The loader was removed so the format is no longer supported
+        if mute_output:
+            sys.stdout = io.StringIO()
+        with unittest.mock.patch('lib_framework.session_mgr.load_config', return_value=config) as load_config:
+            with self.assertRaises(Exception):
+                SessionMgr("test.yml")
+        sys.stdout = sys.__stdout__
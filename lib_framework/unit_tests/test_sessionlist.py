@@ -7,6 +7,8 @@ Unit tests for SessionList and Sessions
 
 
 import unittest
+import io
+import sys
 
 # Functions and classes to tests
 from ..session import SessionList
@@ -41,3 +43,167 @@ class Test_SessionList(unittest.TestCase):
         # Add a second entry and see that it does get added
         session_info = {'mode':'mask', 'hash_type':'raw-md5', 'options':{'mode':'0', 'wordlist':'password.lst'}}
         assert session_list.add(cracker_mgr, session_info, compleated=False, check_duplicates=True) == 1
+
+    def test_update_session(self):
+        """
+        Checks updating a session that was added while it was still running
+        """
+        session_list = SessionList()
+        cracker_mgr = PWCrackerMgr({'main_pot_file':"test.pot"})
+
+        session_info = {'mode':'wordlist', 'options':{'wordlist':'dic0294', 'total_time':10}}
+        assert session_list.add(cracker_mgr, session_info, compleated=False, check_duplicates=True) == 0
+        assert session_list.hash_type_lookup == {'unknown':[0]}
+
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'total_time':20, 'ruleset':'best64'}}
+        assert session_list.update(0, session_info, compleated=True) == 0
+
+        session = session_list.sessions[0]
+        assert session.compleated
+        assert session.hash_type == 'raw-md5'
+        assert session.options == {'wordlist':'dic0294', 'total_time':20, 'ruleset':'best64'}
+        assert session_list.hash_type_lookup == {'raw-md5':[0]}
+
+        # Invalid session
+        suppress_text = io.StringIO()
+        sys.stdout = suppress_text
+        assert session_list.update(5, session_info) == -1
+        sys.stdout = sys.__stdout__
+
+    def test_session_status(self):
+        """
+        Checks the speed and ETA telemetry for running sessions
+        """
+        session_list = SessionList()
+        cracker_mgr = PWCrackerMgr({'main_pot_file':"test.pot"})
+        session_id = session_list.add(cracker_mgr, {'mode':'wordlist'}, compleated=False)
+        session = session_list.sessions[session_id]
+
+        assert not session.is_running()
+        assert session.get_speed() is None
+        assert session.get_eta() is None
+
+        for progress in range(1, 11):
+            session.add_status({'speed':progress * 100, 'progress':progress * 1000, 'progress_total':100000, 'running':True})
+        assert session.is_running()
+
+        # Average of the last five speeds
+        assert session.get_speed() == 800
+        assert session.get_eta() == 90000 / 800
+
+        # Old updates are dropped
+        for _ in range(session.max_status_history):
+            session.add_status({'speed':1000, 'progress':50000, 'progress_total':100000, 'running':True})
+        assert len(session.status_history) == session.max_status_history
+        assert session.status_history[0]['speed'] == 1000
+
+        # Updates without a speed are skipped when averaging
+        session.add_status({'speed':0, 'progress':100000, 'progress_total':100000, 'running':False})
+        assert not session.is_running()
+        assert session.get_speed() == 1000
+        assert session.get_eta() == 0
+
+    def test_session_strikes_and_hashes(self):
+        """
+        Checks adding strikes and hashes to a session
+        """
+        session_list = SessionList()
+        cracker_mgr = PWCrackerMgr({'main_pot_file':"test.pot"})
+        session = session_list.sessions[session_list.add(cracker_mgr, {'mode':'wordlist'})]
+
+        assert session.add_strike(5) == 1
+        assert session.add_strike(3) == 1
+        assert session.add_strike(5) == 0
+        assert session.strike_id_list == [5, 3]
+        assert session.num_cracked_hashes == 2
+
+        assert session.add_hash(1) == 1
+        assert session.add_hash(1) == 0
+        assert session.hashes == [1]
+
+    def test_duplicate_sessions(self):
+        """
+        Checks the duplicate detection and total_time merge rule
+        """
+        session_list = SessionList()
+        cracker_mgr = PWCrackerMgr({'main_pot_file':"test.pot"})
+
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'rules':'best64', 'total_time':10}}
+        assert session_list.add(cracker_mgr, session_info) == 0
+
+        # Option order doesn't matter and a longer run updates the total_time
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'total_time':20, 'rules':'best64', 'wordlist':'dic0294'}}
+        assert session_list.add(cracker_mgr, session_info, compleated=True) == 0
+        assert session_list.sessions[0].options['total_time'] == 20
+        assert session_list.sessions[0].compleated
+
+        # A shorter run is a new session
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'rules':'best64', 'total_time':5}}
+        assert session_list.add(cracker_mgr, session_info) == 1
+        assert session_list.add(cracker_mgr, session_info) == 1
+
+        # Different options, hash type, or tool
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'total_time':10}}
+        assert session_list.add(cracker_mgr, session_info) == 2
+        session_info = {'mode':'wordlist', 'hash_type':'raw-sha1', 'options':{'wordlist':'dic0294', 'total_time':10}}
+        assert session_list.add(cracker_mgr, session_info) == 3
+        cracker_mgr2 = PWCrackerMgr({'main_pot_file':"test.pot"})
+        cracker_mgr2.name = "c2"
+        assert session_list.add(cracker_mgr2, session_info) == 4
+        assert session_list.add(cracker_mgr2, session_info, check_duplicates=False) == 5
+
+        # Updating a session changes what it is a duplicate of
+        session_list.update(2, {'options':{'rules':'jumbo'}})
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'rules':'jumbo', 'total_time':30}}
+        assert session_list.add(cracker_mgr, session_info) == 2
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'total_time':30}}
+        assert session_list.add(cracker_mgr, session_info) == 6
+
+        # A session that was still running is merged into its duplicate once it's over
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic0294', 'rules':'jumbo', 'total_time':15}}
+        assert session_list.add(cracker_mgr, session_info, check_duplicates=False) == 7
+        session_list.sessions[7].add_strike(3)
+        assert session_list.update(7, {'options':{'total_time':40}}, compleated=True) == 7
+        assert session_list.update(7, {'options':{'total_time':40}}, compleated=True, check_duplicates=True) == 2
+        assert 7 not in session_list.sessions
+        assert session_list.sessions[2].options['total_time'] == 40
+        assert session_list.sessions[2].compleated
+        assert session_list.sessions[2].strike_id_list == [3]
+        assert session_list.get_coverage(session_list.get_coverage_key(cracker_mgr.name, 'raw-md5', 'wordlist', session_info['options'])) == "exhausted"
+        # The id of the merged session is given out again
+        assert session_list.add(cracker_mgr, session_info, check_duplicates=False) == 7
+
+
+    def test_coverage(self):
+        """
+        Checks the coverage index used to tell if an attack has already been run
+        """
+        session_list = SessionList()
+        cracker_mgr = PWCrackerMgr({'main_pot_file':"test.pot"})
+
+        key = session_list.get_coverage_key(cracker_mgr.name, "Raw-MD5", "wordlist", {'wordlist':'dic.txt', 'ruleset':'Best64'})
+        assert key == (cracker_mgr.name, "raw-md5", "wordlist", "dic.txt", "best64")
+        assert session_list.get_coverage(key) == "new"
+
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic.txt', 'ruleset':'best64', 'total_time':10}}
+        session_id = session_list.add(cracker_mgr, session_info)
+        assert session_list.get_coverage(key) == "partial"
+
+        # A duplicate that ran to completion
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic.txt', 'ruleset':'best64', 'total_time':20}}
+        assert session_list.add(cracker_mgr, session_info, compleated=True) == session_id
+        assert session_list.get_coverage(key) == "exhausted"
+
+        # Updating a session moves it in the index
+        session_info = {'mode':'wordlist', 'hash_type':'raw-md5', 'options':{'wordlist':'dic.txt', 'total_time':5}}
+        session_id = session_list.add(cracker_mgr, session_info)
+        no_rules_key = session_list.get_coverage_key(cracker_mgr.name, "raw-md5", "wordlist", {'wordlist':'dic.txt'})
+        assert session_list.get_coverage(no_rules_key) == "partial"
+        session_list.update(session_id, {'options':{'ruleset':'jumbo'}}, compleated=True)
+        assert session_list.get_coverage(no_rules_key) == "new"
+        jumbo_key = session_list.get_coverage_key(cracker_mgr.name, "raw-md5", "wordlist", {'wordlist':'dic.txt', 'ruleset':'jumbo'})
+        assert session_list.get_coverage(jumbo_key) == "exhausted"
+
+        # Single mode uses the single ruleset by default
+        single_key = session_list.get_coverage_key(cracker_mgr.name, "raw-md5", "single", {})
+        assert single_key == session_list.get_coverage_key(cracker_mgr.name, "raw-md5", "single", {'ruleset':'Single'})
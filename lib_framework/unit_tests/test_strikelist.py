@@ -43,6 +43,19 @@ class Test_StrikeList(unittest.TestCase):
         details = {'mode':'0', 'wordlist':'passwords.lst'}
         assert strike_list.add(cracker_mgr, hash, details) == 1
 
+        # The order of the details shouldn't matter
+        details = {'wordlist':'passwords.lst', 'mode':'0'}
+        assert strike_list.add(cracker_mgr, hash, details) == 1
+
+        # Strikes that aren't associated with a hash
+        for index in range(1000):
+            assert strike_list.add(cracker_mgr, None, {'rule':str(index)}) == index + 2
+        for index in range(1000):
+            assert strike_list.add(cracker_mgr, None, {'rule':str(index)}) == index + 2
+
+        # Details that can't be used in a dict key
+        assert strike_list.add(cracker_mgr, hash, {'rules':['best64', 'jumbo']}) == 1002
+        assert strike_list.add(cracker_mgr, hash, {'rules':['best64', 'jumbo']}) == 1002
 
     def test_strike_lookup_fields(self):
         """
@@ -78,4 +91,44 @@ class Test_StrikeList(unittest.TestCase):
 
         assert strike_list.hash_id_lookup[0] == [0]
         assert strike_list.hash_id_lookup[1] == [1]
-        assert strike_list.hash_id_lookup[2] == [2, 3]
\ No newline at end of file
+        assert strike_list.hash_id_lookup[2] == [2, 3]
+
+    def test_strike_views(self):
+        """
+        Checks that strikes read back out of the compact storage match what was added
+        """
+        strike_list = StrikeList()
+        cracker_mgr = PWCrackerMgr({'main_pot_file':"test.pot"})
+
+        details = {'attack':'wordlist', 'rule':'$1', 'wordlist':'dic0294.txt', 'duplicate_detection_id':2**64 - 1}
+        assert strike_list.add(cracker_mgr, 5, details) == 0
+        details = {'attack':'incremental', 'mode':'ascii', 'other':['a', 'b']}
+        assert strike_list.add(cracker_mgr, None, details) == 1
+
+        strike = strike_list.strikes[0]
+        assert strike.tool == cracker_mgr.name
+        assert strike.hash_id == 5
+        assert strike.details == {'attack':'wordlist', 'rule':'$1', 'wordlist':'dic0294.txt', 'duplicate_detection_id':2**64 - 1}
+        assert strike.details['rule'] == '$1'
+        assert 'mode' not in strike.details
+        assert strike.details.get('mode') is None
+
+        strike = strike_list.strikes[1]
+        assert strike.hash_id is None
+        assert strike.details == {'attack':'incremental', 'mode':'ascii', 'other':['a', 'b']}
+        with self.assertRaises(KeyError):
+            strike.details['rule']
+
+        assert len(strike_list.strikes) == 2
+        assert list(strike_list.strikes.keys()) == [0, 1]
+        assert 2 not in strike_list.strikes
+
+        # Strings are only saved once
+        for index in range(3000):
+            assert strike_list.add(cracker_mgr, index, {'attack':'wordlist', 'rule':'$1', 'wordlist':'dic0294.txt'}) == index + 2
+        assert len(strike_list._values) == 6
+
+        # Duplicates are still found after the lookup table has been resized
+        for index in range(3000):
+            assert strike_list.add(cracker_mgr, index, {'attack':'wordlist', 'rule':'$1', 'wordlist':'dic0294.txt'}) == index + 2
+        assert strike_list.add(cracker_mgr, 5, {'attack':'wordlist', 'rule':'$1', 'wordlist':'dic0294.txt', 'duplicate_detection_id':2**64 - 1}) == 0
@@ -7,6 +7,8 @@ Unit tests for TargetList and Target
 
 
 import unittest
+import datetime
+import math
 
 # Functions and classes to tests
 from ..target import Target
@@ -67,3 +69,36 @@ class Test_TargetList(unittest.TestCase):
         assert stats['num_hashes'] == 1
         assert stats['num_cracked'] == 0
 
+    def test_typed_columns(self):
+        """
+        Checks that metadata fields are parsed into typed columns and can be range filtered
+        """
+        target_list = TargetList()
+        target_list.add({'user':'bob', 'Created':"Tue May 31 08:26:06 CST 2022", 'age':"42"}, [0])
+        target_list.add({'user':'sue', 'Created':"2022-01-01", 'age':30}, [1])
+        target_list.add({'user':'al', 'Created':datetime.date(2023, 1, 1), 'age':"unknown"}, [2])
+        target_list.add({'user':'tom', 'Created':"not a date"}, [3])
+
+        column = target_list.get_typed_column("Created")
+        assert column['values'][0] == datetime.datetime(2022, 5, 31, 14, 26, 6, tzinfo=datetime.timezone.utc).timestamp()
+        assert column['values'][1] == datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+        assert math.isnan(column['values'][3])
+        assert column['num_invalid'] == 1
+        assert list(column['utc_offsets'][:4]) == [-6 * 3600, 0, 0, 0]
+
+        # Cached until a target is added
+        assert target_list.get_typed_column("Created") is column
+        target_list.add({'user':'ann', 'Created':"2024-06-01T00:00:00+00:00"}, [4])
+        column = target_list.get_typed_column("Created")
+        assert len(column['values']) == 5
+
+        column = target_list.get_typed_column("age", column_type="int")
+        assert list(column['values'][:2]) == [42, 30]
+        assert math.isnan(column['values'][2])
+
+        column = target_list.get_typed_column("user", column_type="category")
+        assert [column['categories'][index] for index in column['values']] == ['bob', 'sue', 'al', 'tom', 'ann']
+
+        assert target_list.filter_range("Created", min_value=datetime.date(2022, 3, 1), max_value="2023-12-31") == [0, 2]
+        assert target_list.filter_range("Created", max_value=datetime.date(2022, 3, 1)) == [1]
+        assert target_list.filter_range("age", min_value=35) == [0]